@@ -6,6 +6,7 @@ from __future__ import unicode_literals
 from __future__ import absolute_import
 
 import argparse
+import glob
 import platform
 import os
 import os.path as p
@@ -13,6 +14,8 @@ import subprocess
 import sys
 
 DIR_OF_THIS_SCRIPT = p.dirname( p.abspath( __file__ ) )
+DIR_OF_THIRD_PARTY = p.join( DIR_OF_THIS_SCRIPT, 'third_party' )
+DIR_OF_PYTHON_BENCHMARKS = p.join( DIR_OF_THIS_SCRIPT, 'ycmd', 'benchmarks' )
 
 
 def ParseArguments():
@@ -20,6 +23,9 @@ def ParseArguments():
   parser.add_argument( '--msvc', type = int, choices = [ 15, 16, 17 ],
                        default = 16, help = 'Choose the Microsoft Visual '
                        'Studio version (default: %(default)s).' )
+  parser.add_argument( '--python', action = 'store_true',
+                       help = 'Run the Python benchmarks instead of the C++ '
+                       'ones. The ycmd libraries must already be built.' )
 
   return parser.parse_known_args()
 
@@ -38,9 +44,30 @@ def BuildYcmdLibsAndRunBenchmark( args, extra_args ):
   subprocess.check_call( build_cmd )
 
 
+def RunPythonBenchmarks():
+  env = os.environ.copy()
+  env[ 'PYTHONPATH' ] = os.pathsep.join( [
+    DIR_OF_THIS_SCRIPT,
+    p.join( DIR_OF_THIRD_PARTY, 'regex-build' ),
+    p.join( DIR_OF_THIRD_PARTY, 'jedi_deps', 'jedi' ),
+    p.join( DIR_OF_THIRD_PARTY, 'jedi_deps', 'parso' ),
+    p.join( DIR_OF_THIRD_PARTY, 'watchdog_deps', 'watchdog', 'build', 'lib3' )
+  ] )
+
+  for benchmark in sorted( glob.glob( p.join( DIR_OF_PYTHON_BENCHMARKS,
+                                              '*_benchmark.py' ) ) ):
+    module = 'ycmd.benchmarks.' + p.splitext( p.basename( benchmark ) )[ 0 ]
+    subprocess.check_call( [ sys.executable, '-m', module ],
+                           cwd = DIR_OF_THIS_SCRIPT,
+                           env = env )
+
+
 def Main():
   args, extra_args = ParseArguments()
-  BuildYcmdLibsAndRunBenchmark( args, extra_args )
+  if args.python:
+    RunPythonBenchmarks()
+  else:
+    BuildYcmdLibsAndRunBenchmark( args, extra_args )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#include "BitsetFilter.h"
+
+#include <limits>
+
+#if defined( __x86_64__ ) || defined( _M_X64 ) || \
+    defined( __i386__ ) || defined( _M_IX86 )
+#define YCM_X86
+#include <immintrin.h>
+#ifdef _MSC_VER
+#include <intrin.h>
+#endif
+#endif
+
+// Allow the vector instructions in a function without enabling them for the
+// whole build so that the library still runs on older CPUs. MSVC doesn't need
+// this.
+#if defined( __GNUC__ ) || defined( __clang__ )
+#define YCM_TARGET( features ) __attribute__(( target( features ) ))
+#else
+#define YCM_TARGET( features )
+#endif
+
+namespace YouCompleteMe {
+
+namespace {
+
+// Number of bitsets tested before writing the indexes of those that passed.
+// Most queries discard nearly all the candidates so a whole block can usually
+// be skipped without writing anything.
+const size_t BLOCK_SIZE = 8;
+
+// Writes to |indexes| the indexes of the bits set in |mask|, offset by |first|.
+// Returns the number of indexes written. The index of every bit is written but
+// only kept if the bit is set, which avoids a hard to predict branch per bit.
+inline size_t WriteIndexes( uint32_t mask, size_t first, uint32_t *indexes ) {
+  size_t number_of_indexes = 0;
+  for ( size_t bit = 0; bit < BLOCK_SIZE; ++bit ) {
+    indexes[ number_of_indexes ] = static_cast< uint32_t >( first + bit );
+    number_of_indexes += ( mask >> bit ) & 1;
+  }
+  return number_of_indexes;
+}
+
+
+inline bool ContainsScalar( const PackedBitset &bitset,
+                            const PackedBitset &query ) {
+  uint64_t missing = 0;
+  for ( size_t word = 0; word < NUM_BYTES / 64; ++word ) {
+    missing |= query.words[ word ] & ~bitset.words[ word ];
+  }
+  return missing == 0;
+}
+
+
+// The filters below write to |indexes| the indexes of the bitsets that contain
+// |query| and return how many they wrote. The bitsets that don't fill a whole
+// block are tested one by one.
+size_t FilterScalar( const PackedBitset *bitsets,
+                     size_t count,
+                     const PackedBitset &query,
+                     uint32_t *indexes ) {
+  size_t number_of_indexes = 0;
+  for ( size_t index = 0; index < count; ++index ) {
+    indexes[ number_of_indexes ] = static_cast< uint32_t >( index );
+    number_of_indexes += ContainsScalar( bitsets[ index ], query );
+  }
+  return number_of_indexes;
+}
+
+
+#ifdef YCM_X86
+
+YCM_TARGET( "sse2" )
+size_t FilterSSE2( const PackedBitset *bitsets,
+                   size_t count,
+                   const PackedBitset &query,
+                   uint32_t *indexes ) {
+  const __m128i *query_words = reinterpret_cast< const __m128i * >(
+    query.words );
+  __m128i query_low = _mm_load_si128( query_words );
+  __m128i query_high = _mm_load_si128( query_words + 1 );
+  __m128i zero = _mm_setzero_si128();
+
+  size_t number_of_indexes = 0;
+  size_t index = 0;
+  for ( ; index + BLOCK_SIZE <= count; index += BLOCK_SIZE ) {
+    uint32_t mask = 0;
+    for ( size_t bit = 0; bit < BLOCK_SIZE; ++bit ) {
+      const __m128i *words = reinterpret_cast< const __m128i * >(
+        bitsets[ index + bit ].words );
+      __m128i missing = _mm_or_si128(
+        _mm_andnot_si128( _mm_load_si128( words ), query_low ),
+        _mm_andnot_si128( _mm_load_si128( words + 1 ), query_high ) );
+      uint32_t contains =
+        _mm_movemask_epi8( _mm_cmpeq_epi8( missing, zero ) ) == 0xFFFF;
+      mask |= contains << bit;
+    }
+    if ( mask ) {
+      number_of_indexes += WriteIndexes( mask,
+                                         index,
+                                         indexes + number_of_indexes );
+    }
+  }
+  for ( ; index < count; ++index ) {
+    indexes[ number_of_indexes ] = static_cast< uint32_t >( index );
+    number_of_indexes += ContainsScalar( bitsets[ index ], query );
+  }
+  return number_of_indexes;
+}
+
+
+YCM_TARGET( "avx2" )
+size_t FilterAVX2( const PackedBitset *bitsets,
+                   size_t count,
+                   const PackedBitset &query,
+                   uint32_t *indexes ) {
+  __m256i query_words = _mm256_load_si256(
+    reinterpret_cast< const __m256i * >( query.words ) );
+
+  size_t number_of_indexes = 0;
+  size_t index = 0;
+  for ( ; index + BLOCK_SIZE <= count; index += BLOCK_SIZE ) {
+    uint32_t mask = 0;
+    for ( size_t bit = 0; bit < BLOCK_SIZE; ++bit ) {
+      __m256i words = _mm256_load_si256(
+        reinterpret_cast< const __m256i * >( bitsets[ index + bit ].words ) );
+      // testc returns 1 if the query has no bit that isn't set in the bitset.
+      uint32_t contains = static_cast< uint32_t >(
+        _mm256_testc_si256( words, query_words ) );
+      mask |= contains << bit;
+    }
+    if ( mask ) {
+      number_of_indexes += WriteIndexes( mask,
+                                         index,
+                                         indexes + number_of_indexes );
+    }
+  }
+  for ( ; index < count; ++index ) {
+    indexes[ number_of_indexes ] = static_cast< uint32_t >( index );
+    number_of_indexes += ContainsScalar( bitsets[ index ], query );
+  }
+  return number_of_indexes;
+}
+
+
+struct CpuFeatures {
+  bool sse2 = false;
+  bool avx2 = false;
+};
+
+
+CpuFeatures DetectCpuFeatures() {
+  CpuFeatures features;
+#ifdef _MSC_VER
+  int info[ 4 ];
+  __cpuid( info, 0 );
+  int max_leaf = info[ 0 ];
+  __cpuid( info, 1 );
+  features.sse2 = ( info[ 3 ] & ( 1 << 26 ) ) != 0;
+  // AVX registers can only be used if the OS saves them on context switches.
+  bool os_saves_avx = ( info[ 2 ] & ( 1 << 27 ) ) != 0 &&
+                      ( _xgetbv( 0 ) & 6 ) == 6;
+  if ( max_leaf >= 7 && os_saves_avx ) {
+    __cpuidex( info, 7, 0 );
+    features.avx2 = ( info[ 1 ] & ( 1 << 5 ) ) != 0;
+  }
+#else
+  __builtin_cpu_init();
+  features.sse2 = __builtin_cpu_supports( "sse2" );
+  features.avx2 = __builtin_cpu_supports( "avx2" );
+#endif
+  return features;
+}
+
+
+const CpuFeatures &GetCpuFeatures() {
+  static const CpuFeatures features = DetectCpuFeatures();
+  return features;
+}
+
+#endif // YCM_X86
+
+} // unnamed namespace
+
+
+PackedBitset PackBitset( const Bitset &bitset ) {
+  const Bitset word_mask( std::numeric_limits< uint64_t >::max() );
+  PackedBitset packed;
+  for ( size_t word = 0; word < NUM_BYTES / 64; ++word ) {
+    packed.words[ word ] = ( ( bitset >> ( 64 * word ) ) & word_mask )
+                           .to_ullong();
+  }
+  return packed;
+}
+
+
+bool IsSupported( BitsetFilterImplementation implementation ) {
+  switch ( implementation ) {
+#ifdef YCM_X86
+    case BitsetFilterImplementation::AVX2:
+      return GetCpuFeatures().avx2;
+    case BitsetFilterImplementation::SSE2:
+      return GetCpuFeatures().sse2;
+#endif
+    case BitsetFilterImplementation::SCALAR:
+      return true;
+    default:
+      return false;
+  }
+}
+
+
+BitsetFilterImplementation BestBitsetFilterImplementation() {
+  static const BitsetFilterImplementation best = [] {
+    if ( IsSupported( BitsetFilterImplementation::AVX2 ) ) {
+      return BitsetFilterImplementation::AVX2;
+    }
+    if ( IsSupported( BitsetFilterImplementation::SSE2 ) ) {
+      return BitsetFilterImplementation::SSE2;
+    }
+    return BitsetFilterImplementation::SCALAR;
+  }();
+  return best;
+}
+
+
+void FilterBitsetsContaining( const PackedBitset *bitsets,
+                              size_t count,
+                              const PackedBitset &query,
+                              std::vector< uint32_t > &indexes ) {
+  FilterBitsetsContaining( bitsets,
+                           count,
+                           query,
+                           indexes,
+                           BestBitsetFilterImplementation() );
+}
+
+
+void FilterBitsetsContaining(
+  const PackedBitset *bitsets,
+  size_t count,
+  const PackedBitset &query,
+  std::vector< uint32_t > &indexes,
+  BitsetFilterImplementation implementation ) {
+  // Make room for the worst case where all the bitsets pass and shrink to the
+  // actual number afterwards.
+  size_t previous_size = indexes.size();
+  indexes.resize( previous_size + count );
+  uint32_t *data = indexes.data() + previous_size;
+  size_t number_of_indexes;
+
+  switch ( implementation ) {
+#ifdef YCM_X86
+    case BitsetFilterImplementation::AVX2:
+      number_of_indexes = FilterAVX2( bitsets, count, query, data );
+      break;
+    case BitsetFilterImplementation::SSE2:
+      number_of_indexes = FilterSSE2( bitsets, count, query, data );
+      break;
+#endif
+    default:
+      number_of_indexes = FilterScalar( bitsets, count, query, data );
+      break;
+  }
+
+  indexes.resize( previous_size + number_of_indexes );
+}
+
+} // namespace YouCompleteMe
@@ -0,0 +1,71 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#ifndef BITSETFILTER_H_R7WD2PLC
+#define BITSETFILTER_H_R7WD2PLC
+
+#include "Word.h"
+
+#include <cstdint>
+#include <vector>
+
+namespace YouCompleteMe {
+
+// A Bitset stored as an array of 64-bit words. The layout of std::bitset is
+// unspecified so it is converted to this type before being compared with
+// vector instructions.
+struct alignas( 32 ) PackedBitset {
+  uint64_t words[ NUM_BYTES / 64 ];
+};
+
+YCM_EXPORT PackedBitset PackBitset( const Bitset &bitset );
+
+
+enum class BitsetFilterImplementation {
+  SCALAR,
+  SSE2,
+  AVX2
+};
+
+// Returns true if the CPU we are running on supports |implementation|.
+YCM_EXPORT bool IsSupported( BitsetFilterImplementation implementation );
+
+// Returns the fastest implementation supported by the CPU. The CPU features are
+// only detected on the first call.
+YCM_EXPORT BitsetFilterImplementation BestBitsetFilterImplementation();
+
+// Appends to |indexes| the indexes of the bitsets in
+// [ bitsets, bitsets + count ) that contain all the bits set in |query|. This
+// is the same test as Word::ContainsBytes applied to a contiguous block of
+// bitsets.
+YCM_EXPORT void FilterBitsetsContaining( const PackedBitset *bitsets,
+                                         size_t count,
+                                         const PackedBitset &query,
+                                         std::vector< uint32_t > &indexes );
+
+// Same as above but with the given implementation, which must be supported.
+// Only useful for tests and benchmarks.
+YCM_EXPORT void FilterBitsetsContaining(
+  const PackedBitset *bitsets,
+  size_t count,
+  const PackedBitset &query,
+  std::vector< uint32_t > &indexes,
+  BitsetFilterImplementation implementation );
+
+} // namespace YouCompleteMe
+
+#endif /* end of include guard: BITSETFILTER_H_R7WD2PLC */
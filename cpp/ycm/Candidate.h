@@ -53,6 +53,12 @@ public:
     return text_is_lowercase_;
   }
 
+  inline size_t HeapMemoryUsage() const {
+    return Word::HeapMemoryUsage() +
+           YouCompleteMe::HeapMemoryUsage( case_swapped_text_ ) +
+           YouCompleteMe::HeapMemoryUsage( word_boundary_chars_ );
+  }
+
   YCM_EXPORT Result QueryMatchResult( const Word &query ) const;
 
 private:
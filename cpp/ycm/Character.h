@@ -18,6 +18,8 @@
 #ifndef CHARACTER_H_YTIET2HZ
 #define CHARACTER_H_YTIET2HZ
 
+#include "Utils.h"
+
 #include <string>
 #include <string_view>
 #include <vector>
@@ -72,6 +74,13 @@ public:
     return is_uppercase_;
   }
 
+  inline size_t HeapMemoryUsage() const {
+    return YouCompleteMe::HeapMemoryUsage( normal_ ) +
+           YouCompleteMe::HeapMemoryUsage( base_ ) +
+           YouCompleteMe::HeapMemoryUsage( folded_case_ ) +
+           YouCompleteMe::HeapMemoryUsage( swapped_case_ );
+  }
+
   inline bool operator== ( const Character &other ) const {
     return normal_ == other.normal_;
   }
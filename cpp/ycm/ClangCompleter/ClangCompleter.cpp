@@ -280,4 +280,15 @@ void ClangCompleter::DeleteCachesForFile( const std::string &filename ) {
 }
 
 
+void ClangCompleter::DeleteCachesForAllFiles() {
+  translation_unit_store_.RemoveAll();
+}
+
+
+std::vector< std::pair< std::string, size_t > >
+ClangCompleter::TranslationUnitsMemoryUsage() {
+  return translation_unit_store_.MemoryUsage();
+}
+
+
 } // namespace YouCompleteMe
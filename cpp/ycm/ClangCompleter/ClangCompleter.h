@@ -124,6 +124,10 @@ public:
 
   void DeleteCachesForFile( const std::string &filename );
 
+  void DeleteCachesForAllFiles();
+
+  std::vector< std::pair< std::string, size_t > > TranslationUnitsMemoryUsage();
+
 private:
 
   /////////////////////////////
@@ -136,6 +136,24 @@ bool TranslationUnit::IsCurrentlyUpdating() const {
 }
 
 
+size_t TranslationUnit::MemoryUsage() const {
+  // Don't wait for a reparse to finish; it can take several seconds.
+  unique_lock< mutex > lock( clang_access_mutex_, try_to_lock_t() );
+  if ( !lock.owns_lock() || !clang_translation_unit_ ) {
+    return 0;
+  }
+
+  CXTUResourceUsage usage =
+    clang_getCXTUResourceUsage( clang_translation_unit_ );
+  size_t bytes = 0;
+  for ( unsigned i = 0; i < usage.numEntries; ++i ) {
+    bytes += usage.entries[ i ].amount;
+  }
+  clang_disposeCXTUResourceUsage( usage );
+  return bytes;
+}
+
+
 std::vector< Diagnostic > TranslationUnit::Reparse(
   const std::vector< UnsavedFile > &unsaved_files ) {
   std::vector< CXUnsavedFile > cxunsaved_files =
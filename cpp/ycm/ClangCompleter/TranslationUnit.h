@@ -55,6 +55,11 @@ public:
 
   YCM_EXPORT bool IsCurrentlyUpdating() const;
 
+  // Returns the number of bytes used by libclang for this TU, as reported by
+  // clang_getCXTUResourceUsage. Returns 0 if the TU is invalid or currently
+  // being updated.
+  YCM_EXPORT size_t MemoryUsage() const;
+
   YCM_EXPORT std::vector< Diagnostic > Reparse(
     const std::vector< UnsavedFile > &unsaved_files );
 
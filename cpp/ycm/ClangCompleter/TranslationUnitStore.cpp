@@ -134,6 +134,25 @@ void TranslationUnitStore::RemoveAll() {
 }
 
 
+std::vector< std::pair< std::string, size_t > >
+TranslationUnitStore::MemoryUsage() {
+  // Copy the TUs so that the store is not locked while querying them.
+  std::vector< std::pair< std::string, shared_ptr< TranslationUnit > > > units;
+  {
+    lock_guard< mutex > lock( filename_to_translation_unit_and_flags_mutex_ );
+    units.assign( filename_to_translation_unit_.begin(),
+                  filename_to_translation_unit_.end() );
+  }
+
+  std::vector< std::pair< std::string, size_t > > usages;
+  usages.reserve( units.size() );
+  for ( const auto &[ filename, unit ] : units ) {
+    usages.emplace_back( filename, unit ? unit->MemoryUsage() : 0 );
+  }
+  return usages;
+}
+
+
 shared_ptr< TranslationUnit > TranslationUnitStore::GetNoLock(
   const std::string &filename ) {
   return FindWithDefault( filename_to_translation_unit_,
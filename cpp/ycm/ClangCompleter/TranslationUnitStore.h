@@ -61,6 +61,9 @@ public:
 
   void RemoveAll();
 
+  // Returns the filename and the memory usage in bytes of each stored TU.
+  std::vector< std::pair< std::string, size_t > > MemoryUsage();
+
 private:
 
   // WARNING: This accesses filename_to_translation_unit_ without a lock!
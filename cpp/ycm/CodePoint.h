@@ -18,6 +18,8 @@
 #ifndef CODE_POINT_H_3W0LNCLY
 #define CODE_POINT_H_3W0LNCLY
 
+#include "Utils.h"
+
 #include <cstdint>
 #include <stdexcept>
 #include <string>
@@ -137,6 +139,12 @@ public:
     return indic_conjunct_break_property_;
   }
 
+  inline size_t HeapMemoryUsage() const {
+    return YouCompleteMe::HeapMemoryUsage( normal_ ) +
+           YouCompleteMe::HeapMemoryUsage( folded_case_ ) +
+           YouCompleteMe::HeapMemoryUsage( swapped_case_ );
+  }
+
   inline bool operator< ( const CodePoint &other ) const {
     return combining_class_ < other.combining_class_;
   }
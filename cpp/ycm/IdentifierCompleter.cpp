@@ -44,10 +44,12 @@ IdentifierCompleter::IdentifierCompleter(
 void IdentifierCompleter::AddSingleIdentifierToDatabase(
   std::string& new_candidate,
   std::string& filetype,
-  std::string& filepath ) {
+  std::string& filepath,
+  size_t line_num ) {
   identifier_database_.AddSingleIdentifier( std::move( new_candidate ),
                                             std::move( filetype ),
-                                            std::move( filepath ) );
+                                            std::move( filepath ),
+                                            line_num );
 }
 
 
@@ -61,12 +63,45 @@ void IdentifierCompleter::ClearForFileAndAddIdentifiersToDatabase(
 }
 
 
-void IdentifierCompleter::AddIdentifiersToDatabaseFromTagFiles(
+std::vector< std::string >
+IdentifierCompleter::AddIdentifiersToDatabaseFromTagFiles(
   std::vector< std::string >& absolute_paths_to_tag_files ) {
+  std::vector< std::string > filepaths;
   for( auto&& path : absolute_paths_to_tag_files ) {
+    auto filetype_identifier_map =
+      ExtractIdentifiersFromTagsFile( std::move( path ) );
+    for ( const auto& [ _, paths_to_identifiers ] : filetype_identifier_map ) {
+      for ( const auto& path_to_identifiers : paths_to_identifiers ) {
+        filepaths.push_back( path_to_identifiers.first );
+      }
+    }
     identifier_database_.RecreateIdentifiers(
-      ExtractIdentifiersFromTagsFile( std::move( path ) ) );
+      std::move( filetype_identifier_map ) );
   }
+  return filepaths;
+}
+
+
+std::vector< std::string > IdentifierCompleter::FiletypesInDatabase() const {
+  return identifier_database_.Filetypes();
+}
+
+
+std::vector< std::string > IdentifierCompleter::FilepathsInDatabase(
+  const std::string &filetype ) const {
+  return identifier_database_.Filepaths( filetype );
+}
+
+
+std::vector< std::string > IdentifierCompleter::IdentifiersInDatabase(
+  const std::string &filetype,
+  const std::string &filepath ) const {
+  return identifier_database_.Identifiers( filetype, filepath );
+}
+
+
+std::vector< FileMemoryUsage > IdentifierCompleter::MemoryUsage() const {
+  return identifier_database_.MemoryUsage();
 }
 
 
@@ -80,12 +115,16 @@ std::vector< std::string > IdentifierCompleter::CandidatesForQuery(
 std::vector< std::string > IdentifierCompleter::CandidatesForQueryAndType(
   std::string& query,
   const std::string &filetype,
-  const size_t max_candidates ) const {
+  const size_t max_candidates,
+  const std::string &filepath,
+  size_t line_num ) const {
 
   std::vector< Result > results =
     identifier_database_.ResultsForQueryAndType( std::move( query ),
                                                  filetype,
-                                                 max_candidates );
+                                                 max_candidates,
+                                                 filepath,
+                                                 line_num );
 
   std::vector< std::string > candidates( results.size() );
 
@@ -43,30 +43,49 @@ public:
                        std::string&& filetype,
                        std::string&& filepath );
 
-  void AddSingleIdentifierToDatabase(
+  // |line_num| is the line where the identifier was typed. The identifiers the
+  // user types are preferred over the others when ranking the candidates.
+  YCM_EXPORT void AddSingleIdentifierToDatabase(
     std::string& new_candidate,
     std::string& filetype,
-    std::string& filepath );
+    std::string& filepath,
+    size_t line_num = 0 );
 
   // Same as above, but clears all identifiers stored for the file before adding
   // new identifiers.
-  void ClearForFileAndAddIdentifiersToDatabase(
+  YCM_EXPORT void ClearForFileAndAddIdentifiersToDatabase(
     std::vector< std::string >& new_candidates,
     std::string& filetype,
     std::string& filepath );
 
-  YCM_EXPORT void AddIdentifiersToDatabaseFromTagFiles(
+  // Returns the paths of the files the identifiers were read from.
+  YCM_EXPORT std::vector< std::string > AddIdentifiersToDatabaseFromTagFiles(
     std::vector< std::string >& absolute_paths_to_tag_files );
 
+  YCM_EXPORT std::vector< std::string > FiletypesInDatabase() const;
+
+  YCM_EXPORT std::vector< std::string > FilepathsInDatabase(
+    const std::string &filetype ) const;
+
+  YCM_EXPORT std::vector< std::string > IdentifiersInDatabase(
+    const std::string &filetype,
+    const std::string &filepath ) const;
+
+  YCM_EXPORT std::vector< FileMemoryUsage > MemoryUsage() const;
+
   // Only provided for tests!
   YCM_EXPORT std::vector< std::string > CandidatesForQuery(
     std::string&& query,
     const size_t max_candidates = 0 ) const;
 
+  // |filepath| and |line_num| are the position of the request. Identifiers
+  // used near that position are preferred.
   YCM_EXPORT std::vector< std::string > CandidatesForQueryAndType(
     std::string& query,
     const std::string &filetype,
-    const size_t max_candidates = 0 ) const;
+    const size_t max_candidates = 0,
+    const std::string &filepath = std::string(),
+    size_t line_num = 0 ) const;
 
 private:
 
@@ -44,35 +44,42 @@ using Hash = std::hash< T >;
 namespace YouCompleteMe {
 
 namespace {
-struct CandidateHasher {
-  size_t operator() ( const Candidate* c ) const noexcept {
-    static Hash< std::string > h;
-    return h(c->Text());
-  }
-};
-struct CandidateCompareEq {
-  bool operator() ( const Candidate* a, const Candidate* b ) const noexcept {
-    return a->Text() == b->Text();
-  }
-};
+
+// Identifiers used within this number of lines of the request are considered
+// nearby.
+const size_t NEARBY_LINES = 50;
+
 } // namespace
 
 
 
 IdentifierDatabase::IdentifierDatabase()
-  : candidate_repository_( Repository< Candidate >::Instance() ) {
+  : candidate_repository_( Repository< Candidate >::Instance() ),
+    usage_clock_( 0 ) {
 }
 
 
 void IdentifierDatabase::RecreateIdentifiers(
   FiletypeIdentifierMap&& filetype_identifier_map ) {
-  std::lock_guard locker( filetype_candidate_map_mutex_ );
-
+  // Building the candidates is the expensive part for large tag files, so it is
+  // done before taking the lock. The identifiers currently in the database stay
+  // queryable until the new sets are swapped in.
+  FiletypeCandidateMap new_candidate_map;
   for ( auto&& [ filetype, paths_to_candidates ] : filetype_identifier_map ) {
+    auto& new_paths_to_candidates = new_candidate_map[ filetype ];
     for ( auto&& [ filepath, identifiers ] : paths_to_candidates ) {
-      RecreateIdentifiersNoLock( std::move( identifiers ),
-                                 std::string( filetype ),
-                                 std::string( filepath ) );
+      new_paths_to_candidates[ filepath ] =
+        BuildCandidates( std::move( identifiers ) );
+    }
+  }
+
+  std::lock_guard locker( filetype_candidate_map_mutex_ );
+
+  for ( auto&& [ filetype, paths_to_candidates ] : new_candidate_map ) {
+    for ( auto&& [ filepath, candidates ] : paths_to_candidates ) {
+      std::swap( GetCandidateSet( std::string( filetype ),
+                                  std::string( filepath ) ),
+                 candidates );
     }
   }
 }
@@ -81,20 +88,30 @@ void IdentifierDatabase::RecreateIdentifiers(
 void IdentifierDatabase::AddSingleIdentifier(
   std::string&& new_candidate,
   std::string&& filetype,
-  std::string&& filepath ) {
+  std::string&& filepath,
+  size_t line_num ) {
   std::lock_guard locker( filetype_candidate_map_mutex_ );
   std::vector< std::string > candidate_vector( 1 );
   auto candidate_pointer = candidate_repository_.GetElements(
          { new_candidate } )[ 0 ];
+
+  if ( !candidate_pointer->IsEmpty() ) {
+    auto& usage = filetype_usage_map_[ filetype ][ candidate_pointer->Text() ];
+    ++usage.count;
+    usage.last_used = ++usage_clock_;
+    usage.line_num = static_cast< uint32_t >( line_num );
+    usage.filepath_hash = Hash< std::string >()( filepath );
+  }
+
   auto& current_identifier_set = GetCandidateSet( std::move( filetype ),
                                                   std::move( filepath ) );
-  auto it = std::find_if( current_identifier_set.begin(),
-                          current_identifier_set.end(),
-                          [ candidate_pointer ]( const Candidate& c ) {
-                                return c.Text() == candidate_pointer->Text();
-                          } );
-  if ( it == current_identifier_set.end() ) {
-    current_identifier_set.push_back( candidate_pointer->clone() );
+  auto& candidates = current_identifier_set.candidates;
+  // The repository returns the same candidate for the same text.
+  if ( std::find( candidates.begin(),
+                  candidates.end(),
+                  candidate_pointer ) == candidates.end() ) {
+    candidates.push_back( candidate_pointer );
+    current_identifier_set.packed.Add( candidate_pointer );
   }
 }
 
@@ -103,53 +120,84 @@ void IdentifierDatabase::RecreateIdentifiers(
   std::vector< std::string >&& new_candidates,
   std::string&& filetype,
   std::string&& filepath ) {
+  auto candidates = BuildCandidates( std::move( new_candidates ) );
   std::lock_guard locker( filetype_candidate_map_mutex_ );
-  RecreateIdentifiersNoLock( std::move( new_candidates ),
-                             std::move( filetype ),
-                             std::move( filepath ) );
+  std::swap( GetCandidateSet( std::move( filetype ), std::move( filepath ) ),
+             candidates );
 }
 
 
 std::vector< Result > IdentifierDatabase::ResultsForQueryAndType(
   std::string&& query,
   const std::string &filetype,
-  const size_t max_results ) const {
-  FiletypeCandidateMap::const_iterator it;
+  const size_t max_results,
+  const std::string &filepath,
+  size_t line_num ) const {
+  Word query_object( std::move( query ) );
+
+  // The repository returns the same candidate for the same text, so comparing
+  // the pointers is enough to detect duplicates.
+  HashSet< const Candidate *,
+           Hash< const Candidate * >,
+           std::equal_to< const Candidate * > > seen_candidates;
+  std::vector< Result > results;
+  std::vector< Result > file_results;
+
   {
+    // Only a shared lock is needed here; writers build their candidates
+    // beforehand and only hold the exclusive lock to swap them in.
     std::shared_lock locker( filetype_candidate_map_mutex_ );
-    it = filetype_candidate_map_.find( filetype );
+    auto it = filetype_candidate_map_.find( filetype );
 
     if ( it == filetype_candidate_map_.end() ) {
       return {};
     }
-  }
-  Word query_object( std::move( query ) );
 
-  HashSet< const Candidate *,
-           CandidateHasher,
-           CandidateCompareEq > seen_candidates;
-  seen_candidates.reserve( candidate_repository_.NumStoredElements() );
-  std::vector< Result > results;
+    const IdentifierToUsage *usages = nullptr;
+    auto usages_it = filetype_usage_map_.find( filetype );
+    if ( usages_it != filetype_usage_map_.end() ) {
+      usages = &usages_it->second;
+    }
+    size_t filepath_hash = Hash< std::string >()( filepath );
 
-  {
-    std::lock_guard locker( filetype_candidate_map_mutex_ );
-    auto& paths_to_candidates = it->second;
-    for ( const auto& [ _, candidates ] : paths_to_candidates ) {
-      for ( const Candidate& candidate : candidates ) {
-        if ( !seen_candidates.insert( &candidate ).second ) {
+    auto add_results = [ & ]( const FileCandidates &candidates,
+                              bool in_current_file ) {
+      file_results.clear();
+      candidates.packed.ResultsForQuery( query_object, file_results );
+      for ( Result& result : file_results ) {
+        if ( !seen_candidates.insert( result.GetCandidate() ).second ) {
           continue;
         }
 
-        if ( candidate.IsEmpty() ||
-             !candidate.ContainsBytes( query_object ) ) {
-          continue;
+        const IdentifierUsage *usage = nullptr;
+        if ( usages ) {
+          auto usage_it = usages->find( result.Text() );
+          if ( usage_it != usages->end() ) {
+            usage = &usage_it->second;
+          }
         }
+        result.SetUsageScore( UsageScore( usage,
+                                          in_current_file,
+                                          filepath_hash,
+                                          line_num ) );
+        results.push_back( result );
+      }
+    };
+
+    auto& paths_to_candidates = it->second;
 
-        Result result = candidate.QueryMatchResult( query_object );
+    // The candidates of the current file are scanned first so that they are
+    // not skipped as duplicates of the same identifiers in other files.
+    const FileCandidates *current_file_candidates = nullptr;
+    auto current_file_it = paths_to_candidates.find( filepath );
+    if ( current_file_it != paths_to_candidates.end() ) {
+      current_file_candidates = &current_file_it->second;
+      add_results( *current_file_candidates, true );
+    }
 
-        if ( result.IsSubsequence() ) {
-          results.push_back( result );
-        }
+    for ( const auto& [ _, candidates ] : paths_to_candidates ) {
+      if ( &candidates != current_file_candidates ) {
+        add_results( candidates, false );
       }
     }
   }
@@ -159,9 +207,126 @@ std::vector< Result > IdentifierDatabase::ResultsForQueryAndType(
 }
 
 
+unsigned int IdentifierDatabase::UsageScore( const IdentifierUsage *usage,
+                                             bool in_current_file,
+                                             size_t filepath_hash,
+                                             size_t line_num ) const {
+  unsigned int score = 0;
+
+  if ( usage ) {
+    // Frequency: 1 plus the logarithm of the number of uses, up to 8.
+    score = 1;
+    for ( uint32_t count = usage->count; count > 1 && score < 8; count >>= 1 ) {
+      ++score;
+    }
+
+    // Recency: how many identifiers were used since this one.
+    uint32_t age = usage_clock_ - usage->last_used;
+    if ( age < 8 ) {
+      score += 3;
+    } else if ( age < 64 ) {
+      score += 2;
+    } else if ( age < 512 ) {
+      score += 1;
+    }
+
+    // Proximity: the identifier was last used near the request.
+    if ( usage->filepath_hash == filepath_hash ) {
+      in_current_file = true;
+      size_t distance = usage->line_num > line_num ?
+                        usage->line_num - line_num :
+                        line_num - usage->line_num;
+      if ( line_num > 0 && usage->line_num > 0 && distance <= NEARBY_LINES ) {
+        score += 4;
+      }
+    }
+  }
+
+  if ( in_current_file ) {
+    score += 2;
+  }
+
+  return score;
+}
+
+
+std::vector< std::string > IdentifierDatabase::Filetypes() const {
+  std::shared_lock locker( filetype_candidate_map_mutex_ );
+  std::vector< std::string > filetypes;
+  filetypes.reserve( filetype_candidate_map_.size() );
+  for ( const auto& [ filetype, _ ] : filetype_candidate_map_ ) {
+    filetypes.push_back( filetype );
+  }
+  return filetypes;
+}
+
+
+std::vector< std::string > IdentifierDatabase::Filepaths(
+  const std::string &filetype ) const {
+  std::shared_lock locker( filetype_candidate_map_mutex_ );
+  auto it = filetype_candidate_map_.find( filetype );
+  if ( it == filetype_candidate_map_.end() ) {
+    return {};
+  }
+
+  std::vector< std::string > filepaths;
+  filepaths.reserve( it->second.size() );
+  for ( const auto& [ filepath, _ ] : it->second ) {
+    filepaths.push_back( filepath );
+  }
+  return filepaths;
+}
+
+
+std::vector< std::string > IdentifierDatabase::Identifiers(
+  const std::string &filetype,
+  const std::string &filepath ) const {
+  std::shared_lock locker( filetype_candidate_map_mutex_ );
+  auto filetype_it = filetype_candidate_map_.find( filetype );
+  if ( filetype_it == filetype_candidate_map_.end() ) {
+    return {};
+  }
+  auto filepath_it = filetype_it->second.find( filepath );
+  if ( filepath_it == filetype_it->second.end() ) {
+    return {};
+  }
+
+  const auto& candidates = filepath_it->second.candidates;
+  std::vector< std::string > identifiers;
+  identifiers.reserve( candidates.size() );
+  for ( const Candidate *candidate : candidates ) {
+    // Candidates that were too long to be stored have an empty text.
+    if ( !candidate->IsEmpty() ) {
+      identifiers.push_back( candidate->Text() );
+    }
+  }
+  return identifiers;
+}
+
+
+std::vector< FileMemoryUsage > IdentifierDatabase::MemoryUsage() const {
+  std::shared_lock locker( filetype_candidate_map_mutex_ );
+  std::vector< FileMemoryUsage > usages;
+  for ( const auto& [ filetype, paths_to_candidates ] :
+        filetype_candidate_map_ ) {
+    for ( const auto& [ filepath, candidates ] : paths_to_candidates ) {
+      usages.push_back( {
+        filetype,
+        filepath,
+        candidates.candidates.size(),
+        sizeof( FileCandidates ) +
+        HeapMemoryUsage( filepath ) +
+        HeapMemoryUsage( candidates.candidates ) +
+        candidates.packed.HeapMemoryUsage() } );
+    }
+  }
+  return usages;
+}
+
+
 // WARNING: You need to hold the filetype_candidate_map_mutex_ before calling
 // this function and while using the returned set.
-std::vector< Candidate > &IdentifierDatabase::GetCandidateSet(
+IdentifierDatabase::FileCandidates &IdentifierDatabase::GetCandidateSet(
   std::string&& filetype,
   std::string&& filepath ) {
   return filetype_candidate_map_[ std::move( filetype ) ]
@@ -169,25 +334,12 @@ std::vector< Candidate > &IdentifierDatabase::GetCandidateSet(
 }
 
 
-// WARNING: You need to hold the filetype_candidate_map_mutex_ before calling
-// this function and while using the returned set.
-void IdentifierDatabase::RecreateIdentifiersNoLock(
-  std::vector< std::string >&& new_candidates,
-  std::string&& filetype,
-  std::string&& filepath ) {
-
-  auto& current_identifier_set = GetCandidateSet( std::move( filetype ),
-                                                  std::move( filepath ) );
-  auto candidate_pointers = candidate_repository_.GetElements(
+IdentifierDatabase::FileCandidates IdentifierDatabase::BuildCandidates(
+  std::vector< std::string >&& new_candidates ) const {
+  auto candidates = candidate_repository_.GetElements(
                   std::move( new_candidates ) );
-  current_identifier_set.clear();
-  current_identifier_set.reserve( candidate_pointers.size() );
-  std::transform( candidate_pointers.begin(),
-                  candidate_pointers.end(),
-                  std::back_inserter( current_identifier_set ),
-                  []( const Candidate* candidate_ptr ) {
-                    return candidate_ptr->clone();
-                  } );
+  PackedCandidates packed( candidates );
+  return { std::move( candidates ), std::move( packed ) };
 }
 
 } // namespace YouCompleteMe
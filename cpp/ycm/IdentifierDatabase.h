@@ -31,6 +31,9 @@ template< typename K, typename V >
 using HashMap = std::unordered_map< K, V >;
 } // namespace YouCompleteMe
 #endif
+#include "PackedCandidates.h"
+
+#include <cstdint>
 #include <memory>
 #include <shared_mutex>
 #include <string>
@@ -51,6 +54,17 @@ using FilepathToIdentifiers = HashMap< std::string, std::vector< std::string > >
 using FiletypeIdentifierMap = HashMap< std::string, FilepathToIdentifiers >;
 
 
+struct FileMemoryUsage {
+  std::string filetype;
+  std::string filepath;
+  size_t number_of_identifiers;
+  // Estimate of the bytes used by the sets of candidates of the file. The
+  // candidates themselves are shared by all files and are accounted for by the
+  // candidate repository.
+  size_t bytes;
+};
+
+
 // This class stores the database of identifiers the identifier completer has
 // seen. It stores them in a data structure that makes it easy to tell which
 // identifier came from which file and what files have which filetypes.
@@ -66,10 +80,13 @@ public:
   IdentifierDatabase( const IdentifierDatabase& ) = delete;
   IdentifierDatabase& operator=( const IdentifierDatabase& ) = delete;
 
+  // Also records that the user used the identifier at line |line_num| of
+  // |filepath|. See ResultsForQueryAndType.
   void AddSingleIdentifier(
     std::string&& new_candidate,
     std::string&& filetype,
-    std::string&& filepath );
+    std::string&& filepath,
+    size_t line_num = 0 );
 
   void RecreateIdentifiers( FiletypeIdentifierMap&& filetype_identifier_map );
 
@@ -81,32 +98,82 @@ public:
   void ClearCandidatesStoredForFile( std::string&& filetype,
                                      std::string&& filepath );
 
+  // Results that match the query equally well are ranked by how often and how
+  // recently the user used them and by how close they are to |line_num| of
+  // |filepath|, the position of the request.
   std::vector< Result > ResultsForQueryAndType(
     std::string&& query,
     const std::string &filetype,
-    const size_t max_results ) const;
+    const size_t max_results,
+    const std::string &filepath = std::string(),
+    size_t line_num = 0 ) const;
+
+  // The following three functions let the caller walk the database, e.g. to
+  // persist it on disk.
+  std::vector< std::string > Filetypes() const;
+
+  std::vector< std::string > Filepaths( const std::string &filetype ) const;
+
+  std::vector< std::string > Identifiers( const std::string &filetype,
+                                          const std::string &filepath ) const;
+
+  std::vector< FileMemoryUsage > MemoryUsage() const;
 
 private:
-  std::vector< Candidate > &GetCandidateSet(
+  // How the user used an identifier. This is kept apart from the candidates
+  // since only a small fraction of them is ever typed.
+  struct IdentifierUsage {
+    uint32_t count = 0;
+    // Value of usage_clock_ when the identifier was last used.
+    uint32_t last_used = 0;
+    uint32_t line_num = 0;
+    size_t filepath_hash = 0;
+  };
+
+  // The candidates of a file. They are matched against the queries through
+  // their packed representation.
+  struct FileCandidates {
+    std::vector< const Candidate * > candidates;
+    PackedCandidates packed;
+  };
+
+  unsigned int UsageScore( const IdentifierUsage *usage,
+                           bool in_current_file,
+                           size_t filepath_hash,
+                           size_t line_num ) const;
+
+  FileCandidates &GetCandidateSet(
     std::string&& filetype,
     std::string&& filepath );
 
-  void RecreateIdentifiersNoLock(
-    std::vector< std::string >&& new_candidates,
-    std::string&& filetype,
-    std::string&& filepath );
+  // Does not touch the database, so it can be called without holding the lock.
+  FileCandidates BuildCandidates(
+    std::vector< std::string >&& new_candidates ) const;
 
 
   // filepath -> ( candidate )
-  using FilepathToCandidates = HashMap< std::string, std::vector< Candidate > >;
+  using FilepathToCandidates = HashMap< std::string, FileCandidates >;
 
   // filetype -> ( filepath -> ( candidate ) )
   using FiletypeCandidateMap = HashMap< std::string, FilepathToCandidates >;
 
+  // identifier -> usage
+  using IdentifierToUsage = HashMap< std::string, IdentifierUsage >;
+
+  // filetype -> ( identifier -> usage )
+  using FiletypeUsageMap = HashMap< std::string, IdentifierToUsage >;
+
 
   Repository< Candidate > &candidate_repository_;
 
   FiletypeCandidateMap filetype_candidate_map_;
+
+  // The usage map and clock are protected by the same mutex as the candidates.
+  FiletypeUsageMap filetype_usage_map_;
+  // Incremented each time an identifier is used. This orders the uses without
+  // having to query the system clock.
+  uint32_t usage_clock_;
+
   mutable std::shared_mutex filetype_candidate_map_mutex_;
 };
 
@@ -0,0 +1,210 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#include "PackedCandidates.h"
+
+#include "Candidate.h"
+#include "Repository.h"
+#include "Result.h"
+
+#include <algorithm>
+#include <limits>
+
+namespace YouCompleteMe {
+
+namespace {
+
+// Code of the strings that don't appear in the candidates.
+const uint32_t NO_CODE = std::numeric_limits< uint32_t >::max();
+
+} // unnamed namespace
+
+
+PackedCandidates::PackedCandidates(
+  const std::vector< const Candidate * > &candidates ) {
+  size_t number_of_characters = 0;
+  for ( const Candidate *candidate : candidates ) {
+    number_of_characters += candidate->Length();
+  }
+
+  candidates_.reserve( candidates.size() );
+  bytes_present_.reserve( candidates.size() );
+  offsets_.reserve( candidates.size() + 1 );
+  base_codes_.reserve( number_of_characters );
+  folded_case_codes_.reserve( number_of_characters );
+  normal_codes_.reserve( number_of_characters );
+  is_uppercase_.reserve( number_of_characters );
+
+  HashMap< const Character *, CharacterCodes > character_codes;
+  for ( const Candidate *candidate : candidates ) {
+    Append( candidate, character_codes );
+  }
+}
+
+
+void PackedCandidates::Add( const Candidate *candidate ) {
+  HashMap< const Character *, CharacterCodes > character_codes;
+  Append( candidate, character_codes );
+}
+
+
+void PackedCandidates::Append(
+  const Candidate *candidate,
+  HashMap< const Character *, CharacterCodes > &character_codes ) {
+  if ( candidate->IsEmpty() ) {
+    return;
+  }
+
+  candidates_.push_back( candidate );
+  bytes_present_.push_back( PackBitset( candidate->BytesPresent() ) );
+  for ( const Character *character : candidate->Characters() ) {
+    auto [ it, inserted ] = character_codes.emplace( character,
+                                                     CharacterCodes() );
+    if ( inserted ) {
+      it->second = AddCodesForCharacter( *character );
+    }
+    const CharacterCodes &codes = it->second;
+    base_codes_.push_back( codes.base );
+    folded_case_codes_.push_back( codes.folded_case );
+    normal_codes_.push_back( codes.normal );
+    is_uppercase_.push_back( codes.is_uppercase );
+  }
+  offsets_.push_back( static_cast< uint32_t >( base_codes_.size() ) );
+}
+
+
+std::vector< uint32_t > PackedCandidates::CandidatesContainingBytes(
+  const Word &query ) const {
+  std::vector< uint32_t > indexes;
+  FilterBitsetsContaining( bytes_present_.data(),
+                           bytes_present_.size(),
+                           PackBitset( query.BytesPresent() ),
+                           indexes );
+  return indexes;
+}
+
+
+void PackedCandidates::ResultsForQuery( const Word &query,
+                                        std::vector< Result > &results ) const {
+  if ( query.IsEmpty() ) {
+    for ( const Candidate *candidate : candidates_ ) {
+      results.emplace_back( candidate, &query, 0, false );
+    }
+    return;
+  }
+
+  std::vector< CharacterCodes > query_codes;
+  query_codes.reserve( query.Length() );
+  for ( const Character *character : query.Characters() ) {
+    query_codes.push_back( CodesForCharacter( *character ) );
+  }
+  size_t query_length = query_codes.size();
+
+  // Same algorithm as Candidate::QueryMatchResult.
+  for ( uint32_t index : CandidatesContainingBytes( query ) ) {
+    size_t begin = offsets_[ index ];
+    size_t end = offsets_[ index + 1 ];
+    if ( end - begin < query_length ) {
+      continue;
+    }
+
+    size_t query_index = 0;
+    size_t index_sum = 0;
+    for ( size_t position = begin; position != end; ++position ) {
+      if ( MatchesSmart( query_codes[ query_index ], position ) ) {
+        size_t candidate_index = position - begin;
+        index_sum += candidate_index;
+
+        if ( ++query_index == query_length ) {
+          results.emplace_back( candidates_[ index ],
+                                &query,
+                                index_sum,
+                                candidate_index + 1 == query_length );
+          break;
+        }
+      }
+    }
+  }
+}
+
+
+PackedCandidates::CharacterCodes PackedCandidates::CodesForCharacter(
+  const Character &character ) const {
+  auto code = [ this ]( const std::string &text ) {
+    auto it = LowerBoundCode( text );
+    if ( it == sorted_codes_.end() || code_strings_[ *it ] != text ) {
+      return NO_CODE;
+    }
+    return *it;
+  };
+
+  return { code( character.Base() ),
+           code( character.FoldedCase() ),
+           code( character.Normal() ),
+           character.IsBase(),
+           character.IsUppercase() };
+}
+
+
+PackedCandidates::CharacterCodes PackedCandidates::AddCodesForCharacter(
+  const Character &character ) {
+  return { AddCodeForString( character.Base() ),
+           AddCodeForString( character.FoldedCase() ),
+           AddCodeForString( character.Normal() ),
+           character.IsBase(),
+           character.IsUppercase() };
+}
+
+
+uint32_t PackedCandidates::AddCodeForString( const std::string &text ) {
+  auto it = LowerBoundCode( text );
+  if ( it != sorted_codes_.end() && code_strings_[ *it ] == text ) {
+    return *it;
+  }
+  uint32_t code = static_cast< uint32_t >( code_strings_.size() );
+  code_strings_.push_back( text );
+  sorted_codes_.insert( it, code );
+  return code;
+}
+
+
+std::vector< uint32_t >::const_iterator PackedCandidates::LowerBoundCode(
+  const std::string &text ) const {
+  return std::lower_bound(
+    sorted_codes_.begin(),
+    sorted_codes_.end(),
+    text,
+    [ this ]( uint32_t code, const std::string &value ) {
+      return code_strings_[ code ] < value;
+    } );
+}
+
+
+size_t PackedCandidates::HeapMemoryUsage() const {
+  return YouCompleteMe::HeapMemoryUsage( candidates_ ) +
+         YouCompleteMe::HeapMemoryUsage( bytes_present_ ) +
+         YouCompleteMe::HeapMemoryUsage( offsets_ ) +
+         YouCompleteMe::HeapMemoryUsage( base_codes_ ) +
+         YouCompleteMe::HeapMemoryUsage( folded_case_codes_ ) +
+         YouCompleteMe::HeapMemoryUsage( normal_codes_ ) +
+         YouCompleteMe::HeapMemoryUsage( is_uppercase_ ) +
+         YouCompleteMe::HeapMemoryUsage( code_strings_ ) +
+         YouCompleteMe::HeapMemoryUsage( sorted_codes_ );
+}
+
+
+} // namespace YouCompleteMe
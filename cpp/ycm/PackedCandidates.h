@@ -0,0 +1,139 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#ifndef PACKEDCANDIDATES_H_K3QN8VXA
+#define PACKEDCANDIDATES_H_K3QN8VXA
+
+#include "BitsetFilter.h"
+#include "Repository.h"
+#include "Word.h"
+
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace YouCompleteMe {
+
+class Candidate;
+class Result;
+
+// This class stores a set of candidates in a layout suited to matching them
+// against a query. Instead of following the pointers from each candidate to its
+// characters, the characters of all the candidates are stored in one arena as
+// codes for their base, folded case and normal forms, with the offset of each
+// candidate in the arena kept in a separate array. The bitsets of the bytes
+// present in the candidates are also stored contiguously so that they can be
+// filtered with vector instructions (see FilterBitsetsContaining). The codes
+// are only meaningful within a set.
+//
+// The set only refers to the candidates, which must outlive it. Candidates can
+// be appended to it with Add. It can be queried from multiple threads as long
+// as none of them modifies it.
+class PackedCandidates {
+public:
+  YCM_EXPORT PackedCandidates() = default;
+  YCM_EXPORT explicit PackedCandidates(
+    const std::vector< const Candidate * > &candidates );
+  PackedCandidates( const PackedCandidates& ) = delete;
+  PackedCandidates& operator=( const PackedCandidates& ) = delete;
+  PackedCandidates( PackedCandidates&& ) = default;
+  PackedCandidates& operator=( PackedCandidates&& ) = default;
+
+  inline size_t Size() const {
+    return candidates_.size();
+  }
+
+  inline const Candidate *GetCandidate( size_t index ) const {
+    return candidates_[ index ];
+  }
+
+  // Appends |candidate| to the set, without repacking the other candidates.
+  YCM_EXPORT void Add( const Candidate *candidate );
+
+  // The candidates themselves are not included.
+  YCM_EXPORT size_t HeapMemoryUsage() const;
+
+  // Returns the indexes of the candidates that contain the bytes of |query|.
+  YCM_EXPORT std::vector< uint32_t > CandidatesContainingBytes(
+    const Word &query ) const;
+
+  // Appends to |results| the results of the candidates that |query| is a
+  // subsequence of. This is equivalent to calling Candidate::QueryMatchResult
+  // on each candidate but faster.
+  YCM_EXPORT void ResultsForQuery( const Word &query,
+                                   std::vector< Result > &results ) const;
+
+private:
+  // Codes of the different forms of a character. See Character::MatchesSmart.
+  struct CharacterCodes {
+    uint32_t base;
+    uint32_t folded_case;
+    uint32_t normal;
+    bool is_base;
+    bool is_uppercase;
+  };
+
+  CharacterCodes CodesForCharacter( const Character &character ) const;
+
+  // Same as above, but assigns a code to the forms that don't have one yet.
+  CharacterCodes AddCodesForCharacter( const Character &character );
+
+  uint32_t AddCodeForString( const std::string &text );
+
+  // Returns the first of |sorted_codes_| whose string is not less than |text|.
+  std::vector< uint32_t >::const_iterator LowerBoundCode(
+    const std::string &text ) const;
+
+  // |character_codes| caches the codes of the characters already added.
+  void Append( const Candidate *candidate,
+               HashMap< const Character *, CharacterCodes > &character_codes );
+
+  // Returns true if the character of |query_codes| matches the character at
+  // |position| in the arena.
+  inline bool MatchesSmart( const CharacterCodes &query_codes,
+                            size_t position ) const {
+    return ( query_codes.is_base &&
+             query_codes.base == base_codes_[ position ] &&
+             ( !query_codes.is_uppercase || is_uppercase_[ position ] ) ) ||
+           ( !query_codes.is_uppercase &&
+             query_codes.folded_case == folded_case_codes_[ position ] ) ||
+           query_codes.normal == normal_codes_[ position ];
+  }
+
+  std::vector< const Candidate * > candidates_;
+  std::vector< PackedBitset > bytes_present_;
+
+  // The characters of candidate i are at positions [ offsets_[ i ],
+  // offsets_[ i + 1 ] ) of the arrays below.
+  std::vector< uint32_t > offsets_ = { 0 };
+  std::vector< uint32_t > base_codes_;
+  std::vector< uint32_t > folded_case_codes_;
+  std::vector< uint32_t > normal_codes_;
+  std::vector< uint8_t > is_uppercase_;
+
+  // The strings that have a code, indexed by their code. The codes are assigned
+  // in order of appearance so that adding a candidate doesn't change the codes
+  // of the others.
+  std::vector< std::string > code_strings_;
+  // The codes sorted by their string, so that the codes of the query can be
+  // found without allocating.
+  std::vector< uint32_t > sorted_codes_;
+};
+
+} // namespace YouCompleteMe
+
+#endif /* end of include guard: PACKEDCANDIDATES_H_K3QN8VXA */
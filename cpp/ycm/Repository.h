@@ -65,6 +65,21 @@ public:
     return element_holder_.size();
   }
 
+  // Returns an estimate of the number of bytes used by the stored elements,
+  // including the holder itself.
+  size_t ApproximateMemoryUsage() const {
+    std::shared_lock locker( element_holder_mutex_ );
+    size_t usage = element_holder_.bucket_count() *
+                   ( sizeof( typename Holder::value_type ) + sizeof( void * ) );
+    for ( const auto &[ text, element ] : element_holder_ ) {
+      usage += HeapMemoryUsage( text );
+      if ( element ) {
+        usage += sizeof( T ) + element->HeapMemoryUsage();
+      }
+    }
+    return usage;
+  }
+
   Sequence GetElements(
     std::vector< std::string >&& elements ) {
     Sequence element_objects( elements.size() );
@@ -62,6 +62,7 @@ Result::Result( const Candidate *candidate,
     query_is_candidate_prefix_( query_is_candidate_prefix ),
     char_match_index_sum_( char_match_index_sum ),
     num_wb_matches_( 0 ),
+    usage_score_( 0 ),
     candidate_( candidate ),
     query_( query ) {
   SetResultFeaturesFromQuery();
@@ -85,6 +86,7 @@ bool Result::operator< ( const Result &other ) const {
     //  - the query is a prefix of the result but not a prefix of the other;
     //  - it has more word boundary characters matched than the other;
     //  - it has less word boundary characters than the other;
+    //  - it has a higher usage score than the other;
     //  - its sum of indexes of its matched characters is less than the sum of
     //    indexes of the other result;
     //  - it has less characters than the other result;
@@ -120,6 +122,10 @@ bool Result::operator< ( const Result &other ) const {
       return NumWordBoundaryChars() < other.NumWordBoundaryChars();
     }
 
+    if ( usage_score_ != other.usage_score_ ) {
+      return usage_score_ > other.usage_score_;
+    }
+
     if ( char_match_index_sum_ != other.char_match_index_sum_ ) {
       return char_match_index_sum_ < other.char_match_index_sum_;
     }
@@ -32,6 +32,7 @@ public:
     query_is_candidate_prefix_( false ),
     char_match_index_sum_( 0 ),
     num_wb_matches_( 0 ),
+    usage_score_( 0 ),
     candidate_( nullptr ),
     query_( nullptr ) {}
 
@@ -40,12 +41,16 @@ public:
           size_t char_match_index_sum,
           bool query_is_candidate_prefix );
 
-  bool operator< ( const Result &other ) const;
+  YCM_EXPORT bool operator< ( const Result &other ) const;
 
   inline const std::string &Text() const {
     return candidate_->Text();
   }
 
+  inline const Candidate *GetCandidate() const {
+    return candidate_;
+  }
+
   inline size_t NumWordBoundaryChars() const {
     return candidate_->WordBoundaryChars().size();
   }
@@ -54,6 +59,10 @@ public:
     return is_subsequence_;
   }
 
+  inline void SetUsageScore( unsigned int usage_score ) {
+    usage_score_ = usage_score;
+  }
+
 private:
   void SetResultFeaturesFromQuery();
 
@@ -86,6 +95,11 @@ private:
   //  - the character is a letter and the previous one is a punctuation.
   size_t num_wb_matches_;
 
+  // A score given by the caller from how the candidate was used, e.g. how
+  // often and how recently the user typed it. Higher is better. It is only
+  // used to break ties between results that match the query equally well.
+  unsigned int usage_score_;
+
   // NOTE: we don't use references for the query and the candidate because we
   // are sorting results through std::sort or std::partial_sort and these
   // functions require move assignments which is not possible with reference
@@ -21,6 +21,7 @@
 #include <algorithm>
 #include <cmath>
 #include <filesystem>
+#include <functional>
 #include <limits>
 #include <string>
 #include <string_view>
@@ -63,6 +64,31 @@ YCM_EXPORT inline std::string Lowercase( std::string_view text ) {
 std::vector< std::string > ReadUtf8File( const fs::path &filepath );
 
 
+// Returns the number of bytes allocated on the heap by |text|. Short strings
+// are stored in the object itself and do not allocate.
+inline size_t HeapMemoryUsage( const std::string &text ) {
+  const char *object = reinterpret_cast< const char * >( &text );
+  std::less< const char * > less;
+  if ( !less( text.data(), object ) &&
+       less( text.data(), object + sizeof( text ) ) ) {
+    return 0;
+  }
+  return text.capacity() + 1;
+}
+
+
+template< typename Element >
+size_t HeapMemoryUsage( const std::vector< Element > &elements ) {
+  size_t usage = elements.capacity() * sizeof( Element );
+  if constexpr ( std::is_same_v< Element, std::string > ) {
+    for ( const auto &element : elements ) {
+      usage += HeapMemoryUsage( element );
+    }
+  }
+  return usage;
+}
+
+
 template <class Container, class Key, typename Value>
 typename Container::mapped_type &
 GetValueElseInsert( Container &container,
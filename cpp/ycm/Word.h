@@ -19,6 +19,7 @@
 #define WORD_H_UOHAUKVQ
 
 #include "Character.h"
+#include "Utils.h"
 
 #include <bitset>
 #include <string>
@@ -67,6 +68,15 @@ public:
     return characters_.empty();
   }
 
+  inline const Bitset &BytesPresent() const {
+    return bytes_present_;
+  }
+
+  inline size_t HeapMemoryUsage() const {
+    return YouCompleteMe::HeapMemoryUsage( text_ ) +
+           YouCompleteMe::HeapMemoryUsage( characters_ );
+  }
+
 private:
   void BreakIntoCharacters();
   void ComputeBytesPresent();
@@ -0,0 +1,105 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#include "BenchUtils.h"
+#include "BitsetFilter.h"
+
+#include <benchmark/benchmark.h>
+
+namespace YouCompleteMe {
+
+// Measures how many candidates per second each implementation filters. The
+// first argument is the number of candidates, the second selects the query: 1
+// for a query contained in all the candidates, 0 for a query contained in
+// almost none of them.
+class BitsetFilterFixture : public benchmark::Fixture {
+public:
+  void SetUp( const benchmark::State& state ) {
+    bitsets_.clear();
+    for ( std::string& candidate :
+          GenerateCandidatesWithCommonPrefix( "a_A_a_", state.range( 0 ) ) ) {
+      bitsets_.push_back(
+        PackBitset( Word( std::move( candidate ) ).BytesPresent() ) );
+    }
+    query_ = PackBitset( Word( state.range( 1 ) ? "aA" : "zzz" )
+                         .BytesPresent() );
+  }
+
+protected:
+  void Filter( benchmark::State& state,
+               BitsetFilterImplementation implementation ) {
+    if ( !IsSupported( implementation ) ) {
+      state.SkipWithError( "Not supported by this CPU" );
+      return;
+    }
+
+    std::vector< uint32_t > indexes;
+    indexes.reserve( bitsets_.size() );
+    for ( auto _ : state ) {
+      indexes.clear();
+      FilterBitsetsContaining( bitsets_.data(),
+                               bitsets_.size(),
+                               query_,
+                               indexes,
+                               implementation );
+      benchmark::DoNotOptimize( indexes );
+    }
+
+    state.SetItemsProcessed( state.iterations() *
+                             static_cast< int64_t >( bitsets_.size() ) );
+    state.SetComplexityN( state.range( 0 ) );
+  }
+
+  std::vector< PackedBitset > bitsets_;
+  PackedBitset query_;
+};
+
+
+BENCHMARK_DEFINE_F( BitsetFilterFixture, FilterScalar )(
+    benchmark::State& state ) {
+  Filter( state, BitsetFilterImplementation::SCALAR );
+}
+
+
+BENCHMARK_DEFINE_F( BitsetFilterFixture, FilterSSE2 )(
+    benchmark::State& state ) {
+  Filter( state, BitsetFilterImplementation::SSE2 );
+}
+
+
+BENCHMARK_DEFINE_F( BitsetFilterFixture, FilterAVX2 )(
+    benchmark::State& state ) {
+  Filter( state, BitsetFilterImplementation::AVX2 );
+}
+
+
+BENCHMARK_REGISTER_F( BitsetFilterFixture, FilterScalar )
+    ->RangeMultiplier( 1 << 4 )
+    ->Ranges( { { 1, 1 << 16 }, { 0, 1 } } )
+    ->Complexity();
+
+BENCHMARK_REGISTER_F( BitsetFilterFixture, FilterSSE2 )
+    ->RangeMultiplier( 1 << 4 )
+    ->Ranges( { { 1, 1 << 16 }, { 0, 1 } } )
+    ->Complexity();
+
+BENCHMARK_REGISTER_F( BitsetFilterFixture, FilterAVX2 )
+    ->RangeMultiplier( 1 << 4 )
+    ->Ranges( { { 1, 1 << 16 }, { 0, 1 } } )
+    ->Complexity();
+
+} // namespace YouCompleteMe
@@ -0,0 +1,110 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#include "BenchUtils.h"
+#include "PackedCandidates.h"
+#include "Repository.h"
+#include "Result.h"
+
+#include <benchmark/benchmark.h>
+
+namespace YouCompleteMe {
+
+// Compares matching a query against candidates through the Candidate objects
+// and through their packed representation.
+class PackedCandidatesFixture : public benchmark::Fixture {
+public:
+  void SetUp( const benchmark::State& state ) {
+    Repository< Candidate >::Instance().ClearElements();
+    Repository< Character >::Instance().ClearElements();
+    Repository< CodePoint >::Instance().ClearElements();
+
+    candidates_ = Repository< Candidate >::Instance().GetElements(
+      GenerateCandidatesWithCommonPrefix( "a_A_a_", state.range( 0 ) ) );
+  }
+
+protected:
+  std::vector< const Candidate * > candidates_;
+};
+
+
+BENCHMARK_DEFINE_F( PackedCandidatesFixture, MatchCandidates )(
+    benchmark::State& state ) {
+  Word query( state.range( 1 ) ? "aA" : "zzz" );
+
+  for ( auto _ : state ) {
+    std::vector< Result > results;
+    for ( const Candidate *candidate : candidates_ ) {
+      if ( candidate->IsEmpty() || !candidate->ContainsBytes( query ) ) {
+        continue;
+      }
+      Result result = candidate->QueryMatchResult( query );
+      if ( result.IsSubsequence() ) {
+        results.push_back( result );
+      }
+    }
+    benchmark::DoNotOptimize( results );
+  }
+
+  state.SetComplexityN( state.range( 0 ) );
+}
+
+
+BENCHMARK_DEFINE_F( PackedCandidatesFixture, MatchPackedCandidates )(
+    benchmark::State& state ) {
+  Word query( state.range( 1 ) ? "aA" : "zzz" );
+  PackedCandidates packed( candidates_ );
+
+  for ( auto _ : state ) {
+    std::vector< Result > results;
+    packed.ResultsForQuery( query, results );
+    benchmark::DoNotOptimize( results );
+  }
+
+  state.SetComplexityN( state.range( 0 ) );
+}
+
+
+BENCHMARK_DEFINE_F( PackedCandidatesFixture, PackCandidates )(
+    benchmark::State& state ) {
+  for ( auto _ : state ) {
+    PackedCandidates packed( candidates_ );
+    benchmark::DoNotOptimize( packed );
+  }
+
+  state.SetComplexityN( state.range( 0 ) );
+}
+
+
+// The second argument selects the query: 1 for a query matching all the
+// candidates, 0 for a query matching almost none of them.
+BENCHMARK_REGISTER_F( PackedCandidatesFixture, MatchCandidates )
+    ->RangeMultiplier( 1 << 4 )
+    ->Ranges( { { 1, 1 << 16 }, { 0, 1 } } )
+    ->Complexity();
+
+BENCHMARK_REGISTER_F( PackedCandidatesFixture, MatchPackedCandidates )
+    ->RangeMultiplier( 1 << 4 )
+    ->Ranges( { { 1, 1 << 16 }, { 0, 1 } } )
+    ->Complexity();
+
+BENCHMARK_REGISTER_F( PackedCandidatesFixture, PackCandidates )
+    ->RangeMultiplier( 1 << 4 )
+    ->Range( 1, 1 << 16 )
+    ->Complexity();
+
+} // namespace YouCompleteMe
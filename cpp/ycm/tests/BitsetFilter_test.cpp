@@ -0,0 +1,164 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#include "BitsetFilter.h"
+
+#include <gtest/gtest.h>
+#include <gmock/gmock.h>
+
+#include <random>
+
+using ::testing::ElementsAre;
+using ::testing::IsEmpty;
+
+namespace YouCompleteMe {
+
+namespace {
+
+const BitsetFilterImplementation IMPLEMENTATIONS[] = {
+  BitsetFilterImplementation::SCALAR,
+  BitsetFilterImplementation::SSE2,
+  BitsetFilterImplementation::AVX2
+};
+
+
+std::vector< PackedBitset > PackWords(
+  const std::vector< std::string > &texts ) {
+  std::vector< PackedBitset > bitsets;
+  for ( std::string text : texts ) {
+    bitsets.push_back( PackBitset( Word( std::move( text ) ).BytesPresent() ) );
+  }
+  return bitsets;
+}
+
+} // unnamed namespace
+
+
+TEST( BitsetFilterTest, PackBitset ) {
+  Bitset bitset;
+  bitset.set( 0 );
+  bitset.set( 63 );
+  bitset.set( 64 );
+  bitset.set( 200 );
+  bitset.set( 255 );
+
+  PackedBitset packed = PackBitset( bitset );
+
+  EXPECT_EQ( packed.words[ 0 ], 0x8000000000000001u );
+  EXPECT_EQ( packed.words[ 1 ], 0x0000000000000001u );
+  EXPECT_EQ( packed.words[ 2 ], 0x0000000000000000u );
+  EXPECT_EQ( packed.words[ 3 ], 0x8000000000000100u );
+}
+
+
+TEST( BitsetFilterTest, ScalarAlwaysSupported ) {
+  EXPECT_TRUE( IsSupported( BitsetFilterImplementation::SCALAR ) );
+  EXPECT_TRUE( IsSupported( BestBitsetFilterImplementation() ) );
+}
+
+
+TEST( BitsetFilterTest, FilterWords ) {
+  std::vector< PackedBitset > bitsets = PackWords(
+    { "foo", "bar", "", "oof", "fóo", "Foo", "foobar" } );
+
+  for ( auto implementation : IMPLEMENTATIONS ) {
+    if ( !IsSupported( implementation ) ) {
+      continue;
+    }
+
+    std::vector< uint32_t > indexes;
+    FilterBitsetsContaining( bitsets.data(),
+                             bitsets.size(),
+                             PackBitset( Word( "fo" ).BytesPresent() ),
+                             indexes,
+                             implementation );
+    EXPECT_THAT( indexes, ElementsAre( 0, 3, 4, 5, 6 ) );
+
+    // Indexes are appended to the existing ones.
+    FilterBitsetsContaining( bitsets.data(),
+                             bitsets.size(),
+                             PackBitset( Word( "ab" ).BytesPresent() ),
+                             indexes,
+                             implementation );
+    EXPECT_THAT( indexes, ElementsAre( 0, 3, 4, 5, 6, 1, 6 ) );
+
+    indexes.clear();
+    FilterBitsetsContaining( bitsets.data(),
+                             bitsets.size(),
+                             PackBitset( Word( "" ).BytesPresent() ),
+                             indexes,
+                             implementation );
+    EXPECT_THAT( indexes, ElementsAre( 0, 1, 2, 3, 4, 5, 6 ) );
+
+    indexes.clear();
+    FilterBitsetsContaining( bitsets.data(),
+                             0,
+                             PackBitset( Word( "" ).BytesPresent() ),
+                             indexes,
+                             implementation );
+    EXPECT_THAT( indexes, IsEmpty() );
+  }
+}
+
+
+TEST( BitsetFilterTest, SameIndexesAsContainsBytes ) {
+  std::mt19937 generator( 42 );
+  std::uniform_int_distribution< int > byte( 0, NUM_BYTES - 1 );
+
+  // Sparse random bitsets so that some of them contain the queries.
+  auto random_bitset = [ & ]( size_t number_of_bits ) {
+    Bitset bitset;
+    for ( size_t i = 0; i < number_of_bits; ++i ) {
+      bitset.set( byte( generator ) );
+    }
+    return bitset;
+  };
+
+  std::vector< Bitset > bitsets;
+  std::vector< PackedBitset > packed_bitsets;
+  for ( size_t i = 0; i < 1000; ++i ) {
+    bitsets.push_back( random_bitset( 200 ) );
+    packed_bitsets.push_back( PackBitset( bitsets.back() ) );
+  }
+
+  for ( size_t query_size = 0; query_size < 8; ++query_size ) {
+    Bitset query = random_bitset( query_size );
+
+    std::vector< uint32_t > expected;
+    for ( size_t i = 0; i < bitsets.size(); ++i ) {
+      if ( ( bitsets[ i ] & query ) == query ) {
+        expected.push_back( static_cast< uint32_t >( i ) );
+      }
+    }
+
+    for ( auto implementation : IMPLEMENTATIONS ) {
+      if ( !IsSupported( implementation ) ) {
+        continue;
+      }
+
+      std::vector< uint32_t > indexes;
+      FilterBitsetsContaining( packed_bitsets.data(),
+                               packed_bitsets.size(),
+                               PackBitset( query ),
+                               indexes,
+                               implementation );
+      EXPECT_EQ( indexes, expected );
+    }
+  }
+}
+
+} // namespace YouCompleteMe
@@ -84,5 +84,19 @@ TEST_F( CandidateRepositoryTest, NonPrintableCandidates ) {
 }
 
 
+TEST_F( CandidateRepositoryTest, MemoryUsageGrowsWithElements ) {
+  size_t empty_usage = repo_.ApproximateMemoryUsage();
+
+  std::vector< std::string > inputs;
+  inputs.push_back( "foobar" );
+  inputs.push_back( std::string( 64, 'a' ) );
+  repo_.GetElements( std::move( inputs ) );
+
+  EXPECT_EQ( 2, repo_.NumStoredElements() );
+  EXPECT_LT( empty_usage + 2 * sizeof( Candidate ),
+             repo_.ApproximateMemoryUsage() );
+}
+
+
 } // namespace YouCompleteMe
 
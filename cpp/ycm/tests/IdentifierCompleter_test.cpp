@@ -22,6 +22,7 @@
 #include "Utils.h"
 #include "TestUtils.h"
 
+using ::testing::Contains;
 using ::testing::ElementsAre;
 using ::testing::IsEmpty;
 using ::testing::WhenSorted;
@@ -290,6 +291,130 @@ TEST( IdentifierCompleterTest, LotOfCandidates ) {
 }
 
 
+namespace {
+
+void UseIdentifier( IdentifierCompleter &completer,
+                    std::string identifier,
+                    std::string filepath = "foo",
+                    size_t line_num = 0 ) {
+  std::string filetype = "c";
+  completer.AddSingleIdentifierToDatabase( identifier,
+                                           filetype,
+                                           filepath,
+                                           line_num );
+}
+
+
+std::vector< std::string > CandidatesForQuery(
+  const IdentifierCompleter &completer,
+  std::string query,
+  const std::string &filepath = "",
+  size_t line_num = 0 ) {
+  return completer.CandidatesForQueryAndType( query,
+                                              "c",
+                                              0,
+                                              filepath,
+                                              line_num );
+}
+
+} // unnamed namespace
+
+
+TEST( IdentifierCompleterTest, UsedIdentifierWins ) {
+  IdentifierCompleter completer( { "foobar", "foobaz" }, "c", "foo" );
+
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba" ),
+               ElementsAre( "foobar",
+                            "foobaz" ) );
+
+  UseIdentifier( completer, "foobaz" );
+
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba" ),
+               ElementsAre( "foobaz",
+                            "foobar" ) );
+}
+
+
+TEST( IdentifierCompleterTest, FrequentlyUsedIdentifierWins ) {
+  IdentifierCompleter completer( { "foobar", "foobaz" }, "c", "foo" );
+
+  UseIdentifier( completer, "foobaz" );
+  UseIdentifier( completer, "foobaz" );
+  UseIdentifier( completer, "foobaz" );
+  UseIdentifier( completer, "foobar" );
+
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba" ),
+               ElementsAre( "foobaz",
+                            "foobar" ) );
+}
+
+
+TEST( IdentifierCompleterTest, RecentlyUsedIdentifierWins ) {
+  IdentifierCompleter completer( { "foobar", "foobaz" }, "c", "foo" );
+
+  UseIdentifier( completer, "foobar" );
+  for ( int i = 0; i < 10; ++i ) {
+    UseIdentifier( completer, "other" + std::to_string( i ) );
+  }
+  UseIdentifier( completer, "foobaz" );
+
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba" ),
+               ElementsAre( "foobaz",
+                            "foobar" ) );
+}
+
+
+TEST( IdentifierCompleterTest, IdentifierUsedNearbyWins ) {
+  IdentifierCompleter completer( { "foobar", "foobaz" }, "c", "foo" );
+
+  UseIdentifier( completer, "foobaz", "foo", 10 );
+  UseIdentifier( completer, "foobar", "foo", 100 );
+
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba", "foo", 12 ),
+               ElementsAre( "foobaz",
+                            "foobar" ) );
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba", "foo", 90 ),
+               ElementsAre( "foobar",
+                            "foobaz" ) );
+}
+
+
+TEST( IdentifierCompleterTest, IdentifierFromCurrentFileWins ) {
+  IdentifierCompleter completer;
+  std::vector< std::string > foo_candidates{ "foobaz" };
+  std::vector< std::string > bar_candidates{ "foobar" };
+  std::string filetype = "c";
+  std::string foo = "foo";
+  std::string bar = "bar";
+  completer.ClearForFileAndAddIdentifiersToDatabase( foo_candidates,
+                                                     filetype,
+                                                     foo );
+  filetype = "c";
+  completer.ClearForFileAndAddIdentifiersToDatabase( bar_candidates,
+                                                     filetype,
+                                                     bar );
+
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba", "foo" ),
+               ElementsAre( "foobaz",
+                            "foobar" ) );
+  EXPECT_THAT( CandidatesForQuery( completer, "fooba", "bar" ),
+               ElementsAre( "foobar",
+                            "foobaz" ) );
+}
+
+
+TEST( IdentifierCompleterTest, BetterMatchWinsOverUsedIdentifier ) {
+  IdentifierCompleter completer( { "xfoo", "foox" }, "c", "foo" );
+
+  UseIdentifier( completer, "xfoo" );
+  UseIdentifier( completer, "xfoo" );
+
+  EXPECT_THAT( CandidatesForQuery( completer, "foo" ),
+               ElementsAre( "foox",
+                            "xfoo" ) );
+}
+
+
 TEST( IdentifierCompleterTest, TagsEndToEndWorks ) {
   IdentifierCompleter completer;
   std::vector< std::string > tag_files;
@@ -305,6 +430,55 @@ TEST( IdentifierCompleterTest, TagsEndToEndWorks ) {
 }
 
 
+TEST( IdentifierCompleterTest, TagsReturnFilepaths ) {
+  IdentifierCompleter completer;
+  std::vector< std::string > tag_files;
+  tag_files.push_back( PathToTestFile( "basic.tags" ).string() );
+
+  EXPECT_THAT( completer.AddIdentifiersToDatabaseFromTagFiles( tag_files ),
+               Contains( PathToTestFile( "foo" ).string() ) );
+}
+
+
+TEST( IdentifierCompleterTest, DatabaseCanBeWalked ) {
+  IdentifierCompleter completer( {
+                                   "foobar",
+                                   "foobaz"
+                                 }, "c", "foo" );
+
+  EXPECT_THAT( completer.FiletypesInDatabase(), ElementsAre( "c" ) );
+  EXPECT_THAT( completer.FilepathsInDatabase( "c" ), ElementsAre( "foo" ) );
+  EXPECT_THAT( completer.FilepathsInDatabase( "cpp" ), IsEmpty() );
+  EXPECT_THAT( completer.IdentifiersInDatabase( "c", "foo" ),
+               WhenSorted( ElementsAre( "foobar",
+                                        "foobaz" ) ) );
+  EXPECT_THAT( completer.IdentifiersInDatabase( "c", "bar" ), IsEmpty() );
+}
+
+
+TEST( IdentifierCompleterTest, MemoryUsageIsReportedPerFile ) {
+  IdentifierCompleter completer( {
+                                   "foobar",
+                                   "foobaz"
+                                 }, "c", "foo" );
+  UseIdentifier( completer, "barfoo", "bar" );
+
+  std::vector< FileMemoryUsage > usages = completer.MemoryUsage();
+  ASSERT_EQ( 2, usages.size() );
+  std::sort( usages.begin(), usages.end(),
+             []( const FileMemoryUsage &a, const FileMemoryUsage &b ) {
+               return a.filepath < b.filepath;
+             } );
+  EXPECT_EQ( "c", usages[ 0 ].filetype );
+  EXPECT_EQ( "bar", usages[ 0 ].filepath );
+  EXPECT_EQ( 1, usages[ 0 ].number_of_identifiers );
+  EXPECT_EQ( "c", usages[ 1 ].filetype );
+  EXPECT_EQ( "foo", usages[ 1 ].filepath );
+  EXPECT_EQ( 2, usages[ 1 ].number_of_identifiers );
+  EXPECT_LT( usages[ 0 ].bytes, usages[ 1 ].bytes );
+}
+
+
 // Filetype checking
 TEST( IdentifierCompleterTest, ManyCandidateSimpleFileType ) {
   IdentifierCompleter completer;
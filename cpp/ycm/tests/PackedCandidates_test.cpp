@@ -0,0 +1,145 @@
+// Copyright (C) 2026 ycmd contributors
+//
+// This file is part of ycmd.
+//
+// ycmd is free software: you can redistribute it and/or modify
+// it under the terms of the GNU General Public License as published by
+// the Free Software Foundation, either version 3 of the License, or
+// (at your option) any later version.
+//
+// ycmd is distributed in the hope that it will be useful,
+// but WITHOUT ANY WARRANTY; without even the implied warranty of
+// MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+// GNU General Public License for more details.
+//
+// You should have received a copy of the GNU General Public License
+// along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+#include "Candidate.h"
+#include "PackedCandidates.h"
+#include "Result.h"
+
+#include <gtest/gtest.h>
+#include <gmock/gmock.h>
+
+using ::testing::ElementsAre;
+using ::testing::IsEmpty;
+
+namespace YouCompleteMe {
+
+namespace {
+
+std::vector< std::string > ResultTexts( std::vector< Result > results ) {
+  std::sort( results.begin(), results.end() );
+  std::vector< std::string > texts;
+  for ( const Result &result : results ) {
+    texts.push_back( result.Text() );
+  }
+  return texts;
+}
+
+} // unnamed namespace
+
+
+TEST( PackedCandidatesTest, SameResultsAsCandidates ) {
+  std::vector< Candidate > candidates;
+  for ( std::string text : { "foo", "fOo", "Foo", "fóo", "FÓO", "bar", "",
+                             "foobar", "f_o_o", "aA_b", "ÉLAN", "élan",
+                             "elan", "Élan", "ﬃ", "ffi" } ) {
+    candidates.emplace_back( std::move( text ) );
+  }
+  std::vector< const Candidate * > candidate_pointers;
+  for ( const Candidate &candidate : candidates ) {
+    candidate_pointers.push_back( &candidate );
+  }
+  PackedCandidates packed( candidate_pointers );
+
+  for ( std::string text : { "", "f", "fo", "Fo", "fó", "FÓ", "oo", "fb",
+                             "ab", "el", "É", "E", "é", "ffi", "z" } ) {
+    Word query( std::move( text ) );
+
+    std::vector< Result > expected;
+    for ( const Candidate &candidate : candidates ) {
+      if ( candidate.IsEmpty() || !candidate.ContainsBytes( query ) ) {
+        continue;
+      }
+      Result result = candidate.QueryMatchResult( query );
+      if ( result.IsSubsequence() ) {
+        expected.push_back( result );
+      }
+    }
+
+    std::vector< Result > results;
+    packed.ResultsForQuery( query, results );
+
+    EXPECT_EQ( ResultTexts( results ), ResultTexts( expected ) )
+      << "for query " << query.Text();
+  }
+}
+
+
+TEST( PackedCandidatesTest, EmptyCandidatesSkipped ) {
+  Candidate empty( "" );
+  Candidate foo( "foo" );
+  PackedCandidates packed( { &empty, &foo } );
+
+  EXPECT_EQ( packed.Size(), 1U );
+  EXPECT_EQ( packed.GetCandidate( 0 ), &foo );
+}
+
+
+TEST( PackedCandidatesTest, CandidatesContainingBytes ) {
+  Candidate foo( "foo" );
+  Candidate bar( "bar" );
+  Candidate foobar( "foobar" );
+  PackedCandidates packed( { &foo, &bar, &foobar } );
+
+  EXPECT_THAT( packed.CandidatesContainingBytes( Word( "fb" ) ),
+               ElementsAre( 2 ) );
+  EXPECT_THAT( packed.CandidatesContainingBytes( Word( "o" ) ),
+               ElementsAre( 0, 2 ) );
+  EXPECT_THAT( packed.CandidatesContainingBytes( Word( "z" ) ), IsEmpty() );
+}
+
+
+TEST( PackedCandidatesTest, QueryPrefixOfCandidate ) {
+  Candidate foobar( "foobar" );
+  Candidate afoobar( "afoobar" );
+  PackedCandidates packed( { &afoobar, &foobar } );
+  Word query( "foo" );
+
+  std::vector< Result > results;
+  packed.ResultsForQuery( query, results );
+
+  // The query is a prefix of "foobar" but not of "afoobar".
+  EXPECT_THAT( ResultTexts( results ), ElementsAre( "foobar", "afoobar" ) );
+}
+
+
+TEST( PackedCandidatesTest, AddedCandidatesSameResultsAsBuilt ) {
+  std::vector< Candidate > candidates;
+  for ( std::string text : { "bar", "foo", "", "FÓO", "élan", "zab" } ) {
+    candidates.emplace_back( std::move( text ) );
+  }
+  std::vector< const Candidate * > candidate_pointers;
+  PackedCandidates added;
+  for ( const Candidate &candidate : candidates ) {
+    candidate_pointers.push_back( &candidate );
+    added.Add( &candidate );
+  }
+  PackedCandidates built( candidate_pointers );
+
+  EXPECT_EQ( added.Size(), built.Size() );
+  for ( std::string text : { "", "b", "fo", "fó", "É", "ab", "z" } ) {
+    Word query( std::move( text ) );
+    std::vector< Result > added_results;
+    added.ResultsForQuery( query, added_results );
+    std::vector< Result > built_results;
+    built.ResultsForQuery( query, built_results );
+
+    EXPECT_EQ( ResultTexts( added_results ), ResultTexts( built_results ) )
+      << "for query " << query.Text();
+  }
+}
+
+} // namespace YouCompleteMe
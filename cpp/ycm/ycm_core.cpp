@@ -16,9 +16,11 @@
 // along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
 #include "Candidate.h"
+#include "Character.h"
 #include "CodePoint.h"
 #include "IdentifierCompleter.h"
 #include "PythonSupport.h"
+#include "Repository.h"
 #include "versioning.h"
 
 #ifdef USE_CLANG_COMPLETER
@@ -73,23 +75,69 @@ PYBIND11_MODULE( ycm_core, mod )
   mod.def( "GetUtf8String", []( py::object o ) -> py::bytes {
                                   return GetUtf8String( o ); } );
 
+  // Returns a dictionary mapping the name of each repository to the number of
+  // elements it stores and an estimate of the bytes they use.
+  mod.def( "RepositoriesMemoryUsage", []() {
+    auto usage = []( const auto &repository ) {
+      return py::make_tuple( repository.NumStoredElements(),
+                             repository.ApproximateMemoryUsage() );
+    };
+    py::dict repositories;
+    repositories[ "candidates" ] = usage( Repository< Candidate >::Instance() );
+    repositories[ "characters" ] = usage( Repository< Character >::Instance() );
+    repositories[ "code_points" ] = usage( Repository< CodePoint >::Instance() );
+    return repositories;
+  } );
+
   py::class_< IdentifierCompleter >( mod, "IdentifierCompleter" )
     .def( py::init<>() )
     .def( "AddSingleIdentifierToDatabase",
           &IdentifierCompleter::AddSingleIdentifierToDatabase,
-          py::call_guard< py::gil_scoped_release >() )
+          py::call_guard< py::gil_scoped_release >(),
+          py::arg( "new_candidate" ),
+          py::arg( "filetype" ),
+          py::arg( "filepath" ),
+          py::arg( "line_num" ) = 0 )
     .def( "ClearForFileAndAddIdentifiersToDatabase",
           &IdentifierCompleter::ClearForFileAndAddIdentifiersToDatabase,
           py::call_guard< py::gil_scoped_release >() )
     .def( "AddIdentifiersToDatabaseFromTagFiles",
           &IdentifierCompleter::AddIdentifiersToDatabaseFromTagFiles,
           py::call_guard< py::gil_scoped_release >() )
+    .def( "FiletypesInDatabase",
+          &IdentifierCompleter::FiletypesInDatabase,
+          py::call_guard< py::gil_scoped_release >() )
+    .def( "FilepathsInDatabase",
+          &IdentifierCompleter::FilepathsInDatabase,
+          py::call_guard< py::gil_scoped_release >() )
+    .def( "IdentifiersInDatabase",
+          &IdentifierCompleter::IdentifiersInDatabase,
+          py::call_guard< py::gil_scoped_release >() )
+    .def( "MemoryUsage",
+          []( const IdentifierCompleter &completer ) {
+            std::vector< FileMemoryUsage > usages;
+            {
+              py::gil_scoped_release unlock;
+              usages = completer.MemoryUsage();
+            }
+            // List of ( filetype, filepath, number of identifiers, bytes ).
+            py::list result;
+            for ( const auto &usage : usages ) {
+              result.append( py::make_tuple( usage.filetype,
+                                             usage.filepath,
+                                             usage.number_of_identifiers,
+                                             usage.bytes ) );
+            }
+            return result;
+          } )
     .def( "CandidatesForQueryAndType",
           &IdentifierCompleter::CandidatesForQueryAndType,
           py::call_guard< py::gil_scoped_release >(),
           py::arg( "query" ),
           py::arg( "filetype" ),
-          py::arg( "max_candidates" ) = 0 );
+          py::arg( "max_candidates" ) = 0,
+          py::arg( "filepath" ) = "",
+          py::arg( "line_num" ) = 0 );
 
   py::bind_vector< std::vector< std::string > >( mod, "StringVector" );
 
@@ -124,6 +172,23 @@ PYBIND11_MODULE( ycm_core, mod )
     .def( "DeleteCachesForFile",
           &ClangCompleter::DeleteCachesForFile,
           py::call_guard< py::gil_scoped_release >() )
+    .def( "DeleteCachesForAllFiles",
+          &ClangCompleter::DeleteCachesForAllFiles,
+          py::call_guard< py::gil_scoped_release >() )
+    .def( "TranslationUnitsMemoryUsage",
+          []( ClangCompleter &completer ) {
+            std::vector< std::pair< std::string, size_t > > usages;
+            {
+              py::gil_scoped_release unlock;
+              usages = completer.TranslationUnitsMemoryUsage();
+            }
+            // List of ( filename, bytes ).
+            py::list result;
+            for ( const auto &[ filename, bytes ] : usages ) {
+              result.append( py::make_tuple( filename, bytes ) );
+            }
+            return result;
+          } )
     .def( "UpdatingTranslationUnit",
           &ClangCompleter::UpdatingTranslationUnit,
           py::call_guard< py::gil_scoped_release >() )
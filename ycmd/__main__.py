@@ -184,6 +184,8 @@ def Main():
   # preload has executed.
   from ycmd import handlers
   from ycmd.watchdog_plugin import WatchdogPlugin
+  from ycmd.metrics_plugin import MetricsPlugin
+  from ycmd.tracing_plugin import TracingPlugin
   handlers.UpdateUserOptions( options )
   handlers.SetHmacSecret( hmac_secret )
   handlers.KeepSubserversAlive( args.check_interval_seconds )
@@ -194,6 +196,10 @@ def Main():
                                     args.stderr,
                                     args.keep_logfiles )
   atexit.register( handlers.ServerCleanup )
+  if options[ 'enable_metrics' ]:
+    handlers.app.install( MetricsPlugin() )
+  if options[ 'enable_tracing' ]:
+    handlers.app.install( TracingPlugin() )
   handlers.app.install( WatchdogPlugin( args.idle_suicide_seconds,
                                         args.check_interval_seconds ) )
   handlers.app.install( HmacPlugin( hmac_secret ) )
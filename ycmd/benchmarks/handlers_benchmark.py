@@ -0,0 +1,336 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the latency of the hot request paths of ycmd, from the request to
+the response, both by calling the WSGI application in-process and through the
+HTTP server over a real socket. Requests are made on synthetic buffers of
+growing size and the language server is replaced by stub_language_server.py,
+so that only the cost of ycmd itself is measured. The results are written as
+JSON so that they can be compared between commits with --compare."""
+
+import argparse
+import http.client
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from base64 import b64encode
+
+from ycmd import handlers, hmac_utils, user_options_store, utils
+from ycmd.hmac_plugin import HmacPlugin
+from ycmd.wsgi_server import StoppableWSGIServer
+
+HMAC_SECRET = os.urandom( 16 )
+STUB_LANGUAGE_SERVER = os.path.join( os.path.dirname( os.path.abspath(
+  __file__ ) ), 'stub_language_server.py' )
+STUB_FILETYPE = 'ycmd_benchmark_stub'
+SERVER_READY_TIMEOUT = 30
+
+
+class WSGIClient:
+  """Sends the requests to the WSGI application in-process."""
+  name = 'wsgi'
+
+  def Request( self, method, path, body ):
+    environ = {
+      'REQUEST_METHOD': method,
+      'PATH_INFO': path,
+      'QUERY_STRING': '',
+      'CONTENT_TYPE': 'application/json',
+      'CONTENT_LENGTH': str( len( body ) ),
+      'wsgi.input': io.BytesIO( body ),
+    }
+    for name, value in _Headers( method, path, body ).items():
+      environ[ 'HTTP_' + name.replace( '-', '_' ).upper() ] = value
+
+    status = []
+    data = b''.join(
+      handlers.app( environ, lambda *args: status.append( args[ 0 ] ) ) )
+    return int( status[ 0 ].split()[ 0 ] ), data
+
+
+  def Close( self ):
+    pass
+
+
+class SocketClient:
+  """Sends the requests to the HTTP server ycmd runs, over a real socket."""
+  name = 'socket'
+
+  def __init__( self ):
+    self._server = StoppableWSGIServer( handlers.app, '127.0.0.1', 0 )
+    self._thread = utils.StartThread( self._server.serve_forever )
+
+
+  def Request( self, method, path, body ):
+    connection = http.client.HTTPConnection( '127.0.0.1',
+                                             self._server.server_port )
+    try:
+      connection.request( method,
+                          path,
+                          body,
+                          _Headers( method, path, body ) )
+      response = connection.getresponse()
+      return response.status, response.read()
+    finally:
+      connection.close()
+
+
+  def Close( self ):
+    self._server.shutdown()
+    self._server.server_close()
+    self._thread.join()
+
+
+def _Headers( method, path, body ):
+  request_hmac = hmac_utils.CreateRequestHmac( method.encode( 'utf-8' ),
+                                               path.encode( 'utf-8' ),
+                                               body,
+                                               HMAC_SECRET )
+  return { 'Host': 'localhost',
+           'Content-Type': 'application/json',
+           'X-Ycm-Hmac': b64encode( request_hmac ).decode( 'ascii' ) }
+
+
+def Post( client, path, data ):
+  status, body = client.Request( 'POST',
+                                 path,
+                                 json.dumps( data ).encode( 'utf-8' ) )
+  if status != 200:
+    raise RuntimeError( f'{ path } failed with status { status }: '
+                        f'{ body[ : 1000 ] }' )
+  return json.loads( body )
+
+
+def GenerateFile( number_of_lines ):
+  return ''.join( f'int identifier{ index } = identifier{ index // 2 } + '
+                  f'{ index };\n' for index in range( number_of_lines ) )
+
+
+def BuildRequest( filepath, filetype, contents, **kwargs ):
+  lines = contents.split( '\n' )
+  request = {
+    'filepath': filepath,
+    'filetypes': [ filetype ],
+    'line_num': len( lines ),
+    'column_num': len( lines[ -1 ] ) + 1,
+    'file_data': {
+      filepath: {
+        'contents': contents,
+        'filetypes': [ filetype ]
+      }
+    }
+  }
+  request.update( kwargs )
+  return request
+
+
+def Scenarios( tmp_dir, size ):
+  """Returns ( name, setup requests, measured requests ) triples for buffers of
+  |size| lines. Requests are ( path, data ) pairs."""
+  size_dir = os.path.join( tmp_dir, str( size ) )
+  directory = os.path.join( size_dir, 'directory' )
+  os.makedirs( directory )
+  for index in range( size ):
+    open( os.path.join( directory, f'file{ index }.txt' ), 'w' ).close()
+
+  contents = GenerateFile( size )
+  filepath = os.path.join( size_dir, 'file.txt' )
+  stub_filepath = os.path.join( size_dir, 'file.stub' )
+  file_ready_to_parse = ( '/event_notification',
+                          BuildRequest( filepath,
+                                        'text',
+                                        contents,
+                                        event_name = 'FileReadyToParse' ) )
+  candidates = [ { 'word': f'identifier{ index }' } for index in range( size ) ]
+
+  return [
+    ( 'event_notification_file_ready_to_parse',
+      [],
+      [ file_ready_to_parse ] ),
+    ( 'completions_identifier',
+      [ file_ready_to_parse ],
+      [ ( '/completions',
+          BuildRequest( filepath, 'text', contents + 'ide' ) ) ] ),
+    ( 'completions_filename',
+      [],
+      [ ( '/completions',
+          BuildRequest( filepath, 'text', contents + './directory/fil' ) ) ] ),
+    ( 'filter_and_sort_candidates',
+      [],
+      [ ( '/filter_and_sort_candidates',
+          { 'candidates': candidates,
+            'sort_property': 'word',
+            'query': 'i1' } ) ] ),
+    ( 'semantic_tokens',
+      [ ( '/event_notification',
+          BuildRequest( stub_filepath,
+                        STUB_FILETYPE,
+                        contents,
+                        event_name = 'FileReadyToParse' ) ) ],
+      [ ( '/semantic_tokens',
+          BuildRequest( stub_filepath, STUB_FILETYPE, contents ) ) ] ),
+  ]
+
+
+def WaitForStubLanguageServer( client, tmp_dir, filetype = STUB_FILETYPE ):
+  """Semantic tokens are empty until the stub language server is
+  initialized."""
+  filepath = os.path.join( tmp_dir, f'ready.{ filetype }' )
+  request = BuildRequest( filepath, filetype, 'ready\n' )
+  Post( client,
+        '/event_notification',
+        dict( request, event_name = 'FileReadyToParse' ) )
+  deadline = time.monotonic() + SERVER_READY_TIMEOUT
+  while time.monotonic() < deadline:
+    response = Post( client, '/semantic_tokens', request )
+    if response[ 'semantic_tokens' ].get( 'tokens' ):
+      return
+    time.sleep( 0.1 )
+  raise RuntimeError( 'The stub language server did not start' )
+
+
+def Measure( client, setup, requests, repetitions ):
+  """Sends the |setup| requests, then returns statistics on the latency of the
+  measured |requests|, sent in turn |repetitions| times in total."""
+  for path, data in setup:
+    Post( client, path, data )
+  # Warm up caches, as a user would have by the time they type.
+  for path, data in requests:
+    Post( client, path, data )
+  latencies = []
+  for index in range( repetitions ):
+    path, data = requests[ index % len( requests ) ]
+    start_time = time.perf_counter()
+    Post( client, path, data )
+    latencies.append( time.perf_counter() - start_time )
+  latencies.sort()
+  return {
+    'repetitions': repetitions,
+    'min_ms': latencies[ 0 ] * 1000,
+    'median_ms': statistics.median( latencies ) * 1000,
+    'p95_ms': latencies[ int( ( len( latencies ) - 1 ) * 0.95 ) ] * 1000,
+  }
+
+
+def GetCommit():
+  try:
+    return subprocess.check_output(
+      [ 'git', 'rev-parse', 'HEAD' ],
+      cwd = os.path.dirname( os.path.abspath( __file__ ) ),
+      stderr = subprocess.DEVNULL ).decode( 'ascii' ).strip()
+  except ( OSError, subprocess.CalledProcessError ):
+    return None
+
+
+def SetUpServer( language_servers ):
+  options = user_options_store.DefaultOptions()
+  options[ 'language_server' ] = language_servers
+  handlers.UpdateUserOptions( options )
+  handlers.SetHmacSecret( HMAC_SECRET )
+  handlers.app.install( HmacPlugin( HMAC_SECRET ) )
+
+
+def PrintResults( results, baseline, unit = 'lines' ):
+  baseline_results = {
+    ( result[ 'transport' ], result[ 'scenario' ], result[ 'size' ] ):
+      result for result in ( baseline or {} ).get( 'results', [] ) }
+  for result in results:
+    line = ( f'  { result[ "transport" ]:6} { result[ "scenario" ]:40} '
+             f'{ result[ "size" ]:>7} { unit }: '
+             f'median { result[ "median_ms" ]:8.2f} ms, '
+             f'p95 { result[ "p95_ms" ]:8.2f} ms' )
+    baseline_result = baseline_results.get(
+      ( result[ 'transport' ], result[ 'scenario' ], result[ 'size' ] ) )
+    if baseline_result:
+      ratio = result[ 'median_ms' ] / baseline_result[ 'median_ms' ]
+      line += f' ({ ratio:.2f}x baseline)'
+    print( line )
+
+
+def WriteResults( path, results ):
+  with open( path, 'w' ) as output_file:
+    json.dump( { 'commit': GetCommit(),
+                 'python': platform.python_version(),
+                 'platform': platform.platform(),
+                 'results': results }, output_file, indent = 2 )
+
+
+def Main():
+  parser = argparse.ArgumentParser()
+  parser.add_argument( '--sizes', type = int, nargs = '+',
+                       default = [ 100, 1000, 10000 ],
+                       help = 'Number of lines of the buffers.' )
+  parser.add_argument( '--repetitions', type = int, default = 20 )
+  parser.add_argument( '--transports', nargs = '+',
+                       choices = [ 'wsgi', 'socket' ],
+                       default = [ 'wsgi', 'socket' ] )
+  parser.add_argument( '--output',
+                       help = 'Write the results as JSON to this file.' )
+  parser.add_argument( '--compare',
+                       help = 'Compare the results with a JSON file written '
+                       'by a previous run.' )
+  args = parser.parse_args()
+
+  baseline = None
+  if args.compare:
+    with open( args.compare ) as baseline_file:
+      baseline = json.load( baseline_file )
+
+  # Failing to find a semantic completer for a filetype is logged with its
+  # traceback, which would be printed on every request.
+  utils.LOGGER.setLevel( logging.CRITICAL )
+  SetUpServer( [ { 'name': 'stub',
+                   'cmdline': [ sys.executable, STUB_LANGUAGE_SERVER ],
+                   'filetypes': [ STUB_FILETYPE ] } ] )
+
+  results = []
+  try:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      for transport in args.transports:
+        client = WSGIClient() if transport == 'wsgi' else SocketClient()
+        try:
+          WaitForStubLanguageServer( client, tmp_dir )
+          transport_dir = os.path.join( tmp_dir, transport )
+          for size in args.sizes:
+            for name, setup, requests in Scenarios( transport_dir, size ):
+              result = Measure( client, setup, requests, args.repetitions )
+              results.append( dict( result,
+                                    transport = transport,
+                                    scenario = name,
+                                    size = size ) )
+        finally:
+          client.Close()
+  finally:
+    handlers.ServerCleanup()
+
+  print( 'Latency of the requests (in-process WSGI calls and HTTP requests '
+         'over a socket):' )
+  PrintResults( results, baseline )
+
+  if args.output:
+    WriteResults( args.output, results )
+
+
+if __name__ == '__main__':
+  Main()
@@ -0,0 +1,99 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the time until the first identifier completion after startup, with
+the identifiers coming from a large tag file, and with them coming from the
+identifier database snapshot."""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from ycmd.completers.all.identifier_completer import IdentifierCompleter
+from ycmd.user_options_store import DefaultOptions
+
+
+def GenerateTagFile( path, number_of_files, identifiers_per_file ):
+  random.seed( 0 )
+  with open( path, 'w' ) as tag_file:
+    tag_file.write( '!_TAG_FILE_FORMAT\t2\t/extended format/\n' )
+    for file_index in range( number_of_files ):
+      filepath = f'src/file{ file_index }.c'
+      for _ in range( identifiers_per_file ):
+        identifier = ''.join( random.choices( string.ascii_letters, k = 12 ) )
+        tag_file.write(
+          f'{ identifier }\t{ filepath }\t/^{ identifier }$/;"\tf\t'
+          'language:C\n' )
+
+
+def TimeFirstCompletion( options, tag_file = None ):
+  start_time = time.perf_counter()
+  completer = IdentifierCompleter( options )
+  if tag_file:
+    completer._AddIdentifiersFromTagFiles( [ tag_file ] )
+    completer._tag_files_queue.join()
+  completer._LoadSnapshotForFiletype( 'c' )
+  completer._completer.CandidatesForQueryAndType( 'abc', 'c', 10 )
+  elapsed_time = time.perf_counter() - start_time
+  return completer, elapsed_time
+
+
+def Main():
+  parser = argparse.ArgumentParser()
+  parser.add_argument( '--files', type = int, default = 2000,
+                       help = 'Number of files in the tag file.' )
+  parser.add_argument( '--identifiers-per-file', type = int, default = 100,
+                       help = 'Number of identifiers per file.' )
+  parser.add_argument( '--repetitions', type = int, default = 5 )
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    tag_file = os.path.join( tmp_dir, 'tags' )
+    GenerateTagFile( tag_file, args.files, args.identifiers_per_file )
+
+    options = DefaultOptions()
+    options[ 'identifier_database_snapshot_path' ] = os.path.join(
+      tmp_dir, 'identifiers' )
+
+    # Create the snapshot.
+    completer, _ = TimeFirstCompletion( options, tag_file )
+    completer.Shutdown()
+
+    tag_file_times = []
+    snapshot_times = []
+    for _ in range( args.repetitions ):
+      completer, elapsed_time = TimeFirstCompletion( DefaultOptions(),
+                                                     tag_file )
+      completer.Shutdown()
+      tag_file_times.append( elapsed_time )
+
+      completer, elapsed_time = TimeFirstCompletion( options )
+      completer.Shutdown()
+      snapshot_times.append( elapsed_time )
+
+    number_of_identifiers = args.files * args.identifiers_per_file
+    print( f'Time to first completion with { number_of_identifiers } '
+           f'identifiers (best of { args.repetitions }):' )
+    print( f'  from tag file: { min( tag_file_times ) * 1000:.1f} ms' )
+    print( f'  from snapshot: { min( snapshot_times ) * 1000:.1f} ms' )
+
+
+if __name__ == '__main__':
+  Main()
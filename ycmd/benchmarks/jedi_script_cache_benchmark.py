@@ -0,0 +1,133 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the latency of the Jedi requests sent for each keystroke, i.e.
+completion followed by signature help, in a large module, with and without
+reusing the jedi.Script across requests on the same contents."""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import jedi
+
+from ycmd.completers.python import jedi_operations
+
+
+def GenerateModule( number_of_lines ):
+  lines = [ 'import os', '' ]
+  index = 0
+  while len( lines ) < number_of_lines:
+    lines.extend( [
+      f'class Class{ index }:',
+      f'  def __init__( self, value_{ index } ):',
+      f'    self.value = value_{ index }',
+      '',
+      f'  def Method{ index }( self, first, second = None ):',
+      '    return os.path.join( str( self.value ), first )',
+      '',
+      '',
+      f'def Function{ index }( argument ):',
+      f'  instance = Class{ index }( argument )',
+      f'  return instance.Method{ index }( "{ index }" )',
+      '',
+      ''
+    ] )
+    index += 1
+  lines.append( 'instance = Class0( 1 )' )
+  return '\n'.join( lines ) + '\n'
+
+
+def Request( filepath, contents ):
+  lines = contents.split( '\n' )
+  line_num = len( lines ) - 1
+  column_codepoint = len( lines[ -2 ] ) + 1
+  start_codepoint = column_codepoint
+  while ( start_codepoint > 1 and
+          lines[ -2 ][ start_codepoint - 2 ].isalnum() ):
+    start_codepoint -= 1
+  return {
+    'filepath': filepath,
+    'contents': contents,
+    'line_num': line_num,
+    'start_codepoint': start_codepoint,
+    'column_codepoint': column_codepoint
+  }
+
+
+def TimeKeystrokes( scripts, filepath, contents, typed_text ):
+  project = jedi.Project( os.path.dirname( filepath ) )
+  environment = jedi.get_default_environment()
+  latencies = []
+  for index in range( 1, len( typed_text ) + 1 ):
+    request = Request( filepath, contents + typed_text[ : index ] + '\n' )
+    start_time = time.perf_counter()
+    completions = jedi_operations.Complete(
+      scripts, project, environment, request, () )
+    for completion in completions[ : 10 ]:
+      jedi_operations.DetailCompletion( completion )
+    jedi_operations.Signatures( scripts, project, environment, request, () )
+    latencies.append( time.perf_counter() - start_time )
+  return latencies
+
+
+def Main():
+  parser = argparse.ArgumentParser()
+  parser.add_argument( '--lines', type = int, default = 5000,
+                       help = 'Number of lines of the module.' )
+  parser.add_argument( '--repetitions', type = int, default = 3 )
+  args = parser.parse_args()
+
+  contents = GenerateModule( args.lines )
+  typed_text = 'print( instance.Method0( os.path.jo'
+
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    filepath = os.path.join( tmp_dir, 'module.py' )
+    with open( filepath, 'w' ) as module:
+      module.write( contents )
+
+    # Warm up the caches of Jedi and parso for the standard library.
+    TimeKeystrokes( jedi_operations.ScriptCache(), filepath, contents, 'os.' )
+
+    results = {}
+    for name, max_size in [
+        ( 'new script per request', 0 ),
+        ( 'reused script', jedi_operations.MAX_CACHED_SCRIPTS ) ]:
+      latencies = []
+      for _ in range( args.repetitions ):
+        latencies.extend( TimeKeystrokes(
+          jedi_operations.ScriptCache( max_size = max_size ),
+          filepath,
+          contents,
+          typed_text ) )
+      results[ name ] = latencies
+
+  print( f'Latency of completion and signature help per keystroke in a '
+         f'{ args.lines } lines module '
+         f'({ len( typed_text ) * args.repetitions } keystrokes):' )
+  for name, latencies in results.items():
+    latencies.sort()
+    median = statistics.median( latencies )
+    p95 = latencies[ int( len( latencies ) * 0.95 ) ]
+    print( f'  { name }: median { median * 1000:.1f} ms, '
+           f'p95 { p95 * 1000:.1f} ms' )
+
+
+if __name__ == '__main__':
+  Main()
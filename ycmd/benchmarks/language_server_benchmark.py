@@ -0,0 +1,161 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the cost of LanguageServerCompleter on the client side of the
+language server protocol, with stub_language_server.py answering instantly
+over the standard input and output and over TCP. Completion lists, semantic
+tokens, diagnostics and workspace symbols of growing size are requested through
+the request handlers, called in-process. The stub publishes the diagnostics
+each time the file changes, so the diagnostics scenario also includes the cost
+of receiving them. The results are written as JSON like handlers_benchmark."""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from ycmd import handlers, utils
+from ycmd.benchmarks.handlers_benchmark import ( BuildRequest,
+                                                 GenerateFile,
+                                                 Measure,
+                                                 PrintResults,
+                                                 SetUpServer,
+                                                 STUB_LANGUAGE_SERVER,
+                                                 WaitForStubLanguageServer,
+                                                 WriteResults,
+                                                 WSGIClient )
+
+
+def StubFiletype( transport, size ):
+  return f'stub_{ transport }_{ size }'
+
+
+def StubSettings( transport, size ):
+  """Returns the settings of a stub language server replying with |size|
+  completion items, diagnostics and symbols."""
+  filetype = StubFiletype( transport, size )
+  cmdline = [ sys.executable,
+              STUB_LANGUAGE_SERVER,
+              '--incomplete',
+              '--completion-items', str( size ),
+              '--diagnostics', str( size ),
+              '--workspace-symbols', str( size ) ]
+  settings = { 'name': filetype, 'filetypes': [ filetype ] }
+  if transport == 'tcp':
+    cmdline.extend( [ '--port', '${port}' ] )
+    settings[ 'port' ] = '*'
+  settings[ 'cmdline' ] = cmdline
+  return settings
+
+
+def Scenarios( tmp_dir, filetype, size ):
+  """Returns ( name, setup requests, measured requests ) triples for a buffer
+  of |size| lines. Requests are ( path, data ) pairs."""
+  filepath = os.path.join( tmp_dir, f'file.{ filetype }' )
+  # The buffer ends with the query, so that completion requests do not change
+  # it and thus do not trigger diagnostics.
+  contents = GenerateFile( size ) + 'ide'
+  file_ready_to_parse = [
+    ( '/event_notification',
+      BuildRequest( filepath,
+                    filetype,
+                    buffer_contents,
+                    event_name = 'FileReadyToParse' ) )
+    for buffer_contents in ( contents, contents + '\n' ) ]
+
+  return [
+    ( 'completions',
+      file_ready_to_parse[ : 1 ],
+      [ ( '/completions',
+          BuildRequest( filepath,
+                        filetype,
+                        contents,
+                        force_semantic = True ) ) ] ),
+    ( 'semantic_tokens',
+      file_ready_to_parse[ : 1 ],
+      [ ( '/semantic_tokens',
+          BuildRequest( filepath, filetype, contents ) ) ] ),
+    ( 'workspace_symbols',
+      file_ready_to_parse[ : 1 ],
+      [ ( '/run_completer_command',
+          BuildRequest( filepath,
+                        filetype,
+                        contents,
+                        command_arguments = [ 'GoToSymbol',
+                                              'identifier' ] ) ) ] ),
+    # Each request changes the buffer.
+    ( 'diagnostics',
+      [],
+      file_ready_to_parse ),
+  ]
+
+
+def Main():
+  parser = argparse.ArgumentParser()
+  parser.add_argument( '--sizes', type = int, nargs = '+',
+                       default = [ 100, 1000, 10000 ],
+                       help = 'Number of completion items, lines, diagnostics '
+                       'and symbols.' )
+  parser.add_argument( '--repetitions', type = int, default = 20 )
+  parser.add_argument( '--transports', nargs = '+',
+                       choices = [ 'stdio', 'tcp' ],
+                       default = [ 'stdio', 'tcp' ] )
+  parser.add_argument( '--output',
+                       help = 'Write the results as JSON to this file.' )
+  parser.add_argument( '--compare',
+                       help = 'Compare the results with a JSON file written '
+                       'by a previous run.' )
+  args = parser.parse_args()
+
+  baseline = None
+  if args.compare:
+    with open( args.compare ) as baseline_file:
+      baseline = json.load( baseline_file )
+
+  utils.LOGGER.setLevel( logging.CRITICAL )
+  SetUpServer( [ StubSettings( transport, size )
+                 for transport in args.transports
+                 for size in args.sizes ] )
+
+  client = WSGIClient()
+  results = []
+  try:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      for transport in args.transports:
+        for size in args.sizes:
+          filetype = StubFiletype( transport, size )
+          WaitForStubLanguageServer( client, tmp_dir, filetype )
+          for name, setup, requests in Scenarios( tmp_dir, filetype, size ):
+            result = Measure( client, setup, requests, args.repetitions )
+            results.append( dict( result,
+                                  transport = transport,
+                                  scenario = name,
+                                  size = size ) )
+  finally:
+    handlers.ServerCleanup()
+
+  print( 'Latency of the requests to a stub language server:' )
+  PrintResults( results, baseline, unit = 'items' )
+
+  if args.output:
+    WriteResults( args.output, results )
+
+
+if __name__ == '__main__':
+  Main()
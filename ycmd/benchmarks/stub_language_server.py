@@ -0,0 +1,276 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A language server stub for measuring and profiling the cost of
+LanguageServerCompleter in isolation from the cost of a real language server.
+
+The stub keeps the contents of the open files and answers completion, semantic
+token and workspace symbol requests with replies of configurable size, after a
+configurable latency. It can also flood the client with diagnostics each time a
+file is opened or changed. Replies can be scripted with a JSON file mapping
+methods to their results. Other requests are answered with a null result.
+
+By default, the stub communicates over its standard input and output, like the
+servers run by StandardIOLanguageServerConnection. With --port, it listens on
+that port of localhost for the single connection TCPSingleStreamConnection
+makes. For instance, to use it through the generic LSP completer:
+
+  "language_server": [ {
+    "name": "stub",
+    "filetypes": [ "stub" ],
+    "cmdline": [ "python", "/path/to/ycmd/benchmarks/stub_language_server.py",
+                 "--port", "${port}", "--completion-items", "1000" ],
+    "port": "*"
+  } ]"""
+
+import argparse
+import json
+import re
+import socket
+import sys
+import threading
+
+WORD_REGEX = re.compile( r'\w+' )
+
+
+class StubLanguageServer:
+  def __init__( self, options, reader, writer ):
+    self._options = options
+    self._reader = reader
+    self._writer = writer
+    self._write_lock = threading.Lock()
+    self._files = {}
+    self._scripted_results = {}
+    if options.responses:
+      with open( options.responses ) as responses_file:
+        self._scripted_results = json.load( responses_file )
+
+
+  def Run( self ):
+    while True:
+      message = self._ReadMessage()
+      if message is None or message.get( 'method' ) == 'exit':
+        return
+
+      method = message.get( 'method' )
+      if method is None:
+        # A response to a request of the stub; none are sent.
+        continue
+
+      if 'id' in message:
+        self._Respond( message[ 'id' ], method, message.get( 'params', {} ) )
+      else:
+        self._HandleNotification( method, message.get( 'params', {} ) )
+
+
+  def _ReadMessage( self ):
+    content_length = 0
+    while True:
+      header = self._reader.readline()
+      if not header:
+        return None
+      header = header.strip()
+      if not header:
+        break
+      name, value = header.split( b':', 1 )
+      if name.strip().lower() == b'content-length':
+        content_length = int( value )
+    return json.loads( self._reader.read( content_length ) )
+
+
+  def _Send( self, message ):
+    data = json.dumps( dict( message, jsonrpc = '2.0' ) ).encode( 'utf-8' )
+    with self._write_lock:
+      self._writer.write(
+        f'Content-Length: { len( data ) }\r\n\r\n'.encode( 'ascii' ) + data )
+      self._writer.flush()
+
+
+  def _Respond( self, request_id, method, params ):
+    if method in self._scripted_results:
+      result = self._scripted_results[ method ]
+    else:
+      handler = getattr( self, '_' + re.sub( r'\W', '_', method ), None )
+      result = handler( params ) if handler else None
+    response = { 'id': request_id, 'result': result }
+
+    # Requests of a language server are processed concurrently, so a slow
+    # request must not delay the following ones.
+    if self._options.latency_ms and method not in ( 'initialize', 'shutdown' ):
+      timer = threading.Timer( self._options.latency_ms / 1000,
+                               self._Send,
+                               ( response, ) )
+      timer.daemon = True
+      timer.start()
+    else:
+      self._Send( response )
+
+
+  def _HandleNotification( self, method, params ):
+    if method == 'textDocument/didOpen':
+      document = params[ 'textDocument' ]
+      self._files[ document[ 'uri' ] ] = document[ 'text' ]
+      self._PublishDiagnostics( document[ 'uri' ] )
+    elif method == 'textDocument/didChange':
+      uri = params[ 'textDocument' ][ 'uri' ]
+      # Only full synchronization is advertised.
+      self._files[ uri ] = params[ 'contentChanges' ][ -1 ][ 'text' ]
+      self._PublishDiagnostics( uri )
+    elif method == 'textDocument/didClose':
+      self._files.pop( params[ 'textDocument' ][ 'uri' ], None )
+
+
+  def _PublishDiagnostics( self, uri ):
+    if not self._options.diagnostics:
+      return
+    lines = self._files[ uri ].split( '\n' )
+    diagnostics = [ {
+      'range': {
+        'start': { 'line': index % len( lines ), 'character': 0 },
+        'end': { 'line': index % len( lines ),
+                 'character': len( lines[ index % len( lines ) ] ) }
+      },
+      'severity': 1 + index % 4,
+      'source': 'stub',
+      'message': f'Diagnostic { index }'
+    } for index in range( self._options.diagnostics ) ]
+    for _ in range( self._options.diagnostics_notifications ):
+      self._Send( { 'method': 'textDocument/publishDiagnostics',
+                    'params': { 'uri': uri, 'diagnostics': diagnostics } } )
+
+
+  def _initialize( self, params ):
+    return {
+      'capabilities': {
+        'textDocumentSync': 1,
+        'completionProvider': {
+          'resolveProvider': False,
+          'triggerCharacters': [ '.' ]
+        },
+        'semanticTokensProvider': {
+          'legend': {
+            'tokenTypes': [ 'variable', 'function', 'type' ],
+            'tokenModifiers': []
+          },
+          'full': True
+        },
+        'workspaceSymbolProvider': True
+      },
+      'serverInfo': { 'name': 'stub' }
+    }
+
+
+  def _textDocument_completion( self, params ):
+    return {
+      'isIncomplete': self._options.incomplete,
+      'items': [ {
+        'label': f'identifier{ index }',
+        'kind': 6,
+        'detail': 'int',
+        'documentation': f'Documentation of identifier{ index }.',
+        'sortText': f'{ index:08}'
+      } for index in range( self._options.completion_items ) ]
+    }
+
+
+  def _textDocument_semanticTokens_full( self, params ):
+    """Returns a token for each word of the file."""
+    contents = self._files.get( params[ 'textDocument' ][ 'uri' ], '' )
+    data = []
+    previous_line = 0
+    previous_start = 0
+    for line_num, line in enumerate( contents.split( '\n' ) ):
+      for match in WORD_REGEX.finditer( line ):
+        if line_num != previous_line:
+          previous_start = 0
+        data.extend( [ line_num - previous_line,
+                       match.start() - previous_start,
+                       len( match.group() ),
+                       len( data ) // 5 % 3,
+                       0 ] )
+        previous_line = line_num
+        previous_start = match.start()
+    return { 'data': data }
+
+
+  def _workspace_symbol( self, params ):
+    """Returns symbols spread over the lines of the open files."""
+    locations = [ ( uri, line_num, len( line ) )
+                  for uri, contents in self._files.items()
+                  for line_num, line in enumerate( contents.split( '\n' ) ) ]
+    if not locations:
+      return []
+    symbols = []
+    for index in range( self._options.workspace_symbols ):
+      uri, line_num, length = locations[ index % len( locations ) ]
+      symbols.append( {
+        'name': f'{ params[ "query" ] }{ index }',
+        'kind': 13,
+        'location': {
+          'uri': uri,
+          'range': {
+            'start': { 'line': line_num, 'character': 0 },
+            'end': { 'line': line_num, 'character': length }
+          }
+        }
+      } )
+    return symbols
+
+
+def ParseArguments( args = None ):
+  parser = argparse.ArgumentParser()
+  parser.add_argument( '--port', type = int,
+                       help = 'Listen on this port of localhost instead of '
+                       'using the standard input and output.' )
+  parser.add_argument( '--latency-ms', type = float, default = 0,
+                       help = 'Delay before answering each request.' )
+  parser.add_argument( '--completion-items', type = int, default = 100,
+                       help = 'Number of items of the completion replies.' )
+  parser.add_argument( '--incomplete', action = 'store_true',
+                       help = 'Mark completion lists as incomplete so that '
+                       'the client requests them on each keystroke.' )
+  parser.add_argument( '--diagnostics', type = int, default = 0,
+                       help = 'Number of diagnostics published each time a '
+                       'file is opened or changed.' )
+  parser.add_argument( '--diagnostics-notifications', type = int, default = 1,
+                       help = 'Number of times the diagnostics are published '
+                       'each time a file is opened or changed.' )
+  parser.add_argument( '--workspace-symbols', type = int, default = 1000,
+                       help = 'Number of symbols of the workspace/symbol '
+                       'replies.' )
+  parser.add_argument( '--responses',
+                       help = 'JSON file mapping methods to the results to '
+                       'reply with.' )
+  return parser.parse_args( args )
+
+
+def Main():
+  options = ParseArguments()
+  if options.port is None:
+    StubLanguageServer( options, sys.stdin.buffer, sys.stdout.buffer ).Run()
+    return
+
+  with socket.create_server( ( '127.0.0.1', options.port ) ) as server_socket:
+    connection, _ = server_socket.accept()
+  with connection:
+    reader = connection.makefile( 'rb' )
+    writer = connection.makefile( 'wb' )
+    StubLanguageServer( options, reader, writer ).Run()
+
+
+if __name__ == '__main__':
+  Main()
@@ -0,0 +1,212 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measures the latency of a completion request per keystroke in a large
+TypeScript file when the buffer is sent to TSServer through a temporary file
+and a reload request, and when only the changes are sent. TSServer is replaced
+by a stub that keeps the contents of the files, so only the cost of the
+synchronization is measured, not the time TSServer takes to parse the file."""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from functools import partial
+from unittest.mock import patch
+
+from ycmd import user_options_store, utils
+from ycmd.completers.typescript import typescript_completer
+from ycmd.completers.typescript.typescript_completer import (
+  TypeScriptCompleter )
+
+
+def StubTSServer():
+  """Implements the commands of TSServer used by the benchmark. Responses are
+  sent for the requests TSServer responds to."""
+  files = {}
+  entries = [ { 'name': f'identifier{ index }', 'kind': 'property' }
+              for index in range( 100 ) ]
+
+  def Respond( request, body = None ):
+    message = json.dumps( { 'seq': 0,
+                            'type': 'response',
+                            'command': request[ 'command' ],
+                            'request_seq': request[ 'seq' ],
+                            'success': True,
+                            'body': body } ) + '\n'
+    sys.stdout.buffer.write( f'Content-Length: { len( message ) }\r\n\r\n'
+                             f'{ message }'.encode( 'utf-8' ) )
+    sys.stdout.buffer.flush()
+
+  for line in sys.stdin:
+    request = json.loads( line )
+    command = request[ 'command' ]
+    arguments = request.get( 'arguments', {} )
+    if command == 'exit':
+      return
+    # The files are stored as lists of lines, like TSServer does.
+    if command == 'open':
+      files[ arguments[ 'file' ] ] = arguments[ 'fileContent' ].split( '\n' )
+    elif command == 'change':
+      lines = files[ arguments[ 'file' ] ]
+      first_line = arguments[ 'line' ] - 1
+      last_line = arguments[ 'endLine' ] - 1
+      lines[ first_line : last_line + 1 ] = (
+        lines[ first_line ][ : arguments[ 'offset' ] - 1 ] +
+        arguments[ 'insertString' ] +
+        lines[ last_line ][ arguments[ 'endOffset' ] - 1 : ] ).split( '\n' )
+    elif command == 'close':
+      files.pop( arguments[ 'file' ], None )
+    elif command == 'reload':
+      with open( arguments[ 'tmpfile' ], encoding = 'utf-8' ) as tmpfile:
+        files[ arguments[ 'file' ] ] = tmpfile.read().split( '\n' )
+      Respond( request )
+    elif command == 'status':
+      Respond( request, { 'version': 'stub' } )
+    elif command == 'completionInfo':
+      Respond( request, { 'entries': entries } )
+    else:
+      Respond( request )
+
+
+def ReloadFile( completer, request_data ):
+  """Sends the buffer to TSServer the way it was done before the changes were
+  sent: through a temporary file and a reload request."""
+  filename = request_data[ 'filepath' ]
+  contents = request_data[ 'file_data' ][ filename ][ 'contents' ]
+  tmpfile = tempfile.NamedTemporaryFile( delete = False )
+  tmpfile.write( utils.ToBytes( contents ) )
+  tmpfile.close()
+  completer._SendRequest( 'reload', {
+    'file':    filename,
+    'tmpfile': tmpfile.name
+  } )
+  utils.RemoveIfExists( tmpfile.name )
+
+
+def GenerateFile( number_of_lines ):
+  lines = []
+  index = 0
+  while len( lines ) < number_of_lines:
+    lines.extend( [
+      f'export class Class{ index } {{',
+      f'  private value{ index }: number = { index };',
+      f'  public method{ index }( argument: string ): string {{',
+      f'    return argument + this.value{ index };',
+      '  }',
+      '}',
+      ''
+    ] )
+    index += 1
+  return '\n'.join( lines ) + '\n'
+
+
+def BuildRequest( filepath, contents ):
+  lines = contents.split( '\n' )
+  column_num = len( lines[ -2 ] ) + 1
+  return {
+    'filepath': filepath,
+    'filetypes': [ 'typescript' ],
+    'line_num': len( lines ) - 1,
+    'column_num': column_num,
+    'start_codepoint': column_num,
+    'file_data': {
+      filepath: {
+        'contents': contents,
+        'filetypes': [ 'typescript' ]
+      }
+    }
+  }
+
+
+def TimeKeystrokes( completer, filepath, contents, typed_text ):
+  completer.OnBufferVisit( BuildRequest( filepath, contents ) )
+  latencies = []
+  for index in range( 1, len( typed_text ) + 1 ):
+    request_data = BuildRequest( filepath,
+                                 contents + typed_text[ : index ] + '\n' )
+    start_time = time.perf_counter()
+    completer.ComputeCandidatesInner( request_data )
+    latencies.append( time.perf_counter() - start_time )
+  completer.OnBufferUnload( BuildRequest( filepath, contents ) )
+  return latencies
+
+
+def Main():
+  parser = argparse.ArgumentParser()
+  parser.add_argument( '--lines', type = int, default = 5000,
+                       help = 'Number of lines of the file.' )
+  parser.add_argument( '--repetitions', type = int, default = 5 )
+  parser.add_argument( '--stub-tsserver', action = 'store_true',
+                       help = argparse.SUPPRESS )
+  args = parser.parse_args()
+
+  if args.stub_tsserver:
+    StubTSServer()
+    return
+
+  contents = GenerateFile( args.lines )
+  typed_text = 'const instance = new Class0().method0'
+
+  options = user_options_store.DefaultOptions()
+  user_options_store.SetAll( options )
+  with patch.object( typescript_completer,
+                     'FindTSServer',
+                     return_value = [ sys.executable,
+                                      os.path.abspath( __file__ ),
+                                      '--stub-tsserver' ] ):
+    completer = TypeScriptCompleter( options )
+  try:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      filepath = os.path.join( tmp_dir, 'file.ts' )
+      with open( filepath, 'w' ) as ts_file:
+        ts_file.write( contents )
+
+      incremental = []
+      reload = []
+      for _ in range( args.repetitions ):
+        incremental.extend( TimeKeystrokes( completer,
+                                            filepath,
+                                            contents,
+                                            typed_text ) )
+        with patch.object( completer,
+                           '_SynchronizeFile',
+                           side_effect = partial( ReloadFile, completer ) ):
+          reload.extend( TimeKeystrokes( completer,
+                                         filepath,
+                                         contents,
+                                         typed_text ) )
+  finally:
+    completer.Shutdown()
+
+  print( f'Latency of a completion request per keystroke in a '
+         f'{ args.lines } lines file '
+         f'({ len( typed_text ) * args.repetitions } keystrokes):' )
+  for name, latencies in [ ( 'temporary file and reload', reload ),
+                           ( 'open and change', incremental ) ]:
+    latencies.sort()
+    median = statistics.median( latencies )
+    p95 = latencies[ int( len( latencies ) * 0.95 ) ]
+    print( f'  { name }: median { median * 1000:.2f} ms, '
+           f'p95 { p95 * 1000:.2f} ms' )
+
+
+if __name__ == '__main__':
+  Main()
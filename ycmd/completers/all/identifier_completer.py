@@ -16,15 +16,26 @@
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import queue
+import threading
+import time
 from collections import defaultdict
+from ycmd.completers.all import identifier_database_snapshot
+from ycmd.completers.completer import CompletionStage
 from ycmd.completers.general_completer import GeneralCompleter
 from ycmd import identifier_utils
-from ycmd.utils import ImportCore, LOGGER, SplitLines
+from ycmd.utils import ImportCore, LOGGER, SplitLines, StartThread
 from ycmd import responses
 ycm_core = ImportCore()
 
 SYNTAX_FILENAME = 'YCM_PLACEHOLDER_FOR_SYNTAX'
 
+# Size of the tag files progress message ring buffer
+MAX_QUEUED_MESSAGES = 50
+
+# How often the identifier database snapshot is saved, if it has changed.
+SNAPSHOT_SAVE_INTERVAL = 300
+
 
 class IdentifierCompleter( GeneralCompleter ):
   def __init__( self, user_options ):
@@ -33,6 +44,42 @@ class IdentifierCompleter( GeneralCompleter ):
     self._tags_file_last_mtime = defaultdict( int )
     self._max_candidates = user_options[ 'max_num_identifier_candidates' ]
 
+    # Tag files are loaded by a single background thread so that the (possibly
+    # huge) files don't block the request threads. The identifiers currently in
+    # the database stay queryable while a tag file is being loaded and the new
+    # ones are swapped in once built.
+    self._tag_files_queue = queue.Queue()
+    self._tag_files_thread = None
+    self._tag_files_messages = queue.Queue( maxsize = MAX_QUEUED_MESSAGES )
+    # _tag_files_lock protects the loading state below, which is read by the
+    # request threads for debug info.
+    self._tag_files_lock = threading.Lock()
+    self._tag_files_pending = 0
+    self._tag_file_being_loaded = None
+    self._last_loaded_tag_file = None
+    self._last_tag_file_load_time = None
+    # tag file -> filepaths read from it, for the tag files that are loaded.
+    self._tag_file_filepaths = {}
+
+    # The identifier database is persisted on disk so that the identifiers (in
+    # particular those from tag files) are available right after startup. Only
+    # the index of the snapshot is read here; the identifiers of a filetype are
+    # loaded from the memory-mapped snapshot the first time that filetype is
+    # used.
+    # _snapshot_lock protects the snapshot state below.
+    self._snapshot_path = os.path.expanduser(
+      user_options[ 'identifier_database_snapshot_path' ] )
+    self._snapshot_lock = threading.Lock()
+    self._snapshot = None
+    self._snapshot_filetypes_to_load = set()
+    self._snapshot_stale_filepaths = set()
+    self._snapshot_dirty = False
+    self._snapshot_stop_event = threading.Event()
+    self._snapshot_thread = None
+    if self._snapshot_path:
+      self._OpenSnapshot()
+      self._snapshot_thread = StartThread( self._SaveSnapshotPeriodically )
+
 
   def ShouldUseNow( self, request_data ):
     return self.QueryLengthAboveMinThreshold( request_data )
@@ -42,10 +89,15 @@ class IdentifierCompleter( GeneralCompleter ):
     if not self.ShouldUseNow( request_data ):
       return []
 
-    completions = self._completer.CandidatesForQueryAndType(
-      _SanitizeQuery( request_data[ 'query' ] ),
-      request_data[ 'first_filetype' ],
-      self._max_candidates )
+    filetype = request_data[ 'first_filetype' ]
+    self._LoadSnapshotForFiletype( filetype )
+    with CompletionStage( 'IdentifierCompleter', 'filter_and_sort' ):
+      completions = self._completer.CandidatesForQueryAndType(
+        _SanitizeQuery( request_data[ 'query' ] ),
+        filetype,
+        self._max_candidates,
+        request_data[ 'filepath' ],
+        request_data[ 'line_num' ] )
 
     completions = _RemoveSmallCandidates(
       completions, self.user_options[ 'min_num_identifier_candidate_chars' ] )
@@ -66,9 +118,12 @@ class IdentifierCompleter( GeneralCompleter ):
       return
 
     LOGGER.info( 'Adding ONE buffer identifier for file: %s', filepath )
+    self._LoadSnapshotForFiletype( filetype )
     self._completer.AddSingleIdentifierToDatabase( identifier,
                                                   filetype,
-                                                  filepath )
+                                                  filepath,
+                                                  request_data[ 'line_num' ] )
+    self._snapshot_dirty = True
 
 
   def _AddPreviousIdentifier( self, request_data ):
@@ -99,12 +154,14 @@ class IdentifierCompleter( GeneralCompleter ):
       'collect_identifiers_from_comments_and_strings' ] )
     text = request_data[ 'file_data' ][ filepath ][ 'contents' ]
     LOGGER.info( 'Adding buffer identifiers for file: %s', filepath )
+    self._LoadSnapshotForFiletype( filetype )
     self._completer.ClearForFileAndAddIdentifiersToDatabase(
         _IdentifiersFromBuffer( text,
                                 filetype,
                                 collect_from_comments_and_strings ),
         filetype,
         filepath )
+    self._snapshot_dirty = True
 
 
   def _FilterUnchangedTagFiles( self, tag_files ):
@@ -127,17 +184,198 @@ class IdentifierCompleter( GeneralCompleter ):
 
 
   def _AddIdentifiersFromTagFiles( self, tag_files ):
-    self._completer.AddIdentifiersToDatabaseFromTagFiles(
-      ycm_core.StringVector(
-        self._FilterUnchangedTagFiles( tag_files ) ) )
+    tag_files = list( self._FilterUnchangedTagFiles( tag_files ) )
+    if not tag_files:
+      return
+
+    with self._tag_files_lock:
+      # The identifiers read from the previous version of these tag files are
+      # outdated; make sure they are not loaded from the snapshot.
+      stale_filepaths = []
+      for tag_file in tag_files:
+        stale_filepaths.extend( self._tag_file_filepaths.pop( tag_file, [] ) )
+    with self._snapshot_lock:
+      self._snapshot_stale_filepaths.update( stale_filepaths )
+
+    with self._tag_files_lock:
+      self._tag_files_pending += len( tag_files )
+      if self._tag_files_thread is None:
+        self._tag_files_thread = StartThread( self._LoadTagFilesInBackground )
+
+    for tag_file in tag_files:
+      self._tag_files_queue.put( tag_file )
+
+
+  def _LoadTagFilesInBackground( self ):
+    while True:
+      tag_file = self._tag_files_queue.get()
+      try:
+        if tag_file is None:
+          return
+        self._LoadTagFile( tag_file )
+      finally:
+        self._tag_files_queue.task_done()
+
+
+  def _LoadTagFile( self, tag_file ):
+    with self._tag_files_lock:
+      self._tag_file_being_loaded = tag_file
+    self._PostTagFilesMessage( f'Loading identifiers from { tag_file }' )
+
+    start_time = time.time()
+    filepaths = None
+    try:
+      filepaths = list( self._completer.AddIdentifiersToDatabaseFromTagFiles(
+        ycm_core.StringVector( [ tag_file ] ) ) )
+    except Exception:
+      LOGGER.exception( 'Error while loading identifiers from %s', tag_file )
+    load_time = time.time() - start_time
+
+    LOGGER.info( 'Loaded identifiers from %s in %.3f seconds',
+                 tag_file,
+                 load_time )
+    with self._tag_files_lock:
+      self._tag_files_pending -= 1
+      self._tag_file_being_loaded = None
+      self._last_loaded_tag_file = tag_file
+      self._last_tag_file_load_time = load_time
+      if filepaths is not None:
+        self._tag_file_filepaths[ tag_file ] = filepaths
+    self._snapshot_dirty = True
+    self._PostTagFilesMessage(
+      f'Loaded identifiers from { tag_file } in { load_time:.2f} seconds' )
+
+
+  def _PostTagFilesMessage( self, message ):
+    message = responses.BuildDisplayMessageResponse( message )
+    while True:
+      try:
+        self._tag_files_messages.put_nowait( message )
+        return
+      except queue.Full:
+        pass
+
+      # Nobody is polling for messages; discard the oldest one and try again.
+      try:
+        self._tag_files_messages.get_nowait()
+      except queue.Empty: # pragma: no cover
+        pass
 
 
   def _AddIdentifiersFromSyntax( self, keyword_list, filetype ):
     filepath = SYNTAX_FILENAME + filetype
+    self._LoadSnapshotForFiletype( filetype )
     self._completer.ClearForFileAndAddIdentifiersToDatabase(
       ycm_core.StringVector( keyword_list ),
       filetype,
       filepath )
+    self._snapshot_dirty = True
+
+
+  def _OpenSnapshot( self ):
+    try:
+      snapshot = identifier_database_snapshot.IdentifierDatabaseSnapshot(
+        self._snapshot_path )
+    except FileNotFoundError:
+      LOGGER.info( 'No identifier database snapshot at %s',
+                   self._snapshot_path )
+      return
+    except ( OSError, identifier_database_snapshot.SnapshotError ):
+      LOGGER.exception( 'Cannot open identifier database snapshot %s',
+                        self._snapshot_path )
+      return
+
+    # The identifiers of the tag files that changed since the snapshot was
+    # saved are outdated and must not be loaded. The other tag files don't need
+    # to be loaded again.
+    for tag_file, ( mtime, filepaths ) in snapshot.tag_files.items():
+      try:
+        current_mtime = os.path.getmtime( tag_file )
+      except OSError:
+        current_mtime = None
+
+      if current_mtime == mtime:
+        self._tags_file_last_mtime[ tag_file ] = mtime
+        self._tag_file_filepaths[ tag_file ] = filepaths
+      else:
+        self._snapshot_stale_filepaths.update( filepaths )
+
+    self._snapshot = snapshot
+    self._snapshot_filetypes_to_load.update( snapshot.Filetypes() )
+    LOGGER.info( 'Opened identifier database snapshot %s', self._snapshot_path )
+
+
+  def _LoadSnapshotForFiletype( self, filetype ):
+    # Avoid taking the lock in the common case where there is nothing to load.
+    if filetype not in self._snapshot_filetypes_to_load:
+      return
+
+    with self._snapshot_lock:
+      self._LoadSnapshotForFiletypeNoLock( filetype )
+
+
+  def _LoadSnapshotForFiletypeNoLock( self, filetype ):
+    if filetype not in self._snapshot_filetypes_to_load:
+      return
+
+    start_time = time.time()
+    for filepath, identifiers in self._snapshot.Identifiers( filetype ):
+      if filepath in self._snapshot_stale_filepaths:
+        continue
+      self._completer.ClearForFileAndAddIdentifiersToDatabase(
+        ycm_core.StringVector( identifiers ),
+        filetype,
+        filepath )
+    LOGGER.info( 'Loaded %s identifiers from snapshot in %.3f seconds',
+                 filetype,
+                 time.time() - start_time )
+
+    self._snapshot_filetypes_to_load.discard( filetype )
+    if not self._snapshot_filetypes_to_load:
+      self._snapshot.Close()
+      self._snapshot = None
+
+
+  def _SaveSnapshotPeriodically( self ):
+    while not self._snapshot_stop_event.wait( SNAPSHOT_SAVE_INTERVAL ):
+      self._SaveSnapshot()
+
+
+  def _SaveSnapshot( self ):
+    with self._snapshot_lock:
+      if not self._snapshot_dirty:
+        return
+      self._snapshot_dirty = False
+
+      # The snapshot file is about to be replaced, so the identifiers that are
+      # only in the snapshot must be loaded first.
+      for filetype in list( self._snapshot_filetypes_to_load ):
+        self._LoadSnapshotForFiletypeNoLock( filetype )
+
+      with self._tag_files_lock:
+        tag_files = {
+          tag_file: ( self._tags_file_last_mtime[ tag_file ], filepaths )
+          for tag_file, filepaths in self._tag_file_filepaths.items() }
+
+      database = (
+        ( filetype, (
+          ( filepath,
+            self._completer.IdentifiersInDatabase( filetype, filepath ) )
+          for filepath in self._completer.FilepathsInDatabase( filetype ) ) )
+        for filetype in self._completer.FiletypesInDatabase() )
+
+      start_time = time.time()
+      try:
+        identifier_database_snapshot.WriteSnapshot( self._snapshot_path,
+                                                    tag_files,
+                                                    database )
+      except Exception:
+        LOGGER.exception( 'Cannot save identifier database snapshot %s',
+                          self._snapshot_path )
+        return
+      LOGGER.info( 'Saved identifier database snapshot %s in %.3f seconds',
+                   self._snapshot_path,
+                   time.time() - start_time )
 
 
   def OnFileReadyToParse( self, request_data ):
@@ -157,6 +395,81 @@ class IdentifierCompleter( GeneralCompleter ):
     self._AddPreviousIdentifier( request_data )
 
 
+  def PollForMessagesInner( self, request_data, timeout ):
+    messages = []
+    try:
+      while True:
+        messages.append( self._tag_files_messages.get_nowait() )
+    except queue.Empty:
+      pass
+
+    if messages:
+      return messages
+
+    try:
+      return [ self._tag_files_messages.get( timeout = timeout ) ]
+    except queue.Empty:
+      return True
+
+
+  def DebugInfo( self, request_data ):
+    with self._tag_files_lock:
+      tag_files_pending = self._tag_files_pending
+      tag_file_being_loaded = self._tag_file_being_loaded
+      last_loaded_tag_file = self._last_loaded_tag_file
+      last_tag_file_load_time = self._last_tag_file_load_time
+
+    if last_tag_file_load_time is not None:
+      last_tag_file_load_time = f'{ last_tag_file_load_time:.3f}s'
+
+    return responses.BuildDebugInfoResponse( name = 'Identifier', items = [
+      responses.DebugInfoItem( 'Tag Files Pending', tag_files_pending ),
+      responses.DebugInfoItem( 'Tag File Being Loaded',
+                               tag_file_being_loaded ),
+      responses.DebugInfoItem( 'Last Loaded Tag File', last_loaded_tag_file ),
+      responses.DebugInfoItem( 'Last Tag File Load Time',
+                               last_tag_file_load_time ),
+      responses.DebugInfoItem( 'Database Snapshot',
+                               self._snapshot_path or None ),
+      responses.DebugInfoItem( 'Filetypes Not Loaded From Snapshot',
+                               sorted( self._snapshot_filetypes_to_load ) ) ] )
+
+
+  def MemoryUsage( self ):
+    filetypes = {}
+    total_identifiers = 0
+    total_bytes = 0
+    for filetype, filepath, identifiers, size in self._completer.MemoryUsage():
+      usage = filetypes.setdefault( filetype,
+                                    { 'entries': 0, 'bytes': 0, 'files': {} } )
+      usage[ 'entries' ] += identifiers
+      usage[ 'bytes' ] += size
+      usage[ 'files' ][ filepath ] = { 'entries': identifiers, 'bytes': size }
+      total_identifiers += identifiers
+      total_bytes += size
+
+    return dict( super().MemoryUsage(),
+                 identifier_database = { 'entries': total_identifiers,
+                                         'bytes': total_bytes,
+                                         'filetypes': filetypes } )
+
+
+  def Shutdown( self ):
+    with self._tag_files_lock:
+      if self._tag_files_thread is not None:
+        self._tag_files_queue.put( None )
+
+    if self._snapshot_thread is not None:
+      self._snapshot_stop_event.set()
+      self._SaveSnapshot()
+
+    with self._snapshot_lock:
+      if self._snapshot is not None:
+        self._snapshot.Close()
+        self._snapshot = None
+        self._snapshot_filetypes_to_load.clear()
+
+
 # This looks for the previous identifier and returns it; this might mean looking
 # at last identifier on the previous line if a new line has just been created.
 def _PreviousIdentifier( min_num_candidate_size_chars,
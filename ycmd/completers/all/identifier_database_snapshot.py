@@ -0,0 +1,214 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Reading and writing of identifier database snapshots.
+
+A snapshot is a binary file with the following layout (all integers are little
+endian):
+
+  header:     magic (8 bytes), version (uint32), index offset (uint64)
+  data:       one blob per (filetype, filepath) pair, holding the identifiers of
+              that file as newline-separated UTF-8
+  index:      number of tag files (uint32), then for each tag file its path,
+              modification time (double), number of filepaths read from it
+              (uint32) and these filepaths; then the number of filetypes
+              (uint32), and for each filetype its name, number of files
+              (uint32) and, for each file, its path, blob offset (uint64) and
+              blob size (uint32)
+
+Strings in the index are stored as their UTF-8 size (uint32) followed by their
+bytes. The index is at the end of the file so that the snapshot can be written
+in a single pass; opening a snapshot only reads the header and the index, the
+blobs are read from the memory-mapped file when they are needed."""
+
+import mmap
+import os
+import struct
+import tempfile
+
+MAGIC = b'YCMIDSNP'
+VERSION = 1
+
+_HEADER = struct.Struct( '<8sIQ' )
+_UINT32 = struct.Struct( '<I' )
+_UINT64 = struct.Struct( '<Q' )
+_DOUBLE = struct.Struct( '<d' )
+
+
+class SnapshotError( Exception ):
+  pass
+
+
+class IdentifierDatabaseSnapshot:
+  """A snapshot opened for reading. Only the index is parsed when the snapshot
+  is opened; the identifiers are read from the memory-mapped file on demand.
+  Not thread-safe."""
+
+  def __init__( self, path ):
+    with open( path, 'rb' ) as snapshot_file:
+      # mmap raises ValueError for empty files.
+      try:
+        self._data = mmap.mmap( snapshot_file.fileno(),
+                                0,
+                                access = mmap.ACCESS_READ )
+      except ValueError:
+        raise SnapshotError( f'Snapshot { path } is empty' )
+
+    try:
+      self._ReadIndex()
+    except ( struct.error, UnicodeDecodeError, SnapshotError ) as error:
+      self.Close()
+      raise SnapshotError( f'Snapshot { path } is invalid: { error }' )
+
+
+  def _ReadIndex( self ):
+    magic, version, index_offset = _HEADER.unpack_from( self._data, 0 )
+    if magic != MAGIC:
+      raise SnapshotError( 'not an identifier database snapshot' )
+    if version != VERSION:
+      raise SnapshotError( f'unsupported version { version }' )
+
+    reader = _IndexReader( self._data, index_offset )
+
+    # tag file -> ( modification time, filepaths )
+    self.tag_files = {}
+    for _ in range( reader.ReadUint32() ):
+      tag_file = reader.ReadString()
+      mtime = reader.ReadDouble()
+      filepaths = [ reader.ReadString() for _ in range( reader.ReadUint32() ) ]
+      self.tag_files[ tag_file ] = ( mtime, filepaths )
+
+    # filetype -> [ ( filepath, blob offset, blob size ) ]
+    self._filetypes = {}
+    for _ in range( reader.ReadUint32() ):
+      filetype = reader.ReadString()
+      files = []
+      for _ in range( reader.ReadUint32() ):
+        filepath = reader.ReadString()
+        offset = reader.ReadUint64()
+        size = reader.ReadUint32()
+        if offset + size > index_offset:
+          raise SnapshotError( f'blob for { filepath } is out of bounds' )
+        files.append( ( filepath, offset, size ) )
+      self._filetypes[ filetype ] = files
+
+
+  def Filetypes( self ):
+    return list( self._filetypes )
+
+
+  def Identifiers( self, filetype ):
+    """Yields a ( filepath, identifiers ) pair for each file stored for
+    |filetype|."""
+    for filepath, offset, size in self._filetypes.get( filetype, [] ):
+      blob = self._data[ offset : offset + size ].decode( 'utf-8' )
+      yield filepath, blob.split( '\n' ) if blob else []
+
+
+  def Close( self ):
+    self._data.close()
+
+
+class _IndexReader:
+  def __init__( self, data, offset ):
+    self._data = data
+    self._offset = offset
+
+
+  def _Unpack( self, unpacker ):
+    value, = unpacker.unpack_from( self._data, self._offset )
+    self._offset += unpacker.size
+    return value
+
+
+  def ReadUint32( self ):
+    return self._Unpack( _UINT32 )
+
+
+  def ReadUint64( self ):
+    return self._Unpack( _UINT64 )
+
+
+  def ReadDouble( self ):
+    return self._Unpack( _DOUBLE )
+
+
+  def ReadString( self ):
+    size = self.ReadUint32()
+    if self._offset + size > len( self._data ):
+      raise SnapshotError( 'string is out of bounds' )
+    value = self._data[ self._offset : self._offset + size ].decode( 'utf-8' )
+    self._offset += size
+    return value
+
+
+def _PackString( value ):
+  value = value.encode( 'utf-8' )
+  return _UINT32.pack( len( value ) ) + value
+
+
+def WriteSnapshot( path, tag_files, database ):
+  """Writes a snapshot to |path|, replacing any existing file atomically.
+  |tag_files| is a dictionary mapping the tag files to their modification time
+  and the filepaths read from them. |database| is an iterable of ( filetype,
+  files ) pairs where files is an iterable of ( filepath, identifiers )
+  pairs."""
+  index = [ _UINT32.pack( len( tag_files ) ) ]
+  for tag_file, ( mtime, filepaths ) in tag_files.items():
+    index.append( _PackString( tag_file ) )
+    index.append( _DOUBLE.pack( mtime ) )
+    index.append( _UINT32.pack( len( filepaths ) ) )
+    index.extend( _PackString( filepath ) for filepath in filepaths )
+
+  fd, temporary_path = tempfile.mkstemp( dir = os.path.dirname( path ),
+                                         prefix = os.path.basename( path ),
+                                         suffix = '.tmp' )
+  try:
+    with os.fdopen( fd, 'wb' ) as snapshot_file:
+      snapshot_file.write( _HEADER.pack( MAGIC, VERSION, 0 ) )
+      offset = _HEADER.size
+
+      filetypes_index = []
+      number_of_filetypes = 0
+      for filetype, files in database:
+        number_of_filetypes += 1
+        files_index = []
+        for filepath, identifiers in files:
+          blob = '\n'.join( identifier for identifier in identifiers
+                            if '\n' not in identifier ).encode( 'utf-8' )
+          snapshot_file.write( blob )
+          files_index.append( _PackString( filepath ) +
+                              _UINT64.pack( offset ) +
+                              _UINT32.pack( len( blob ) ) )
+          offset += len( blob )
+        filetypes_index.append( _PackString( filetype ) +
+                                _UINT32.pack( len( files_index ) ) )
+        filetypes_index.extend( files_index )
+
+      index.append( _UINT32.pack( number_of_filetypes ) )
+      snapshot_file.write( b''.join( index ) )
+      snapshot_file.write( b''.join( filetypes_index ) )
+      snapshot_file.seek( 0 )
+      snapshot_file.write( _HEADER.pack( MAGIC, VERSION, offset ) )
+
+    os.replace( temporary_path, path )
+  except BaseException:
+    try:
+      os.remove( temporary_path )
+    except OSError:
+      pass
+    raise
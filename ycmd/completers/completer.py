@@ -17,10 +17,11 @@
 
 import abc
 import threading
-from ycmd import extra_conf_store
+from contextlib import contextmanager
+from ycmd import extra_conf_store, metrics, tracing
 from ycmd.completers import completer_utils
 from ycmd.responses import NoDiagnosticSupport, SignatureHelpAvailalability
-from ycmd.utils import LOGGER
+from ycmd.utils import ApproximateSize, LOGGER
 
 NO_USER_COMMANDS = 'This completer does not define any commands.'
 
@@ -28,6 +29,16 @@ NO_USER_COMMANDS = 'This completer does not define any commands.'
 MESSAGE_POLL_TIMEOUT = 10
 
 
+@contextmanager
+def CompletionStage( completer, stage ):
+  """Records the duration of a completion |stage| of |completer| both as a
+  metric and as a tracing span."""
+  with metrics.Timer( 'ycmd_completer_duration_seconds',
+                      ( ( 'completer', completer ), ( 'stage', stage ) ) ):
+    with tracing.Span( f'{ completer }.{ stage }' ):
+      yield
+
+
 class CompletionsChanged( Exception ):
   pass # pragma: no cover
 
@@ -161,6 +172,11 @@ class Completer( metaclass = abc.ABCMeta ):
   Override the Shutdown() member function if your Completer subclass needs to do
   custom cleanup logic on server shutdown.
 
+  If your completer holds large caches, override the MemoryUsage member function
+  to report them in the /memory_usage response and the TrimCaches member
+  function to free them when the /trim_caches request is received. Call the
+  base implementations so that the completions cache is also covered.
+
   If the completer server provides unsolicited messages, such as used in
   Language Server Protocol, then you can override the PollForMessagesInner
   method. This method is called by the client in the "long poll" fashion to
@@ -300,11 +316,14 @@ class Completer( metaclass = abc.ABCMeta ):
          not self.ShouldUseNow( request_data ) ):
       return []
 
-    candidates = self._GetCandidatesFromSubclass( request_data )
-    candidates = self.FilterAndSortCandidates( candidates,
-                                               request_data[ 'query' ] )
-
-    return self.DetailCandidates( request_data, candidates )
+    completer = type( self ).__name__
+    with CompletionStage( completer, 'semantic_engine' ):
+      candidates = self._GetCandidatesFromSubclass( request_data )
+    with CompletionStage( completer, 'filter_and_sort' ):
+      candidates = self.FilterAndSortCandidates( candidates,
+                                                 request_data[ 'query' ] )
+    with CompletionStage( completer, 'resolve' ):
+      return self.DetailCandidates( request_data, candidates )
 
 
   def ShouldDetailCandidateList( self, candidates ):
@@ -520,6 +539,18 @@ class Completer( metaclass = abc.ABCMeta ):
     return self.ServerIsHealthy()
 
 
+  def MemoryUsage( self ):
+    """Returns a dictionary mapping the name of each cache held by the
+    completer to its number of entries and an estimate of its size in bytes."""
+    return { 'completions_cache': self._completions_cache.MemoryUsage() }
+
+
+  def TrimCaches( self ):
+    """Frees the memory held by the caches of the completer. The caches must be
+    transparently rebuilt when they are needed again."""
+    self._completions_cache.Invalidate()
+
+
   def SignatureHelpAvailable( self ):
     return SignatureHelpAvailalability.NOT_AVAILABLE
 
@@ -598,6 +629,13 @@ class CompletionsCache:
       return self.GetCompletionsIfCacheValidNoLock( request_data )
 
 
+  def MemoryUsage( self ):
+    with self._access_lock:
+      return { 'entries': len( self._completions or [] ),
+               'bytes': ApproximateSize( ( self._request_data,
+                                           self._completions ) ) }
+
+
   def GetCompletionsIfCacheValidNoLock( self, request_data ):
     if self._request_data and self._request_data == request_data:
       return self._completions
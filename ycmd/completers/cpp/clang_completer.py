@@ -22,7 +22,8 @@ import xml.etree.ElementTree
 from xml.etree.ElementTree import ParseError as XmlParseError
 
 from ycmd import responses
-from ycmd.utils import ImportCore, PathLeftSplit, re, ToBytes, ToUnicode
+from ycmd.utils import ( ImportCore, MemoryUsage, PathLeftSplit, re, ToBytes,
+                         ToUnicode )
 from ycmd.completers.completer import Completer
 from ycmd.completers.cpp.flags import ( Flags, PrepareFlagsForClang,
                                         UserIncludePaths )
@@ -391,6 +392,26 @@ class ClangCompleter( Completer ):
     self._completer.DeleteCachesForFile( request_data[ 'filepath' ] )
 
 
+  def MemoryUsage( self ):
+    translation_units = dict( self._completer.TranslationUnitsMemoryUsage() )
+    return dict( super().MemoryUsage(),
+                 translation_units = {
+                   'entries': len( translation_units ),
+                   'bytes': sum( translation_units.values() ),
+                   'files': translation_units
+                 },
+                 flags_for_file = MemoryUsage( self._flags.flags_for_file ),
+                 include_cache = self._include_cache.MemoryUsage() )
+
+
+  def TrimCaches( self ):
+    super().TrimCaches()
+    # The translation units are rebuilt on the next parse of their files.
+    self._completer.DeleteCachesForAllFiles()
+    self._flags.Clear()
+    self._include_cache.Clear()
+
+
   def GetDetailedDiagnostic( self, request_data ):
     current_line = request_data[ 'line_num' ]
     current_column = request_data[ 'column_num' ]
@@ -20,6 +20,7 @@ import os
 import subprocess
 
 from ycmd import extra_conf_store, responses
+from ycmd.completers.completer import CompletionStage
 from ycmd.completers.cpp.flags import ( AddMacIncludePaths,
                                         RemoveUnusedFlags,
                                         ShouldAllowWinStyleFlags )
@@ -220,6 +221,8 @@ class ClangdCompleter( language_server_completer.LanguageServerCompleter ):
     self._clangd_command = GetClangdCommand( user_options )
     self._use_ycmd_caching = user_options[ 'clangd_uses_ycmd_caching' ]
     self._compilation_commands = {}
+    self._uncached_files = set()
+    self._compilation_command_cache = {}
 
     self.RegisterOnFileReadyToParse(
       lambda self, request_data: self._SendFlagsFromExtraConf( request_data )
@@ -229,6 +232,8 @@ class ClangdCompleter( language_server_completer.LanguageServerCompleter ):
   def _Reset( self ):
     super()._Reset()
     self._compilation_commands = {}
+    self._uncached_files = set()
+    self._compilation_command_cache = {}
 
 
   def GetCompleterName( self ):
@@ -365,58 +370,126 @@ class ClangdCompleter( language_server_completer.LanguageServerCompleter ):
     if self._use_ycmd_caching:
       return super().ComputeCandidates( request_data )
     codepoint = request_data[ 'column_codepoint' ]
-    candidates, _ = super().ComputeCandidatesInner( request_data,
-                                                    codepoint )
+    with CompletionStage( 'ClangdCompleter', 'semantic_engine' ):
+      candidates, _ = super().ComputeCandidatesInner( request_data,
+                                                      codepoint )
     return candidates
 
 
   def _SendFlagsFromExtraConf( self, request_data ):
-    """Reads the flags from the extra conf of the given request and sends them
-    to Clangd as an entry of a compilation database using the
-    'compilationDatabaseChanges' configuration."""
-    filepath = request_data[ 'filepath' ]
+    """Reads the flags from the extra conf of the file of the given request and
+    of the other C-family files in its file data, and sends those that were not
+    sent yet to Clangd in a single notification as entries of a compilation
+    database using the 'compilationDatabaseChanges' configuration. Restoring a
+    session with many files thus makes Clangd update its state once instead of
+    once per file.
+
+    The flags of the files whose extra conf doesn't cache them are only
+    refreshed for the current file, since Clangd rebuilds the files whose flags
+    are sent. Errors for the other files are logged and don't prevent the flags
+    of the current file from being sent."""
+    current_filepath = request_data[ 'filepath' ]
+    filepaths = [ current_filepath ]
+    filepaths.extend(
+      filepath for filepath, file_data in request_data[ 'file_data' ].items()
+      if filepath != current_filepath and
+         set( file_data[ 'filetypes' ] ) & set( self.SupportedFiletypes() ) )
 
     with self._server_info_mutex:
-      # Replicate the logic from flags.py _GetFlagsFromCompilationDatabase:
-      #  - if there's a local extra conf, use it
-      #  - otherwise if there's no database, try and use a global extra conf
-
-      module = extra_conf_store.ModuleForSourceFile( filepath )
-      if not module:
-        # No extra conf and no global extra conf. Just let clangd handle it.
+      changes = {}
+      for filepath in filepaths:
+        if ( filepath in self._compilation_commands and
+             ( filepath != current_filepath or
+               filepath not in self._uncached_files ) ):
+          # Flags for this file have already been sent to Clangd.
+          continue
+
+        if filepath == current_filepath:
+          change = self._CompilationDatabaseChange( filepath, request_data )
+        else:
+          try:
+            change = self._CompilationDatabaseChange( filepath, request_data )
+          except Exception:
+            LOGGER.exception( 'Error while reading the flags for %s',
+                              filepath )
+            continue
+        if change:
+          changes[ filepath ] = change
+
+      if not changes:
         return
 
-      if ( extra_conf_store.IsGlobalExtraConfModule( module ) and
-           CompilationDatabaseExists( filepath ) ):
-        # No local extra conf, database exists: use database (i.e. clangd)
-        return
+      self.GetConnection().SendNotification( lsp.DidChangeConfiguration( {
+        'compilationDatabaseChanges': changes
+      } ) )
 
-      # Use our module (either local extra conf or global extra conf when no
-      # database is found)
-      settings = self.GetSettings( module, request_data )
+      for filepath, change in changes.items():
+        self._compilation_commands[ filepath ] = change[ 'compilationCommand' ]
 
-      if 'flags' not in settings:
-        # No flags returned. Let Clangd find the flags.
-        return
 
-      if ( settings.get( 'do_cache', True ) and
-           filepath in self._compilation_commands ):
-        # Flags for this file have already been sent to Clangd.
-        return
+  def _CompilationDatabaseChange( self, filepath, request_data ):
+    """Returns the compilation database entry of |filepath| computed from the
+    flags of its extra conf, or None if Clangd should find the flags itself."""
+    # Replicate the logic from flags.py _GetFlagsFromCompilationDatabase:
+    #  - if there's a local extra conf, use it
+    #  - otherwise if there's no database, try and use a global extra conf
 
-      flags = BuildCompilationCommand( settings[ 'flags' ], filepath )
+    module = extra_conf_store.ModuleForSourceFile( filepath )
+    if not module:
+      # No extra conf and no global extra conf. Just let clangd handle it.
+      return None
+
+    if ( extra_conf_store.IsGlobalExtraConfModule( module ) and
+         CompilationDatabaseExists( filepath ) ):
+      # No local extra conf, database exists: use database (i.e. clangd)
+      return None
+
+    # Use our module (either local extra conf or global extra conf when no
+    # database is found)
+    settings = self.GetSettings( module, {
+      'filepath': filepath,
+      'extra_conf_data': request_data[ 'extra_conf_data' ]
+    } )
+
+    if 'flags' not in settings:
+      # No flags returned. Let Clangd find the flags.
+      return None
+
+    if settings.get( 'do_cache', True ):
+      self._uncached_files.discard( filepath )
+    else:
+      self._uncached_files.add( filepath )
+
+    return {
+      'compilationCommand': self._BuildCompilationCommand( module,
+                                                           settings[ 'flags' ],
+                                                           filepath ),
+      'workingDirectory': settings.get( 'include_paths_relative_to_dir',
+                                        self._project_directory )
+    }
 
-      self.GetConnection().SendNotification( lsp.DidChangeConfiguration( {
-        'compilationDatabaseChanges': {
-          filepath: {
-            'compilationCommand': flags,
-            'workingDirectory': settings.get( 'include_paths_relative_to_dir',
-                                              self._project_directory )
-          }
-        }
-      } ) )
 
-      self._compilation_commands[ filepath ] = flags
+  def _BuildCompilationCommand( self, module, flags, filepath ):
+    """Memoized version of BuildCompilationCommand. Files of a project usually
+    share the same flags, so the command is computed once per extra conf module
+    and set of flags, and only the filepath is appended. Flags referring to the
+    file itself are not shared as they are removed from its command; like
+    RemoveUnusedFlags, this compares their real paths."""
+    flags = list( flags )
+    key = ( module.__file__, hash( tuple( flags ) ) )
+    entry = self._compilation_command_cache.get( key )
+    if entry is None or entry[ 0 ] != flags:
+      entry = ( flags, { os.path.realpath( flag ) for flag in flags }, None )
+      self._compilation_command_cache[ key ] = entry
+
+    flags, flag_paths, command = entry
+    if os.path.realpath( filepath ) in flag_paths:
+      return BuildCompilationCommand( flags, filepath )
+
+    if command is None:
+      command = BuildCompilationCommand( flags, filepath )[ : -1 ]
+      self._compilation_command_cache[ key ] = ( flags, flag_paths, command )
+    return command + [ filepath ]
 
 
   def ExtraDebugItems( self, request_data ):
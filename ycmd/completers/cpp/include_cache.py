@@ -24,7 +24,7 @@ from collections import defaultdict, namedtuple
 from ycmd import responses
 from ycmd.completers.general.filename_completer import ( GetPathType,
                                                          GetPathTypeName )
-from ycmd.utils import GetModificationTime, ListDirectory
+from ycmd.utils import GetModificationTime, ListDirectory, MemoryUsage
 
 
 """ Represents single include completion candidate.
@@ -83,6 +83,16 @@ class IncludeCache:
     return includes
 
 
+  def MemoryUsage( self ):
+    with self._cache_lock:
+      return MemoryUsage( self._cache )
+
+
+  def Clear( self ):
+    with self._cache_lock:
+      self._cache.clear()
+
+
   def _AddToCache( self, path, includes, mtime = None ):
     if not mtime:
       mtime = GetModificationTime( path )
@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
-from collections import defaultdict
+from collections import defaultdict, deque
 import os
 import errno
 import json
@@ -54,6 +54,19 @@ if ( not os.path.isfile( PATH_TO_OMNISHARP_ROSLYN_BINARY )
   PATH_TO_OMNISHARP_ROSLYN_BINARY = (
     os.path.join( PATH_TO_ROSLYN_OMNISHARP, 'omnisharp', 'OmniSharp.exe' ) )
 LOGFILE_FORMAT = 'omnisharp_{port}_{sln}_{std}_'
+# Maximum number of requests sent at the same time to an OmniSharp server.
+# Other requests wait in a queue, where they can be superseded by a newer
+# request for the same file.
+MAX_CONCURRENT_REQUESTS = 4
+# These requests are used to manage the server and must not wait behind the
+# others.
+UNSCHEDULED_HANDLERS = [ '/checkalivestatus',
+                         '/checkreadystatus',
+                         '/stopserver' ]
+
+
+class OmniSharpRequestCancelled( RuntimeError ):
+  pass
 
 
 def ShouldEnableCsCompleter( user_options ):
@@ -82,7 +95,7 @@ class CsharpCompleter( Completer ):
 
   def __init__( self, user_options ):
     super().__init__( user_options )
-    self._solution_for_file = {}
+    self._solution_for_directory = {}
     self._completer_per_solution = {}
     self._diagnostic_store = None
     self._solution_state_lock = threading.Lock()
@@ -270,7 +283,13 @@ class CsharpCompleter( Completer ):
     if not solutioncompleter.ServerIsHealthy():
       return
 
-    errors = solutioncompleter.CodeCheck( request_data )
+    try:
+      errors = solutioncompleter.CodeCheck( request_data )
+    except OmniSharpRequestCancelled:
+      # A newer request will update the diagnostics.
+      LOGGER.debug( 'Superseded CodeCheck request for %s',
+                    request_data[ 'filepath' ] )
+      return
 
     diagnostics = [ self._QuickFixToDiagnostic( request_data, x ) for x in
                     errors[ "QuickFixes" ] ]
@@ -351,6 +370,7 @@ class CsharpCompleter( Completer ):
       solution_item = responses.DebugInfoItem(
         key = 'solution',
         value = completer._solution_path )
+      scheduler_items = completer._scheduler.DebugInfoItems()
 
       omnisharp_server = responses.DebugInfoServer(
         name = 'OmniSharp',
@@ -359,7 +379,7 @@ class CsharpCompleter( Completer ):
         address = 'localhost',
         port = completer._omnisharp_port,
         logfiles = [ completer._filename_stdout, completer._filename_stderr ],
-        extras = [ solution_item ] )
+        extras = [ solution_item ] + scheduler_items )
 
       return responses.BuildDebugInfoResponse( name = 'C#',
                                                servers = [ omnisharp_server ] )
@@ -382,15 +402,18 @@ class CsharpCompleter( Completer ):
 
 
   def _GetSolutionFile( self, filepath ):
-    if filepath not in self._solution_for_file:
+    """Returns the solution of |filepath|. The solution is looked up once per
+    directory: all the files in a directory use the same solution."""
+    directory = os.path.dirname( filepath )
+    if directory not in self._solution_for_directory:
       # NOTE: detection could throw an exception if an extra_conf_store needs
       # to be confirmed
       path_to_solutionfile = solutiondetection.FindSolutionPath( filepath )
       if not path_to_solutionfile:
         raise RuntimeError( 'Autodetection of solution file failed.' )
-      self._solution_for_file[ filepath ] = path_to_solutionfile
+      self._solution_for_directory[ directory ] = path_to_solutionfile
 
-    return self._solution_for_file[ filepath ]
+    return self._solution_for_directory[ directory ]
 
 
 class CsharpSolutionCompleter( object ):
@@ -411,6 +434,7 @@ class CsharpSolutionCompleter( object ):
     self._server_state_lock = threading.Lock()
     self._roslyn_path = roslyn_path
     self._mono_path = mono_path
+    self._scheduler = _RequestScheduler( MAX_CONCURRENT_REQUESTS )
 
 
   def CodeCheck( self, request_data ):
@@ -419,7 +443,8 @@ class CsharpSolutionCompleter( object ):
       raise ValueError( INVALID_FILE_MESSAGE )
 
     return self._GetResponse( '/codecheck',
-                              self._DefaultParameters( request_data ) )
+                              self._DefaultParameters( request_data ),
+                              supersede_key = ( '/codecheck', filename ) )
 
 
   def _StartServer( self ):
@@ -553,7 +578,16 @@ class CsharpSolutionCompleter( object ):
     parameters[ 'WantKind' ] = True
     parameters[ 'WantReturnType' ] = False
     parameters[ 'WantDocumentationForEveryCompletionResult' ] = True
-    completions = self._GetResponse( '/autocomplete', parameters )
+    try:
+      completions = self._GetResponse(
+        '/autocomplete',
+        parameters,
+        supersede_key = ( '/autocomplete', request_data[ 'filepath' ] ) )
+    except OmniSharpRequestCancelled:
+      # The client has already sent a newer completion request.
+      LOGGER.debug( 'Superseded completion request for %s',
+                    request_data[ 'filepath' ] )
+      return []
     return completions if completions is not None else []
 
 
@@ -887,8 +921,22 @@ class CsharpSolutionCompleter( object ):
     return f'http://127.0.0.1:{ self._omnisharp_port }'
 
 
-  def _GetResponse( self, handler, parameters = {}, timeout = None ):
-    """ Handle communication with server """
+  def _GetResponse( self,
+                    handler,
+                    parameters = {},
+                    timeout = None,
+                    supersede_key = None ):
+    """ Handle communication with server. A queued request with the same
+    |supersede_key| is cancelled since its response would be outdated. """
+    if handler in UNSCHEDULED_HANDLERS:
+      return self._SendRequest( handler, parameters, timeout )
+    return self._scheduler.Run(
+      handler,
+      supersede_key,
+      lambda: self._SendRequest( handler, parameters, timeout ) )
+
+
+  def _SendRequest( self, handler, parameters, timeout ):
     target = urljoin( self._ServerLocation(), handler )
     LOGGER.debug( 'TX (%s): %s', handler, parameters )
     try:
@@ -914,6 +962,98 @@ class CsharpSolutionCompleter( object ):
     LOGGER.info( 'using port %s', self._omnisharp_port )
 
 
+class _Latency:
+  def __init__( self ):
+    self.count = 0
+    self.total = 0.0
+    self.maximum = 0.0
+
+
+  def Add( self, seconds ):
+    self.count += 1
+    self.total += seconds
+    self.maximum = max( self.maximum, seconds )
+
+
+  def __str__( self ):
+    mean = self.total / self.count if self.count else 0.0
+    return ( f'{ self.count } requests, mean { mean * 1000:.1f}ms, '
+             f'max { self.maximum * 1000:.1f}ms' )
+
+
+class _ScheduledRequest:
+  def __init__( self, supersede_key ):
+    self.supersede_key = supersede_key
+    self.cancelled = False
+
+
+class _RequestScheduler:
+  """Limits the number of requests sent at the same time to an OmniSharp
+  server. Requests are sent from the calling thread in the order they arrive;
+  a queued request is cancelled when a newer request with the same supersede
+  key arrives."""
+
+  def __init__( self, max_concurrent_requests ):
+    self._max_concurrent_requests = max_concurrent_requests
+    self._condition = threading.Condition()
+    self._queue = deque()
+    self._running = 0
+    self._superseded = 0
+    self._latencies = defaultdict( _Latency )
+
+
+  def Run( self, handler, supersede_key, send ):
+    """Calls |send| once fewer than the maximum number of requests are running
+    and the requests queued before this one have been sent, and returns its
+    result. Raises OmniSharpRequestCancelled if the request is superseded
+    while queued."""
+    request = _ScheduledRequest( supersede_key )
+    submitted = time.monotonic()
+    with self._condition:
+      if supersede_key is not None:
+        for queued_request in list( self._queue ):
+          if queued_request.supersede_key == supersede_key:
+            self._queue.remove( queued_request )
+            queued_request.cancelled = True
+            self._superseded += 1
+        self._condition.notify_all()
+      self._queue.append( request )
+
+      while not request.cancelled and (
+          self._queue[ 0 ] is not request or
+          self._running >= self._max_concurrent_requests ):
+        self._condition.wait()
+      if request.cancelled:
+        raise OmniSharpRequestCancelled(
+          f'OmniSharp { handler } request superseded by a newer one.' )
+
+      self._queue.popleft()
+      self._running += 1
+      # The next request may be sent as well.
+      self._condition.notify_all()
+
+    try:
+      return send()
+    finally:
+      with self._condition:
+        self._running -= 1
+        self._latencies[ handler ].Add( time.monotonic() - submitted )
+        self._condition.notify_all()
+
+
+  def DebugInfoItems( self ):
+    with self._condition:
+      items = [
+        responses.DebugInfoItem( key = 'queued requests',
+                                 value = str( len( self._queue ) ) ),
+        responses.DebugInfoItem( key = 'superseded requests',
+                                 value = str( self._superseded ) ) ]
+      for handler, latency in sorted( self._latencies.items() ):
+        items.append( responses.DebugInfoItem( key = f'{ handler } latency',
+                                               value = str( latency ) ) )
+      return items
+
+
 def DiagnosticsToDiagStructure( diagnostics ):
   structure = defaultdict( lambda : defaultdict( list ) )
   for diagnostic in diagnostics:
@@ -17,11 +17,12 @@
 
 import os
 
-from ycmd.completers.completer import Completer
+from ycmd.completers.completer import Completer, CompletionStage
 from ycmd.utils import ( ExpandVariablesInPath,
                          GetCurrentDirectory,
                          GetModificationTime,
                          ListDirectory,
+                         MemoryUsage,
                          OnWindows,
                          re,
                          ToUnicode )
@@ -218,6 +219,20 @@ class FilenameCompleter( Completer ):
     return candidates
 
 
+  def MemoryUsage( self ):
+    return dict( super().MemoryUsage(),
+                 head_path_for_directory = MemoryUsage(
+                   self._head_path_for_directory ),
+                 candidates_for_directory = MemoryUsage(
+                   self._candidates_for_directory ) )
+
+
+  def TrimCaches( self ):
+    super().TrimCaches()
+    self._head_path_for_directory.clear()
+    self._candidates_for_directory.clear()
+
+
   def ComputeCandidates( self, request_data ):
     if not self.ShouldUseNow( request_data ):
       return []
@@ -230,9 +245,11 @@ class FilenameCompleter( Completer ):
     old_start_codepoint = request_data[ 'start_codepoint' ]
     request_data[ 'start_codepoint' ] = start_codepoint
 
-    candidates = self.GetCandidatesForDirectory( directory )
-    candidates = self.FilterAndSortCandidates( candidates,
-                                               request_data[ 'query' ] )
+    with CompletionStage( 'FilenameCompleter', 'list_directory' ):
+      candidates = self.GetCandidatesForDirectory( directory )
+    with CompletionStage( 'FilenameCompleter', 'filter_and_sort' ):
+      candidates = self.FilterAndSortCandidates( candidates,
+                                                 request_data[ 'query' ] )
     if not candidates:
       # No candidates were matched. Reset the start column for the identifier
       # completer.
@@ -59,6 +59,19 @@ class GeneralCompleterStore( Completer ):
     return candidates
 
 
+  def MemoryUsage( self ):
+    return {
+      'identifier': self._identifier_completer.MemoryUsage(),
+      'filename': self._filename_completer.MemoryUsage(),
+      'ultisnips': self._ultisnips_completer.MemoryUsage()
+    }
+
+
+  def TrimCaches( self ):
+    for completer in self._all_completers:
+      completer.TrimCaches()
+
+
   def OnFileReadyToParse( self, request_data ):
     for completer in self._all_completers:
       completer.OnFileReadyToParse( request_data )
@@ -22,10 +22,12 @@ import os
 import shutil
 import tempfile
 import threading
+import time
 from collections import OrderedDict
 
 from ycmd import responses, utils
 from ycmd.completers.language_server import language_server_completer
+from ycmd.request_wrap import RequestWrap
 from ycmd.utils import LOGGER
 
 NO_DOCUMENTATION_MESSAGE = 'No documentation available for current context'
@@ -103,6 +105,16 @@ WORKSPACE_ROOT_PATH_OPTION = 'java_jdtls_workspace_root_path'
 # vscode-java extension.
 EXTENSION_PATH_OPTION = 'java_jdtls_extension_path'
 
+# When workspaces are re-used, the projects for which jdt.ls was started are
+# recorded in a small MRU file under the workspace root, along with the time it
+# took jdt.ls to import them. If this option is set, jdt.ls is started for the
+# most recently used project when ycmd starts so that its workspace is already
+# imported when the first Java file is opened.
+PREWARM_OPTION = 'java_jdtls_prewarm'
+
+RECENT_PROJECTS_FILE = 'recent_projects.json'
+MAX_RECENT_PROJECTS = 10
+
 
 def ShouldEnableJavaCompleter( user_options ):
   LOGGER.info( 'Looking for jdt.ls' )
@@ -273,6 +285,47 @@ def _FindProjectDir( starting_dir ):
   return project_path
 
 
+def _ReadRecentProjects( workspace_root_path ):
+  """Returns the list of recently used projects recorded under
+  |workspace_root_path|, most recent first. Each project is a dictionary with
+  the keys 'project_directory', 'filepath' (the file for which jdt.ls was
+  started), 'last_used' and 'import_time' (in seconds)."""
+  try:
+    with open( os.path.join( workspace_root_path, RECENT_PROJECTS_FILE ) ) as f:
+      return json.load( f )[ 'projects' ]
+  except ( OSError, ValueError, KeyError, TypeError ):
+    return []
+
+
+def _RecordRecentProject( workspace_root_path,
+                          project_directory,
+                          filepath,
+                          import_time ):
+  projects = [ project for project in _ReadRecentProjects( workspace_root_path )
+               if project.get( 'project_directory' ) != project_directory ]
+  projects.insert( 0, {
+    'project_directory': project_directory,
+    'filepath': filepath,
+    'last_used': time.time(),
+    'import_time': import_time,
+  } )
+
+  recent_projects_file = os.path.join( workspace_root_path,
+                                       RECENT_PROJECTS_FILE )
+  try:
+    os.makedirs( workspace_root_path, exist_ok = True )
+    with tempfile.NamedTemporaryFile( 'w',
+                                      dir = workspace_root_path,
+                                      prefix = RECENT_PROJECTS_FILE,
+                                      suffix = '.tmp',
+                                      delete = False ) as f:
+      json.dump( { 'projects': projects[ : MAX_RECENT_PROJECTS ] }, f )
+    os.replace( f.name, recent_projects_file )
+  except OSError:
+    LOGGER.exception( 'Unable to record recent project in %s',
+                      recent_projects_file )
+
+
 def _WorkspaceDirForProject( workspace_root_path,
                              project_dir,
                              use_clean_workspace ):
@@ -301,6 +354,7 @@ class JavaCompleter( language_server_completer.LanguageServerCompleter ):
 
     self._server_keep_logfiles = user_options[ 'server_keep_logfiles' ]
     self._use_clean_workspace = user_options[ CLEAN_WORKSPACE_OPTION ]
+    self._prewarm = user_options[ PREWARM_OPTION ]
     self._workspace_root_path = user_options[ WORKSPACE_ROOT_PATH_OPTION ]
     self._extension_path = user_options[ EXTENSION_PATH_OPTION ]
 
@@ -391,6 +445,11 @@ class JavaCompleter( language_server_completer.LanguageServerCompleter ):
       items.append( responses.DebugInfoItem( 'Workspace Path',
                                              self._workspace_path ) )
 
+    if self._import_time is not None:
+      items.append( responses.DebugInfoItem(
+        'Project Import Time',
+        f'{ self._import_time * 1000:.1f}ms' ) )
+
     items.append( responses.DebugInfoItem( 'Extension Path',
                                            self._extension_path ) )
 
@@ -411,6 +470,69 @@ class JavaCompleter( language_server_completer.LanguageServerCompleter ):
     return _FindProjectDir( os.path.dirname( filepath ) )
 
 
+  def GetProjectRootFiles( self ):
+    return list( PROJECT_FILE_TAILS )
+
+
+  def Prewarm( self ):
+    """Starts jdt.ls in the background for the most recently used project that
+    still exists, so that it is imported by the time a Java file is opened.
+    Only done if the prewarm option is set and workspaces are re-used. Returns
+    whether jdt.ls is being started."""
+    if not self._prewarm or self._use_clean_workspace:
+      return False
+
+    for project in _ReadRecentProjects( self._workspace_root_path ):
+      filepath = project.get( 'filepath' )
+      if not filepath:
+        continue
+      try:
+        contents = utils.ReadFile( filepath )
+      except ( OSError, ValueError ):
+        continue
+
+      request_data = RequestWrap( {
+        'filepath': filepath,
+        'line_num': 1,
+        'column_num': 1,
+        'file_data': {
+          filepath: {
+            'contents': contents,
+            'filetypes': [ 'java' ],
+          }
+        },
+        'extra_conf_data': {},
+      } )
+      self._prewarmed_project_dir = self.GetWorkspaceForFilepath( filepath )
+      if not self.StartServerInBackground( request_data ):
+        self._prewarmed_project_dir = None
+        return False
+
+      LOGGER.info( 'Prewarming jdt.ls for project %s (last import took %s '
+                   'seconds)',
+                   self._prewarmed_project_dir,
+                   project.get( 'import_time' ) )
+      return True
+
+    return False
+
+
+  def OnFileReadyToParse( self, request_data ):
+    # The prewarmed server is only useful if the first Java file belongs to the
+    # same project. Otherwise, restart it for the project of that file.
+    if self._prewarmed_project_dir:
+      with self._server_start_mutex:
+        prewarmed_project_dir = self._prewarmed_project_dir
+        self._prewarmed_project_dir = None
+        project_dir = self.GetWorkspaceForFilepath( request_data[ 'filepath' ] )
+        if prewarmed_project_dir and project_dir != prewarmed_project_dir:
+          LOGGER.info( 'Restarting jdt.ls prewarmed for project %s for project '
+                       '%s', prewarmed_project_dir, project_dir )
+          self._RestartServer( request_data )
+
+    return super().OnFileReadyToParse( request_data )
+
+
   def _WipeWorkspace( self, request_data, args ):
     with_config = False
     if len( args ) > 0 and '--with-config' in args:
@@ -435,6 +557,10 @@ class JavaCompleter( language_server_completer.LanguageServerCompleter ):
     self._java_project_dir = None
     self._received_ready_message = threading.Event()
     self._server_init_status = 'Not started'
+    self._import_start_time = None
+    self._import_filepath = None
+    self._import_time = None
+    self._prewarmed_project_dir = None
 
     self._started_message_sent = False
 
@@ -479,6 +605,8 @@ class JavaCompleter( language_server_completer.LanguageServerCompleter ):
           self._workspace_root_path,
           wipe_config )
 
+        self._import_start_time = time.monotonic()
+        self._import_filepath = request_data[ 'filepath' ]
         self._command = [ PATH_TO_JAVA ] + self._GetJvmArgs( request_data ) + [
           '-Dfile.encoding=UTF-8',
           '-Declipse.application=org.eclipse.jdt.ls.core.id1',
@@ -525,12 +653,29 @@ class JavaCompleter( language_server_completer.LanguageServerCompleter ):
         LOGGER.info( 'jdt.ls initialized successfully' )
         self._server_init_status = notification[ 'params' ][ 'message' ]
         self._received_ready_message.set()
+        self._RecordImport()
       elif not self._received_ready_message.is_set():
         self._server_init_status = notification[ 'params' ][ 'message' ]
 
     super().HandleNotificationInPollThread( notification )
 
 
+  def _RecordImport( self ):
+    if self._import_start_time is None:
+      return
+
+    self._import_time = time.monotonic() - self._import_start_time
+    LOGGER.info( 'jdt.ls imported project %s in %.1f seconds',
+                 self._java_project_dir,
+                 self._import_time )
+
+    if not self._use_clean_workspace and self._import_filepath:
+      _RecordRecentProject( self._workspace_root_path,
+                            self._java_project_dir,
+                            self._import_filepath,
+                            self._import_time )
+
+
   def ConvertNotificationToMessage( self, request_data, notification ):
     if notification[ 'method' ] == 'language/status':
       message = notification[ 'params' ][ 'message' ]
@@ -15,8 +15,10 @@
 # You should have received a copy of the GNU General Public License
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
 import logging
 import os
+import re
 import urllib.request
 import urllib.error
 import json
@@ -53,6 +55,15 @@ SERVER_HOST = '127.0.0.1'
 
 LOGFILE_FORMAT = 'tern_{port}_{std}_'
 
+# Completion and type requests on a file with at least this number of lines only
+# send the lines around the cursor to the Tern server, as a 'part' file, when
+# the server already has a previous version of the file. See
+# http://ternjs.net/doc/manual.html#protocol
+PART_MIN_LINES = 250
+PART_LINES_BEFORE_CURSOR = 50
+PART_LINES_AFTER_CURSOR = 20
+FUNCTION_REGEX = re.compile( r'\bfunction\b' )
+
 
 def ShouldEnableTernCompleter( user_options ):
   """Returns whether or not the tern completer is 'installed'. That is whether
@@ -134,6 +145,11 @@ class TernCompleter( Completer ):
     self._server_working_dir = None
     self._server_project_file = None
 
+    # Hash of the contents the Tern server has for each file we sent it. Files
+    # whose contents didn't change are not sent again.
+    self._file_hashes_lock = threading.Lock()
+    self._file_hashes = {}
+
 
   def _WarnIfMissingTernProject( self, request_data ):
     # The Tern server will operate without a .tern-project file. However, it
@@ -180,7 +196,8 @@ class TernCompleter( Completer ):
 
     response = self._GetResponse( query,
                                   request_data[ 'start_codepoint' ],
-                                  request_data )
+                                  request_data,
+                                  allow_part = True )
 
     completions = response.get( 'completions', [] )
     tern_start_codepoint = response[ 'start' ][ 'ch' ]
@@ -300,7 +317,7 @@ class TernCompleter( Completer ):
       return False
 
 
-  def _PostRequest( self, request, request_data ):
+  def _PostRequest( self, request, request_data, part = None ):
     """Send a raw request with the supplied request block, and
     return the server's response. If the server is not running, it is started.
 
@@ -308,24 +325,17 @@ class TernCompleter( Completer ):
     the files are being updated.
 
     The request block should contain the optional query block only. The file
-    data are added automatically."""
+    data are added automatically, except for the files whose contents the
+    server already has. If |part| is given, it is sent first instead of the
+    current file."""
 
     if not self._ServerIsRunning():
       raise ValueError( 'Not connected to server' )
 
-    def MakeIncompleteFile( name, file_data ):
-      return {
-        'type': 'full',
-        'name': name,
-        'text': file_data[ 'contents' ],
-      }
-
-    file_data = request_data.get( 'file_data', {} )
+    files, file_hashes = self._FilesToSend( request_data, part )
 
     full_request = {
-      'files': [ MakeIncompleteFile( x, file_data[ x ] )
-                 for x in file_data.keys()
-                 if 'javascript' in file_data[ x ][ 'filetypes' ] ],
+      'files': files,
     }
     full_request.update( request )
     try:
@@ -335,14 +345,89 @@ class TernCompleter( Completer ):
 
       json_response = json.loads( response.read() )
       response.close()
-      return json_response
     except urllib.error.HTTPError as response:
+      # We don't know which files the server has read, so send them again next
+      # time.
+      with self._file_hashes_lock:
+        for filepath in file_hashes:
+          self._file_hashes.pop( filepath, None )
       exception = ToUnicode( response.fp.read() )
       response.close()
       raise RuntimeError( exception )
 
+    with self._file_hashes_lock:
+      self._file_hashes.update( file_hashes )
+    return json_response
+
+
+  def _FilesToSend( self, request_data, part ):
+    """Returns the files to send to the server, i.e. |part| if any and the
+    JavaScript files of |request_data| the server doesn't have yet, and the
+    hashes of the contents of these full files."""
+    file_data = request_data.get( 'file_data', {} )
+    contents_hashes = {}
+    for filepath, data in file_data.items():
+      if ( 'javascript' in data[ 'filetypes' ] and
+           not ( part and filepath == part[ 'name' ] ) ):
+        contents_hashes[ filepath ] = _ContentsHash( data[ 'contents' ] )
+
+    with self._file_hashes_lock:
+      file_hashes = { filepath: contents_hash
+                      for filepath, contents_hash in contents_hashes.items()
+                      if self._file_hashes.get( filepath ) != contents_hash }
+
+    files = [ part ] if part else []
+    for filepath in file_hashes:
+      files.append( {
+        'type': 'full',
+        'name': filepath,
+        'text': file_data[ filepath ][ 'contents' ],
+      } )
+    return files, file_hashes
+
+
+  def _MakePart( self, request_data ):
+    """Returns a 'part' file holding the lines around the cursor if the current
+    file is large and the server has a different version of it, None otherwise.
+    Like the Tern plugin for Vim, the part starts at the least indented function
+    found in the lines before the cursor so that Tern can find the scope of the
+    cursor."""
+    lines = request_data[ 'lines' ]
+    if len( lines ) < PART_MIN_LINES:
+      return None
 
-  def _GetResponse( self, query, codepoint, request_data ):
+    filepath = request_data[ 'filepath' ]
+    with self._file_hashes_lock:
+      server_hash = self._file_hashes.get( filepath )
+    contents = request_data[ 'file_data' ][ filepath ][ 'contents' ]
+    if server_hash is None or server_hash == _ContentsHash( contents ):
+      return None
+
+    line = request_data[ 'line_num' ] - 1
+    start = max( 0, line - PART_LINES_BEFORE_CURSOR )
+    min_indent = None
+    for index in range( start, line ):
+      if not FUNCTION_REGEX.search( lines[ index ] ):
+        continue
+      indent = len( lines[ index ] ) - len( lines[ index ].lstrip() )
+      if min_indent is None or indent <= min_indent:
+        min_indent = indent
+        start = index
+    end = min( len( lines ), line + PART_LINES_AFTER_CURSOR + 1 )
+
+    return {
+      'type': 'part',
+      'name': filepath,
+      'offsetLines': start,
+      'text': '\n'.join( lines[ start : end ] ),
+    }
+
+
+  def _GetResponse( self,
+                    query,
+                    codepoint,
+                    request_data,
+                    allow_part = False ):
     """Send a standard file/line request with the supplied query block, and
     return the server's response. If the server is not running, it is started.
 
@@ -352,24 +437,33 @@ class TernCompleter( Completer ):
     The query block should contain the type and any parameters. The files,
     position, etc. are added automatically.
 
+    If |allow_part| is True, only the lines around the cursor of a large file
+    may be sent. This must only be used for queries that don't return positions
+    in the current file other than the cursor's.
+
     NOTE: the |codepoint| parameter is usually the current cursor position,
     though it should be the "completion start column" codepoint for completion
     requests."""
 
+    part = self._MakePart( request_data ) if allow_part else None
+
     def MakeTernLocation( request_data ):
+      # Positions in a part file are relative to its first line.
+      offset_lines = part[ 'offsetLines' ] if part else 0
       return {
-        'line': request_data[ 'line_num' ] - 1,
+        'line': request_data[ 'line_num' ] - 1 - offset_lines,
         'ch':   codepoint - 1
       }
 
     full_query = {
-      'file':              request_data[ 'filepath' ],
+      # A part file is referenced by its index in the files.
+      'file':              '#0' if part else request_data[ 'filepath' ],
       'end':               MakeTernLocation( request_data ),
       'lineCharPositions': True,
     }
     full_query.update( query )
 
-    return self._PostRequest( { 'query': full_query }, request_data )
+    return self._PostRequest( { 'query': full_query }, request_data, part )
 
 
   def _ServerPathToAbsolute( self, path ):
@@ -506,6 +600,9 @@ class TernCompleter( Completer ):
     self._server_working_dir = None
     self._server_project_file = None
 
+    with self._file_hashes_lock:
+      self._file_hashes = {}
+
 
   def _ServerIsRunning( self ):
     return utils.ProcessIsRunning( self._server_handle )
@@ -518,7 +615,8 @@ class TernCompleter( Completer ):
 
     response = self._GetResponse( query,
                                   request_data[ 'column_codepoint' ],
-                                  request_data )
+                                  request_data,
+                                  allow_part = True )
 
     return responses.BuildDisplayMessageResponse( response[ 'type' ] )
 
@@ -536,7 +634,8 @@ class TernCompleter( Completer ):
 
     response = self._GetResponse( query,
                                   request_data[ 'column_codepoint' ],
-                                  request_data )
+                                  request_data,
+                                  allow_part = True )
 
     doc_string = 'Name: {name}\nType: {type}\n\n{doc}'.format(
         name = response.get( 'name', 'Unknown' ),
@@ -679,6 +778,10 @@ class TernCompleter( Completer ):
         [ BuildFixItChunk( x ) for x in response[ 'changes' ] ] ) ] )
 
 
+def _ContentsHash( contents ):
+  return hashlib.sha1( ToBytes( contents ) ).digest()
+
+
 def _BuildLocation( file_contents, filename, line, ch ):
   # tern returns codepoint offsets, but we need byte offsets, so we must
   # convert
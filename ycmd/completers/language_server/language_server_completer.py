@@ -31,7 +31,7 @@ import threading
 from watchdog.events import PatternMatchingEventHandler
 from watchdog.observers import Observer
 
-from ycmd import extra_conf_store, responses, utils
+from ycmd import extra_conf_store, metrics, responses, tracing, utils
 from ycmd.completers.completer import Completer, CompletionsCache
 from ycmd.completers.completer_utils import GetFileContents, GetFileLines
 from ycmd.utils import LOGGER
@@ -46,6 +46,9 @@ REQUEST_TIMEOUT_INITIALISE = 30
 REQUEST_TIMEOUT_COMMAND    = 30
 CONNECTION_TIMEOUT         = 5
 
+# Interval at which a pending request checks whether it should be canceled.
+CANCELLATION_POLL_INTERVAL = 0.05
+
 # Size of the notification ring buffer
 MAX_QUEUED_MESSAGES = 250
 
@@ -136,6 +139,13 @@ class ResponseAbortedException( Exception ):
   pass # pragma: no cover
 
 
+class ResponseCancelledException( ResponseAbortedException ):
+  """Raised by LanguageServerConnection if a request is canceled because it
+  was superseded by a newer request or because the client of the HTTP request
+  disconnected."""
+  pass # pragma: no cover
+
+
 class ResponseFailedException( Exception ):
   """Raised by LanguageServerConnection if a request returns an error"""
   def __init__( self, error ):
@@ -183,6 +193,7 @@ class Response:
     self._event = threading.Event()
     self._message = None
     self._response_callback = response_callback
+    self._cancelled = False
 
 
   def ResponseReceived( self, message ):
@@ -200,19 +211,41 @@ class Response:
     self.ResponseReceived( None )
 
 
-  def AwaitResponse( self, timeout ):
+  def Cancel( self ):
+    """Called when the request is canceled. Any response received later from
+    the server is dropped."""
+    self._cancelled = True
+    self.Abort()
+
+
+  def AwaitResponse( self, timeout, cancelled = None ):
     """Called by clients to wait synchronously for either a response to be
-    received or for |timeout| seconds to have passed.
+    received or for |timeout| seconds to have passed. If supplied, |cancelled|
+    is polled while waiting and the wait stops once it returns True.
     Returns the message, or:
         - throws ResponseFailedException if the request fails
         - throws ResponseTimeoutException in case of timeout
+        - throws ResponseCancelledException in case the request is canceled
         - throws ResponseAbortedException in case the server is shut down."""
-    self._event.wait( timeout )
+    if cancelled is None:
+      self._event.wait( timeout )
+    else:
+      deadline = time.monotonic() + timeout
+      while not self._event.wait( min( CANCELLATION_POLL_INTERVAL,
+                                       max( deadline - time.monotonic(),
+                                            0 ) ) ):
+        if cancelled():
+          self._cancelled = True
+          raise ResponseCancelledException( 'Response Cancelled' )
+        if time.monotonic() >= deadline:
+          break
 
     if not self._event.is_set():
       raise ResponseTimeoutException( 'Response Timeout' )
 
     if self._message is None:
+      if self._cancelled:
+        raise ResponseCancelledException( 'Response Cancelled' )
       raise ResponseAbortedException( 'Response Aborted' )
 
     if 'error' in self._message:
@@ -438,9 +471,40 @@ class LanguageServerConnection( threading.Thread ):
 
   def GetResponse( self, request_id, message, timeout ):
     """Issue a request to the server and await the response. See
-    Response.AwaitResponse for return values and exceptions."""
+    Response.AwaitResponse for return values and exceptions. The request is
+    canceled if it times out or if the client of the HTTP request handled by
+    the current thread disconnects."""
     response = self.GetResponseAsync( request_id, message )
-    return response.AwaitResponse( timeout )
+    method = ( _MethodOfMessage( message )
+               if metrics.IsEnabled() or tracing.IsEnabled() else '' )
+    labels = ( ( 'method', method ), ) if metrics.IsEnabled() else ()
+    with metrics.Timer( 'ycmd_language_server_request_duration_seconds',
+                        labels ):
+      with tracing.Span( method ):
+        try:
+          return response.AwaitResponse( timeout,
+                                         utils.GetClientDisconnectedCheck() )
+        except ( ResponseTimeoutException, ResponseCancelledException ):
+          self.CancelRequest( request_id )
+          raise
+
+
+  def CancelRequest( self, request_id ):
+    """Cancels the request |request_id| if it is still pending: its Response
+    is dropped, any waiter gets a ResponseCancelledException and the server is
+    sent a $/cancelRequest notification so that it can stop working on it."""
+    with self._response_mutex:
+      response = self._responses.pop( request_id, None )
+
+    if response is None:
+      return
+
+    response.Cancel()
+
+    try:
+      self.SendNotification( lsp.CancelRequest( request_id ) )
+    except Exception:
+      LOGGER.exception( 'Failed to cancel request %s', request_id )
 
 
   def SendNotification( self, message ):
@@ -660,9 +724,13 @@ class LanguageServerConnection( threading.Thread ):
       else:
         # This is a response to the message with id message[ 'id' ]
         with self._response_mutex:
-          assert message_id in self._responses
-          self._responses[ message_id ].ResponseReceived( message )
-          del self._responses[ message_id ]
+          response = self._responses.pop( message_id, None )
+          if response is None:
+            # The request was canceled.
+            LOGGER.debug( 'Dropping response to canceled request %s',
+                          message_id )
+            return
+          response.ResponseReceived( message )
     else:
       # This is a notification
       self._AddNotificationToQueue( message )
@@ -698,6 +766,17 @@ class LanguageServerConnection( threading.Thread ):
         pass # pragma: no cover
 
 
+def _MethodOfMessage( message ):
+  """Returns the method of the serialized request |message| without parsing it.
+  Keys are sorted when serializing messages, so the method comes before the
+  parameters."""
+  start = message.find( b'"method":"' )
+  if start < 0:
+    return ''
+  start += len( b'"method":"' )
+  return utils.ToUnicode( message[ start : message.find( b'"', start ) ] )
+
+
 class StandardIOLanguageServerConnection( LanguageServerConnection ):
   """Concrete language server connection using stdin/stdout to communicate with
   the server. This should be the default choice for concrete completers."""
@@ -1028,6 +1107,16 @@ class LanguageServerCompleter( Completer ):
     self._stdout_file = None
     self._stderr_file = None
     self._server_started = False
+    # Used to ensure that the server is started only once when it is started
+    # both in the background and by OnFileReadyToParse. Held while starting the
+    # server.
+    self._server_start_mutex = threading.Lock()
+    self._server_starting_in_background = threading.Event()
+
+    # ( filepath, line, start codepoint ) -> id of the pending completion
+    # request
+    self._pending_completions = {}
+    self._pending_completions_mutex = threading.Lock()
 
     self._Reset()
 
@@ -1064,6 +1153,8 @@ class LanguageServerCompleter( Completer ):
     self._extra_conf_dir = None
     self._semantic_token_atlas = None
     self._server_workspace_dirs = set()
+    self._server_start_time = None
+    self._time_to_first_completion = None
 
 
   def GetCompleterName( self ):
@@ -1308,10 +1399,35 @@ class LanguageServerCompleter( Completer ):
 
     request_id = self.GetConnection().NextRequestId()
 
+    # A newer completion request at the same start position (i.e. the user
+    # typed more characters of the same identifier) supersedes the pending one,
+    # whose results would be discarded by the client anyway.
+    completion_key = ( request_data[ 'filepath' ],
+                       request_data[ 'line_num' ],
+                       request_data[ 'start_codepoint' ] )
+    with self._pending_completions_mutex:
+      superseded_request_id = self._pending_completions.get( completion_key )
+      self._pending_completions[ completion_key ] = request_id
+    if superseded_request_id is not None:
+      LOGGER.debug( 'Cancelling superseded completion request %s',
+                    superseded_request_id )
+      self.GetConnection().CancelRequest( superseded_request_id )
+
     msg = lsp.Completion( request_id, request_data, codepoint )
-    response = self.GetConnection().GetResponse( request_id,
-                                                 msg,
-                                                 REQUEST_TIMEOUT_COMPLETION )
+    try:
+      response = self.GetConnection().GetResponse( request_id,
+                                                   msg,
+                                                   REQUEST_TIMEOUT_COMPLETION )
+    except ResponseCancelledException:
+      # Either a newer request superseded this one or the client went away; in
+      # both cases, nobody is interested in the results.
+      LOGGER.debug( 'Completion request %s was cancelled', request_id )
+      return [], True
+    finally:
+      with self._pending_completions_mutex:
+        if self._pending_completions.get( completion_key ) == request_id:
+          del self._pending_completions[ completion_key ]
+    self._RecordFirstCompletion()
     result = response.get( 'result' ) or []
 
     if isinstance( result, list ):
@@ -1330,11 +1446,23 @@ class LanguageServerCompleter( Completer ):
     # should be based on ycmd's version of the insertion_text. Fortunately it's
     # likely much quicker to do the simple calculations inline rather than a
     # series of potentially many blocking server round trips.
-    return ( self._CandidatesFromCompletionItems(
-              items,
-              LanguageServerCompleter.RESOLVE_NONE,
-              request_data ),
-            is_incomplete )
+    with tracing.Span( 'CandidatesFromCompletionItems' ):
+      return ( self._CandidatesFromCompletionItems(
+                items,
+                LanguageServerCompleter.RESOLVE_NONE,
+                request_data ),
+              is_incomplete )
+
+
+  def _RecordFirstCompletion( self ):
+    if ( self._server_start_time is None or
+         self._time_to_first_completion is not None ):
+      return
+    self._time_to_first_completion = (
+      time.monotonic() - self._server_start_time )
+    LOGGER.info( '%s: first semantic completion %.1fms after server start',
+                 self.GetServerName(),
+                 self._time_to_first_completion * 1000 )
 
 
   def _GetCandidatesFromSubclass( self, request_data ):
@@ -1748,6 +1876,30 @@ class LanguageServerCompleter( Completer ):
     return []
 
 
+  def MemoryUsage( self ):
+    with self._server_info_mutex:
+      server_file_state = utils.MemoryUsage( self._server_file_state )
+    with self._latest_diagnostics_mutex:
+      latest_diagnostics = utils.MemoryUsage( self._latest_diagnostics )
+    return dict( super().MemoryUsage(),
+                 server_file_state = server_file_state,
+                 latest_diagnostics = latest_diagnostics )
+
+
+  def TrimCaches( self ):
+    super().TrimCaches()
+    # Drop the diagnostics of the files that are not open in the server. The
+    # server publishes them again when the files are opened.
+    with self._server_info_mutex:
+      open_uris = { lsp.FilePathToUri( file_name )
+                    for file_name, file_state in self._server_file_state.items()
+                    if file_state.state == lsp.ServerFileState.OPEN }
+    with self._latest_diagnostics_mutex:
+      for uri in list( self._latest_diagnostics ):
+        if uri not in open_uris:
+          del self._latest_diagnostics[ uri ]
+
+
   def DebugInfo( self, request_data ):
     with self._server_info_mutex:
       extras = self.CommonDebugItems() + self.ExtraDebugItems( request_data )
@@ -1930,17 +2082,62 @@ class LanguageServerCompleter( Completer ):
     # throw an exception
     self._server_started = True
 
+    self._server_start_time = time.monotonic()
+    self._time_to_first_completion = None
     if self.StartServer( request_data, *args, **kwargs ):
       self._SendInitialize( request_data )
 
 
-  def OnFileReadyToParse( self, request_data ):
-    if not self.ServerIsHealthy() and not self._server_started:
-      # We have to get the settings before starting the server, as this call
-      # might throw UnknownExtraConf.
-      self._StartAndInitializeServer( request_data )
+  def StartServerInBackground( self, request_data ):
+    """Starts the server and sends the initialize request in a background
+    thread, unless the server was already started. Until the initialize
+    exchange completes, completion requests fall back to the identifier
+    completer and the FileReadyToParse handlers are queued. Returns whether the
+    server is being started."""
+    with self._server_start_mutex:
+      if self.ServerIsHealthy() or self._server_started:
+        return False
+      # Prevent OnFileReadyToParse from starting the server too.
+      self._server_started = True
+      self._server_starting_in_background.set()
+
+    utils.StartThread( self._StartAndInitializeServerInBackground,
+                       request_data )
+    return True
 
-    if not self.ServerIsHealthy():
+
+  def Prewarm( self ):
+    """Called when ycmd starts. Completers that can guess which project will be
+    used may start their server in the background here. Returns whether the
+    server is being started. Does nothing by default."""
+    return False
+
+
+  def _StartAndInitializeServerInBackground( self, request_data ):
+    try:
+      with self._server_start_mutex:
+        self._StartAndInitializeServer( request_data )
+    except responses.UnknownExtraConf:
+      # The server will be started by OnFileReadyToParse, which asks the user
+      # to confirm the extra conf file.
+      LOGGER.info( 'Not starting %s in the background: the extra conf file '
+                   'must be confirmed', self.GetServerName() )
+    except Exception:
+      LOGGER.exception( 'Error while starting %s in the background',
+                        self.GetServerName() )
+    finally:
+      self._server_starting_in_background.clear()
+
+
+  def OnFileReadyToParse( self, request_data ):
+    with self._server_start_mutex:
+      if not self.ServerIsHealthy() and not self._server_started:
+        # We have to get the settings before starting the server, as this call
+        # might throw UnknownExtraConf.
+        self._StartAndInitializeServer( request_data )
+
+    if ( not self.ServerIsHealthy() and
+         not self._server_starting_in_background.is_set() ):
       return
 
     def ClearOneshotHandlers():
@@ -2031,7 +2228,7 @@ class LanguageServerCompleter( Completer ):
   def _AwaitServerMessages( self, request_data, timeout ):
     """Block until either we receive a notification, or a timeout occurs.
     Returns one of the following:
-       - a list containing a single message
+       - a list containing the message received and any message pending after it
        - True if a timeout occurred, and the poll should be restarted
        - False if an error occurred, and no further polling should be attempted
     """
@@ -2059,7 +2256,8 @@ class LanguageServerCompleter( Completer ):
         message = self.ConvertNotificationToMessage( request_data,
                                                      notification )
         if message:
-          return [ message ]
+          pending_messages = self._GetPendingMessages( request_data ) or []
+          return [ message ] + pending_messages
     except queue.Empty:
       return True
 
@@ -2170,6 +2368,11 @@ class LanguageServerCompleter( Completer ):
 
     This method should be called frequently and in any event before a
     synchronous operation."""
+    with tracing.Span( 'UpdateServerWithFileContents' ):
+      self._UpdateServerWithFileContentsInner( request_data )
+
+
+  def _UpdateServerWithFileContentsInner( self, request_data ):
     with self._server_info_mutex:
       self._UpdateDirtyFilesUnderLock( request_data )
       files_to_purge = self._UpdateSavedFilesUnderLock( request_data )
@@ -3124,8 +3327,15 @@ class LanguageServerCompleter( Completer ):
 
       return 'Initialized'
 
+    def TimeToFirstCompletion():
+      if self._time_to_first_completion is None:
+        return None
+      return f'{ self._time_to_first_completion * 1000:.1f}ms'
+
     return [ responses.DebugInfoItem( 'Server State',
                                       ServerStateDescription() ),
+             responses.DebugInfoItem( 'Time To First Semantic Completion',
+                                      TimeToFirstCompletion() ),
              responses.DebugInfoItem( 'Project Directory',
                                       self._project_directory ),
              responses.DebugInfoItem( 'Open Workspaces',
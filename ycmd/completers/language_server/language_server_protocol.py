@@ -427,6 +427,12 @@ def Exit():
   return BuildNotification( 'exit', None )
 
 
+def CancelRequest( request_id ):
+  return BuildNotification( '$/cancelRequest', {
+    'id': request_id,
+  } )
+
+
 def Void( request ):
   return Accept( request, None )
 
@@ -0,0 +1,517 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The operations of the Python completer that use Jedi. They are run either in
+the ycmd process, under a lock, or in a Jedi worker process (see
+jedi_worker.py), so they return picklable data, except for Complete which
+returns Jedi objects.
+
+Each operation takes a ScriptCache, the Jedi project and environment of the
+file, a request dictionary built by JediRequest, and a tuple of arguments."""
+
+from ycmd import responses
+from ycmd.utils import CodepointOffsetToByteOffset, LOGGER
+
+import collections
+import difflib
+import itertools
+import jedi
+import parso
+import time
+
+# Number of files whose jedi.Script is kept by a ScriptCache and for how long,
+# in seconds.
+MAX_CACHED_SCRIPTS = 10
+MAX_SCRIPT_AGE = 30
+
+# Modules of the standard library that are warmed up in every project, in
+# addition to the modules imported by the files, since most files end up
+# importing some of them.
+COMMON_STDLIB_MODULES = [
+  'os',
+  'os.path',
+  'sys',
+  're',
+  'collections',
+  'functools',
+  'itertools',
+  'typing',
+  'json',
+  'logging',
+  'subprocess',
+  'pathlib',
+]
+
+
+def JediRequest( request_data ):
+  """Returns the part of |request_data| needed by the operations. The contents
+  of the other buffers are left out since they are not used and would have to
+  be sent to the worker processes."""
+  filepath = request_data[ 'filepath' ]
+  request = {
+    'filepath': filepath,
+    'contents': request_data[ 'file_data' ][ filepath ][ 'contents' ],
+    'line_num': request_data[ 'line_num' ],
+    'start_codepoint': request_data[ 'start_codepoint' ],
+    'column_codepoint': request_data[ 'column_codepoint' ],
+  }
+  if 'range' in request_data:
+    request[ 'range' ] = request_data[ 'range' ]
+  return request
+
+
+class ScriptCache:
+  """Keeps the jedi.Script of the last files used so that consecutive requests
+  on the same contents of a file, e.g. completion, signature help and
+  detailing the candidates, share one parse and one inference state. A new
+  script is built when the contents, the project or the environment of the
+  file change; parso then reparses incrementally from the previous tree of the
+  file. Not thread-safe.
+
+  The inference state of a script doesn't see the changes made on disk to the
+  modules it already imported, so scripts are only kept for
+  MAX_SCRIPT_AGE seconds."""
+
+  def __init__( self, max_size = MAX_CACHED_SCRIPTS ):
+    self._max_size = max_size
+    # ( filepath, environment executable ) ->
+    #   ( contents, project, creation time, script )
+    self._scripts = collections.OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+
+  def Get( self, project, environment, request ):
+    filepath = request[ 'filepath' ]
+    contents = request[ 'contents' ]
+    key = ( filepath, environment.executable )
+    now = time.monotonic()
+
+    cached = self._scripts.get( key )
+    if ( cached is not None and
+         cached[ 0 ] == contents and
+         cached[ 1 ] is project and
+         now - cached[ 2 ] < MAX_SCRIPT_AGE ):
+      self._scripts.move_to_end( key )
+      self.hits += 1
+      return cached[ 3 ]
+
+    self.misses += 1
+    script = jedi.Script( contents,
+                          path = filepath,
+                          project = project,
+                          environment = environment )
+    if self._max_size > 0:
+      self._scripts[ key ] = ( contents, project, now, script )
+      self._scripts.move_to_end( key )
+      if len( self._scripts ) > self._max_size:
+        self._scripts.popitem( last = False )
+    return script
+
+
+  def Remove( self, filepath ):
+    for key in [ key for key in self._scripts if key[ 0 ] == filepath ]:
+      del self._scripts[ key ]
+
+
+  def Size( self ):
+    return len( self._scripts )
+
+
+def _LineAndColumn( request ):
+  # Jedi expects columns to start at 0, not 1, and for them to be Unicode
+  # codepoint offsets.
+  return request[ 'line_num' ], request[ 'start_codepoint' ] - 1
+
+
+def Complete( scripts, project, environment, request, args ):
+  return scripts.Get( project, environment, request ).complete(
+    *_LineAndColumn( request ) )
+
+
+def _GetExtraData( completion ):
+  if completion.module_path and completion.line and completion.column:
+    return {
+      'location': {
+        'filepath': completion.module_path,
+        'line_num': completion.line,
+        'column_num': completion.column + 1
+      }
+    }
+  return {}
+
+
+def DetailCompletion( completion ):
+  """Returns the fields of a candidate that describe the Jedi |completion|."""
+  return {
+    'extra_menu_info': _BuildTypeInfo( completion ),
+    'detailed_info': completion.docstring(),
+    'kind': completion.type,
+    'extra_data': _GetExtraData( completion )
+  }
+
+
+def Signatures( scripts, project, environment, request, args ):
+  signatures = scripts.Get( project, environment, request ).get_signatures(
+    *_LineAndColumn( request ) )
+  # Sorting by the number or arguments makes the order stable for the tests
+  # and isn't harmful. The order returned by jedi seems to be arbitrary.
+  signatures.sort( key=lambda s: len( s.params ) )
+
+  active_signature = 0
+  active_parameter = 0
+  for index, signature in enumerate( signatures ):
+    if signature.index is not None:
+      active_signature = index
+      active_parameter = signature.index
+      break
+
+  def MakeSignature( s ):
+    label = s.description + '( '
+    parameters = []
+    for index, p in enumerate( s.params ):
+      # We remove 'param ' from the start of each parameter (hence the 6:)
+      param = p.description[ 6: ]
+
+      start = len( label )
+      end = start + len( param )
+
+      label += param
+      if index < len( s.params ) - 1:
+        label += ', '
+
+      parameters.append( {
+        'label': [ CodepointOffsetToByteOffset( label, start ),
+                   CodepointOffsetToByteOffset( label, end ) ]
+      } )
+
+    label += ' )'
+
+    return {
+      'label': label,
+      'parameters': parameters,
+    }
+
+  return {
+    'activeSignature': active_signature,
+    'activeParameter': active_parameter,
+    'signatures': [ MakeSignature( s ) for s in signatures ],
+  }
+
+
+def _BuildGoToResponse( definitions, request ):
+  if len( definitions ) == 1:
+    definition = definitions[ 0 ]
+    column = 1
+    if all( x is None for x in [ definition.column,
+                                 definition.line,
+                                 definition.module_path ] ):
+      return None
+    if definition.column is not None:
+      column += definition.column
+    filepath = definition.module_path or request[ 'filepath' ]
+    return responses.BuildGoToResponse( filepath,
+                                        definition.line,
+                                        column,
+                                        definition.description )
+
+  gotos = []
+  for definition in definitions:
+    column = 1
+    if all( x is None for x in [ definition.column,
+                                 definition.line,
+                                 definition.module_path ] ):
+      continue
+    if definition.column is not None:
+      column += definition.column
+    filepath = definition.module_path or request[ 'filepath' ]
+    gotos.append( responses.BuildGoToResponse( filepath,
+                                               definition.line,
+                                               column,
+                                               definition.description ) )
+  return gotos
+
+
+def GoToType( scripts, project, environment, request, args ):
+  script = scripts.Get( project, environment, request )
+  definitions = script.infer( *_LineAndColumn( request ) )
+  if definitions:
+    type_def = _BuildGoToResponse( definitions, request )
+    if type_def is not None:
+      return type_def
+
+  raise RuntimeError( 'Can\'t jump to type definition.' )
+
+
+def GoToDefinition( scripts, project, environment, request, args ):
+  script = scripts.Get( project, environment, request )
+  definitions = script.goto( *_LineAndColumn( request ) )
+  if definitions:
+    definitions = _BuildGoToResponse( definitions, request )
+    if definitions is not None:
+      return definitions
+
+  raise RuntimeError( 'Can\'t jump to definition.' )
+
+
+def GoToReferences( scripts, project, environment, request, args ):
+  script = scripts.Get( project, environment, request )
+  definitions = script.get_references( *_LineAndColumn( request ) )
+  if definitions:
+    references = _BuildGoToResponse( definitions, request )
+    if references is not None:
+      return references
+  raise RuntimeError( 'Can\'t find references.' )
+
+
+def GoToSymbol( scripts, project, environment, request, args ):
+  query, max_results = args
+  definitions = list( itertools.islice( project.complete_search( query ),
+                                        max_results ) )
+  if definitions:
+    definitions = _BuildGoToResponse( definitions, request )
+    if definitions is not None:
+      return definitions
+
+  raise RuntimeError( 'Symbol not found' )
+
+
+def _BuildTypeInfo( definition ):
+  type_info = definition.description
+  # Jedi doesn't return the signature in the description. Build the signature
+  # from the params field.
+  try:
+    # Remove the "param " prefix from the description.
+    parameters = definition.get_signatures()[ 0 ].params
+    type_info += '(' + ', '.join(
+      [ param.description[ 6: ] for param in parameters ] ) + ')'
+  except IndexError:
+    pass
+  return type_info
+
+
+def GetType( scripts, project, environment, request, args ):
+  definitions = scripts.Get( project, environment, request ).infer(
+    *_LineAndColumn( request ) )
+  type_info = ', '.join( _BuildTypeInfo( definition )
+                         for definition in definitions )
+  if type_info:
+    return responses.BuildDisplayMessageResponse( type_info )
+  raise RuntimeError( 'No type information available.' )
+
+
+def GetDoc( scripts, project, environment, request, args ):
+  definitions = scripts.Get( project, environment, request ).goto(
+    *_LineAndColumn( request ) )
+  documentation = [
+    definition.docstring().strip() for definition in definitions ]
+  documentation = '\n---\n'.join( [ d for d in documentation if d ] )
+  if documentation:
+    return responses.BuildDetailedInfoResponse( documentation )
+  raise RuntimeError( 'No documentation available.' )
+
+
+def _RangeEnd( request ):
+  range_end = request.get( 'range', {} ).get( 'end', {} )
+  return range_end.get( 'line_num', None ), range_end.get( 'column_num', None )
+
+
+def RefactorRename( scripts, project, environment, request, args ):
+  new_name, = args
+  refactoring = scripts.Get( project, environment, request ).rename(
+    line = request[ 'line_num' ],
+    column = request[ 'column_codepoint' ] - 1,
+    new_name = new_name )
+
+  return responses.BuildFixItResponse( [
+    _RefactoringToFixIt( refactoring )
+  ] )
+
+
+def RefactorInline( scripts, project, environment, request, args ):
+  refactoring = scripts.Get( project, environment, request ).inline(
+    line = request[ 'line_num' ],
+    column = request[ 'column_codepoint' ] - 1 )
+
+  return responses.BuildFixItResponse( [
+    _RefactoringToFixIt( refactoring )
+  ] )
+
+
+def RefactorExtractVariable( scripts, project, environment, request, args ):
+  new_name, = args
+  until_line, until_column = _RangeEnd( request )
+  refactoring = scripts.Get( project, environment, request ).extract_variable(
+    line = request[ 'line_num' ],
+    column = request[ 'column_codepoint' ] - 1,
+    new_name = new_name,
+    until_line = until_line,
+    until_column = until_column )
+
+  return responses.BuildFixItResponse( [
+    _RefactoringToFixIt( refactoring )
+  ] )
+
+
+def RefactorExtractFunction( scripts, project, environment, request, args ):
+  new_name, = args
+  until_line, until_column = _RangeEnd( request )
+  refactoring = scripts.Get( project, environment, request ).extract_function(
+    line = request[ 'line_num' ],
+    column = request[ 'column_codepoint' ] - 1,
+    new_name = new_name,
+    until_line = until_line,
+    until_column = until_column )
+
+  return responses.BuildFixItResponse( [
+    _RefactoringToFixIt( refactoring )
+  ] )
+
+# Jedi has the following refactorings:
+#  - rename (RefactorRename)
+#  - inline variable
+#  - extract variable (requires argument)
+#  - extract function (requires argument)
+
+
+def TopLevelImports( contents ):
+  """Returns the names of the modules imported at the top level of the Python
+  source |contents|, in order. Relative imports are left out."""
+  module_names = {}
+  for import_node in parso.parse( contents ).iter_imports():
+    if import_node.level:
+      continue
+    if import_node.type == 'import_from':
+      paths = [ import_node.get_from_names() ]
+    else:
+      paths = import_node.get_paths()
+    for path in paths:
+      module_names[ '.'.join( name.value for name in path ) ] = None
+  return list( module_names )
+
+
+def WarmUp( scripts, project, environment, request, args ):
+  """Imports the module named |args[ 0 ]| and infers its attributes. The
+  script is thrown away but the modules and stubs parsed for it stay in the
+  parso cache, so the first completion in a file importing that module doesn't
+  have to parse them."""
+  module_name, = args
+  script = jedi.Script( f'import { module_name }\n{ module_name }.',
+                        project = project,
+                        environment = environment )
+  script.complete( 2, len( module_name ) + 1 )
+
+
+# The operations that return picklable data, by name.
+OPERATIONS = {
+  'Signatures': Signatures,
+  'GoToType': GoToType,
+  'GoToDefinition': GoToDefinition,
+  'GoToReferences': GoToReferences,
+  'GoToSymbol': GoToSymbol,
+  'GetType': GetType,
+  'GetDoc': GetDoc,
+  'RefactorRename': RefactorRename,
+  'RefactorInline': RefactorInline,
+  'RefactorExtractVariable': RefactorExtractVariable,
+  'RefactorExtractFunction': RefactorExtractFunction,
+  'WarmUp': WarmUp,
+}
+
+
+def _RefactoringToFixIt( refactoring ):
+  """Converts a Jedi Refactoring instance to a single responses.FixIt."""
+
+  # FIXME: refactorings can rename files (apparently). ycmd API doesn't have any
+  # interface for that, so we just ignore them.
+  changes = refactoring.get_changed_files()
+  chunks = []
+
+  # We sort the files to ensure the tests are stable
+  for filename in sorted( changes.keys() ):
+    changed_file = changes[ filename ]
+
+    # NOTE: This is an internal API. We _could_ use GetFileContents( filename )
+    # here, but using Jedi's representation means that it is always consistent
+    # with get_new_code()
+    old_text = changed_file._module_node.get_code()
+    new_text = changed_file.get_new_code()
+
+    # Cache the offsets of all the newlines in the file. These are used to
+    # calculate the line/column values from the offsets retuned by the diff
+    # scanner
+    newlines = [ i for i, c in enumerate( old_text ) if c == '\n' ]
+    newlines.append( len( old_text ) )
+
+    sequence_matcher = difflib.SequenceMatcher( a = old_text,
+                                                b = new_text,
+                                                autojunk = False )
+
+    for ( operation,
+          old_start, old_end,
+          new_start, new_end ) in sequence_matcher.get_opcodes():
+      # Tag of equal means the range is identical, so nothing to do.
+      if operation == 'equal':
+        continue
+
+      # operation can be 'insert', 'replace' or 'delete', the offsets actually
+      # already cover that in our FixIt API (a delete has an empty new_text, an
+      # insert has an empty range), so we just encode the line/column offset and
+      # the replacement text extracted from new_text
+      chunks.append( responses.FixItChunk(
+        new_text[ new_start : new_end ],
+        responses.Range( *_OffsetToPosition( ( old_start, old_end ),
+                                             filename,
+                                             old_text,
+                                             newlines ) )
+      ) )
+
+  return responses.FixIt( responses.Location( 1, 1, 'none' ),
+                          chunks,
+                          '',
+                          kind = responses.FixIt.Kind.REFACTOR )
+
+
+def _OffsetToPosition( start_end, filename, text, newlines ):
+  """Convert the 0-based codepoint offset |offset| to a position (line/col) in
+  |text|. |filename| is the full path of the file containing |text| and
+  |newlines| is a cache of the 0-based character offsets of all the \n
+  characters in |text| (plus one extra). Returns responses.Position."""
+
+  loc = ()
+  for index, newline in enumerate( newlines ):
+    for offset in start_end[ len( loc ): ]:
+      if newline >= offset:
+        start_of_line = newlines[ index - 1 ] + 1 if index > 0 else 0
+        column = offset - start_of_line
+        line_value = text[ start_of_line : newline ]
+        loc += ( responses.Location( index + 1,
+                                     CodepointOffsetToByteOffset( line_value,
+                                                                  column + 1 ),
+                                     filename ), )
+    if len( loc ) == 2:
+      break
+  return loc
+
+  # Invalid position - it's outside of the text. Just return the last
+  # position in the text. This is an internal error.
+  LOGGER.error( "Invalid offset %s in file %s with text %s and newlines %s",
+                offset,
+                filename,
+                text,
+                newlines )
+  raise RuntimeError( "Invalid file offset in diff" )
@@ -0,0 +1,507 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Execution of the Jedi operations in worker processes.
+
+Jedi is pure Python and holds the GIL while it works, so a slow operation run
+in the ycmd process, like finding the references of a name in a big project,
+blocks every other request. A JediWorkerPool instead sends the operations to a
+fixed number of worker processes. The requests are sharded by Python
+interpreter and project directory: each shard is always sent to the same
+worker, which keeps its Jedi project and inference caches warm. Background
+requests, like warming up these caches, only run when their worker has nothing
+else to do.
+
+A worker is a Python process running this module. It reads pickled requests on
+its standard input and writes the pickled responses on its standard output."""
+
+import collections
+import jedi
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+
+from ycmd import responses
+from ycmd.completers.python import jedi_operations
+from ycmd.utils import LOGGER, ProcessIsRunning, SafePopen, StartThread
+
+# Timeouts, in seconds, of the requests sent to the workers. When a request
+# times out while a worker is running it, the worker is left to finish it and
+# its result is dropped: killing the worker would throw away the caches that
+# the next request would need.
+JEDI_TIMEOUT_INTERACTIVE = 10
+JEDI_TIMEOUT_COMMAND = 60
+
+# Number of completion requests whose results a worker keeps so that their
+# candidates can be detailed.
+MAX_STORED_COMPLETIONS = 16
+
+WORKER_SHUTDOWN_TIMEOUT = 2
+
+
+class JediRequestCancelled( RuntimeError ):
+  pass
+
+
+class RemoteCompletion:
+  """A completion returned by Jedi in a worker process. The generations of the
+  completion requests are counted from 0 by each process, so |epoch| tells
+  apart the process that returned the completion from the ones that replaced
+  it."""
+
+  def __init__( self, worker, epoch, generation, index ):
+    self.worker = worker
+    self.epoch = epoch
+    self.generation = generation
+    self.index = index
+
+
+class JediWorkerPool:
+  def __init__( self, number_of_workers ):
+    self._lock = threading.Lock()
+    self._workers = [ _JediWorker( index )
+                      for index in range( number_of_workers ) ]
+    self._worker_for_shard = {}
+
+
+  def _WorkerForShard( self, spec ):
+    shard = spec[ : 2 ]
+    with self._lock:
+      worker = self._worker_for_shard.get( shard )
+      if worker is None:
+        worker = min( self._workers, key = lambda worker: len( worker.shards ) )
+        worker.shards.add( shard )
+        self._worker_for_shard[ shard ] = worker
+      return worker
+
+
+  def Run( self,
+           operation,
+           spec,
+           request,
+           args = (),
+           timeout = None,
+           background = False ):
+    """Runs the jedi_operations.OPERATIONS |operation| in the worker of the
+    project described by |spec|, a ( interpreter path, project directory,
+    sys.path ) tuple, and returns its result. A |background| operation is only
+    run once the worker has no other request queued."""
+    if timeout is None:
+      timeout = JEDI_TIMEOUT_COMMAND
+    worker = self._WorkerForShard( spec )
+    return worker.Run( operation,
+                       ( spec, request, args ),
+                       timeout,
+                       background = background )
+
+
+  def Complete( self, spec, request ):
+    """Returns a ( insertion text, RemoteCompletion ) pair for each completion
+    at the position of |request|. A pending completion request for the same
+    file is cancelled since its results would be outdated."""
+    worker = self._WorkerForShard( spec )
+    epoch, generation, texts = worker.Run(
+      'Complete',
+      ( spec, request, () ),
+      JEDI_TIMEOUT_INTERACTIVE,
+      supersede_key = ( 'Complete', request[ 'filepath' ] ) )
+    return [ ( text, RemoteCompletion( worker, epoch, generation, index ) )
+             for index, text in enumerate( texts ) ]
+
+
+  def Signatures( self, spec, request ):
+    worker = self._WorkerForShard( spec )
+    return worker.Run( 'Signatures',
+                       ( spec, request, () ),
+                       JEDI_TIMEOUT_INTERACTIVE,
+                       supersede_key = ( 'Signatures', request[ 'filepath' ] ) )
+
+
+  def DetailCompletions( self, completions ):
+    """Returns the details of each RemoteCompletion in |completions|, as
+    returned by jedi_operations.DetailCompletion, or None if its worker no
+    longer has it, e.g. because the worker process was restarted since."""
+    indexes_by_request = collections.defaultdict( list )
+    for completion in completions:
+      indexes_by_request[ completion.worker,
+                          completion.epoch,
+                          completion.generation ].append( completion.index )
+
+    details = {}
+    for request, indexes in indexes_by_request.items():
+      worker, epoch, generation = request
+      request_details = worker.Run( 'DetailCompletions',
+                                    ( epoch, generation, indexes ),
+                                    JEDI_TIMEOUT_INTERACTIVE )
+      if request_details is None:
+        continue
+      for index, detail in zip( indexes, request_details ):
+        details[ request + ( index, ) ] = detail
+
+    return [ details.get( ( completion.worker,
+                            completion.epoch,
+                            completion.generation,
+                            completion.index ) )
+             for completion in completions ]
+
+
+  def DebugInfoItems( self ):
+    items = [ responses.DebugInfoItem( key = 'Jedi worker processes',
+                                       value = str( len( self._workers ) ) ) ]
+    latencies = collections.defaultdict( _Latency )
+    for worker in self._workers:
+      items.append( responses.DebugInfoItem(
+        key = f'Jedi worker { worker.index }',
+        value = worker.Describe() ) )
+      for operation, latency in worker.Latencies().items():
+        latencies[ operation ].Merge( latency )
+    for operation, latency in sorted( latencies.items() ):
+      items.append( responses.DebugInfoItem(
+        key = f'Jedi { operation } latency',
+        value = str( latency ) ) )
+    return items
+
+
+  def Shutdown( self ):
+    for worker in self._workers:
+      worker.Shutdown()
+
+
+class _Latency:
+  def __init__( self ):
+    self.count = 0
+    self.total = 0.0
+    self.maximum = 0.0
+
+
+  def Add( self, seconds ):
+    self.count += 1
+    self.total += seconds
+    self.maximum = max( self.maximum, seconds )
+
+
+  def Merge( self, other ):
+    self.count += other.count
+    self.total += other.total
+    self.maximum = max( self.maximum, other.maximum )
+
+
+  def __str__( self ):
+    mean = self.total / self.count if self.count else 0.0
+    return ( f'{ self.count } requests, mean { mean * 1000:.1f}ms, '
+             f'max { self.maximum * 1000:.1f}ms' )
+
+
+class _Job:
+  def __init__( self, operation, message, supersede_key, background ):
+    self.operation = operation
+    self.message = message
+    self.supersede_key = supersede_key
+    self.background = background
+    self.submitted = time.monotonic()
+    self._done = threading.Event()
+    self._result = None
+    self._error = None
+
+
+  def Finish( self, result = None, error = None ):
+    self._result = result
+    self._error = error
+    self._done.set()
+
+
+  def Wait( self, timeout ):
+    return self._done.wait( timeout )
+
+
+  def Result( self ):
+    if self._error is not None:
+      raise self._error
+    return self._result
+
+
+class _JediWorker:
+  """A worker process and the thread sending it the queued requests, one at a
+  time."""
+
+  def __init__( self, index ):
+    self.index = index
+    # The shards sent to this worker, protected by the lock of the pool.
+    self.shards = set()
+    self._condition = threading.Condition()
+    self._queue = collections.deque()
+    self._process = None
+    self._shutdown = False
+    self._next_request_id = 0
+    self._restarts = 0
+    self._timeouts = 0
+    self._superseded = 0
+    self._latencies = collections.defaultdict( _Latency )
+    self._thread = StartThread( self._DispatchLoop )
+
+
+  def Run( self,
+           operation,
+           message,
+           timeout,
+           supersede_key = None,
+           background = False ):
+    job = _Job( operation, message, supersede_key, background )
+    with self._condition:
+      if self._shutdown:
+        raise RuntimeError( 'Jedi worker is shut down.' )
+      if supersede_key is not None:
+        for queued_job in list( self._queue ):
+          if queued_job.supersede_key == supersede_key:
+            self._queue.remove( queued_job )
+            self._superseded += 1
+            queued_job.Finish( error = JediRequestCancelled(
+              f'Jedi { operation } request superseded by a newer one.' ) )
+      self._queue.append( job )
+      self._condition.notify()
+
+    if not job.Wait( timeout ):
+      with self._condition:
+        self._timeouts += 1
+        if job in self._queue:
+          self._queue.remove( job )
+      raise RuntimeError( f'Jedi { operation } request timed out after '
+                          f'{ timeout } seconds.' )
+    return job.Result()
+
+
+  def _DispatchLoop( self ):
+    while True:
+      with self._condition:
+        while not self._queue and not self._shutdown:
+          self._condition.wait()
+        if self._shutdown:
+          return
+        job = self._NextJob()
+
+      try:
+        job.Finish( result = self._Execute( job ) )
+      except Exception as error:
+        job.Finish( error = error )
+
+      with self._condition:
+        self._latencies[ job.operation ].Add(
+          time.monotonic() - job.submitted )
+
+
+  # This method must be called with the condition held.
+  def _NextJob( self ):
+    for job in self._queue:
+      if not job.background:
+        self._queue.remove( job )
+        return job
+    return self._queue.popleft()
+
+
+  def _Execute( self, job ):
+    with self._condition:
+      if not ProcessIsRunning( self._process ):
+        if self._process is not None:
+          self._restarts += 1
+        self._process = _StartWorkerProcess()
+      process = self._process
+      self._next_request_id += 1
+      request_id = self._next_request_id
+
+    try:
+      pickle.dump( ( request_id, job.operation, job.message ),
+                   process.stdin )
+      process.stdin.flush()
+      response_id, succeeded, value = pickle.load( process.stdout )
+      if response_id != request_id:
+        raise RuntimeError( f'Unexpected response { response_id } to request '
+                            f'{ request_id }.' )
+    except Exception:
+      if not self._shutdown:
+        LOGGER.exception( 'Jedi worker %s failed, restarting it', self.index )
+      _StopWorkerProcess( process )
+      raise RuntimeError( 'Jedi worker process exited unexpectedly.' )
+
+    if not succeeded:
+      raise value
+    return value
+
+
+  def Latencies( self ):
+    with self._condition:
+      return dict( self._latencies )
+
+
+  def Describe( self ):
+    with self._condition:
+      process = self._process
+      pid = process.pid if ProcessIsRunning( process ) else 'not running'
+      return ( f'PID: { pid }, '
+               f'projects: { len( self.shards ) }, '
+               f'queued requests: { len( self._queue ) }, '
+               f'timeouts: { self._timeouts }, '
+               f'superseded requests: { self._superseded }, '
+               f'restarts: { self._restarts }' )
+
+
+  def Shutdown( self ):
+    with self._condition:
+      self._shutdown = True
+      queued_jobs = list( self._queue )
+      self._queue.clear()
+      process = self._process
+      self._condition.notify_all()
+
+    for job in queued_jobs:
+      job.Finish( error = JediRequestCancelled( 'Jedi worker is shut down.' ) )
+    if process is not None:
+      _StopWorkerProcess( process )
+
+
+def _StartWorkerProcess():
+  # The worker imports ycmd and Jedi from the same paths as this process.
+  env = os.environ.copy()
+  env[ 'PYTHONPATH' ] = os.pathsep.join( path for path in sys.path if path )
+  return SafePopen( [ sys.executable, '-m', __name__ ],
+                    stdin = subprocess.PIPE,
+                    stdout = subprocess.PIPE,
+                    stderr = subprocess.DEVNULL,
+                    env = env )
+
+
+def _StopWorkerProcess( process ):
+  # The worker exits when its standard input is closed.
+  try:
+    process.stdin.close()
+  except OSError:
+    pass
+  try:
+    process.wait( timeout = WORKER_SHUTDOWN_TIMEOUT )
+  except subprocess.TimeoutExpired:
+    process.kill()
+    process.wait()
+  process.stdout.close()
+
+
+class _WorkerState:
+  """The state of a worker process: the Jedi environments, projects and scripts
+  of the shards sent to it and the results of the last completion requests."""
+
+  def __init__( self ):
+    self._environments = {}
+    self._projects = {}
+    self._scripts = jedi_operations.ScriptCache()
+    self._completions = collections.OrderedDict()
+    self._epoch = os.getpid()
+    self._next_generation = 0
+
+
+  def _Environment( self, interpreter_path ):
+    try:
+      return self._environments[ interpreter_path ]
+    except KeyError:
+      pass
+    environment = jedi.create_environment( interpreter_path, safe = False )
+    self._environments[ interpreter_path ] = environment
+    return environment
+
+
+  def _Project( self, spec ):
+    try:
+      return self._projects[ spec ]
+    except KeyError:
+      pass
+    interpreter_path, project_directory, sys_path = spec
+    project = jedi.Project( project_directory,
+                            sys_path = list( sys_path ),
+                            environment_path = interpreter_path )
+    self._projects[ spec ] = project
+    return project
+
+
+  def Handle( self, operation, message ):
+    if operation == 'DetailCompletions':
+      epoch, generation, indexes = message
+      completions = self._completions.get( generation )
+      if epoch != self._epoch or completions is None:
+        return None
+      return [ jedi_operations.DetailCompletion( completions[ index ] )
+               for index in indexes ]
+
+    spec, request, args = message
+    project = self._Project( spec )
+    environment = self._Environment( spec[ 0 ] )
+
+    if operation == 'Complete':
+      completions = jedi_operations.Complete( self._scripts,
+                                              project,
+                                              environment,
+                                              request,
+                                              args )
+      generation = self._next_generation
+      self._next_generation += 1
+      self._completions[ generation ] = completions
+      if len( self._completions ) > MAX_STORED_COMPLETIONS:
+        self._completions.popitem( last = False )
+      return ( self._epoch,
+               generation,
+               [ completion.complete for completion in completions ] )
+
+    return jedi_operations.OPERATIONS[ operation ]( self._scripts,
+                                                    project,
+                                                    environment,
+                                                    request,
+                                                    args )
+
+
+def _PicklableError( error ):
+  try:
+    pickle.loads( pickle.dumps( error ) )
+    return error
+  except Exception:
+    return RuntimeError( str( error ) )
+
+
+def Main():
+  # The responses are written to the original standard output. Anything else
+  # printed, e.g. by Jedi, goes to the standard error.
+  output = sys.stdout.buffer
+  sys.stdout = sys.stderr
+  input_stream = sys.stdin.buffer
+
+  state = _WorkerState()
+  while True:
+    try:
+      request_id, operation, message = pickle.load( input_stream )
+    except EOFError:
+      return
+
+    try:
+      response = pickle.dumps(
+        ( request_id, True, state.Handle( operation, message ) ) )
+    except Exception as error:
+      response = pickle.dumps(
+        ( request_id, False, _PicklableError( error ) ) )
+    output.write( response )
+    output.flush()
+
+
+if __name__ == '__main__':
+  Main()
@@ -17,16 +17,18 @@
 
 from ycmd import extra_conf_store, responses
 from ycmd.completers.completer import Completer, SignatureHelpAvailalability
-from ycmd.utils import ( CodepointOffsetToByteOffset,
-                         ExpandVariablesInPath,
+from ycmd.completers.python import jedi_operations
+from ycmd.completers.python.jedi_worker import JediWorkerPool
+from ycmd.utils import ( ExpandVariablesInPath,
                          FindExecutable,
-                         LOGGER )
+                         LOGGER,
+                         StartThread )
 
-import difflib
-import itertools
+from collections import defaultdict
 import jedi
 import os
 import parso
+import queue
 from threading import Lock
 
 
@@ -43,6 +45,28 @@ class PythonCompleter( Completer ):
     self._environment_for_file = {}
     self._environment_for_interpreter_path = {}
     self._jedi_project_for_file = {}
+    self._jedi_scripts = jedi_operations.ScriptCache()
+    # When Jedi runs in worker processes, the lock only protects the caches
+    # above.
+    number_of_workers = user_options[ 'python_jedi_worker_processes' ]
+    self._jedi_workers = ( JediWorkerPool( number_of_workers )
+                           if number_of_workers > 0 else None )
+
+    # The modules imported by the files, and the common modules of the standard
+    # library, are warmed up by a background thread, one at a time, so that the
+    # first completion in a new project doesn't wait for Jedi to parse them.
+    # This is only done when Jedi runs in worker processes; in this process, it
+    # would hold the Jedi lock and the GIL while the first requests come in.
+    # _warm_up_lock protects the warm-up state below.
+    self._warm_up_queue = queue.Queue()
+    self._warm_up_thread = None
+    self._warm_up_lock = Lock()
+    # filepath -> ( project spec, request data ) of the files to warm up.
+    self._files_to_warm_up = {}
+    # project spec -> names of the modules warmed up for that project.
+    self._warmed_up_modules = defaultdict( set )
+    self._modules_to_warm_up = 0
+    self._module_being_warmed_up = None
     self.SetSignatureHelpTriggers( [ '(', ',' ] )
 
 
@@ -56,6 +80,74 @@ class PythonCompleter( Completer ):
     environment = self._EnvironmentForRequest( request_data )
     self._JediProjectForFile( request_data, environment )
 
+    if self._jedi_workers and self.user_options[ 'python_jedi_warm_up' ]:
+      self._QueueWarmUp( request_data )
+
+
+  def _QueueWarmUp( self, request_data ):
+    filepath = request_data[ 'filepath' ]
+    spec = self._JediWorkerSpec( request_data )
+    with self._warm_up_lock:
+      if self._warm_up_thread is None:
+        self._warm_up_thread = StartThread( self._WarmUpInBackground )
+      # Only the latest contents of a file are warmed up.
+      queued = filepath in self._files_to_warm_up
+      self._files_to_warm_up[ filepath ] = ( spec, request_data )
+    if not queued:
+      self._warm_up_queue.put( filepath )
+
+
+  def _WarmUpInBackground( self ):
+    while True:
+      filepath = self._warm_up_queue.get()
+      if filepath is None:
+        return
+      with self._warm_up_lock:
+        spec, request_data = self._files_to_warm_up.pop( filepath )
+      try:
+        self._WarmUpFile( spec, request_data )
+      except Exception:
+        LOGGER.exception( 'Error while warming up Jedi for %s', filepath )
+
+
+  def _WarmUpFile( self, spec, request_data ):
+    contents = request_data[ 'file_data' ][ request_data[ 'filepath' ] ][
+      'contents' ]
+    module_names = ( jedi_operations.TopLevelImports( contents ) +
+                     jedi_operations.COMMON_STDLIB_MODULES )
+    with self._warm_up_lock:
+      warmed_up_modules = self._warmed_up_modules[ spec ]
+      module_names = [ module_name
+                       for module_name in dict.fromkeys( module_names )
+                       if module_name not in warmed_up_modules ]
+      self._modules_to_warm_up += len( module_names )
+
+    for module_name in module_names:
+      with self._warm_up_lock:
+        self._module_being_warmed_up = module_name
+      try:
+        self._jedi_workers.Run( 'WarmUp',
+                                spec,
+                                None,
+                                ( module_name, ),
+                                background = True )
+      except Exception:
+        LOGGER.exception( 'Error while warming up Python module %s',
+                          module_name )
+      finally:
+        # A module that failed is not retried.
+        with self._warm_up_lock:
+          warmed_up_modules.add( module_name )
+          self._modules_to_warm_up -= 1
+          self._module_being_warmed_up = None
+
+
+  def OnBufferUnload( self, request_data ):
+    # The workers drop their scripts once they are too old.
+    if not self._jedi_workers:
+      with self._jedi_lock:
+        self._jedi_scripts.Remove( request_data[ 'filepath' ] )
+
 
   def _SettingsForRequest( self, request_data ):
     filepath = request_data[ 'filepath' ]
@@ -163,43 +255,61 @@ class PythonCompleter( Completer ):
     return jedi_project
 
 
-  def _GetJediScript( self, request_data ):
-    path = request_data[ 'filepath' ]
-    source = request_data[ 'file_data' ][ path ][ 'contents' ]
+  # This method must be called under Jedi's lock.
+  def _ProjectAndEnvironment( self, request_data ):
     environment = self._EnvironmentForRequest( request_data )
-    jedi_project = self._JediProjectForFile( request_data, environment )
-    return jedi.Script( source,
-                        path = path,
-                        project = jedi_project,
-                        environment = environment )
+    return self._JediProjectForFile( request_data, environment ), environment
 
 
-  # This method must be called under Jedi's lock.
-  def _GetExtraData( self, completion ):
-    if completion.module_path and completion.line and completion.column:
-      return {
-        'location': {
-          'filepath': completion.module_path,
-          'line_num': completion.line,
-          'column_num': completion.column + 1
-        }
-      }
-    return {}
+  def _JediWorkerSpec( self, request_data ):
+    """Returns what a Jedi worker needs to rebuild the project of the file: a
+    ( interpreter path, project directory, sys.path ) tuple."""
+    with self._jedi_lock:
+      project, environment = self._ProjectAndEnvironment( request_data )
+      return ( environment.executable,
+               str( project._path ),
+               tuple( project._sys_path ) )
 
 
-  def ComputeCandidatesInner( self, request_data ):
+  def _RunJediOperation( self, request_data, operation, args = () ):
+    request = jedi_operations.JediRequest( request_data )
+    if self._jedi_workers:
+      return self._jedi_workers.Run( operation,
+                                     self._JediWorkerSpec( request_data ),
+                                     request,
+                                     args )
+
     with self._jedi_lock:
-      line = request_data[ 'line_num' ]
-      # Jedi expects columns to start at 0, not 1, and for them to be Unicode
-      # codepoint offsets.
-      column = request_data[ 'start_codepoint' ] - 1
-      completions = self._GetJediScript( request_data ).complete( line, column )
-      return [ responses.BuildCompletionData(
-        insertion_text = completion.complete,
-        # We store the Completion object returned by Jedi in the extra_data
-        # field to detail the candidates once the filtering is done.
-        extra_data = completion
-      ) for completion in completions ]
+      project, environment = self._ProjectAndEnvironment( request_data )
+      return jedi_operations.OPERATIONS[ operation ]( self._jedi_scripts,
+                                                      project,
+                                                      environment,
+                                                      request,
+                                                      args )
+
+
+  def ComputeCandidatesInner( self, request_data ):
+    request = jedi_operations.JediRequest( request_data )
+    if self._jedi_workers:
+      completions = self._jedi_workers.Complete(
+        self._JediWorkerSpec( request_data ), request )
+    else:
+      with self._jedi_lock:
+        project, environment = self._ProjectAndEnvironment( request_data )
+        completions = [ ( completion.complete, completion )
+                        for completion in jedi_operations.Complete(
+                          self._jedi_scripts,
+                          project,
+                          environment,
+                          request,
+                          () ) ]
+    return [ responses.BuildCompletionData(
+      insertion_text = insertion_text,
+      # We store the Completion object returned by Jedi, or the reference to
+      # it in a worker, in the extra_data field to detail the candidates once
+      # the filtering is done.
+      extra_data = completion
+    ) for insertion_text, completion in completions ]
 
 
   def SignatureHelpAvailable( self ):
@@ -207,183 +317,83 @@ class PythonCompleter( Completer ):
 
 
   def ComputeSignaturesInner( self, request_data ):
-    with self._jedi_lock:
-      line = request_data[ 'line_num' ]
-      # Jedi expects columns to start at 0, not 1, and for them to be Unicode
-      # codepoint offsets.
-      column = request_data[ 'start_codepoint' ] - 1
-      signatures = self._GetJediScript( request_data ).get_signatures( line,
-                                                                       column )
-      # Sorting by the number or arguments makes the order stable for the tests
-      # and isn't harmful. The order returned by jedi seems to be arbitrary.
-      signatures.sort( key=lambda s: len( s.params ) )
-
-      active_signature = 0
-      active_parameter = 0
-      for index, signature in enumerate( signatures ):
-        if signature.index is not None:
-          active_signature = index
-          active_parameter = signature.index
-          break
-
-      def MakeSignature( s ):
-        label = s.description + '( '
-        parameters = []
-        for index, p in enumerate( s.params ):
-          # We remove 'param ' from the start of each parameter (hence the 6:)
-          param = p.description[ 6: ]
-
-          start = len( label )
-          end = start + len( param )
-
-          label += param
-          if index < len( s.params ) - 1:
-            label += ', '
-
-          parameters.append( {
-            'label': [ CodepointOffsetToByteOffset( label, start ),
-                       CodepointOffsetToByteOffset( label, end ) ]
-          } )
-
-        label += ' )'
-
-        return {
-          'label': label,
-          'parameters': parameters,
-        }
-
-      return {
-        'activeSignature': active_signature,
-        'activeParameter': active_parameter,
-        'signatures': [ MakeSignature( s ) for s in signatures ],
-      }
+    if self._jedi_workers:
+      return self._jedi_workers.Signatures(
+        self._JediWorkerSpec( request_data ),
+        jedi_operations.JediRequest( request_data ) )
+    return self._RunJediOperation( request_data, 'Signatures' )
 
 
   def DetailCandidates( self, request_data, candidates ):
-    with self._jedi_lock:
-      for candidate in candidates:
-        if isinstance( candidate[ 'extra_data' ], dict ):
-          # This candidate is already detailed.
-          continue
-        completion = candidate[ 'extra_data' ]
-        candidate[ 'extra_menu_info' ] = self._BuildTypeInfo( completion )
-        candidate[ 'detailed_info' ] = completion.docstring()
-        candidate[ 'kind' ] = completion.type
-        candidate[ 'extra_data' ] = self._GetExtraData( completion )
+    # The candidates with a dictionary in extra_data are already detailed.
+    candidates_to_detail = [
+      candidate for candidate in candidates
+      if not isinstance( candidate[ 'extra_data' ], dict ) ]
+    completions = [ candidate[ 'extra_data' ]
+                    for candidate in candidates_to_detail ]
+
+    if self._jedi_workers:
+      try:
+        details = self._jedi_workers.DetailCompletions( completions )
+      except RuntimeError:
+        LOGGER.exception( 'Failed to detail Python candidates' )
+        details = [ None ] * len( completions )
+    else:
+      with self._jedi_lock:
+        details = [ jedi_operations.DetailCompletion( completion )
+                    for completion in completions ]
+
+    for candidate, detail in zip( candidates_to_detail, details ):
+      # The worker may no longer have the completion.
+      candidate.update( detail or { 'extra_data': {} } )
     return candidates
 
 
   def GetSubcommandsMap( self ):
     return {
       'GoTo'           : ( lambda self, request_data, args:
-                           self._GoToDefinition( request_data ) ),
+                           self._RunJediOperation( request_data,
+                                                   'GoToDefinition' ) ),
       'GoToDefinition' : ( lambda self, request_data, args:
-                           self._GoToDefinition( request_data ) ),
+                           self._RunJediOperation( request_data,
+                                                   'GoToDefinition' ) ),
       'GoToDeclaration': ( lambda self, request_data, args:
-                           self._GoToDefinition( request_data ) ),
+                           self._RunJediOperation( request_data,
+                                                   'GoToDefinition' ) ),
       'GoToReferences' : ( lambda self, request_data, args:
-                           self._GoToReferences( request_data ) ),
+                           self._RunJediOperation( request_data,
+                                                   'GoToReferences' ) ),
       'GoToSymbol'     : ( lambda self, request_data, args:
                            self._GoToSymbol( request_data, args ) ),
       'GoToType'       : ( lambda self, request_data, args:
-                           self._GoToType( request_data ) ),
+                           self._RunJediOperation( request_data,
+                                                   'GoToType' ) ),
       'GetType'        : ( lambda self, request_data, args:
-                           self._GetType( request_data ) ),
+                           self._RunJediOperation( request_data,
+                                                   'GetType' ) ),
       'GetDoc'         : ( lambda self, request_data, args:
-                           self._GetDoc( request_data ) ),
+                           self._RunJediOperation( request_data,
+                                                   'GetDoc' ) ),
       'RefactorRename' : ( lambda self, request_data, args:
-                           self._RefactorRename( request_data, args ) ),
+                           self._RunRefactoringWithNewName( request_data,
+                                                            'RefactorRename',
+                                                            args ) ),
       'RefactorInline' : ( lambda self, request_data, args:
-                           self._RefactorInline( request_data, args ) ),
+                           self._RunJediOperation( request_data,
+                                                   'RefactorInline' ) ),
       'RefactorExtractVariable' : ( lambda self, request_data, args:
-                                    self._RefactorExtractVariable( request_data,
-                                                                   args ) ),
+                                    self._RunRefactoringWithNewName(
+                                      request_data,
+                                      'RefactorExtractVariable',
+                                      args ) ),
       'RefactorExtractFunction' : ( lambda self, request_data, args:
-                                    self._RefactorExtractFunction( request_data,
-                                                                   args ) ),
+                                    self._RunRefactoringWithNewName(
+                                      request_data,
+                                      'RefactorExtractFunction',
+                                      args ) ),
     }
 
 
-  def _BuildGoToResponse( self, definitions, request_data ):
-    if len( definitions ) == 1:
-      definition = definitions[ 0 ]
-      column = 1
-      if all( x is None for x in [ definition.column,
-                                   definition.line,
-                                   definition.module_path ] ):
-        return None
-      if definition.column is not None:
-        column += definition.column
-      filepath = definition.module_path or request_data[ 'filepath' ]
-      return responses.BuildGoToResponse( filepath,
-                                          definition.line,
-                                          column,
-                                          definition.description )
-
-    gotos = []
-    for definition in definitions:
-      column = 1
-      if all( x is None for x in [ definition.column,
-                                   definition.line,
-                                   definition.module_path ] ):
-        continue
-      if definition.column is not None:
-        column += definition.column
-      filepath = definition.module_path or request_data[ 'filepath' ]
-      gotos.append( responses.BuildGoToResponse( filepath,
-                                                 definition.line,
-                                                 column,
-                                                 definition.description ) )
-    return gotos
-
-
-  def _GoToType( self, request_data ):
-    with self._jedi_lock:
-      line = request_data[ 'line_num' ]
-      # Jedi expects columns to start at 0, not 1, and for them to be Unicode
-      # codepoint offsets.
-      column = request_data[ 'start_codepoint' ] - 1
-      script = self._GetJediScript( request_data )
-      definitions = script.infer( line, column )
-      if definitions:
-        type_def = self._BuildGoToResponse( definitions, request_data )
-        if type_def is not None:
-          return type_def
-
-    raise RuntimeError( 'Can\'t jump to type definition.' )
-
-
-  def _GoToDefinition( self, request_data ):
-    with self._jedi_lock:
-      line = request_data[ 'line_num' ]
-      # Jedi expects columns to start at 0, not 1, and for them to be Unicode
-      # codepoint offsets.
-      column = request_data[ 'start_codepoint' ] - 1
-      script = self._GetJediScript( request_data )
-      definitions = script.goto( line, column )
-      if definitions:
-        definitions = self._BuildGoToResponse( definitions, request_data )
-        if definitions is not None:
-          return definitions
-
-    raise RuntimeError( 'Can\'t jump to definition.' )
-
-
-  def _GoToReferences( self, request_data ):
-    with self._jedi_lock:
-      line = request_data[ 'line_num' ]
-      # Jedi expects columns to start at 0, not 1, and for them to be Unicode
-      # codepoint offsets.
-      column = request_data[ 'start_codepoint' ] - 1
-      definitions = self._GetJediScript( request_data ).get_references( line,
-                                                                        column )
-      if definitions:
-        references = self._BuildGoToResponse( definitions, request_data )
-        if references is not None:
-          return references
-    raise RuntimeError( 'Can\'t find references.' )
-
-
   def _GoToSymbol( self, request_data, args ):
     if len( args ) < 1:
       raise RuntimeError( 'Must specify something to search for' )
@@ -398,145 +408,16 @@ class PythonCompleter( Completer ):
     if MAX_RESULTS < 0:
       MAX_RESULTS = 100
 
-    with self._jedi_lock:
-      environent = self._EnvironmentForRequest( request_data )
-      project = self._JediProjectForFile( request_data, environent )
-
-      definitions = list( itertools.islice( project.complete_search( query ),
-                                            MAX_RESULTS ) )
-      if definitions:
-        definitions = self._BuildGoToResponse( definitions, request_data )
-        if definitions is not None:
-          return definitions
-
-    raise RuntimeError( 'Symbol not found' )
-
-
-  # This method must be called under Jedi's lock.
-  def _BuildTypeInfo( self, definition ):
-    type_info = definition.description
-    # Jedi doesn't return the signature in the description. Build the signature
-    # from the params field.
-    try:
-      # Remove the "param " prefix from the description.
-      parameters = definition.get_signatures()[ 0 ].params
-      type_info += '(' + ', '.join(
-        [ param.description[ 6: ] for param in parameters ] ) + ')'
-    except IndexError:
-      pass
-    return type_info
+    return self._RunJediOperation( request_data,
+                                   'GoToSymbol',
+                                   ( query, MAX_RESULTS ) )
 
 
-  def _GetType( self, request_data ):
-    with self._jedi_lock:
-      line = request_data[ 'line_num' ]
-      # Jedi expects columns to start at 0, not 1, and for them to be Unicode
-      # codepoint offsets.
-      column = request_data[ 'start_codepoint' ] - 1
-      definitions = self._GetJediScript( request_data ).infer( line, column )
-      type_info = [ self._BuildTypeInfo( definition )
-                    for definition in definitions ]
-    type_info = ', '.join( type_info )
-    if type_info:
-      return responses.BuildDisplayMessageResponse( type_info )
-    raise RuntimeError( 'No type information available.' )
-
-
-  def _GetDoc( self, request_data ):
-    with self._jedi_lock:
-      line = request_data[ 'line_num' ]
-      # Jedi expects columns to start at 0, not 1, and for them to be Unicode
-      # codepoint offsets.
-      column = request_data[ 'start_codepoint' ] - 1
-      definitions = self._GetJediScript( request_data ).goto( line, column )
-      documentation = [
-        definition.docstring().strip() for definition in definitions ]
-    documentation = '\n---\n'.join( [ d for d in documentation if d ] )
-    if documentation:
-      return responses.BuildDetailedInfoResponse( documentation )
-    raise RuntimeError( 'No documentation available.' )
-
-
-  def _RefactorRename( self, request_data, args ):
+  def _RunRefactoringWithNewName( self, request_data, operation, args ):
     if len( args ) < 1:
       raise RuntimeError( 'Must specify a new name' )
 
-    new_name = args[ 0 ]
-    with self._jedi_lock:
-      refactoring = self._GetJediScript( request_data ).rename(
-        line = request_data[ 'line_num' ],
-        column = request_data[ 'column_codepoint' ] - 1,
-        new_name = new_name )
-
-      return responses.BuildFixItResponse( [
-        _RefactoringToFixIt( refactoring )
-      ] )
-
-  def _RefactorInline( self, request_data, args ):
-    with self._jedi_lock:
-      refactoring = self._GetJediScript( request_data ).inline(
-        line = request_data[ 'line_num' ],
-        column = request_data[ 'column_codepoint' ] - 1 )
-
-      return responses.BuildFixItResponse( [
-        _RefactoringToFixIt( refactoring )
-      ] )
-
-  def _RefactorExtractVariable( self, request_data, args ):
-    if len( args ) < 1:
-      raise RuntimeError( 'Must specify a new name' )
-
-    new_name = args[ 0 ]
-    if 'range' in request_data:
-      range_end = request_data[ 'range' ].get( 'end', {} )
-      until_line = range_end.get( 'line_num', None )
-      until_column = range_end.get( 'column_num', None )
-    else:
-      until_line = None
-      until_column = None
-
-    with self._jedi_lock:
-      refactoring = self._GetJediScript( request_data ).extract_variable(
-        line = request_data[ 'line_num' ],
-        column = request_data[ 'column_codepoint' ] - 1,
-        new_name = new_name,
-        until_line = until_line,
-        until_column = until_column )
-
-      return responses.BuildFixItResponse( [
-        _RefactoringToFixIt( refactoring )
-      ] )
-
-  def _RefactorExtractFunction( self, request_data, args ):
-    if len( args ) < 1:
-      raise RuntimeError( 'Must specify a new name' )
-
-    new_name = args[ 0 ]
-    if 'range' in request_data:
-      range_end = request_data[ 'range' ].get( 'end', {} )
-      until_line = range_end.get( 'line_num', None )
-      until_column = range_end.get( 'column_num', None )
-    else:
-      until_line = None
-      until_column = None
-
-    with self._jedi_lock:
-      refactoring = self._GetJediScript( request_data ).extract_function(
-        line = request_data[ 'line_num' ],
-        column = request_data[ 'column_codepoint' ] - 1,
-        new_name = new_name,
-        until_line = until_line,
-        until_column = until_column )
-
-      return responses.BuildFixItResponse( [
-        _RefactoringToFixIt( refactoring )
-      ] )
-
-  # Jedi has the following refactorings:
-  #  - rename (RefactorRename)
-  #  - inline variable
-  #  - extract variable (requires argument)
-  #  - extract function (requires argument)
+    return self._RunJediOperation( request_data, operation, ( args[ 0 ], ) )
 
 
   def DebugInfo( self, request_data ):
@@ -568,94 +449,35 @@ class PythonCompleter( Completer ):
       key = 'Parso version',
       value = parso.__version__ )
 
-    return responses.BuildDebugInfoResponse( name = 'Python',
-                                             items = [ python_interpreter,
-                                                       python_root,
-                                                       python_path,
-                                                       python_version,
-                                                       jedi_version,
-                                                       parso_version ] )
-
-
-def _RefactoringToFixIt( refactoring ):
-  """Converts a Jedi Refactoring instance to a single responses.FixIt."""
-
-  # FIXME: refactorings can rename files (apparently). ycmd API doesn't have any
-  # interface for that, so we just ignore them.
-  changes = refactoring.get_changed_files()
-  chunks = []
-
-  # We sort the files to ensure the tests are stable
-  for filename in sorted( changes.keys() ):
-    changed_file = changes[ filename ]
-
-    # NOTE: This is an internal API. We _could_ use GetFileContents( filename )
-    # here, but using Jedi's representation means that it is always consistent
-    # with get_new_code()
-    old_text = changed_file._module_node.get_code()
-    new_text = changed_file.get_new_code()
-
-    # Cache the offsets of all the newlines in the file. These are used to
-    # calculate the line/column values from the offsets retuned by the diff
-    # scanner
-    newlines = [ i for i, c in enumerate( old_text ) if c == '\n' ]
-    newlines.append( len( old_text ) )
-
-    sequence_matcher = difflib.SequenceMatcher( a = old_text,
-                                                b = new_text,
-                                                autojunk = False )
-
-    for ( operation,
-          old_start, old_end,
-          new_start, new_end ) in sequence_matcher.get_opcodes():
-      # Tag of equal means the range is identical, so nothing to do.
-      if operation == 'equal':
-        continue
-
-      # operation can be 'insert', 'replace' or 'delete', the offsets actually
-      # already cover that in our FixIt API (a delete has an empty new_text, an
-      # insert has an empty range), so we just encode the line/column offset and
-      # the replacement text extracted from new_text
-      chunks.append( responses.FixItChunk(
-        new_text[ new_start : new_end ],
-        responses.Range( *_OffsetToPosition( ( old_start, old_end ),
-                                             filename,
-                                             old_text,
-                                             newlines ) )
-      ) )
-
-  return responses.FixIt( responses.Location( 1, 1, 'none' ),
-                          chunks,
-                          '',
-                          kind = responses.FixIt.Kind.REFACTOR )
-
-
-def _OffsetToPosition( start_end, filename, text, newlines ):
-  """Convert the 0-based codepoint offset |offset| to a position (line/col) in
-  |text|. |filename| is the full path of the file containing |text| and
-  |newlines| is a cache of the 0-based character offsets of all the \n
-  characters in |text| (plus one extra). Returns responses.Position."""
-
-  loc = ()
-  for index, newline in enumerate( newlines ):
-    for offset in start_end[ len( loc ): ]:
-      if newline >= offset:
-        start_of_line = newlines[ index - 1 ] + 1 if index > 0 else 0
-        column = offset - start_of_line
-        line_value = text[ start_of_line : newline ]
-        loc += ( responses.Location( index + 1,
-                                     CodepointOffsetToByteOffset( line_value,
-                                                                  column + 1 ),
-                                     filename ), )
-    if len( loc ) == 2:
-      break
-  return loc
-
-  # Invalid position - it's outside of the text. Just return the last
-  # position in the text. This is an internal error.
-  LOGGER.error( "Invalid offset %s in file %s with text %s and newlines %s",
-                offset,
-                filename,
-                text,
-                newlines )
-  raise RuntimeError( "Invalid file offset in diff" )
+    items = [ python_interpreter,
+              python_root,
+              python_path,
+              python_version,
+              jedi_version,
+              parso_version ]
+    spec = self._JediWorkerSpec( request_data )
+    with self._warm_up_lock:
+      items.extend( [
+        responses.DebugInfoItem(
+          key = 'Jedi warmed up modules',
+          value = str( len( self._warmed_up_modules.get( spec, () ) ) ) ),
+        responses.DebugInfoItem(
+          key = 'Jedi modules to warm up',
+          value = str( self._modules_to_warm_up ) ),
+        responses.DebugInfoItem(
+          key = 'Jedi module being warmed up',
+          value = self._module_being_warmed_up ) ] )
+
+    if self._jedi_workers:
+      items.extend( self._jedi_workers.DebugInfoItems() )
+
+    return responses.BuildDebugInfoResponse( name = 'Python', items = items )
+
+
+  def Shutdown( self ):
+    with self._warm_up_lock:
+      if self._warm_up_thread is not None:
+        self._warm_up_queue.put( None )
+
+    if self._jedi_workers:
+      self._jedi_workers.Shutdown()
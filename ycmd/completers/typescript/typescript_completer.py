@@ -18,14 +18,13 @@
 import json
 import logging
 import os
+import queue
 import subprocess
 import itertools
 import threading
 from collections import defaultdict
 from functools import partial
 
-from tempfile import NamedTemporaryFile
-
 from ycmd import extra_conf_store
 from ycmd import responses
 from ycmd import utils
@@ -38,12 +37,24 @@ NO_DIAGNOSTIC_MESSAGE = 'No diagnostic for current line!'
 
 RESPONSE_TIMEOUT_SECONDS = 20
 
+MAX_QUEUED_MESSAGES = 50
+
+# The events sent by TSServer with the diagnostics of a file in response to a
+# geterr request, in the order their diagnostics are reported.
+DIAGNOSTICS_EVENTS = [ 'semanticDiag', 'syntaxDiag' ]
+
 TSSERVER_DIR = os.path.abspath(
   os.path.join( os.path.dirname( __file__ ), '..', '..', '..', 'third_party',
                 'tsserver' ) )
 
 LOGFILE_FORMAT = 'tsserver_'
 
+# TSServer splits lines on these characters too and counts offsets in UTF-16
+# code units. The position of a change is only computed when the text before it
+# contains none of them; otherwise the whole file is sent again.
+UNSUPPORTED_CHANGE_POSITION_REGEX = re.compile(
+  '[\r\u2028\u2029\U00010000-\U0010FFFF]' )
+
 
 class DeferredResponse:
   """
@@ -171,10 +182,28 @@ class TypeScriptCompleter( Completer ):
     # the pending response dictionary
     self._pending_lock = threading.Lock()
 
-    self._StartServer()
-
+    # Diagnostics are requested with geterr, which doesn't block TSServer: it
+    # sends them later as events, which are turned into messages for the client.
+    # _latest_diagnostics_for_file_lock protects the diagnostics state below.
     self._latest_diagnostics_for_file_lock = threading.Lock()
     self._latest_diagnostics_for_file = defaultdict( list )
+    # ( sequence id, filepath -> lines of the file when it was sent ) of the
+    # outstanding geterr request, or None.
+    self._diagnostics_request = None
+    # filepath -> event name -> diagnostics received for the last geterr
+    # request.
+    self._received_ts_diagnostics = defaultdict( dict )
+    self._diagnostics_messages = queue.Queue( maxsize = MAX_QUEUED_MESSAGES )
+    # The error codes for which TSServer may have code fixes.
+    self._supported_code_fixes = set()
+
+    # The contents of the files as known by TSServer. Each file is opened with
+    # its contents and then only the changed part is sent. The lock is held
+    # while the changes are written so that they reach TSServer in order.
+    self._file_contents_lock = threading.Lock()
+    self._file_contents = {}
+
+    self._StartServer()
 
     # There's something in the API that lists the trigger characters, but
     # there is no way to request that from the server, so we just hard-code
@@ -188,6 +217,15 @@ class TypeScriptCompleter( Completer ):
     with self._tsserver_lock:
       self._tsserver_version = version
 
+    try:
+      supported_code_fixes = self._SendRequest( 'getSupportedCodeFixes' )
+    except RuntimeError:
+      LOGGER.exception( 'Unable to get the error codes with code fixes' )
+      return
+    with self._latest_diagnostics_for_file_lock:
+      self._supported_code_fixes = {
+        int( code ) for code in supported_code_fixes }
+
     # TODO: We should probably make this configurable in ycm_extra_conf.py along
     # with all the other preferences
     self._SendCommand( 'configure',  {
@@ -258,11 +296,9 @@ class TypeScriptCompleter( Completer ):
           self._tsserver_is_running.clear()
         continue
 
-      # We ignore events for now since we don't have a use for them.
       msgtype = message[ 'type' ]
       if msgtype == 'event':
-        eventname = message[ 'event' ]
-        LOGGER.info( 'Received %s event from TSServer',  eventname )
+        self._HandleEvent( message )
         continue
       if msgtype != 'response':
         LOGGER.error( 'Unsupported message type', msgtype )
@@ -275,6 +311,123 @@ class TypeScriptCompleter( Completer ):
           del self._pending[ seq ]
 
 
+  def _HandleEvent( self, message ):
+    eventname = message[ 'event' ]
+    if eventname in DIAGNOSTICS_EVENTS:
+      body = message[ 'body' ]
+      with self._latest_diagnostics_for_file_lock:
+        self._received_ts_diagnostics[ body[ 'file' ] ][ eventname ] = [
+          _EventDiagnosticToTsDiagnostic( diagnostic )
+          for diagnostic in body[ 'diagnostics' ] ]
+      return
+
+    if eventname == 'requestCompleted':
+      self._PublishDiagnostics( message[ 'body' ][ 'request_seq' ] )
+      return
+
+    # We ignore the other events since we don't have a use for them.
+    LOGGER.info( 'Received %s event from TSServer', eventname )
+
+
+  def _RequestDiagnostics( self, request_data ):
+    """Sends a geterr request for the current file. A geterr request cancels the
+    previous one, so the files of the outstanding request, whose diagnostics
+    have not all been received, are requested again with the current file."""
+    filepath = request_data[ 'filepath' ]
+    with self._latest_diagnostics_for_file_lock:
+      files = ( dict( self._diagnostics_request[ 1 ] )
+                if self._diagnostics_request else {} )
+      files[ filepath ] = GetFileLines( request_data, filepath )
+      request = self._BuildRequest( 'geterr', {
+        'files': list( files ),
+        'delay': 0
+      } )
+      self._diagnostics_request = ( request[ 'seq' ], files )
+      for requested_filepath in files:
+        self._received_ts_diagnostics.pop( requested_filepath, None )
+      # Written with the lock held so that TSServer receives the geterr
+      # requests in the order they are recorded.
+      self._WriteRequest( request )
+
+
+  def _PublishDiagnostics( self, seq ):
+    """Turns the diagnostics received for the geterr request |seq| into a
+    message for each of its files. Only the outstanding request is published: a
+    request cancelled by a later one has incomplete diagnostics, and its files
+    are part of the later request."""
+    with self._latest_diagnostics_for_file_lock:
+      if not self._diagnostics_request or self._diagnostics_request[ 0 ] != seq:
+        return
+      files = self._diagnostics_request[ 1 ]
+      self._diagnostics_request = None
+
+      messages = []
+      for filepath, lines in files.items():
+        received_ts_diagnostics = self._received_ts_diagnostics.pop( filepath,
+                                                                     {} )
+        ts_diagnostics = list( itertools.chain.from_iterable(
+          received_ts_diagnostics.get( eventname, [] )
+          for eventname in DIAGNOSTICS_EVENTS ) )
+        diagnostics = [
+          _TsDiagnosticToYcmdDiagnostic( filepath,
+                                         lines,
+                                         ts_diagnostic,
+                                         self._CodeFixesPlaceholder(
+                                           ts_diagnostic ) )
+          for ts_diagnostic in ts_diagnostics ]
+        self._latest_diagnostics_for_file[ filepath ] = diagnostics
+        messages.append( {
+          'diagnostics': responses.BuildDiagnosticResponse(
+            diagnostics, filepath, self.max_diagnostics_to_display ),
+          'filepath': filepath
+        } )
+
+    for message in messages:
+      self._PostMessage( message )
+
+
+  # This method must be called with the diagnostics lock held.
+  def _CodeFixesPlaceholder( self, ts_diagnostic ):
+    # The code fixes are only requested when the user asks for them with the
+    # FixIt command. Until then, a placeholder tells the client that some may be
+    # available.
+    if ts_diagnostic[ 'code' ] in self._supported_code_fixes:
+      return [ responses.UnresolvedFixIt( None, 'FixIt' ) ]
+    return []
+
+
+  def _PostMessage( self, message ):
+    while True:
+      try:
+        self._diagnostics_messages.put_nowait( message )
+        return
+      except queue.Full:
+        pass
+
+      # Nobody is polling for messages; discard the oldest one and try again.
+      try:
+        self._diagnostics_messages.get_nowait()
+      except queue.Empty: # pragma: no cover
+        pass
+
+
+  def PollForMessagesInner( self, request_data, timeout ):
+    messages = []
+    try:
+      while True:
+        messages.append( self._diagnostics_messages.get_nowait() )
+    except queue.Empty:
+      pass
+
+    if messages:
+      return messages
+
+    try:
+      return [ self._diagnostics_messages.get( timeout = timeout ) ]
+    except queue.Empty:
+      return True
+
+
   def _ReadMessage( self ):
     """Read a response message from TSServer."""
 
@@ -365,7 +518,7 @@ class TypeScriptCompleter( Completer ):
     return deferred.result()
 
 
-  def _Reload( self, request_data ):
+  def _SynchronizeFile( self, request_data ):
     """
     Synchronize TSServer's view of the file to
     the contents of the unsaved buffer.
@@ -373,14 +526,25 @@ class TypeScriptCompleter( Completer ):
 
     filename = request_data[ 'filepath' ]
     contents = request_data[ 'file_data' ][ filename ][ 'contents' ]
-    tmpfile = NamedTemporaryFile( delete = False )
-    tmpfile.write( utils.ToBytes( contents ) )
-    tmpfile.close()
-    self._SendRequest( 'reload', {
-      'file':    filename,
-      'tmpfile': tmpfile.name
-    } )
-    utils.RemoveIfExists( tmpfile.name )
+    with self._file_contents_lock:
+      if self._file_contents.get( filename ) == contents:
+        return
+
+      # If the command can't be written, the whole file is sent next time.
+      previous_contents = self._file_contents.pop( filename, None )
+      change = ( _ComputeChange( previous_contents, contents )
+                 if previous_contents is not None else None )
+      # TSServer doesn't respond to these commands and processes the requests
+      # in order, so there is no need to wait.
+      if change is None:
+        self._SendCommand( 'open', {
+          'file':        filename,
+          'fileContent': contents
+        } )
+      else:
+        change[ 'file' ] = filename
+        self._SendCommand( 'change', change )
+      self._file_contents[ filename ] = contents
 
 
   def _ServerIsRunning( self ):
@@ -404,7 +568,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def ComputeCandidatesInner( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     entries = self._SendRequest( 'completionInfo', {
       'file':                         request_data[ 'filepath' ],
       'line':                         request_data[ 'line_num' ],
@@ -502,17 +666,18 @@ class TypeScriptCompleter( Completer ):
 
 
   def OnBufferVisit( self, request_data ):
-    filename = request_data[ 'filepath' ]
-    self._SendCommand( 'open', { 'file': filename } )
+    self._SynchronizeFile( request_data )
 
 
   def OnBufferUnload( self, request_data ):
     filename = request_data[ 'filepath' ]
-    self._SendCommand( 'close', { 'file': filename } )
+    with self._file_contents_lock:
+      self._file_contents.pop( filename, None )
+      self._SendCommand( 'close', { 'file': filename } )
 
 
   def ComputeInlayHints( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
 
     # Cache the offsets of all the newlines in the file. These are used to
     # calculate the line/column values from the offsets retuned by the diff
@@ -562,12 +727,17 @@ class TypeScriptCompleter( Completer ):
   def OnFileReadyToParse( self, request_data ):
     # Only load the extra conf. We don't need it for anything but Format.
     extra_conf_store.ModuleFileForSourceFile( request_data[ 'filepath' ] )
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
+    self._RequestDiagnostics( request_data )
 
-    diagnostics = self.GetDiagnosticsForCurrentFile( request_data )
+    # The diagnostics for the current contents are sent through
+    # PollForMessages. Return the latest ones we have in the meantime, like the
+    # language server completers do.
     filepath = request_data[ 'filepath' ]
     with self._latest_diagnostics_for_file_lock:
-      self._latest_diagnostics_for_file[ filepath ] = diagnostics
+      if filepath not in self._latest_diagnostics_for_file:
+        return None
+      diagnostics = list( self._latest_diagnostics_for_file[ filepath ] )
     return responses.BuildDiagnosticResponse( diagnostics,
                                               filepath,
                                               self.max_diagnostics_to_display )
@@ -587,7 +757,7 @@ class TypeScriptCompleter( Completer ):
     return ts_diagnostics
 
 
-  def _TsDiagnosticToYcmdDiagnostic( self, request_data, ts_diagnostic ):
+  def _GetCodeFixes( self, request_data, ts_diagnostic ):
     filepath = request_data[ 'filepath' ]
 
     ts_fixes = self._SendRequest( 'getCodeFixes', {
@@ -616,39 +786,21 @@ class TypeScriptCompleter( Completer ):
                                                       fix[ 'changes' ] ),
                                description )
       fixits.append( fixit )
-
-    contents = GetFileLines( request_data, filepath )
-
-    ts_start_location = ts_diagnostic[ 'startLocation' ]
-    ts_start_line = ts_start_location[ 'line' ]
-    start_offset = utils.CodepointOffsetToByteOffset(
-      contents[ ts_start_line - 1 ],
-      ts_start_location[ 'offset' ] )
-
-    ts_end_location = ts_diagnostic[ 'endLocation' ]
-    ts_end_line = ts_end_location[ 'line' ]
-    end_offset = utils.CodepointOffsetToByteOffset(
-      contents[ ts_end_line - 1 ],
-      ts_end_location[ 'offset' ] )
-
-    location_start = responses.Location( ts_start_line, start_offset, filepath )
-    location_end = responses.Location( ts_end_line, end_offset, filepath )
-
-    location_extent = responses.Range( location_start, location_end )
-
-    return responses.Diagnostic( [ location_extent ],
-                                 location_start,
-                                 location_extent,
-                                 ts_diagnostic[ 'message' ],
-                                 'ERROR',
-                                 fixits = fixits )
+    return fixits
 
 
   def GetDiagnosticsForCurrentFile( self, request_data ):
     ts_diagnostics = self.GetTsDiagnosticsForCurrentFile( request_data )
+    filepath = request_data[ 'filepath' ]
+    lines = GetFileLines( request_data, filepath )
 
-    return [ self._TsDiagnosticToYcmdDiagnostic( request_data, x )
-             for x in ts_diagnostics ]
+    with self._latest_diagnostics_for_file_lock:
+      return [ _TsDiagnosticToYcmdDiagnostic(
+                 filepath,
+                 lines,
+                 ts_diagnostic,
+                 self._CodeFixesPlaceholder( ts_diagnostic ) )
+               for ts_diagnostic in ts_diagnostics ]
 
 
   def GetDetailedDiagnostic( self, request_data ):
@@ -681,15 +833,12 @@ class TypeScriptCompleter( Completer ):
         distance_to_closest_ts_diagnostic = distance
         closest_ts_diagnostic = ts_diagnostic
 
-    closest_diagnostic = self._TsDiagnosticToYcmdDiagnostic(
-      request_data,
-      closest_ts_diagnostic )
-
-    return responses.BuildDisplayMessageResponse( closest_diagnostic.text_ )
+    return responses.BuildDisplayMessageResponse(
+      closest_ts_diagnostic[ 'message' ] )
 
 
   def ComputeSignaturesInner( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     try:
       items = self._SendRequest( 'signatureHelp', {
         'file': request_data[ 'filepath' ],
@@ -757,7 +906,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _InitialHierarchy( self, request_data, args ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     response = self._SendRequest( 'prepareCallHierarchy', {
       'file': request_data[ 'filepath' ],
       'line': request_data[ 'line_num' ],
@@ -787,7 +936,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _CallHierarchy( self, request_data, args ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
 
     response = self._SendRequest( f'provideCallHierarchy{ args[ 0 ] }Calls', {
       'file':   request_data[ 'filepath' ],
@@ -866,7 +1015,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _GoToDefinition( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     filespans = self._SendRequest( 'definition', {
       'file':   request_data[ 'filepath' ],
       'line':   request_data[ 'line_num' ],
@@ -885,7 +1034,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _GoToImplementation( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     try:
       filespans = self._SendRequest( 'implementation', {
         'file':   request_data[ 'filepath' ],
@@ -908,7 +1057,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _GoToReferences( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     response = self._SendRequest( 'references', {
       'file':   request_data[ 'filepath' ],
       'line':   request_data[ 'line_num' ],
@@ -926,7 +1075,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _GoToType( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     try:
       filespans = self._SendRequest( 'typeDefinition', {
         'file':   request_data[ 'filepath' ],
@@ -952,7 +1101,7 @@ class TypeScriptCompleter( Completer ):
       raise RuntimeError( 'Must specify something to search for' )
     query = args[ 0 ]
 
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     filespans = self._SendRequest( 'navto', {
       'searchValue': query,
       'file': request_data[ 'filepath' ]
@@ -978,7 +1127,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _GetType( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     info = self._SendRequest( 'quickinfo', {
       'file':   request_data[ 'filepath' ],
       'line':   request_data[ 'line_num' ],
@@ -988,7 +1137,7 @@ class TypeScriptCompleter( Completer ):
 
 
   def _GetDoc( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
     info = self._SendRequest( 'quickinfo', {
       'file':   request_data[ 'filepath' ],
       'line':   request_data[ 'line_num' ],
@@ -1005,24 +1154,23 @@ class TypeScriptCompleter( Completer ):
 
 
   def _FixIt( self, request_data, args ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
 
-    filepath = request_data[ 'filepath' ]
     line_num = request_data[ 'line_num' ]
 
+    # The code fixes are only requested for the diagnostics on the current line.
     fixits = []
-    with self._latest_diagnostics_for_file_lock:
-      for diagnostic in self._latest_diagnostics_for_file[ filepath ]:
-        if diagnostic.location_.line_number_ != line_num:
-          continue
+    for ts_diagnostic in self.GetTsDiagnosticsForCurrentFile( request_data ):
+      if ts_diagnostic[ 'startLocation' ][ 'line' ] != line_num:
+        continue
 
-        fixits.extend( diagnostic.fixits_ )
+      fixits.extend( self._GetCodeFixes( request_data, ts_diagnostic ) )
 
     return responses.BuildFixItResponse( fixits )
 
 
   def _OrganizeImports( self, request_data ):
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
 
     filepath = request_data[ 'filepath' ]
     changes = self._SendRequest( 'organizeImports', {
@@ -1048,7 +1196,7 @@ class TypeScriptCompleter( Completer ):
       raise ValueError( 'Please specify a new name to rename it to.\n'
                         'Usage: RefactorRename <new name>' )
 
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
 
     response = self._SendRequest( 'rename', {
       'file':   request_data[ 'filepath' ],
@@ -1106,7 +1254,7 @@ class TypeScriptCompleter( Completer ):
   def _Format( self, request_data ):
     filepath = request_data[ 'filepath' ]
 
-    self._Reload( request_data )
+    self._SynchronizeFile( request_data )
 
     # TODO: support all formatting options. See
     # https://github.com/Microsoft/TypeScript/blob/72e92a055823f1ade97d03d7526dbab8be405dde/lib/protocol.d.ts#L2060-L2077
@@ -1177,7 +1325,12 @@ class TypeScriptCompleter( Completer ):
   def _CleanUp( self ):
     utils.CloseStandardStreams( self._tsserver_handle )
     self._tsserver_handle = None
-    self._latest_diagnostics_for_file = defaultdict( list )
+    with self._latest_diagnostics_for_file_lock:
+      self._latest_diagnostics_for_file = defaultdict( list )
+      self._diagnostics_request = None
+      self._received_ts_diagnostics = defaultdict( dict )
+    with self._file_contents_lock:
+      self._file_contents.clear()
     if not self.user_options[ 'server_keep_logfiles' ] and self._logfile:
       utils.RemoveIfExists( self._logfile )
       self._logfile = None
@@ -1202,6 +1355,44 @@ class TypeScriptCompleter( Completer ):
                                                servers = [ tsserver ] )
 
 
+def _EventDiagnosticToTsDiagnostic( diagnostic ):
+  """Converts a diagnostic sent in a geterr event to the format returned by
+  the requests for the diagnostics of a file."""
+  return {
+    'startLocation': diagnostic[ 'start' ],
+    'endLocation':   diagnostic[ 'end' ],
+    'message':       diagnostic[ 'text' ],
+    'code':          diagnostic[ 'code' ],
+    'category':      diagnostic[ 'category' ]
+  }
+
+
+def _TsDiagnosticToYcmdDiagnostic( filepath, lines, ts_diagnostic, fixits ):
+  ts_start_location = ts_diagnostic[ 'startLocation' ]
+  ts_start_line = ts_start_location[ 'line' ]
+  start_offset = utils.CodepointOffsetToByteOffset(
+    lines[ ts_start_line - 1 ],
+    ts_start_location[ 'offset' ] )
+
+  ts_end_location = ts_diagnostic[ 'endLocation' ]
+  ts_end_line = ts_end_location[ 'line' ]
+  end_offset = utils.CodepointOffsetToByteOffset(
+    lines[ ts_end_line - 1 ],
+    ts_end_location[ 'offset' ] )
+
+  location_start = responses.Location( ts_start_line, start_offset, filepath )
+  location_end = responses.Location( ts_end_line, end_offset, filepath )
+
+  location_extent = responses.Range( location_start, location_end )
+
+  return responses.Diagnostic( [ location_extent ],
+                               location_start,
+                               location_extent,
+                               ts_diagnostic[ 'message' ],
+                               'ERROR',
+                               fixits = fixits )
+
+
 def _LogLevel():
   return 'verbose' if LOGGER.isEnabledFor( logging.DEBUG ) else 'normal'
 
@@ -1346,6 +1537,95 @@ def _BuildTsFormatRange( request_data ):
   }
 
 
+# Size of the blocks compared when looking for the changed part of a file.
+# Comparing slices is much faster than comparing the characters one by one in
+# Python.
+CHANGE_BLOCK_SIZE = 4096
+
+
+def _CommonPrefixLength( first, second, max_length ):
+  length = 0
+  while length < max_length:
+    block_end = min( length + CHANGE_BLOCK_SIZE, max_length )
+    if first[ length : block_end ] != second[ length : block_end ]:
+      break
+    length = block_end
+  else:
+    return max_length
+
+  # The difference is in this block.
+  low = length
+  high = min( length + CHANGE_BLOCK_SIZE, max_length )
+  while low < high:
+    middle = ( low + high + 1 ) // 2
+    if first[ length : middle ] == second[ length : middle ]:
+      low = middle
+    else:
+      high = middle - 1
+  return low
+
+
+def _CommonSuffixLength( first, second, max_length ):
+  first_end = len( first )
+  second_end = len( second )
+  length = 0
+  while length < max_length:
+    block_end = min( length + CHANGE_BLOCK_SIZE, max_length )
+    if ( first[ first_end - block_end : first_end - length ] !=
+         second[ second_end - block_end : second_end - length ] ):
+      break
+    length = block_end
+  else:
+    return max_length
+
+  low = length
+  high = min( length + CHANGE_BLOCK_SIZE, max_length )
+  while low < high:
+    middle = ( low + high + 1 ) // 2
+    if ( first[ first_end - middle : first_end - length ] ==
+         second[ second_end - middle : second_end - length ] ):
+      low = middle
+    else:
+      high = middle - 1
+  return low
+
+
+def _LineAndOffset( contents, index ):
+  line = contents.count( '\n', 0, index ) + 1
+  offset = index - contents.rfind( '\n', 0, index )
+  return line, offset
+
+
+def _ComputeChange( old_contents, new_contents ):
+  """Returns the arguments of the TSServer change command that turns
+  |old_contents| into |new_contents|, or None if the position of the change
+  can't be computed."""
+  max_length = min( len( old_contents ), len( new_contents ) )
+  start = _CommonPrefixLength( old_contents, new_contents, max_length )
+  suffix_length = _CommonSuffixLength( old_contents,
+                                       new_contents,
+                                       max_length - start )
+  old_end = len( old_contents ) - suffix_length
+  new_end = len( new_contents ) - suffix_length
+
+  # Searching the regex is slow, so it is only done on non-ASCII text.
+  text_before_change = old_contents[ : old_end ]
+  if ( '\r' in text_before_change or
+       ( not text_before_change.isascii() and
+         UNSUPPORTED_CHANGE_POSITION_REGEX.search( text_before_change ) ) ):
+    return None
+
+  line, offset = _LineAndOffset( old_contents, start )
+  end_line, end_offset = _LineAndOffset( old_contents, old_end )
+  return {
+    'line':         line,
+    'offset':       offset,
+    'endLine':      end_line,
+    'endOffset':    end_offset,
+    'insertString': new_contents[ start : new_end ]
+  }
+
+
 def _DisplayPartsToString( parts ):
   return ''.join( [ p[ 'text' ] for p in parts ] )
 
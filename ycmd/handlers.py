@@ -18,12 +18,19 @@
 import json
 import platform
 import sys
+import threading
 import time
 import traceback
 
 
 import ycmd.web_plumbing
-from ycmd import extra_conf_store, hmac_plugin, server_state, user_options_store
+from ycmd import ( extra_conf_store,
+                   hmac_plugin,
+                   metrics,
+                   profiler,
+                   server_state,
+                   tracing,
+                   user_options_store )
 from ycmd.responses import ( BuildExceptionResponse,
                              BuildCompletionResponse,
                              BuildResolveCompletionResponse,
@@ -34,6 +41,8 @@ from ycmd.responses import ( BuildExceptionResponse,
                              SignatureHelpAvailalability,
                              UnknownExtraConf )
 from ycmd.request_wrap import RequestWrap
+from ycmd.scheduler import Priority, RequestSuperseded
+from ycmd.completers.completer import MESSAGE_POLL_TIMEOUT
 from ycmd.completers.completer_utils import FilterAndSortCandidatesWrap
 from ycmd.utils import LOGGER, StartThread, ImportCore
 ycm_core = ImportCore()
@@ -43,22 +52,54 @@ _server_state = None
 _hmac_secret = bytes()
 app = ycmd.web_plumbing.AppProducer()
 wsgi_server = None
+# Set when the server is shutting down, so that message streams end instead of
+# holding the server open.
+_shutting_down = threading.Event()
 
 
 @app.post( '/event_notification' )
 def EventNotification( request, response ):
-  request_data = RequestWrap( request.json )
+  with tracing.Span( 'RequestWrap' ):
+    request_data = RequestWrap( request.json )
   event_name = request_data[ 'event_name' ]
   LOGGER.debug( 'Event name: %s', event_name )
 
-  event_handler = 'On' + event_name
-  getattr( _server_state.GetGeneralCompleter(), event_handler )( request_data )
+  _server_state.StartLanguageServersInBackground( request_data )
+
+  filepath = request_data[ 'filepath' ]
+  file_ready_to_parse = event_name == 'FileReadyToParse'
+  # The events of a file are run one at a time, in the order they are received.
+  # Only the latest contents of a file are parsed when several FileReadyToParse
+  # events for this file are waiting. The others get the latest diagnostics.
+  supersede_key = filepath if file_ready_to_parse else None
+  delay = ( _server_state.user_options[ 'file_ready_to_parse_debounce_ms' ] /
+            1000 if file_ready_to_parse else 0 )
 
-  filetypes = request_data[ 'filetypes' ]
-  response_data = None
-  if _server_state.FiletypeCompletionUsable( filetypes ):
-    response_data = getattr( _server_state.GetFiletypeCompleter( filetypes ),
-                             event_handler )( request_data )
+  event_handler = 'On' + event_name
+  try:
+    with _server_state.ScheduledForRequest( request_data,
+                                            Priority.EVENT,
+                                            supersede_key,
+                                            delay,
+                                            serialize_key = filepath ):
+      getattr( _server_state.GetGeneralCompleter(), event_handler )(
+        request_data )
+
+      filetypes = request_data[ 'filetypes' ]
+      response_data = None
+      if _server_state.FiletypeCompletionUsable( filetypes ):
+        response_data = getattr(
+          _server_state.GetFiletypeCompleter( filetypes ),
+          event_handler )( request_data )
+  except RequestSuperseded:
+    _CountFileReadyToParse( request_data, 'superseded' )
+    response_data = _server_state.GetLatestDiagnostics( filepath )
+  else:
+    if file_ready_to_parse:
+      _CountFileReadyToParse( request_data, 'parsed' )
+      _server_state.SetLatestDiagnostics( filepath, response_data )
+    elif event_name == 'BufferUnload':
+      _server_state.SetLatestDiagnostics( filepath, None )
 
   if response_data:
     return _JsonResponse( response_data, response )
@@ -86,9 +127,10 @@ def RunCompleterCommand( request, response ):
   request_data = RequestWrap( request.json )
   completer = _GetCompleterForRequestData( request_data )
 
-  return _JsonResponse( completer.OnUserCommand(
-      request_data[ 'command_arguments' ],
-      request_data ), response )
+  with _server_state.Scheduled( completer, Priority.BACKGROUND ):
+    return _JsonResponse( completer.OnUserCommand(
+        request_data[ 'command_arguments' ],
+        request_data ), response )
 
 
 @app.post( '/resolve_fixit' )
@@ -96,44 +138,51 @@ def ResolveFixit( request, response ):
   request_data = RequestWrap( request.json )
   completer = _GetCompleterForRequestData( request_data )
 
-  return _JsonResponse( completer.ResolveFixit( request_data ), response )
+  with _server_state.Scheduled( completer, Priority.BACKGROUND ):
+    return _JsonResponse( completer.ResolveFixit( request_data ), response )
 
 
 @app.post( '/completions' )
 def GetCompletions( request, response ):
-  request_data = RequestWrap( request.json )
-  do_filetype_completion = _server_state.ShouldUseFiletypeCompleter(
-    request_data )
-  LOGGER.debug( 'Using filetype completion: %s', do_filetype_completion )
-
-  errors = None
-  completions = None
-
-  if do_filetype_completion:
-    try:
-      filetype_completer = _server_state.GetFiletypeCompleter(
-        request_data[ 'filetypes' ] )
-      completions = filetype_completer.ComputeCandidates( request_data )
-    except Exception as exception:
-      if request_data[ 'force_semantic' ]:
-        # user explicitly asked for semantic completion, so just pass the error
-        # back
-        raise
-
-      # store the error to be returned with results from the identifier
-      # completer
-      LOGGER.exception( 'Exception from semantic completer (using general)' )
-      stack = traceback.format_exc()
-      errors = [ BuildExceptionResponse( exception, stack ) ]
-
-  if not completions and not request_data[ 'force_semantic' ]:
-    completions = _server_state.GetGeneralCompleter().ComputeCandidates(
+  with tracing.Span( 'RequestWrap' ):
+    request_data = RequestWrap( request.json )
+  with _server_state.ScheduledForRequest( request_data,
+                                          Priority.INTERACTIVE ):
+    do_filetype_completion = _server_state.ShouldUseFiletypeCompleter(
       request_data )
-
-  return _JsonResponse(
-      BuildCompletionResponse( completions if completions else [],
-                               request_data[ 'start_column' ],
-                               errors = errors ), response )
+    LOGGER.debug( 'Using filetype completion: %s', do_filetype_completion )
+
+    errors = None
+    completions = None
+
+    if do_filetype_completion:
+      try:
+        filetype_completer = _server_state.GetFiletypeCompleter(
+          request_data[ 'filetypes' ] )
+        with tracing.Span( 'SemanticCompletion' ):
+          completions = filetype_completer.ComputeCandidates( request_data )
+      except Exception as exception:
+        if request_data[ 'force_semantic' ]:
+          # user explicitly asked for semantic completion, so just pass the
+          # error back
+          raise
+
+        # store the error to be returned with results from the identifier
+        # completer
+        LOGGER.exception( 'Exception from semantic completer (using general)' )
+        stack = traceback.format_exc()
+        errors = [ BuildExceptionResponse( exception, stack ) ]
+
+    if not completions and not request_data[ 'force_semantic' ]:
+      with tracing.Span( 'GeneralCompletion' ):
+        completions = _server_state.GetGeneralCompleter().ComputeCandidates(
+          request_data )
+
+  with tracing.Span( 'BuildCompletionResponse' ):
+    return _JsonResponse(
+        BuildCompletionResponse( completions if completions else [],
+                                 request_data[ 'start_column' ],
+                                 errors = errors ), response )
 
 
 @app.post( '/resolve_completion' )
@@ -144,7 +193,8 @@ def ResolveCompletionItem( request, response ):
   errors = None
   completion = None
   try:
-    completion = completer.ResolveCompletionItem( request_data )
+    with _server_state.Scheduled( completer, Priority.INTERACTIVE ):
+      completion = completer.ResolveCompletionItem( request_data )
   except Exception as e:
     errors = [ BuildExceptionResponse( e, traceback.format_exc() ) ]
 
@@ -166,7 +216,8 @@ def GetSignatureHelp( request, response ):
   try:
     filetype_completer = _server_state.GetFiletypeCompleter(
       request_data[ 'filetypes' ] )
-    signature_info = filetype_completer.ComputeSignatures( request_data )
+    with _server_state.Scheduled( filetype_completer, Priority.INTERACTIVE ):
+      signature_info = filetype_completer.ComputeSignatures( request_data )
   except Exception as exception:
     LOGGER.exception( 'Exception from semantic completer during sig help' )
     errors = [ BuildExceptionResponse( exception, traceback.format_exc() ) ]
@@ -192,7 +243,8 @@ def GetSemanticTokens( request, response ):
   try:
     filetype_completer = _server_state.GetFiletypeCompleter(
       request_data[ 'filetypes' ] )
-    semantic_tokens = filetype_completer.ComputeSemanticTokens( request_data )
+    with _server_state.Scheduled( filetype_completer, Priority.BACKGROUND ):
+      semantic_tokens = filetype_completer.ComputeSemanticTokens( request_data )
   except Exception as exception:
     LOGGER.exception(
       'Exception from semantic completer during tokens request' )
@@ -220,7 +272,8 @@ def GetInlayHints( request, response ):
   try:
     filetype_completer = _server_state.GetFiletypeCompleter(
       request_data[ 'filetypes' ] )
-    inlay_hints = filetype_completer.ComputeInlayHints( request_data )
+    with _server_state.Scheduled( filetype_completer, Priority.BACKGROUND ):
+      inlay_hints = filetype_completer.ComputeInlayHints( request_data )
   except Exception as exception:
     LOGGER.exception(
       'Exception from semantic completer during tokens request' )
@@ -281,8 +334,9 @@ def GetDetailedDiagnostic( request, response ):
   request_data = RequestWrap( request.json )
   completer = _GetCompleterForRequestData( request_data )
 
-  return _JsonResponse( completer.GetDetailedDiagnostic( request_data ),
-                        response )
+  with _server_state.Scheduled( completer, Priority.BACKGROUND ):
+    return _JsonResponse( completer.GetDetailedDiagnostic( request_data ),
+                          response )
 
 
 @app.post( '/load_extra_conf_file' )
@@ -341,6 +395,48 @@ def DebugInfo( request, response ):
   return _JsonResponse( result, response )
 
 
+@app.get( '/memory_usage' )
+def GetMemoryUsage( request, response ):
+  memory_usage = _server_state.MemoryUsage()
+  memory_usage[ 'repositories' ] = {
+    name: { 'entries': entries, 'bytes': size }
+    for name, ( entries, size ) in ycm_core.RepositoriesMemoryUsage().items()
+  }
+  return _JsonResponse( memory_usage, response )
+
+
+@app.post( '/trim_caches' )
+def TrimCaches( request, response ):
+  _server_state.TrimCaches()
+  return _JsonResponse( True, response )
+
+
+@app.get( '/metrics' )
+def Metrics( request, response ):
+  response.set_header( 'Content-Type', 'text/plain; version=0.0.4' )
+  return metrics.REGISTRY.Render()
+
+
+@app.get( '/trace' )
+def GetTrace( request, response ):
+  return _JsonResponse( tracing.ChromeTraceEvents(), response )
+
+
+@app.post( '/profiler/start' )
+def StartProfiler( request, response ):
+  sampling_interval_ms = request.json.get(
+    'sampling_interval_ms',
+    _server_state.user_options[ 'profiler_sampling_interval_ms' ] )
+  profiler.Start( sampling_interval_ms / 1000 )
+  return _JsonResponse( True, response )
+
+
+@app.post( '/profiler/stop' )
+def StopProfiler( request, response ):
+  return _JsonResponse( profiler.Stop( request.json.get( 'filepath' ) ),
+                        response )
+
+
 @app.post( '/shutdown' )
 def Shutdown( request, response ):
   ServerShutdown()
@@ -364,6 +460,64 @@ def ReceiveMessages( request, response ):
   return _JsonResponse( completer.PollForMessages( request_data ), response )
 
 
+@app.post( '/message_stream' )
+def MessageStream( request, response ):
+  # Message stream is the streaming counterpart of receive_messages. The
+  # messages are pushed to the client as server-sent events over a single
+  # response that stays open until polling should stop. Messages arriving
+  # within message_stream_batch_window_ms of each other are sent as one event.
+  request_data = RequestWrap( request.json )
+  try:
+    completer = _GetCompleterForRequestData( request_data )
+  except Exception:
+    # No semantic completer for this filetype, don't requery. This is not an
+    # error.
+    return _JsonResponse( False, response )
+
+  batch_window = (
+    _server_state.user_options[ 'message_stream_batch_window_ms' ] / 1000 )
+  return ycmd.web_plumbing.EventStream(
+    _StreamMessages( completer, request_data, batch_window ) )
+
+
+def _StreamMessages( completer, request_data, batch_window ):
+  """Yields a ( 'messages', list of messages ) event for each batch of messages
+  received from |completer|, a heartbeat when no message was received for
+  MESSAGE_POLL_TIMEOUT seconds, and a final ( 'done', false ) event when polling
+  should stop."""
+  try:
+    while not _shutting_down.is_set():
+      messages = completer.PollForMessagesInner( request_data,
+                                                 MESSAGE_POLL_TIMEOUT )
+      if messages is True:
+        yield None, None
+        continue
+      if not messages:
+        break
+
+      messages = list( messages )
+      more_messages = True
+      deadline = time.monotonic() + batch_window
+      while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+          break
+        more_messages = completer.PollForMessagesInner( request_data,
+                                                        remaining )
+        if not isinstance( more_messages, list ):
+          break
+        messages.extend( more_messages )
+
+      yield 'messages', json.dumps( messages,
+                                    separators = ( ',', ':' ),
+                                    default = _UniversalSerialize )
+      if more_messages is False:
+        break
+  except Exception:
+    LOGGER.exception( 'Error while streaming messages' )
+  yield 'done', json.dumps( False )
+
+
 def ErrorHandler( httperror : ycmd.web_plumbing.HTTPError,
                   response : ycmd.web_plumbing.Response ):
   body = _JsonResponse( BuildExceptionResponse( httperror.exception,
@@ -393,6 +547,12 @@ def _UniversalSerialize( obj ):
     return str( obj )
 
 
+def _CountFileReadyToParse( request_data, outcome ):
+  metrics.IncrementCounter( 'ycmd_file_ready_to_parse_total',
+                            ( ( 'filetype', request_data[ 'first_filetype' ] ),
+                              ( 'outcome', outcome ) ) )
+
+
 def _GetCompleterForRequestData( request_data ):
   completer_target = request_data.get( 'completer_target', None )
 
@@ -405,6 +565,8 @@ def _GetCompleterForRequestData( request_data ):
 
 
 def ServerShutdown():
+  _shutting_down.set()
+
   def Terminator():
     if wsgi_server:
       wsgi_server.shutdown()
@@ -418,6 +580,9 @@ def ServerCleanup():
   if _server_state:
     _server_state.Shutdown()
     extra_conf_store.Shutdown()
+    trace_file = _server_state.user_options.get( 'tracing_trace_file' )
+    if tracing.IsEnabled() and trace_file:
+      tracing.WriteChromeTrace( trace_file )
 
 
 def SetHmacSecret( hmac_secret ):
@@ -434,7 +599,12 @@ def UpdateUserOptions( options ):
   # This should never be passed in, but let's try to remove it just in case.
   options.pop( 'hmac_secret', None )
   user_options_store.SetAll( options )
+  metrics.SetEnabled( options.get( 'enable_metrics' ) )
+  tracing.Configure( options )
   _server_state = server_state.ServerState( options )
+  _server_state.PrewarmLanguageServers()
+  # A previous server may have been shut down in the same process.
+  _shutting_down.clear()
 
 
 def KeepSubserversAlive( check_interval_seconds ):
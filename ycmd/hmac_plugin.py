@@ -20,7 +20,7 @@ from hmac import compare_digest
 from urllib.parse import urlparse
 from ycmd import hmac_utils
 from ycmd.utils import LOGGER, ToBytes, ToUnicode
-from ycmd.web_plumbing import abort
+from ycmd.web_plumbing import abort, EventStream
 
 HTTP_UNAUTHORIZED = 401
 
@@ -37,6 +37,11 @@ _HOST_HEADER = 'host'
 # The x-ycm-hmac value is encoded as base64 during transport instead of sent raw
 # because https://tools.ietf.org/html/rfc5987 says header values must be in the
 # ISO-8859-1 character set.
+#
+# Event streams are sent before their content is known, so each of their events
+# carries in an hmac field the HMAC of its name and data joined by a newline,
+# so that an event can't be passed off as another one, and the header holds the
+# HMAC of an empty body.
 class HmacPlugin:
   name = 'hmac'
   api = 2
@@ -62,11 +67,19 @@ class HmacPlugin:
         abort( HTTP_UNAUTHORIZED, 'Unauthorized, received bad HMAC.' )
         return
       body = callback( request, response )
-      SetHmacHeader( body, self._hmac_secret, response )
+      if isinstance( body, EventStream ):
+        body.AddField( 'hmac', self._EventHmac )
+        SetHmacHeader( '', self._hmac_secret, response )
+      else:
+        SetHmacHeader( body, self._hmac_secret, response )
       return body
     return wrapper
 
 
+  def _EventHmac( self, event, data ):
+    return _Base64Hmac( f'{ event }\n{ data }', self._hmac_secret )
+
+
 def HostHeaderCorrect( request ):
   host = urlparse( 'http://' + request.headers[ _HOST_HEADER ] ).hostname
   return host == '127.0.0.1' or host == 'localhost'
@@ -85,7 +98,11 @@ def RequestAuthenticated( method, path, body, headers, hmac_secret ):
       ToBytes( b64decode( headers[ _HMAC_HEADER ] ) ) )
 
 
-def SetHmacHeader( body, hmac_secret, response ):
-  value = b64encode( hmac_utils.CreateHmac( ToBytes( body ),
+def _Base64Hmac( content, hmac_secret ):
+  value = b64encode( hmac_utils.CreateHmac( ToBytes( content ),
                                             ToBytes( hmac_secret ) ) )
-  response.set_header( _HMAC_HEADER, ToUnicode( value ) )
+  return ToUnicode( value )
+
+
+def SetHmacHeader( body, hmac_secret, response ):
+  response.set_header( _HMAC_HEADER, _Base64Hmac( body, hmac_secret ) )
@@ -0,0 +1,201 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""In-process metrics exposed in the Prometheus text format on /metrics.
+
+Metrics are only recorded when enabled with the 'enable_metrics' option. When
+disabled, recording a metric costs a single check of a module-level flag."""
+
+import bisect
+import contextlib
+import threading
+import time
+
+# Upper bounds of the buckets of the latency histograms, in seconds.
+LATENCY_BUCKETS = ( 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                    1.0, 2.5, 5.0, 10.0 )
+
+# Upper bounds of the buckets of the size histograms, in bytes.
+SIZE_BUCKETS = ( 128, 512, 2048, 8192, 32768, 131072, 524288, 2097152,
+                 8388608 )
+
+_enabled = False
+
+
+def SetEnabled( enabled ):
+  global _enabled
+  _enabled = bool( enabled )
+
+
+def IsEnabled():
+  return _enabled
+
+
+class Histogram:
+  def __init__( self, buckets ):
+    self.buckets = buckets
+    # The last count is for the values above the largest bucket.
+    self.counts = [ 0 ] * ( len( buckets ) + 1 )
+    self.count = 0
+    self.total = 0
+
+
+  def Observe( self, value ):
+    self.counts[ bisect.bisect_left( self.buckets, value ) ] += 1
+    self.count += 1
+    self.total += value
+
+
+class Registry:
+  """Thread-safe store of the histograms and counters, each identified by a
+  metric name and a tuple of ( label, value ) pairs."""
+
+  def __init__( self ):
+    self._lock = threading.Lock()
+    self._histograms = {}
+    self._counters = {}
+    self._help = {}
+
+
+  def Describe( self, name, help_text ):
+    with self._lock:
+      self._help[ name ] = help_text
+
+
+  def Observe( self, name, labels, value, buckets = LATENCY_BUCKETS ):
+    key = ( name, labels )
+    with self._lock:
+      histogram = self._histograms.get( key )
+      if histogram is None:
+        histogram = self._histograms[ key ] = Histogram( buckets )
+      histogram.Observe( value )
+
+
+  def Increment( self, name, labels, value = 1 ):
+    key = ( name, labels )
+    with self._lock:
+      self._counters[ key ] = self._counters.get( key, 0 ) + value
+
+
+  def Clear( self ):
+    with self._lock:
+      self._histograms.clear()
+      self._counters.clear()
+
+
+  def Render( self ):
+    """Returns all metrics in the Prometheus text exposition format."""
+    lines = []
+    with self._lock:
+      for name in sorted( { name for name, _ in self._histograms } ):
+        self._RenderHeader( lines, name, 'histogram' )
+        for ( metric, labels ), histogram in sorted(
+            self._histograms.items() ):
+          if metric != name:
+            continue
+          cumulative = 0
+          for bound, count in zip( histogram.buckets + ( '+Inf', ),
+                                   histogram.counts ):
+            cumulative += count
+            bucket_labels = labels + ( ( 'le', str( bound ) ), )
+            lines.append( f'{ name }_bucket{ _Labels( bucket_labels ) } '
+                          f'{ cumulative }' )
+          lines.append( f'{ name }_sum{ _Labels( labels ) } '
+                        f'{ histogram.total }' )
+          lines.append( f'{ name }_count{ _Labels( labels ) } '
+                        f'{ histogram.count }' )
+
+      for name in sorted( { name for name, _ in self._counters } ):
+        self._RenderHeader( lines, name, 'counter' )
+        for ( metric, labels ), value in sorted( self._counters.items() ):
+          if metric == name:
+            lines.append( f'{ name }{ _Labels( labels ) } { value }' )
+
+    return ''.join( line + '\n' for line in lines )
+
+
+  def _RenderHeader( self, lines, name, metric_type ):
+    if name in self._help:
+      lines.append( f'# HELP { name } { self._help[ name ] }' )
+    lines.append( f'# TYPE { name } { metric_type }' )
+
+
+def _EscapeLabelValue( value ):
+  return ( str( value ).replace( '\\', '\\\\' )
+                       .replace( '"', '\\"' )
+                       .replace( '\n', '\\n' ) )
+
+
+def _Labels( labels ):
+  if not labels:
+    return ''
+  return '{' + ','.join( f'{ label }="{ _EscapeLabelValue( value ) }"'
+                         for label, value in labels ) + '}'
+
+
+REGISTRY = Registry()
+REGISTRY.Describe( 'ycmd_request_duration_seconds',
+                   'Time spent handling HTTP requests, by route.' )
+REGISTRY.Describe( 'ycmd_request_size_bytes',
+                   'Size of the HTTP request bodies, by route.' )
+REGISTRY.Describe( 'ycmd_response_size_bytes',
+                   'Size of the HTTP response bodies, by route.' )
+REGISTRY.Describe( 'ycmd_request_errors_total',
+                   'Number of HTTP requests that failed, by route and status.' )
+REGISTRY.Describe( 'ycmd_completer_duration_seconds',
+                   'Time spent in the stages of semantic completion, by '
+                   'completer and stage.' )
+REGISTRY.Describe( 'ycmd_language_server_request_duration_seconds',
+                   'Round trip time of the requests to language servers, by '
+                   'method.' )
+REGISTRY.Describe( 'ycmd_scheduler_wait_seconds',
+                   'Time spent by requests waiting for more urgent requests, '
+                   'by completer and priority.' )
+REGISTRY.Describe( 'ycmd_file_ready_to_parse_total',
+                   'Number of FileReadyToParse events, by filetype and by '
+                   'whether the file was parsed or the event superseded by a '
+                   'newer one.' )
+
+
+def ObserveLatency( name, labels, seconds ):
+  if _enabled:
+    REGISTRY.Observe( name, labels, seconds )
+
+
+def ObserveSize( name, labels, size ):
+  if _enabled:
+    REGISTRY.Observe( name, labels, size, SIZE_BUCKETS )
+
+
+def IncrementCounter( name, labels, value = 1 ):
+  if _enabled:
+    REGISTRY.Increment( name, labels, value )
+
+
+@contextlib.contextmanager
+def Timer( name, labels ):
+  """Context manager recording the time spent in its block in the latency
+  histogram |name| with the |labels| tuple of ( label, value ) pairs."""
+  if not _enabled:
+    yield
+    return
+
+  start_time = time.perf_counter()
+  try:
+    yield
+  finally:
+    REGISTRY.Observe( name, labels, time.perf_counter() - start_time )
@@ -0,0 +1,62 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+from ycmd import metrics
+from ycmd.web_plumbing import EventStream, HTTPError
+
+
+# This class implements the Bottle plugin API:
+# http://bottlepy.org/docs/dev/plugindev.html
+#
+# Every route handler is decorated so that the latency of each request, the
+# sizes of its body and of the response, and its failures are recorded per
+# route in the metrics registry, to be exposed on /metrics. The plugin is only
+# installed when metrics are enabled.
+class MetricsPlugin:
+  name = 'metrics'
+  api = 2
+
+  def __call__( self, callback ):
+    def wrapper( request, response ):
+      labels = ( ( 'route', request.path ), )
+      start_time = time.perf_counter()
+      try:
+        body = callback( request, response )
+      except HTTPError as error:
+        metrics.IncrementCounter(
+          'ycmd_request_errors_total',
+          labels + ( ( 'status', str( error.status ) ), ) )
+        raise
+      except Exception:
+        metrics.IncrementCounter( 'ycmd_request_errors_total',
+                                  labels + ( ( 'status', '500' ), ) )
+        raise
+      finally:
+        metrics.ObserveLatency( 'ycmd_request_duration_seconds',
+                                labels,
+                                time.perf_counter() - start_time )
+        metrics.ObserveSize( 'ycmd_request_size_bytes',
+                             labels,
+                             request.content_length )
+
+      # Responses are JSON serialized with ASCII escapes, so their length is
+      # their size in bytes. The size of event streams is not known up front.
+      if not isinstance( body, EventStream ):
+        metrics.ObserveSize( 'ycmd_response_size_bytes', labels, len( body ) )
+      return body
+    return wrapper
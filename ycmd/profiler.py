@@ -0,0 +1,122 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""In-process sampling profiler.
+
+While it runs, the stacks of all the threads are sampled at a regular interval
+with sys._current_frames. When it is stopped, the samples are written in the
+collapsed stack format read by flamegraph.pl, speedscope and similar tools: one
+line per distinct stack, with the frames from the thread to the innermost
+function separated by semicolons and followed by the number of samples."""
+
+import collections
+import os
+import sys
+import tempfile
+import threading
+from ycmd.utils import LOGGER, StartThread
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+class _Sampler:
+  def __init__( self, sampling_interval ):
+    self.sampling_interval = sampling_interval
+    self.number_of_samples = 0
+    self.stacks = collections.Counter()
+    self._stop_event = threading.Event()
+    self._thread = StartThread( self._Run )
+
+
+  def _Run( self ):
+    sampler_thread_id = threading.get_ident()
+    while not self._stop_event.wait( self.sampling_interval ):
+      thread_names = { thread.ident: thread.name
+                       for thread in threading.enumerate() }
+      for thread_id, frame in sys._current_frames().items():
+        if thread_id != sampler_thread_id:
+          self.stacks[ _CollapseStack(
+            thread_names.get( thread_id, str( thread_id ) ), frame ) ] += 1
+      self.number_of_samples += 1
+
+
+  def Stop( self ):
+    self._stop_event.set()
+    self._thread.join()
+
+
+def _CollapseStack( thread_name, frame ):
+  frames = []
+  while frame is not None:
+    code = frame.f_code
+    frames.append( f'{ code.co_name } '
+                   f'({ code.co_filename }:{ code.co_firstlineno })' )
+    frame = frame.f_back
+  frames.append( thread_name )
+  # Semicolons separate the frames.
+  return ';'.join( name.replace( ';', ',' ) for name in reversed( frames ) )
+
+
+def IsRunning():
+  return _sampler is not None
+
+
+def Start( sampling_interval ):
+  """Starts sampling the stacks of all the threads every |sampling_interval|
+  seconds."""
+  global _sampler
+  if sampling_interval <= 0:
+    raise ValueError( 'The sampling interval must be positive.' )
+  with _sampler_lock:
+    if _sampler is not None:
+      raise RuntimeError( 'The profiler is already running.' )
+    LOGGER.info( 'Starting the profiler with a sampling interval of %sms',
+                 sampling_interval * 1000 )
+    _sampler = _Sampler( sampling_interval )
+
+
+def _OpenProfileFile( filepath ):
+  if filepath:
+    return open( filepath, 'w', encoding = 'utf-8' ), filepath
+  fd, filepath = tempfile.mkstemp( prefix = f'ycmd_profile_{ os.getpid() }_',
+                                   suffix = '.folded' )
+  return open( fd, 'w', encoding = 'utf-8' ), filepath
+
+
+def Stop( filepath = None ):
+  """Stops the profiler and writes the collapsed stacks to |filepath|, or to a
+  new file in the temporary directory if not given. Returns the path of the
+  file and the number of samples. If the file can't be opened, the profiler
+  keeps running."""
+  global _sampler
+  with _sampler_lock:
+    if _sampler is None:
+      raise RuntimeError( 'The profiler is not running.' )
+    profile_file, filepath = _OpenProfileFile( filepath )
+    sampler = _sampler
+    _sampler = None
+  sampler.Stop()
+
+  with profile_file:
+    for stack, count in sampler.stacks.most_common():
+      profile_file.write( f'{ stack } { count }\n' )
+
+  LOGGER.info( 'Wrote %s profiler samples to %s',
+               sampler.number_of_samples,
+               filepath )
+  return { 'filepath': filepath, 'samples': sampler.number_of_samples }
@@ -0,0 +1,220 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Scheduling of the requests handled by a completer.
+
+The requests are split into three priority classes: interactive requests
+(completions and signature help) run as soon as they arrive; event
+notifications wait until no interactive request is running for the same
+completer; commands, diagnostics, semantic tokens and inlay hints also wait for
+the queued and running events. Since a completer serializes most of its work on
+its own locks, this lets the interactive requests skip ahead of the background
+work queued for the same completer instead of waiting behind it.
+
+Events are run one at a time for each file, the key they are serialized on.
+The events of different files don't wait for each other, so that a slow parse
+of a file doesn't hold back the events of the others, even when they share the
+general completer.
+
+A queued request that waited for more than the maximum delay stops waiting for
+the more urgent requests, so that a steady stream of completions can't starve
+the events.
+
+Queued requests can also be given a supersede key: such a request is cancelled
+if a newer request with the same key arrives before it starts running. This is
+used to only parse the latest contents of a file when several FileReadyToParse
+events are received in a short time."""
+
+import contextlib
+import enum
+import threading
+import time
+from collections import Counter, deque
+
+from ycmd import metrics, tracing
+
+
+class Priority( enum.IntEnum ):
+  """Priority classes of the requests, from the most to the least urgent."""
+  INTERACTIVE = 0
+  EVENT = 1
+  BACKGROUND = 2
+
+
+# Maximum number of requests of each priority class and serialize key running
+# at the same time for a completer. Interactive requests are not limited.
+# Running the events of a file one at a time also keeps them in the order they
+# were received.
+MAX_CONCURRENT_REQUESTS = {
+  Priority.EVENT: 1,
+  Priority.BACKGROUND: 2
+}
+
+
+
+class RequestSuperseded( Exception ):
+  """Raised when a queued request is superseded by a newer request with the
+  same supersede key."""
+  pass
+
+
+class _Ticket:
+  """A queued request."""
+  __slots__ = ( 'serialize_key', )
+
+  def __init__( self, serialize_key ):
+    self.serialize_key = serialize_key
+
+
+class Scheduler:
+  """Orders the requests handled by a single completer. Requests of the same
+  class run in the order they arrive."""
+
+  def __init__( self, name, max_delay ):
+    self._name = name
+    self._max_delay = max_delay
+    self._condition = threading.Condition()
+    self._running = { priority: 0 for priority in Priority }
+    # ( priority, serialize key ) -> number of running requests.
+    self._running_by_key = Counter()
+    self._queues = { priority: deque() for priority in MAX_CONCURRENT_REQUESTS }
+    # supersede key -> ticket of the newest request not yet running with this
+    # key.
+    self._latest_tickets = {}
+
+
+  @contextlib.contextmanager
+  def Run( self,
+           priority,
+           supersede_key = None,
+           delay = 0,
+           serialize_key = None ):
+    """Context manager running its block once a request of |priority| is
+    allowed to run. A request that is not interactive waits at least |delay|
+    seconds before being queued and raises RequestSuperseded if a newer request
+    with the same |supersede_key| arrives before it starts running. Only the
+    requests of the same class and |serialize_key| share the limit of
+    MAX_CONCURRENT_REQUESTS and run in the order they arrive."""
+    key = ( priority, serialize_key )
+    if priority == Priority.INTERACTIVE:
+      with self._condition:
+        self._running[ priority ] += 1
+        self._running_by_key[ key ] += 1
+    else:
+      self._WaitForTurn( priority, supersede_key, delay, serialize_key )
+
+    try:
+      yield
+    finally:
+      with self._condition:
+        self._running[ priority ] -= 1
+        self._running_by_key[ key ] -= 1
+        if not self._running_by_key[ key ]:
+          del self._running_by_key[ key ]
+        self._condition.notify_all()
+
+
+  def QueueLengths( self ):
+    with self._condition:
+      return { priority.name.lower(): len( queue )
+               for priority, queue in self._queues.items() }
+
+
+  def _WaitForTurn( self, priority, supersede_key, delay, serialize_key ):
+    ticket = _Ticket( serialize_key )
+    arrival_time = time.monotonic()
+    with self._condition:
+      if supersede_key is not None:
+        self._latest_tickets[ supersede_key ] = ticket
+        # Wake up the request being superseded.
+        self._condition.notify_all()
+
+      def Superseded():
+        return ( supersede_key is not None and
+                 self._latest_tickets.get( supersede_key ) is not ticket )
+
+      queue = self._queues[ priority ]
+      delay_end = arrival_time + delay
+      deadline = None
+
+      # Returns whether the request can stop waiting and, if not, how long to
+      # wait at most before checking again. The clock is only read once so that
+      # both answers agree.
+      def Poll():
+        nonlocal deadline
+        if Superseded():
+          return True, None
+        now = time.monotonic()
+        if now < delay_end:
+          return False, delay_end - now
+        if deadline is None:
+          queue.append( ticket )
+          deadline = now + self._max_delay
+        if self._CanRun( ticket, priority, deadline, now ):
+          return True, None
+        return False, deadline - now if deadline > now else None
+
+      try:
+        ready, timeout = Poll()
+        if not ready:
+          with tracing.Span( 'SchedulerWait' ):
+            while not ready:
+              self._condition.wait( timeout )
+              ready, timeout = Poll()
+
+        if Superseded():
+          raise RequestSuperseded
+
+        queue.remove( ticket )
+        self._running[ priority ] += 1
+        self._running_by_key[ priority, serialize_key ] += 1
+        # The next request of the same class may be allowed to run as well.
+        self._condition.notify_all()
+      finally:
+        if ( supersede_key is not None and
+             self._latest_tickets.get( supersede_key ) is ticket ):
+          del self._latest_tickets[ supersede_key ]
+        if ticket in queue:
+          queue.remove( ticket )
+          # The next request may be allowed to run now.
+          self._condition.notify_all()
+
+    metrics.ObserveLatency( 'ycmd_scheduler_wait_seconds',
+                            ( ( 'completer', self._name ),
+                              ( 'priority', priority.name.lower() ) ),
+                            time.monotonic() - arrival_time )
+
+
+  # Must be called under the lock.
+  def _CanRun( self, ticket, priority, deadline, now ):
+    key = ( priority, ticket.serialize_key )
+    if self._running_by_key[ key ] >= MAX_CONCURRENT_REQUESTS[ priority ]:
+      return False
+
+    # The requests with the same serialize key run in the order they arrive.
+    for queued_ticket in self._queues[ priority ]:
+      if queued_ticket is ticket:
+        break
+      if queued_ticket.serialize_key == ticket.serialize_key:
+        return False
+
+    if now >= deadline:
+      return True
+
+    return not any( self._running[ more_urgent ] or
+                    self._queues.get( more_urgent )
+                    for more_urgent in Priority if more_urgent < priority )
@@ -17,10 +17,25 @@
 
 import threading
 from importlib import import_module
+from pathlib import Path
 from ycmd.completers.general.general_completer_store import (
     GeneralCompleterStore )
 from ycmd.completers.language_server import generic_lsp_completer
-from ycmd.utils import LOGGER
+from ycmd.completers.language_server.language_server_completer import (
+    LanguageServerCompleter )
+from ycmd.request_wrap import RequestWrap
+from ycmd.scheduler import Scheduler
+from ycmd.utils import LOGGER, PathsToAllParentFolders, StartThread
+
+# Filetypes of the built-in language server completers started in the
+# background when their project root files are found.
+PROJECT_ROOT_FILETYPES = [ 'go', 'java', 'rust' ]
+
+# Filetypes of the built-in language server completers that may start their
+# server when ycmd starts, and the options enabling this.
+PREWARM_OPTIONS = {
+  'java': 'java_jdtls_prewarm',
+}
 
 
 def _GetGenericLSPCompleter( user_options, filetype ):
@@ -37,12 +52,41 @@ def _GetGenericLSPCompleter( user_options, filetype ):
   return None
 
 
+def _RequestForFile( request_data, filepath ):
+  """Returns a copy of |request_data| for the beginning of |filepath|."""
+  request = {
+    'filepath': filepath,
+    'line_num': 1,
+    'column_num': 1,
+    'file_data': request_data[ 'file_data' ],
+    'extra_conf_data': dict( request_data[ 'extra_conf_data' ] ),
+  }
+  if 'working_dir' in request_data:
+    request[ 'working_dir' ] = request_data[ 'working_dir' ]
+  return RequestWrap( request )
+
+
+def _ProjectRootFileExists( completer, filepath ):
+  project_root_files = completer.GetProjectRootFiles()
+  for folder in PathsToAllParentFolders( filepath ):
+    for root_file in project_root_files:
+      if next( Path( folder ).glob( root_file ), None ):
+        return True
+  return False
+
+
 class ServerState:
   def __init__( self, user_options ):
     self._user_options = user_options
     self._filetype_completers = {}
     self._filetype_completers_lock = threading.Lock()
     self._gencomp = GeneralCompleterStore( self._user_options )
+    self._language_servers_started = False
+    self._language_servers_started_lock = threading.Lock()
+    self._schedulers = {}
+    self._schedulers_lock = threading.Lock()
+    self._latest_diagnostics = {}
+    self._latest_diagnostics_lock = threading.Lock()
 
 
   @property
@@ -97,12 +141,174 @@ class ServerState:
       f'No semantic completer exists for filetypes: { current_filetypes }' )
 
 
+  def StartLanguageServersInBackground( self, request_data ):
+    """On the first call only, starts concurrently in the background the
+    language servers likely to be needed: those of the filetypes in the file
+    data of |request_data| and those whose project root files are found in a
+    parent folder of the current file. The servers of the current filetypes are
+    left to OnFileReadyToParse."""
+    if not self._user_options[ 'language_server_background_startup' ]:
+      return
+
+    with self._language_servers_started_lock:
+      if self._language_servers_started:
+        return
+      self._language_servers_started = True
+
+    StartThread( self._StartLanguageServers, request_data )
+
+
+  def PrewarmLanguageServers( self ):
+    """Lets the language server completers for which prewarming is enabled
+    start their server in the background for a recently used project."""
+    if not any( self._user_options.get( option )
+                for option in PREWARM_OPTIONS.values() ):
+      return
+    StartThread( self._PrewarmLanguageServers )
+
+
+  def _PrewarmLanguageServers( self ):
+    for filetype, option in PREWARM_OPTIONS.items():
+      if ( not self._user_options.get( option ) or
+           not self.CurrentFiletypeCompletionEnabled( [ filetype ] ) ):
+        continue
+      try:
+        completer = self._GetFiletypeCompleterForFiletype( filetype )
+        if isinstance( completer, LanguageServerCompleter ):
+          completer.Prewarm()
+      except Exception:
+        LOGGER.exception( 'Unable to prewarm the language server for filetype '
+                          '%s', filetype )
+
+
+  def _StartLanguageServers( self, request_data ):
+    try:
+      current_completer = self.GetFiletypeCompleter(
+        request_data[ 'filetypes' ] )
+    except ValueError:
+      current_completer = None
+
+    # ( filetype, request, whether a project root file must be found )
+    candidates = []
+    for filepath, file_data in request_data[ 'file_data' ].items():
+      if filepath != request_data[ 'filepath' ]:
+        request = _RequestForFile( request_data, filepath )
+        candidates.extend( ( filetype, request, False )
+                           for filetype in file_data[ 'filetypes' ] )
+    configured_filetypes = PROJECT_ROOT_FILETYPES + [
+      filetype for server_settings in self._user_options[ 'language_server' ]
+      for filetype in server_settings[ 'filetypes' ] ]
+    candidates.extend( ( filetype, request_data, True )
+                       for filetype in configured_filetypes )
+
+    started_completers = set()
+    for filetype, request, needs_project_root_file in candidates:
+      if not self.CurrentFiletypeCompletionEnabled( [ filetype ] ):
+        continue
+      try:
+        completer = self._GetFiletypeCompleterForFiletype( filetype )
+        if ( not isinstance( completer, LanguageServerCompleter ) or
+             completer is current_completer or
+             completer in started_completers ):
+          continue
+        if ( needs_project_root_file and
+             not _ProjectRootFileExists( completer,
+                                         request_data[ 'filepath' ] ) ):
+          continue
+        started_completers.add( completer )
+        if completer.StartServerInBackground( request ):
+          LOGGER.info( 'Starting %s in the background for filetype %s',
+                       completer.GetServerName(),
+                       filetype )
+      except Exception:
+        LOGGER.exception( 'Unable to start the language server for filetype '
+                          '%s in the background', filetype )
+
+
+  def Scheduled( self,
+                 completer,
+                 priority,
+                 supersede_key = None,
+                 delay = 0,
+                 serialize_key = None ):
+    """Returns a context manager running its block once the scheduler of
+    |completer| allows a request of |priority| to run. See Scheduler.Run for
+    |supersede_key|, |delay| and |serialize_key|."""
+    with self._schedulers_lock:
+      scheduler = self._schedulers.get( completer )
+      if scheduler is None:
+        scheduler = Scheduler(
+          type( completer ).__name__,
+          self._user_options[ 'request_scheduler_max_delay_ms' ] / 1000 )
+        self._schedulers[ completer ] = scheduler
+    return scheduler.Run( priority, supersede_key, delay, serialize_key )
+
+
+  def ScheduledForRequest( self,
+                           request_data,
+                           priority,
+                           supersede_key = None,
+                           delay = 0,
+                           serialize_key = None ):
+    """Same as Scheduled for the completer used by |request_data|: the
+    filetype completer if it is usable, the general completer otherwise."""
+    filetypes = request_data[ 'filetypes' ]
+    if self.FiletypeCompletionUsable( filetypes, silent = True ):
+      completer = self.GetFiletypeCompleter( filetypes )
+    else:
+      completer = self._gencomp
+    return self.Scheduled( completer,
+                           priority,
+                           supersede_key,
+                           delay,
+                           serialize_key )
+
+
+  def SetLatestDiagnostics( self, filepath, diagnostics ):
+    """Stores the response to the last FileReadyToParse event processed for
+    |filepath|. It is returned to the events superseded by a newer one."""
+    with self._latest_diagnostics_lock:
+      if diagnostics is None:
+        self._latest_diagnostics.pop( filepath, None )
+      else:
+        self._latest_diagnostics[ filepath ] = diagnostics
+
+
+  def GetLatestDiagnostics( self, filepath ):
+    with self._latest_diagnostics_lock:
+      return self._latest_diagnostics.get( filepath )
+
+
   def GetLoadedFiletypeCompleters( self ):
     with self._filetype_completers_lock:
       return { completer for completer in
                self._filetype_completers.values() if completer }
 
 
+  def MemoryUsage( self ):
+    """Returns the memory usage of the general completers and of the loaded
+    filetype completers, keyed by the filetypes they are used for."""
+    with self._filetype_completers_lock:
+      filetypes_for_completer = {}
+      for filetype, completer in self._filetype_completers.items():
+        if completer:
+          filetypes_for_completer.setdefault( completer, [] ).append( filetype )
+
+    return {
+      'general_completers': self._gencomp.MemoryUsage(),
+      'filetype_completers': {
+        ','.join( sorted( filetypes ) ): completer.MemoryUsage()
+        for completer, filetypes in filetypes_for_completer.items()
+      }
+    }
+
+
+  def TrimCaches( self ):
+    self._gencomp.TrimCaches()
+    for completer in self.GetLoadedFiletypeCompleters():
+      completer.TrimCaches()
+
+
   def FiletypeCompletionAvailable( self, filetypes, silent = False ):
     """Returns True if there is a ycmd semantic completer defined for any
     filetype in the list |filetypes|. Otherwise, returns False and prints an
@@ -54,6 +54,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': 'Dead',
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': None,
@@ -95,6 +98,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': 'Initialized',
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile(),
@@ -138,6 +144,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': 'Initialized',
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'extra_conf' ),
@@ -182,6 +191,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': 'Initialized',
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'extra_conf' ),
@@ -228,6 +240,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': 'Initialized',
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile(),
@@ -275,6 +290,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': 'Initialized',
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'extra_conf' ),
@@ -328,6 +346,9 @@ class DebugInfoTest( TestCase ):
                   'key': 'Server State',
                   'value': 'Initialized',
                 } ),
+                has_entries( {
+                  'key': 'Time To First Semantic Completion',
+                } ),
                 has_entries( {
                   'key': 'Project Directory',
                   'value': tmp_dir,
@@ -389,6 +410,9 @@ def Settings( **kwargs ):
                     'key': 'Server State',
                     'value': 'Initialized',
                   } ),
+                  has_entries( {
+                    'key': 'Time To First Semantic Completion',
+                  } ),
                   has_entries( {
                     'key': 'Project Directory',
                     'value': tmp_dir,
@@ -447,6 +471,9 @@ def Settings( **kwargs ):
                   'key': 'Server State',
                   'value': 'Initialized',
                 } ),
+                has_entries( {
+                  'key': 'Time To First Semantic Completion',
+                } ),
                 has_entries( {
                   'key': 'Project Directory',
                   'value': tmp_dir,
@@ -491,6 +518,9 @@ def Settings( **kwargs ):
               'key': 'Server State',
               'value': 'Initialized',
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'extra_conf' ),
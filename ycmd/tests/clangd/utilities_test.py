@@ -17,13 +17,14 @@
 
 """This test is for utilities used in clangd."""
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from unittest import TestCase
-from hamcrest import assert_that, equal_to
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries
 from ycmd import handlers
 from ycmd.completers.cpp import clangd_completer
 from ycmd.completers.language_server.language_server_completer import (
     LanguageServerConnectionTimeout )
+from ycmd.request_wrap import RequestWrap
 from ycmd.tests.clangd import IsolatedYcmd, PathToTestFile
 from ycmd.tests.test_utils import BuildRequest
 from ycmd.user_options_store import DefaultOptions
@@ -248,3 +249,123 @@ class UtilitiesTest( TestCase ):
                        ) )
         assert_that( resp.status_code, equal_to( 200 ) )
         shutdown.assert_called()
+
+
+  def test_ClangdCompleter_SendFlagsFromExtraConf_Batched( self ):
+    class ExtraConf:
+      __file__ = '/extra_conf.py'
+      settings_calls = 0
+
+      @staticmethod
+      def Settings( **kwargs ):
+        ExtraConf.settings_calls += 1
+        return { 'flags': [ '-x', 'c++' ] }
+
+    completer = clangd_completer.ClangdCompleter( DefaultOptions() )
+    connection = MagicMock()
+    request_data = BuildRequest( filepath = '/foo.cc',
+                                 filetype = 'cpp',
+                                 contents = '' )
+    request_data[ 'file_data' ].update( {
+      '/bar.cc': { 'filetypes': [ 'cpp' ], 'contents': '' },
+      '/baz.py': { 'filetypes': [ 'python' ], 'contents': '' },
+    } )
+
+    with patch( 'ycmd.extra_conf_store.ModuleForSourceFile',
+                return_value = ExtraConf ), \
+         patch( 'ycmd.extra_conf_store.IsGlobalExtraConfModule',
+                return_value = False ), \
+         patch( 'ycmd.completers.cpp.clangd_completer.BuildCompilationCommand',
+                wraps = clangd_completer.BuildCompilationCommand ) as build, \
+         patch.object( clangd_completer.lsp,
+                       'DidChangeConfiguration',
+                       wraps = clangd_completer.lsp.DidChangeConfiguration ) \
+           as did_change_configuration, \
+         patch.object( completer, 'GetConnection', return_value = connection ):
+      completer._SendFlagsFromExtraConf( RequestWrap( request_data ) )
+      completer._SendFlagsFromExtraConf( RequestWrap( request_data ) )
+
+    connection.SendNotification.assert_called_once()
+    did_change_configuration.assert_called_once()
+    assert_that( did_change_configuration.call_args[ 0 ][ 0 ], has_entries( {
+      'compilationDatabaseChanges': has_entries( {
+        '/foo.cc': has_entries( {
+          'compilationCommand': contains_exactly( 'clang-tool',
+                                                  '-x',
+                                                  'c++',
+                                                  '/foo.cc' )
+        } ),
+        '/bar.cc': has_entries( {
+          'compilationCommand': contains_exactly( 'clang-tool',
+                                                  '-x',
+                                                  'c++',
+                                                  '/bar.cc' )
+        } ),
+      } )
+    } ) )
+    assert_that( ExtraConf.settings_calls, equal_to( 2 ) )
+    build.assert_called_once()
+
+
+  def test_ClangdCompleter_SendFlagsFromExtraConf_OtherFiles( self ):
+    class ExtraConf:
+      __file__ = '/extra_conf.py'
+      settings_calls = []
+
+      @staticmethod
+      def Settings( **kwargs ):
+        filename = kwargs[ 'filename' ]
+        ExtraConf.settings_calls.append( filename )
+        if filename == '/broken.cc':
+          raise RuntimeError( 'broken extra conf' )
+        return { 'flags': [ '-x', 'c++' ], 'do_cache': False }
+
+    completer = clangd_completer.ClangdCompleter( DefaultOptions() )
+    connection = MagicMock()
+
+    def Request( filepath ):
+      request_data = BuildRequest( filepath = filepath,
+                                   filetype = 'cpp',
+                                   contents = '' )
+      for other_filepath in [ '/foo.cc', '/bar.cc', '/broken.cc' ]:
+        request_data[ 'file_data' ][ other_filepath ] = {
+          'filetypes': [ 'cpp' ], 'contents': '' }
+      return RequestWrap( request_data )
+
+    with patch( 'ycmd.extra_conf_store.ModuleForSourceFile',
+                return_value = ExtraConf ), \
+         patch( 'ycmd.extra_conf_store.IsGlobalExtraConfModule',
+                return_value = False ), \
+         patch.object( completer, 'GetConnection', return_value = connection ):
+      completer._SendFlagsFromExtraConf( Request( '/foo.cc' ) )
+      completer._SendFlagsFromExtraConf( Request( '/foo.cc' ) )
+      completer._SendFlagsFromExtraConf( Request( '/bar.cc' ) )
+
+    # The error for /broken.cc doesn't prevent the flags of the other files
+    # from being sent. The uncached flags are only refreshed for the current
+    # file.
+    assert_that( ExtraConf.settings_calls,
+                 contains_exactly( '/foo.cc', '/bar.cc', '/broken.cc',
+                                   '/foo.cc', '/broken.cc',
+                                   '/bar.cc', '/broken.cc' ) )
+    assert_that( connection.SendNotification.call_count, equal_to( 3 ) )
+
+
+  def test_ClangdCompleter_BuildCompilationCommand_FlagNamingFile( self ):
+    module = MagicMock( __file__ = '/extra_conf.py' )
+    completer = clangd_completer.ClangdCompleter( DefaultOptions() )
+    flags = [ '-x', 'c++', '-include', '/src/./foo.h' ]
+
+    assert_that( completer._BuildCompilationCommand( module,
+                                                     flags,
+                                                     '/src/bar.cc' ),
+                 contains_exactly( 'clang-tool', '-x', 'c++',
+                                   '-include', '/src/./foo.h',
+                                   '/src/bar.cc' ) )
+    # The flag is the same file as /src/foo.h once normalized, so it is removed
+    # from its command instead of using the memoized one.
+    assert_that( completer._BuildCompilationCommand( module,
+                                                     flags,
+                                                     '/src/foo.h' ),
+                 contains_exactly( 'clang-tool', '-x', 'c++',
+                                   '-include', '/src/foo.h' ) )
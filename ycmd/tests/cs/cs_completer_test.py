@@ -0,0 +1,115 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+from unittest.mock import MagicMock, patch
+from unittest import TestCase
+from hamcrest import assert_that, calling, contains_exactly, equal_to, raises
+
+from ycmd.completers.cs.cs_completer import ( CsharpCompleter,
+                                              CsharpSolutionCompleter,
+                                              OmniSharpRequestCancelled,
+                                              _RequestScheduler )
+from ycmd.tests.cs import setUpModule, tearDownModule # noqa
+from ycmd import user_options_store
+
+
+class CsharpCompleterTest( TestCase ):
+  @patch( 'ycmd.completers.cs.solutiondetection.FindSolutionPath',
+          return_value = '/solution/testy.sln' )
+  def test_GetSolutionFile_CachedPerDirectory( self, find_solution_path ):
+    completer = CsharpCompleter( user_options_store.GetAll() )
+    for filename in [ 'Program.cs', 'Utils.cs' ]:
+      assert_that(
+        completer._GetSolutionFile( f'/solution/testy/{ filename }' ),
+        equal_to( '/solution/testy.sln' ) )
+    find_solution_path.assert_called_once_with( '/solution/testy/Program.cs' )
+
+
+  @patch( 'ycmd.completers.cs.solutiondetection.FindSolutionPath',
+          side_effect = [ None, '/solution/testy.sln' ] )
+  def test_GetSolutionFile_FailureIsNotCached( self, *args ):
+    completer = CsharpCompleter( user_options_store.GetAll() )
+    assert_that(
+      calling( completer._GetSolutionFile ).with_args(
+        '/solution/testy/Program.cs' ),
+      raises( RuntimeError, 'Autodetection of solution file failed.' ) )
+    assert_that( completer._GetSolutionFile( '/solution/testy/Program.cs' ),
+                 equal_to( '/solution/testy.sln' ) )
+
+
+  def test_RequestScheduler_SupersedesQueuedRequests( self ):
+    scheduler = _RequestScheduler( 1 )
+    unblock = threading.Event()
+    results = {}
+
+    def Send( name, supersede_key, send ):
+      try:
+        results[ name ] = scheduler.Run( '/autocomplete', supersede_key, send )
+      except OmniSharpRequestCancelled:
+        results[ name ] = 'cancelled'
+
+    def WaitUntilQueued( number_of_requests ):
+      while len( scheduler._queue ) != number_of_requests:
+        unblock.wait( 0.01 )
+
+    running = threading.Thread(
+      target = Send,
+      args = ( 'running', ( '/autocomplete', 'a.cs' ),
+               lambda: unblock.wait() and 'running' ) )
+    running.start()
+    while not scheduler._running:
+      unblock.wait( 0.01 )
+
+    threads = []
+    for name, filename in [ ( 'first', 'a.cs' ),
+                            ( 'other file', 'b.cs' ),
+                            ( 'second', 'a.cs' ) ]:
+      thread = threading.Thread(
+        target = Send,
+        args = ( name,
+                 ( '/autocomplete', filename ),
+                 lambda name = name: name ) )
+      thread.start()
+      threads.append( thread )
+      WaitUntilQueued( 2 if name == 'second' else len( threads ) )
+
+    unblock.set()
+    for thread in [ running ] + threads:
+      thread.join()
+
+    assert_that( results, equal_to( { 'running': 'running',
+                                      'first': 'cancelled',
+                                      'other file': 'other file',
+                                      'second': 'second' } ) )
+    assert_that(
+      [ ( item.key, item.value[ : 10 ] )
+        for item in scheduler.DebugInfoItems() ],
+      contains_exactly( ( 'queued requests', '0' ),
+                        ( 'superseded requests', '1' ),
+                        ( '/autocomplete latency', '3 requests' ) ) )
+
+
+  def test_GetCompletions_SupersededRequestReturnsNoCompletions( self ):
+    solution_completer = MagicMock()
+    solution_completer._DefaultParameters.return_value = {}
+    solution_completer._GetResponse.side_effect = OmniSharpRequestCancelled(
+      'OmniSharp /autocomplete request superseded by a newer one.' )
+    assert_that(
+      CsharpSolutionCompleter._GetCompletions( solution_completer,
+                                               { 'filepath': '/a.cs' } ),
+      equal_to( [] ) )
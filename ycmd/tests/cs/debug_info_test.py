@@ -16,7 +16,7 @@
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
 from hamcrest import ( assert_that, contains_exactly, empty, equal_to,
-                       has_entries, has_entry, instance_of )
+                       has_entries, has_entry, has_items, instance_of )
 
 from subprocess import Popen as _mockable_popen
 
@@ -54,10 +54,20 @@ def SolutionSelectCheck( app, sourcefile, reference_solution,
     has_entry( 'completer', has_entries( {
       'name': 'C#',
       'servers': contains_exactly( has_entries( {
-        'extras': contains_exactly( has_entries( {
-          'key': 'solution',
-          'value': reference_solution
-        } ) )
+        'extras': contains_exactly(
+          has_entries( {
+            'key': 'solution',
+            'value': reference_solution
+          } ),
+          has_entries( {
+            'key': 'queued requests',
+            'value': '0'
+          } ),
+          has_entries( {
+            'key': 'superseded requests',
+            'value': '0'
+          } )
+        )
       } ) )
     } ) )
   )
@@ -91,10 +101,20 @@ class DebugInfoTest( TestCase ):
           'port': instance_of( int ),
           'logfiles': contains_exactly( instance_of( str ),
                                 instance_of( str ) ),
-          'extras': contains_exactly( has_entries( {
-            'key': 'solution',
-            'value': instance_of( str )
-          } ) )
+          'extras': has_items(
+            has_entries( {
+              'key': 'solution',
+              'value': instance_of( str )
+            } ),
+            has_entries( {
+              'key': 'queued requests',
+              'value': instance_of( str )
+            } ),
+            has_entries( {
+              'key': 'superseded requests',
+              'value': instance_of( str )
+            } )
+          )
         } ) ),
         'items': empty()
       } ) )
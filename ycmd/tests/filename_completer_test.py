@@ -16,7 +16,8 @@
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-from hamcrest import assert_that, contains_inanyorder, empty, is_not
+from hamcrest import ( assert_that, contains_inanyorder, empty, greater_than,
+                       has_entries, is_not )
 from unittest.mock import patch
 from unittest import TestCase
 
@@ -290,6 +291,29 @@ class FilenameCompleterTest( TestCase ):
     ) )
 
 
+  @IsolatedYcmd( { 'filepath_completion_use_working_dir': 0 } )
+  def test_FilenameCompleter_TrimCaches( self, app ):
+    def DirectoryCachesUsage():
+      return app.get( '/memory_usage' ).json[
+        'general_completers' ][ 'filename' ]
+
+    app.post_json( '/completions',
+                   BuildRequest( contents = 'ls ./dir with spaces (x64)/',
+                                 filepath = PATH_TO_TEST_FILE,
+                                 column_num = 28 ) )
+    assert_that( DirectoryCachesUsage(), has_entries( {
+      'head_path_for_directory': has_entries( { 'entries': 1 } ),
+      'candidates_for_directory': has_entries( { 'entries': 1,
+                                                 'bytes': greater_than( 0 ) } )
+    } ) )
+
+    app.post_json( '/trim_caches', {} )
+    assert_that( DirectoryCachesUsage(), has_entries( {
+      'head_path_for_directory': has_entries( { 'entries': 0 } ),
+      'candidates_for_directory': has_entries( { 'entries': 0 } )
+    } ) )
+
+
   @IsolatedYcmd( { 'filepath_completion_use_working_dir': 1 } )
   def test_WorkingDir_UseServerWorkingDirectory( self, app ):
     test_dir = os.path.join( DATA_DIR, 'dir with spaces (x64)' )
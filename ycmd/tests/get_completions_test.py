@@ -26,7 +26,8 @@ from unittest.mock import patch
 from unittest import TestCase
 from ycmd.tests import IsolatedYcmd, SharedYcmd, PathToTestFile
 from ycmd.tests.test_utils import ( BuildRequest, CompletionEntryMatcher,
-                                    DummyCompleter, PatchCompleter )
+                                    DummyCompleter, PatchCompleter,
+                                    WaitUntilTagFilesAreLoaded )
 
 
 class GetCompletionsTest( TestCase ):
@@ -262,6 +263,7 @@ class GetCompletionsTest( TestCase ):
     event_data = BuildRequest( event_name = 'FileReadyToParse',
                                tag_files = [ PathToTestFile( 'basic.tags' ) ] )
     app.post_json( '/event_notification', event_data )
+    WaitUntilTagFilesAreLoaded( app )
 
     completion_data = BuildRequest( contents = 'oo',
                                     column_num = 3,
@@ -57,6 +57,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str ),
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile(),
@@ -103,6 +106,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str ),
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile(),
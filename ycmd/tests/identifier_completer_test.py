@@ -16,14 +16,23 @@
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
-from hamcrest import assert_that, empty, equal_to, contains_exactly
+import shutil
+from hamcrest import ( assert_that,
+                       contains_exactly,
+                       contains_inanyorder,
+                       empty,
+                       equal_to,
+                       has_entries,
+                       has_entry,
+                       has_items,
+                       starts_with )
 from unittest import TestCase
 from ycmd.user_options_store import DefaultOptions
 from ycmd.completers.all import identifier_completer as ic
 from ycmd.completers.all.identifier_completer import IdentifierCompleter
 from ycmd.request_wrap import RequestWrap
 from ycmd.tests import PathToTestFile
-from ycmd.tests.test_utils import BuildRequest
+from ycmd.tests.test_utils import BuildRequest, TemporaryTestDir
 
 
 def BuildRequestWrap( contents, column_num, line_num = 1 ):
@@ -305,3 +314,170 @@ class IdentifierCompleterTest( TestCase ):
     assert_that(
         list( ident_completer._FilterUnchangedTagFiles( [ tag_file ] ) ),
         empty() )
+
+
+  def test_ComputeCandidates_JustFinishedIdentifierWins( self ):
+    ident_completer = IdentifierCompleter( DefaultOptions() )
+    ident_completer.OnFileReadyToParse( BuildRequestWrap( 'foobar foobaz', 1 ) )
+
+    assert_that(
+      ident_completer.ComputeCandidates( BuildRequestWrap( 'fooba', 6 ) ),
+      contains_exactly( has_entry( 'insertion_text', 'foobar' ),
+                        has_entry( 'insertion_text', 'foobaz' ) ) )
+
+    ident_completer.OnCurrentIdentifierFinished(
+      BuildRequestWrap( 'foobar foobaz ', 15 ) )
+
+    assert_that(
+      ident_completer.ComputeCandidates( BuildRequestWrap( 'fooba', 6 ) ),
+      contains_exactly( has_entry( 'insertion_text', 'foobaz' ),
+                        has_entry( 'insertion_text', 'foobar' ) ) )
+
+
+  def test_AddIdentifiersFromTagFiles_LoadedInBackground( self ):
+    ident_completer = IdentifierCompleter( DefaultOptions() )
+    tag_file = PathToTestFile( 'basic.tags' )
+
+    ident_completer._AddIdentifiersFromTagFiles( [ tag_file ] )
+    ident_completer._tag_files_queue.join()
+
+    assert_that(
+      list( ident_completer._completer.CandidatesForQueryAndType( 'oo',
+                                                                  'cpp' ) ),
+      contains_inanyorder( 'foosy', 'fooaaa' ) )
+    assert_that(
+      ident_completer.PollForMessagesInner( {}, 0 ),
+      contains_exactly(
+        has_entry( 'message', f'Loading identifiers from { tag_file }' ),
+        has_entry( 'message',
+                   starts_with( f'Loaded identifiers from { tag_file }' ) ) ) )
+    ident_completer.Shutdown()
+
+
+  def test_AddIdentifiersFromTagFiles_SkipUnchangedFiles( self ):
+    ident_completer = IdentifierCompleter( DefaultOptions() )
+
+    tag_file = PathToTestFile( 'basic.tags' )
+    ident_completer._tags_file_last_mtime[ tag_file ] = os.path.getmtime(
+        tag_file )
+
+    ident_completer._AddIdentifiersFromTagFiles( [ tag_file ] )
+
+    assert_that( ident_completer._tag_files_thread, equal_to( None ) )
+    assert_that( ident_completer.PollForMessagesInner( {}, 0 ),
+                 equal_to( True ) )
+
+
+  def test_DebugInfo_TagFilesLoadingState( self ):
+    ident_completer = IdentifierCompleter( DefaultOptions() )
+    assert_that( ident_completer.DebugInfo( {} ), has_entries( {
+      'name': 'Identifier',
+      'items': has_items(
+        has_entries( { 'key': 'Tag Files Pending', 'value': 0 } ),
+        has_entries( { 'key': 'Last Loaded Tag File', 'value': None } ) )
+    } ) )
+
+    tag_file = PathToTestFile( 'basic.tags' )
+    ident_completer._AddIdentifiersFromTagFiles( [ tag_file ] )
+    ident_completer._tag_files_queue.join()
+
+    assert_that( ident_completer.DebugInfo( {} ), has_entries( {
+      'name': 'Identifier',
+      'items': has_items(
+        has_entries( { 'key': 'Tag Files Pending', 'value': 0 } ),
+        has_entries( { 'key': 'Tag File Being Loaded', 'value': None } ),
+        has_entries( { 'key': 'Last Loaded Tag File', 'value': tag_file } ) )
+    } ) )
+    ident_completer.Shutdown()
+
+
+  def test_DatabaseSnapshot_SavedOnShutdownAndLoadedLazily( self ):
+    with TemporaryTestDir() as tmp_dir:
+      options = DefaultOptions()
+      options[ 'identifier_database_snapshot_path' ] = os.path.join(
+        tmp_dir, 'identifiers' )
+
+      ident_completer = IdentifierCompleter( options )
+      ident_completer._AddIdentifiersFromSyntax( [ 'foobar', 'foozoo' ], 'c' )
+      ident_completer._AddIdentifiersFromSyntax( [ 'barfoo' ], 'cpp' )
+      ident_completer.Shutdown()
+
+      ident_completer = IdentifierCompleter( options )
+      assert_that( ident_completer._snapshot_filetypes_to_load,
+                   contains_inanyorder( 'c', 'cpp' ) )
+      assert_that( list( ident_completer._completer.FiletypesInDatabase() ),
+                   empty() )
+
+      assert_that(
+        ident_completer.ComputeCandidates(
+          RequestWrap( BuildRequest( filetype = 'c',
+                                     contents = 'oo',
+                                     column_num = 3 ) ) ),
+        contains_inanyorder( has_entry( 'insertion_text', 'foobar' ),
+                             has_entry( 'insertion_text', 'foozoo' ) ) )
+      assert_that( ident_completer._snapshot_filetypes_to_load,
+                   contains_exactly( 'cpp' ) )
+      ident_completer.Shutdown()
+
+
+  def test_DatabaseSnapshot_UnchangedTagFilesNotLoadedAgain( self ):
+    with TemporaryTestDir() as tmp_dir:
+      options = DefaultOptions()
+      options[ 'identifier_database_snapshot_path' ] = os.path.join(
+        tmp_dir, 'identifiers' )
+      tag_file = os.path.join( tmp_dir, 'basic.tags' )
+      shutil.copy( PathToTestFile( 'basic.tags' ), tag_file )
+
+      ident_completer = IdentifierCompleter( options )
+      ident_completer._AddIdentifiersFromTagFiles( [ tag_file ] )
+      ident_completer._tag_files_queue.join()
+      ident_completer.Shutdown()
+
+      ident_completer = IdentifierCompleter( options )
+      ident_completer._AddIdentifiersFromTagFiles( [ tag_file ] )
+      assert_that( ident_completer._tag_files_thread, equal_to( None ) )
+      ident_completer._LoadSnapshotForFiletype( 'cpp' )
+      assert_that(
+        list( ident_completer._completer.CandidatesForQueryAndType( 'oo',
+                                                                    'cpp' ) ),
+        contains_inanyorder( 'foosy', 'fooaaa' ) )
+      ident_completer.Shutdown()
+
+
+  def test_DatabaseSnapshot_ChangedTagFilesInvalidated( self ):
+    with TemporaryTestDir() as tmp_dir:
+      options = DefaultOptions()
+      options[ 'identifier_database_snapshot_path' ] = os.path.join(
+        tmp_dir, 'identifiers' )
+      tag_file = os.path.join( tmp_dir, 'basic.tags' )
+      shutil.copy( PathToTestFile( 'basic.tags' ), tag_file )
+
+      ident_completer = IdentifierCompleter( options )
+      ident_completer._AddIdentifiersFromTagFiles( [ tag_file ] )
+      ident_completer._tag_files_queue.join()
+      ident_completer.Shutdown()
+
+      mtime = os.path.getmtime( tag_file )
+      os.utime( tag_file, ( mtime + 10, mtime + 10 ) )
+
+      ident_completer = IdentifierCompleter( options )
+      ident_completer._LoadSnapshotForFiletype( 'cpp' )
+      assert_that(
+        list( ident_completer._completer.CandidatesForQueryAndType( 'oo',
+                                                                    'cpp' ) ),
+        empty() )
+      ident_completer.Shutdown()
+
+
+  def test_DatabaseSnapshot_InvalidSnapshotIgnored( self ):
+    with TemporaryTestDir() as tmp_dir:
+      options = DefaultOptions()
+      snapshot_path = os.path.join( tmp_dir, 'identifiers' )
+      options[ 'identifier_database_snapshot_path' ] = snapshot_path
+      with open( snapshot_path, 'wb' ) as snapshot_file:
+        snapshot_file.write( b'not a snapshot' )
+
+      ident_completer = IdentifierCompleter( options )
+      assert_that( ident_completer._snapshot, equal_to( None ) )
+      assert_that( ident_completer._snapshot_filetypes_to_load, empty() )
+      ident_completer.Shutdown()
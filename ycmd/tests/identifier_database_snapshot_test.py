@@ -0,0 +1,97 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from hamcrest import ( assert_that,
+                       calling,
+                       contains_exactly,
+                       contains_inanyorder,
+                       empty,
+                       equal_to,
+                       raises )
+from unittest import TestCase
+from ycmd.completers.all.identifier_database_snapshot import (
+  IdentifierDatabaseSnapshot,
+  SnapshotError,
+  WriteSnapshot )
+from ycmd.tests.test_utils import TemporaryTestDir
+
+
+class IdentifierDatabaseSnapshotTest( TestCase ):
+  def test_WriteAndRead( self ):
+    with TemporaryTestDir() as tmp_dir:
+      path = os.path.join( tmp_dir, 'snapshot' )
+      WriteSnapshot( path,
+                     { '/tags': ( 1234.5, [ '/foo.c', '/bar.c' ] ) },
+                     [ ( 'c', [ ( '/foo.c', [ 'foo', 'bär' ] ),
+                                ( '/bar.c', [] ) ] ),
+                       ( 'python', [ ( '/foo.py', [ 'baz' ] ) ] ) ] )
+
+      snapshot = IdentifierDatabaseSnapshot( path )
+      assert_that( snapshot.tag_files, equal_to( {
+        '/tags': ( 1234.5, [ '/foo.c', '/bar.c' ] ) } ) )
+      assert_that( snapshot.Filetypes(),
+                   contains_inanyorder( 'c', 'python' ) )
+      assert_that( list( snapshot.Identifiers( 'c' ) ), contains_exactly(
+        ( '/foo.c', [ 'foo', 'bär' ] ),
+        ( '/bar.c', [] ) ) )
+      assert_that( list( snapshot.Identifiers( 'python' ) ), contains_exactly(
+        ( '/foo.py', [ 'baz' ] ) ) )
+      assert_that( list( snapshot.Identifiers( 'cpp' ) ), empty() )
+      snapshot.Close()
+
+
+  def test_WriteReplacesExistingSnapshot( self ):
+    with TemporaryTestDir() as tmp_dir:
+      path = os.path.join( tmp_dir, 'snapshot' )
+      WriteSnapshot( path, {}, [ ( 'c', [ ( '/foo.c', [ 'foo' ] ) ] ) ] )
+      WriteSnapshot( path, {}, [ ( 'cpp', [ ( '/foo.cpp', [ 'bar' ] ) ] ) ] )
+
+      snapshot = IdentifierDatabaseSnapshot( path )
+      assert_that( snapshot.Filetypes(), contains_exactly( 'cpp' ) )
+      snapshot.Close()
+      assert_that( os.listdir( tmp_dir ), contains_exactly( 'snapshot' ) )
+
+
+  def test_EmptySnapshot( self ):
+    with TemporaryTestDir() as tmp_dir:
+      path = os.path.join( tmp_dir, 'snapshot' )
+      open( path, 'wb' ).close()
+
+      assert_that( calling( IdentifierDatabaseSnapshot ).with_args( path ),
+                   raises( SnapshotError, 'is empty' ) )
+
+
+  def test_InvalidSnapshot( self ):
+    with TemporaryTestDir() as tmp_dir:
+      path = os.path.join( tmp_dir, 'snapshot' )
+      with open( path, 'wb' ) as snapshot_file:
+        snapshot_file.write( b'YCMIDSNP\x01\x00\x00\x00\xff\xff' )
+
+      assert_that( calling( IdentifierDatabaseSnapshot ).with_args( path ),
+                   raises( SnapshotError, 'is invalid' ) )
+
+
+  def test_TruncatedSnapshot( self ):
+    with TemporaryTestDir() as tmp_dir:
+      path = os.path.join( tmp_dir, 'snapshot' )
+      WriteSnapshot( path, {}, [ ( 'c', [ ( '/foo.c', [ 'foo' ] ) ] ) ] )
+      with open( path, 'rb+' ) as snapshot_file:
+        snapshot_file.truncate( os.path.getsize( path ) - 4 )
+
+      assert_that( calling( IdentifierDatabaseSnapshot ).with_args( path ),
+                   raises( SnapshotError, 'is invalid' ) )
@@ -99,6 +99,7 @@ class DebugInfoTest( TestCase ):
           'extras': contains_exactly(
             has_entries( { 'key': 'Server State',
                            'value': 'Initialized' } ),
+            has_entries( { 'key': 'Time To First Semantic Completion' } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'simple_eclipse_project' )
@@ -122,6 +123,8 @@ class DebugInfoTest( TestCase ):
                            'value': instance_of( str ) } ),
             has_entries( { 'key': 'Workspace Path',
                            'value': instance_of( str ) } ),
+            has_entries( { 'key': 'Project Import Time',
+                           'value': instance_of( str ) } ),
             has_entries( { 'key': 'Extension Path',
                            'value': contains_exactly( instance_of( str ) ) } ),
           )
@@ -158,6 +161,7 @@ class DebugInfoTest( TestCase ):
           'extras': contains_exactly(
             has_entries( { 'key': 'Server State',
                            'value': 'Initialized' } ),
+            has_entries( { 'key': 'Time To First Semantic Completion' } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'extra_confs',
@@ -182,6 +186,8 @@ class DebugInfoTest( TestCase ):
                            'value': instance_of( str ) } ),
             has_entries( { 'key': 'Workspace Path',
                            'value': instance_of( str ) } ),
+            has_entries( { 'key': 'Project Import Time',
+                           'value': instance_of( str ) } ),
             has_entries( { 'key': 'Extension Path',
                            'value': contains_exactly( instance_of( str ) ) } ),
           )
@@ -18,12 +18,18 @@
 import os
 import requests
 
-from hamcrest import assert_that, equal_to, calling, has_entries, is_not, raises
+from hamcrest import ( assert_that,
+                       contains_exactly,
+                       equal_to,
+                       calling,
+                       has_entries,
+                       is_not,
+                       raises )
 from unittest.mock import patch
 from unittest import TestCase
 
 from ycmd import handlers, user_options_store
-from ycmd.tests.test_utils import BuildRequest, ErrorMatcher
+from ycmd.tests.test_utils import BuildRequest, ErrorMatcher, TemporaryTestDir
 from ycmd.tests.java import setUpModule, tearDownModule # noqa
 from ycmd.tests.java import SharedYcmd
 from ycmd.completers.java import java_completer, hook
@@ -96,6 +102,79 @@ class JavaCompleterTest( TestCase ):
     )
 
 
+  def test_RecentProjects_MostRecentFirst( self ):
+    with TemporaryTestDir() as workspace_root:
+      assert_that( java_completer._ReadRecentProjects( workspace_root ),
+                   equal_to( [] ) )
+
+      for project in [ 'a', 'b', 'a' ]:
+        java_completer._RecordRecentProject( workspace_root,
+                                             f'/{ project }',
+                                             f'/{ project }/Test.java',
+                                             1.5 )
+
+      assert_that(
+        java_completer._ReadRecentProjects( workspace_root ),
+        contains_exactly(
+          has_entries( { 'project_directory': '/a',
+                         'filepath': '/a/Test.java',
+                         'import_time': 1.5 } ),
+          has_entries( { 'project_directory': '/b',
+                         'filepath': '/b/Test.java',
+                         'import_time': 1.5 } ),
+        )
+      )
+
+
+  def test_RecentProjects_InvalidFile( self ):
+    with TemporaryTestDir() as workspace_root:
+      with open( os.path.join( workspace_root,
+                               java_completer.RECENT_PROJECTS_FILE ),
+                 'w' ) as f:
+        f.write( '{ not json' )
+      assert_that( java_completer._ReadRecentProjects( workspace_root ),
+                   equal_to( [] ) )
+
+
+  def test_JavaCompleter_Prewarm( self ):
+    with TemporaryTestDir() as workspace_root:
+      project_dir = os.path.join( workspace_root, 'project' )
+      os.makedirs( project_dir )
+      open( os.path.join( project_dir, 'pom.xml' ), 'w' ).close()
+      filepath = os.path.join( project_dir, 'Test.java' )
+      open( filepath, 'w' ).close()
+      java_completer._RecordRecentProject( workspace_root,
+                                           project_dir,
+                                           filepath,
+                                           1.5 )
+      java_completer._RecordRecentProject( workspace_root,
+                                           '/does/not/exist',
+                                           '/does/not/exist/Test.java',
+                                           1.5 )
+
+      options = dict( DEFAULT_OPTIONS )
+      options.update( {
+        'java_jdtls_prewarm': 1,
+        'java_jdtls_use_clean_workspace': 0,
+        'java_jdtls_workspace_root_path': workspace_root,
+      } )
+      completer = java_completer.JavaCompleter( options )
+      with patch.object( completer,
+                         'StartServerInBackground',
+                         return_value = True ) as start:
+        assert_that( completer.Prewarm(), equal_to( True ) )
+      assert_that( start.call_args[ 0 ][ 0 ][ 'filepath' ],
+                   equal_to( filepath ) )
+      assert_that( completer._prewarmed_project_dir, equal_to( project_dir ) )
+
+      # Prewarming requires re-used workspaces.
+      options[ 'java_jdtls_use_clean_workspace' ] = 1
+      completer = java_completer.JavaCompleter( options )
+      with patch.object( completer, 'StartServerInBackground' ) as start:
+        assert_that( completer.Prewarm(), equal_to( False ) )
+      start.assert_not_called()
+
+
   @SharedYcmd
   def test_JavaCompleter_GetType( self, app ):
     completer = handlers._server_state.GetFiletypeCompleter( [ 'java' ] )
@@ -24,10 +24,23 @@ from unittest import TestCase
 
 from ycmd.tests.javascript import setUpModule, tearDownModule # noqa
 from ycmd.tests.javascript import PathToTestFile, SharedYcmd
-from ycmd.tests.test_utils import BuildRequest, LocationMatcher, RangeMatcher
+from ycmd.tests.test_utils import ( BuildRequest,
+                                    LocationMatcher,
+                                    PollForMessages,
+                                    RangeMatcher )
 from ycmd.utils import ReadFile
 
 
+def PollForDiagnostics( app, filepath, filetype ):
+  # The diagnostics are sent asynchronously once TSServer has checked the file.
+  for message in PollForMessages( app,
+                                  { 'filepath': filepath,
+                                    'contents': ReadFile( filepath ),
+                                    'filetype': filetype } ):
+    if 'diagnostics' in message and message[ 'filepath' ] == filepath:
+      return message[ 'diagnostics' ]
+
+
 class DiagnosticsTest( TestCase ):
   @SharedYcmd
   def test_Diagnostics_FileReadyToParse( self, app ):
@@ -45,8 +58,10 @@ class DiagnosticsTest( TestCase ):
                                contents = contents,
                                event_name = 'FileReadyToParse' )
 
+    app.post_json( '/event_notification', event_data )
+
     assert_that(
-      app.post_json( '/event_notification', event_data ).json,
+      PollForDiagnostics( app, filepath, 'javascript' ),
       contains_inanyorder(
         has_entries( {
           'kind': 'ERROR',
@@ -55,7 +70,9 @@ class DiagnosticsTest( TestCase ):
           'location_extent': RangeMatcher( filepath, ( 14, 5 ), ( 14, 6 ) ),
           'ranges': contains_exactly(
             RangeMatcher( filepath, ( 14, 5 ), ( 14, 6 ) ) ),
-          'fixit_available': False
+          # The code fixes are only computed by the FixIt command, so this only
+          # tells that TSServer has code fixes for this kind of error.
+          'fixit_available': True
         } ),
         has_entries( {
           'kind': 'ERROR',
@@ -41,6 +41,7 @@ from ycmd.tests.test_utils import ( BuildRequest,
                                     LocationMatcher,
                                     RangeMatcher,
                                     SignatureAvailableMatcher,
+                                    StopCompleterServer,
                                     WaitUntilCompleterServerReady )
 from ycmd.utils import ReadFile
 
@@ -204,6 +205,9 @@ class GenericCompleterTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str ),
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'generic_server' ),
@@ -256,6 +260,9 @@ class GenericCompleterTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str ),
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'generic_server' ),
@@ -313,6 +320,9 @@ class GenericCompleterTest( TestCase ):
                 'key': 'Server State',
                 'value': 'Dead',
               } ),
+              has_entries( {
+                'key': 'Time To First Semantic Completion',
+              } ),
               has_entries( {
                 'key': 'Project Directory',
                 'value': None,
@@ -518,6 +528,9 @@ class GenericCompleterTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str ),
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'generic_server', 'foo' ),
@@ -574,6 +587,9 @@ class GenericCompleterTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str ),
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': PathToTestFile( 'generic_server', 'foo' ),
@@ -780,3 +796,62 @@ class GenericCompleterTest( TestCase ):
                    },
                    'java': { 'rename': { 'enabled': False } }
                  } ) )
+
+
+  @IsolatedYcmd( { 'language_server_background_startup': 1,
+                   'language_server':
+    [ { 'name': 'foo',
+        'filetypes': [ 'foo' ],
+        'cmdline': [ 'node', PATH_TO_GENERIC_COMPLETER, '--stdio' ] },
+      { 'name': 'bar',
+        'filetypes': [ 'bar' ],
+        'cmdline': [ 'node', PATH_TO_GENERIC_COMPLETER, '--stdio' ] } ] } )
+  def test_GenericLSPCompleter_BackgroundStartup_OpenFiles( self, app ):
+    request = BuildRequest( filepath = TEST_FILE,
+                            filetype = 'foo',
+                            line_num = 1,
+                            column_num = 1,
+                            contents = TEST_FILE_CONTENT,
+                            event_name = 'FileReadyToParse' )
+    request[ 'file_data' ][ PathToTestFile( 'generic_server', 'bar' ) ] = {
+      'contents': '',
+      'filetypes': [ 'bar' ]
+    }
+    try:
+      app.post_json( '/event_notification', request )
+      # The server for the other file is started without parsing that file.
+      WaitUntilCompleterServerReady( app, 'bar' )
+      WaitUntilCompleterServerReady( app, 'foo' )
+    finally:
+      StopCompleterServer( app, 'bar' )
+
+
+  @IsolatedYcmd( { 'language_server_background_startup': 1,
+                   'language_server':
+    [ { 'name': 'foo',
+        'filetypes': [ 'foo' ],
+        'cmdline': [ 'node', PATH_TO_GENERIC_COMPLETER, '--stdio' ] },
+      { 'name': 'bar',
+        'filetypes': [ 'bar' ],
+        'project_root_files': [ 'proj_root' ],
+        'cmdline': [ 'node', PATH_TO_GENERIC_COMPLETER, '--stdio' ] },
+      { 'name': 'baz',
+        'filetypes': [ 'baz' ],
+        'project_root_files': [ 'no_such_root' ],
+        'cmdline': [ 'node', PATH_TO_GENERIC_COMPLETER, '--stdio' ] } ] } )
+  def test_GenericLSPCompleter_BackgroundStartup_ProjectRootFiles( self, app ):
+    test_file = PathToTestFile(
+        'generic_server', 'foo', 'bar', 'baz', 'test_file' )
+    request = BuildRequest( filepath = test_file,
+                            filetype = 'foo',
+                            line_num = 1,
+                            column_num = 1,
+                            contents = '',
+                            event_name = 'FileReadyToParse' )
+    try:
+      app.post_json( '/event_notification', request )
+      WaitUntilCompleterServerReady( app, 'bar' )
+      completer = handlers._server_state.GetFiletypeCompleter( [ 'baz' ] )
+      assert_that( completer.ServerIsHealthy(), equal_to( False ) )
+    finally:
+      StopCompleterServer( app, 'bar' )
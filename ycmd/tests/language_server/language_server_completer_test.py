@@ -794,6 +794,43 @@ class LanguageServerCompleterTest( TestCase ):
         )
 
 
+  @IsolatedYcmd()
+  def test_LanguageServerCompleter_GetCompletions_CancelsSuperseded( self,
+                                                                     app ):
+    completer = MockCompleter()
+    request_data = RequestWrap( BuildRequest() )
+    completion_key = ( request_data[ 'filepath' ],
+                       request_data[ 'line_num' ],
+                       request_data[ 'start_codepoint' ] )
+    completer._pending_completions[ completion_key ] = 42
+
+    with patch.object( completer, '_is_completion_provider', True ):
+      with patch.object( completer.GetConnection(),
+                         'GetResponse',
+                         return_value = { 'result': [] } ):
+        with patch.object( completer.GetConnection(),
+                           'CancelRequest' ) as cancel_request:
+          completer.ComputeCandidatesInner( request_data, 1 )
+          cancel_request.assert_called_once_with( 42 )
+
+    assert_that( completer._pending_completions, equal_to( {} ) )
+
+
+  @IsolatedYcmd()
+  def test_LanguageServerCompleter_GetCompletions_Cancelled( self, app ):
+    completer = MockCompleter()
+    request_data = RequestWrap( BuildRequest() )
+
+    with patch.object( completer, '_is_completion_provider', True ):
+      with patch.object( completer.GetConnection(),
+                         'GetResponse',
+                         side_effect = lsc.ResponseCancelledException ):
+        assert_that( completer.ComputeCandidatesInner( request_data, 1 ),
+                     contains_exactly( empty(), True ) )
+
+    assert_that( completer._pending_completions, equal_to( {} ) )
+
+
   @IsolatedYcmd()
   def test_LanguageServerCompleter_GetCompletions_UnsupportedKinds( self, app ):
     completer = MockCompleter()
@@ -16,7 +16,9 @@
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
 from unittest.mock import patch, MagicMock
+from ycmd import utils
 from ycmd.completers.language_server import language_server_completer as lsc
+from ycmd.completers.language_server import language_server_protocol as lsp
 from hamcrest import assert_that, calling, equal_to, raises
 from unittest import TestCase
 from ycmd.tests.language_server import MockConnection
@@ -84,6 +86,53 @@ class LanguageServerConnectionTest( TestCase ):
                    raises( lsc.ResponseAbortedException ) )
 
 
+  def test_LanguageServerConnection_TimeoutCancelsRequest( self ):
+    connection = MockConnection()
+
+    with patch.object( connection, 'WriteData' ) as write_data:
+      assert_that( calling( connection.GetResponse ).with_args(
+                     1, bytes( b'{"test":"test"}' ), 0.01 ),
+                   raises( lsc.ResponseTimeoutException ) )
+      write_data.assert_called_with( lsp.CancelRequest( 1 ) )
+
+    assert_that( connection._responses, equal_to( {} ) )
+
+    # A late response is dropped.
+    connection._DispatchMessage( { 'id': 1, 'result': None } )
+
+
+  def test_LanguageServerConnection_ClientDisconnectedCancelsRequest( self ):
+    connection = MockConnection()
+
+    utils.SetClientDisconnectedCheck( lambda: True )
+    try:
+      with patch.object( connection, 'WriteData' ) as write_data:
+        assert_that( calling( connection.GetResponse ).with_args(
+                       1, bytes( b'{"test":"test"}' ), 10 ),
+                     raises( lsc.ResponseCancelledException ) )
+        write_data.assert_called_with( lsp.CancelRequest( 1 ) )
+    finally:
+      utils.SetClientDisconnectedCheck( None )
+
+    assert_that( connection._responses, equal_to( {} ) )
+
+
+  def test_LanguageServerConnection_CancelRequest( self ):
+    connection = MockConnection()
+
+    response = connection.GetResponseAsync( 1, bytes( b'{"test":"test"}' ) )
+    with patch.object( connection, 'WriteData' ) as write_data:
+      connection.CancelRequest( 1 )
+      write_data.assert_called_once_with( lsp.CancelRequest( 1 ) )
+
+      # Cancelling again does nothing.
+      connection.CancelRequest( 1 )
+      write_data.assert_called_once()
+
+    assert_that( calling( response.AwaitResponse ).with_args( 10 ),
+                 raises( lsc.ResponseCancelledException ) )
+
+
   def test_LanguageServerConnection_ServerConnectionDies( self ):
     connection = MockConnection()
 
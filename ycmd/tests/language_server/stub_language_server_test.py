@@ -0,0 +1,173 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+from hamcrest import ( assert_that,
+                       contains_exactly,
+                       equal_to,
+                       has_entries,
+                       has_length )
+from unittest import TestCase
+
+from ycmd import utils
+from ycmd.completers.language_server import language_server_completer as lsc
+from ycmd.completers.language_server import language_server_protocol as lsp
+
+DIR_OF_THIS_SCRIPT = os.path.dirname( os.path.abspath( __file__ ) )
+STUB_LANGUAGE_SERVER = os.path.join( DIR_OF_THIS_SCRIPT,
+                                     '..',
+                                     '..',
+                                     'benchmarks',
+                                     'stub_language_server.py' )
+TIMEOUT = 10
+URI = lsp.FilePathToUri( os.path.abspath( 'file.stub' ) )
+
+
+def _Exchange( connection, server ):
+  """Sends the requests the completers send to |server| through |connection|
+  and returns the notifications received."""
+  notifications = queue.Queue()
+  connection._notification_handler = (
+    lambda connection, notification: notifications.put( notification ) )
+  connection.Start()
+  try:
+    connection.AwaitServerConnection()
+
+    def Request( method, params ):
+      request_id = connection.NextRequestId()
+      return connection.GetResponse(
+        request_id,
+        lsp.BuildRequest( request_id, method, params ),
+        TIMEOUT )[ 'result' ]
+
+    results = { 'initialize': Request( 'initialize', {} ) }
+    connection.SendNotification( lsp.BuildNotification(
+      'textDocument/didOpen',
+      { 'textDocument': { 'uri': URI,
+                          'languageId': 'stub',
+                          'version': 1,
+                          'text': 'int a;\nb' } } ) )
+    document = { 'textDocument': { 'uri': URI } }
+    for method, params in [
+        ( 'textDocument/completion', document ),
+        ( 'textDocument/semanticTokens/full', document ),
+        ( 'workspace/symbol', { 'query': 'symbol' } ),
+        ( 'textDocument/hover', document ) ]:
+      results[ method ] = Request( method, params )
+    # Notifications are sent before the responses to the following requests.
+    results[ 'notifications' ] = []
+    while not notifications.empty():
+      results[ 'notifications' ].append( notifications.get() )
+    Request( 'shutdown', None )
+    connection.SendNotification( lsp.BuildNotification( 'exit', None ) )
+    assert_that( server.wait( TIMEOUT ), equal_to( 0 ) )
+  finally:
+    connection.Close()
+    utils.CloseStandardStreams( server )
+  return results
+
+
+class StubLanguageServerTest( TestCase ):
+  def _AssertResults( self, results ):
+    assert_that( results, has_entries( {
+      'initialize': has_entries( {
+        'capabilities': has_entries( {
+          'semanticTokensProvider': has_entries( { 'full': True } )
+        } )
+      } ),
+      'textDocument/completion': has_entries( {
+        'isIncomplete': True,
+        'items': has_length( 3 )
+      } ),
+      'textDocument/semanticTokens/full': has_entries( {
+        # int, a and b.
+        'data': equal_to( [ 0, 0, 3, 0, 0,
+                            0, 4, 1, 1, 0,
+                            1, 0, 1, 2, 0 ] )
+      } ),
+      'workspace/symbol': contains_exactly(
+        has_entries( { 'name': 'symbol0' } ),
+        has_entries( { 'name': 'symbol1' } ) ),
+      'textDocument/hover': None,
+      'notifications': contains_exactly( has_entries( {
+        'method': 'textDocument/publishDiagnostics',
+        'params': has_entries( { 'uri': URI, 'diagnostics': has_length( 4 ) } )
+      } ) )
+    } ) )
+
+
+  def test_StubLanguageServer_StandardIO( self ):
+    server = utils.SafePopen( [ sys.executable,
+                                STUB_LANGUAGE_SERVER,
+                                '--incomplete',
+                                '--latency-ms', '10',
+                                '--completion-items', '3',
+                                '--diagnostics', '4',
+                                '--workspace-symbols', '2' ],
+                              stdin = subprocess.PIPE,
+                              stdout = subprocess.PIPE )
+    connection = lsc.StandardIOLanguageServerConnection( None,
+                                                         None,
+                                                         server.stdin,
+                                                         server.stdout,
+                                                         None )
+    self._AssertResults( _Exchange( connection, server ) )
+
+
+  def test_StubLanguageServer_TCP( self ):
+    port = utils.GetUnusedLocalhostPort()
+    server = utils.SafePopen( [ sys.executable,
+                                STUB_LANGUAGE_SERVER,
+                                '--port', str( port ),
+                                '--incomplete',
+                                '--completion-items', '3',
+                                '--diagnostics', '4',
+                                '--workspace-symbols', '2' ] )
+    connection = lsc.TCPSingleStreamConnection( None, None, port, None )
+    self._AssertResults( _Exchange( connection, server ) )
+
+
+  def test_StubLanguageServer_ScriptedResponses( self ):
+    with tempfile.NamedTemporaryFile( 'w',
+                                      suffix = '.json',
+                                      delete = False ) as responses_file:
+      json.dump( { 'textDocument/hover': { 'contents': 'scripted' } },
+                 responses_file )
+    try:
+      server = utils.SafePopen( [ sys.executable,
+                                  STUB_LANGUAGE_SERVER,
+                                  '--responses', responses_file.name ],
+                                stdin = subprocess.PIPE,
+                                stdout = subprocess.PIPE )
+      connection = lsc.StandardIOLanguageServerConnection( None,
+                                                           None,
+                                                           server.stdin,
+                                                           server.stdout,
+                                                           None )
+      results = _Exchange( connection, server )
+    finally:
+      os.remove( responses_file.name )
+
+    assert_that( results, has_entries( {
+      'textDocument/hover': has_entries( { 'contents': 'scripted' } ),
+      'notifications': contains_exactly()
+    } ) )
@@ -0,0 +1,85 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+from hamcrest import assert_that, calling, contains_string, equal_to, raises
+from unittest.mock import MagicMock, patch
+from unittest import TestCase
+from ycmd import metrics
+from ycmd.metrics_plugin import MetricsPlugin
+from ycmd.web_plumbing import HTTPError
+
+
+class MetricsTest( TestCase ):
+  def test_Registry_Render( self ):
+    registry = metrics.Registry()
+    registry.Describe( 'latency_seconds', 'Some latency.' )
+    registry.Observe( 'latency_seconds', ( ( 'route', '/a' ), ), 0.003 )
+    registry.Observe( 'latency_seconds', ( ( 'route', '/a' ), ), 20 )
+    registry.Increment( 'errors_total', ( ( 'route', '/"b"' ), ) )
+    registry.Increment( 'errors_total', ( ( 'route', '/"b"' ), ), 2 )
+
+    rendered = registry.Render()
+    assert_that( rendered, contains_string(
+      '# HELP latency_seconds Some latency.\n'
+      '# TYPE latency_seconds histogram\n'
+      'latency_seconds_bucket{route="/a",le="0.001"} 0\n'
+      'latency_seconds_bucket{route="/a",le="0.0025"} 0\n'
+      'latency_seconds_bucket{route="/a",le="0.005"} 1\n' ) )
+    assert_that( rendered, contains_string(
+      'latency_seconds_bucket{route="/a",le="10.0"} 1\n'
+      'latency_seconds_bucket{route="/a",le="+Inf"} 2\n'
+      'latency_seconds_sum{route="/a"} 20.003\n'
+      'latency_seconds_count{route="/a"} 2\n' ) )
+    assert_that( rendered, contains_string(
+      '# TYPE errors_total counter\n'
+      'errors_total{route="/\\"b\\""} 3\n' ) )
+
+
+  def test_Disabled( self ):
+    with patch.object( metrics, 'REGISTRY', metrics.Registry() ) as registry:
+      metrics.SetEnabled( False )
+      metrics.ObserveLatency( 'latency_seconds', (), 1 )
+      metrics.IncrementCounter( 'errors_total', () )
+      with metrics.Timer( 'latency_seconds', () ):
+        pass
+      assert_that( registry.Render(), equal_to( '' ) )
+
+
+  def test_MetricsPlugin( self ):
+    request = MagicMock( path = '/completions', content_length = 100 )
+    callback = MagicMock( side_effect = [ '{"a":1}',
+                                          HTTPError( 401, 'Unauthorized' ) ] )
+    wrapper = MetricsPlugin()( callback )
+
+    with patch.object( metrics, 'REGISTRY', metrics.Registry() ) as registry:
+      metrics.SetEnabled( True )
+      try:
+        assert_that( wrapper( request, MagicMock() ), equal_to( '{"a":1}' ) )
+        assert_that( calling( wrapper ).with_args( request, MagicMock() ),
+                     raises( HTTPError ) )
+      finally:
+        metrics.SetEnabled( False )
+
+      rendered = registry.Render()
+      assert_that( rendered, contains_string(
+        'ycmd_request_duration_seconds_count{route="/completions"} 2\n' ) )
+      assert_that( rendered, contains_string(
+        'ycmd_request_size_bytes_sum{route="/completions"} 200\n' ) )
+      assert_that( rendered, contains_string(
+        'ycmd_response_size_bytes_sum{route="/completions"} 7\n' ) )
+      assert_that( rendered, contains_string(
+        'ycmd_request_errors_total{route="/completions",status="401"} 1\n' ) )
@@ -15,16 +15,23 @@
 # You should have received a copy of the GNU General Public License
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
-from hamcrest import ( any_of, assert_that, contains_exactly, empty, equal_to,
-                       has_entries, instance_of )
-from unittest.mock import patch
+from hamcrest import ( any_of, assert_that, contains_exactly, contains_string,
+                       empty, equal_to, greater_than, has_entries, has_items,
+                       instance_of )
+from base64 import b64encode
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
 from unittest import TestCase
+import os
 import requests
 
-from ycmd.web_plumbing import RouteNotFound
+from ycmd import handlers, hmac_utils, metrics, tracing
+from ycmd.hmac_plugin import HmacPlugin
+from ycmd.web_plumbing import EventStream, RouteNotFound
 from ycmd.tests import IsolatedYcmd, PathToTestFile, SharedYcmd
 from ycmd.tests.test_utils import ( BuildRequest,
                                     DummyCompleter,
+                                    IsolatedApp,
                                     PatchCompleter,
                                     SignatureAvailableMatcher,
                                     ErrorMatcher )
@@ -44,6 +51,111 @@ class MiscHandlersTest( TestCase ):
                    equal_to( True ) )
 
 
+  @IsolatedYcmd( { 'enable_metrics': 1 } )
+  def test_MiscHandlers_Metrics( self, app ):
+    with patch.object( metrics, 'REGISTRY', metrics.Registry() ):
+      app.post_json( '/completions',
+                     BuildRequest( contents = 'foobar\nfoo',
+                                   line_num = 2,
+                                   column_num = 4 ) )
+      response = app.get( '/metrics' )
+
+    assert_that( response.headers[ 'Content-Type' ],
+                 equal_to( 'text/plain; version=0.0.4' ) )
+    assert_that( response.text, contains_string(
+      'ycmd_completer_duration_seconds_count{completer="IdentifierCompleter",'
+      'stage="filter_and_sort"} 1\n' ) )
+
+
+  @SharedYcmd
+  def test_MiscHandlers_Metrics_Disabled( self, app ):
+    assert_that( app.get( '/metrics' ).text, equal_to( '' ) )
+
+
+  @IsolatedYcmd( { 'enable_tracing': 1,
+                   'tracing_slow_request_threshold_ms': 0 } )
+  def test_MiscHandlers_Trace( self, app ):
+    tracing.ClearTraces()
+    with tracing.Trace( '/completions' ):
+      app.post_json( '/completions',
+                     BuildRequest( contents = 'foobar\nfoo',
+                                   line_num = 2,
+                                   column_num = 4 ) )
+    events = app.get( '/trace' ).json[ 'traceEvents' ]
+    tracing.ClearTraces()
+
+    assert_that( events, has_items(
+      has_entries( { 'name': '/completions', 'ph': 'X' } ),
+      has_entries( { 'name': 'RequestWrap', 'ph': 'X' } ),
+      has_entries( { 'name': 'IdentifierCompleter.filter_and_sort',
+                     'ph': 'X' } ) ) )
+
+
+  @SharedYcmd
+  def test_MiscHandlers_Trace_Disabled( self, app ):
+    assert_that( app.get( '/trace' ).json,
+                 has_entries( { 'traceEvents': empty() } ) )
+
+
+  @SharedYcmd
+  def test_MiscHandlers_Profiler( self, app ):
+    with TemporaryDirectory() as tmp_dir:
+      filepath = os.path.join( tmp_dir, 'profile.folded' )
+      assert_that( app.post_json( '/profiler/start',
+                                  { 'sampling_interval_ms': 1 } ).json,
+                   equal_to( True ) )
+      assert_that(
+        app.post_json( '/profiler/start', {}, expect_errors = True ).json,
+        ErrorMatcher( RuntimeError, 'The profiler is already running.' ) )
+      assert_that( app.post_json( '/profiler/stop',
+                                  { 'filepath': filepath } ).json,
+                   has_entries( { 'filepath': filepath } ) )
+      assert_that( os.path.exists( filepath ), equal_to( True ) )
+
+    assert_that(
+      app.post_json( '/profiler/stop', {}, expect_errors = True ).json,
+      ErrorMatcher( RuntimeError, 'The profiler is not running.' ) )
+
+
+  @IsolatedYcmd()
+  def test_MiscHandlers_MemoryUsage( self, app ):
+    app.post_json( '/event_notification',
+                   BuildRequest( contents = 'foo foogoo ba',
+                                 event_name = 'FileReadyToParse' ) )
+
+    assert_that( app.get( '/memory_usage' ).json, has_entries( {
+      'repositories': has_entries( {
+        'candidates': has_entries( { 'entries': greater_than( 0 ),
+                                     'bytes': greater_than( 0 ) } ),
+        'characters': has_entries( { 'entries': greater_than( 0 ) } ),
+        'code_points': has_entries( { 'entries': greater_than( 0 ) } )
+      } ),
+      'general_completers': has_entries( {
+        'identifier': has_entries( {
+          'identifier_database': has_entries( {
+            'filetypes': has_entries( {
+              'foo': has_entries( {
+                'entries': 3,
+                'files': has_entries( {
+                  '/foo': has_entries( { 'entries': 3,
+                                         'bytes': greater_than( 0 ) } )
+                } )
+              } )
+            } )
+          } )
+        } ),
+        'filename': has_entries( {
+          'candidates_for_directory': has_entries( { 'entries': 0 } )
+        } )
+      } )
+    } ) )
+
+
+  @SharedYcmd
+  def test_MiscHandlers_TrimCaches( self, app ):
+    assert_that( app.post_json( '/trim_caches', {} ).json, equal_to( True ) )
+
+
   @SharedYcmd
   def test_MiscHandlers_SignatureHelpAvailable( self, app ):
     response = app.get( '/signature_help_available', expect_errors = True ).json
@@ -238,6 +350,60 @@ class MiscHandlersTest( TestCase ):
                    equal_to( False ) )
 
 
+  @SharedYcmd
+  def test_MiscHandlers_MessageStream_NoCompleter( self, app ):
+    request_data = BuildRequest()
+    assert_that( app.post_json( '/message_stream', request_data ).json,
+                 equal_to( False ) )
+
+
+  @SharedYcmd
+  def test_MiscHandlers_MessageStream( self, app ):
+    with PatchCompleter( DummyCompleter, filetype = 'dummy_filetype' ):
+      with patch.object( DummyCompleter,
+                         'PollForMessagesInner',
+                         side_effect = [ [ { 'message': 'a' } ],
+                                         [ { 'message': 'b' } ],
+                                         True,
+                                         True,
+                                         [ { 'message': 'c' } ],
+                                         False ] ):
+        request_data = BuildRequest( filetype = 'dummy_filetype' )
+        response = app.post_json( '/message_stream', request_data )
+
+    assert_that( response.headers[ 'Content-Type' ],
+                 equal_to( 'text/event-stream' ) )
+    assert_that( response.text, equal_to(
+      ': stream\n\n'
+      'event: messages\n'
+      'data: [{"message":"a"},{"message":"b"}]\n\n'
+      ': heartbeat\n\n'
+      'event: messages\n'
+      'data: [{"message":"c"}]\n\n'
+      'event: done\n'
+      'data: false\n\n' ) )
+
+
+  @patch( 'ycmd.hmac_plugin.HostHeaderCorrect', return_value = True )
+  @patch( 'ycmd.hmac_plugin.RequestAuthenticated', return_value = True )
+  def test_MiscHandlers_MessageStream_EventHmac( self, *args ):
+    stream = EventStream( [ ( 'done', 'false' ) ] )
+    callback = HmacPlugin( b'secret' )( lambda request, response: stream )
+    body = callback( MagicMock(), MagicMock() )
+
+    event_hmac = b64encode(
+      hmac_utils.CreateHmac( b'done\nfalse', b'secret' ) ).decode()
+    assert_that( list( body ), contains_exactly(
+      ': stream\n\n',
+      f'event: done\ndata: false\nhmac: { event_hmac }\n\n' ) )
+
+
+  def test_MiscHandlers_MessageStream_NotShuttingDownAfterRestart( self ):
+    handlers._shutting_down.set()
+    with IsolatedApp():
+      assert_that( handlers._shutting_down.is_set(), equal_to( False ) )
+
+
   @SharedYcmd
   @patch( 'ycmd.completers.completer.Completer.ShouldUseSignatureHelpNow',
           return_value = True )
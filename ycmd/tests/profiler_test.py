@@ -0,0 +1,113 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import threading
+from hamcrest import ( assert_that,
+                       calling,
+                       contains_string,
+                       equal_to,
+                       greater_than,
+                       has_entries,
+                       raises )
+from unittest import TestCase
+from ycmd import profiler
+from ycmd.utils import ReadFile
+
+
+def _BusyFunction( stop_event ):
+  while not stop_event.is_set():
+    pass
+
+
+class ProfilerTest( TestCase ):
+  def test_Profiler_CollapsedStacks( self ):
+    stop_event = threading.Event()
+    thread = threading.Thread( target = _BusyFunction,
+                               args = ( stop_event, ),
+                               name = 'busy thread' )
+    thread.start()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      filepath = os.path.join( tmp_dir, 'profile.folded' )
+      profiler.Start( 0.001 )
+      try:
+        assert_that( profiler.IsRunning(), equal_to( True ) )
+        while not profiler._sampler.number_of_samples:
+          stop_event.wait( 0.01 )
+      finally:
+        result = profiler.Stop( filepath )
+        stop_event.set()
+        thread.join()
+
+      assert_that( profiler.IsRunning(), equal_to( False ) )
+      assert_that( result, has_entries( {
+        'filepath': filepath,
+        'samples': greater_than( 0 )
+      } ) )
+      stacks = ReadFile( filepath )
+
+    busy_stack = next( line for line in stacks.splitlines()
+                       if line.startswith( 'busy thread;' ) )
+    assert_that( busy_stack, contains_string( ';_BusyFunction (' ) )
+    assert_that( busy_stack, contains_string( 'profiler_test.py:' ) )
+    count = busy_stack.rsplit( ' ', 1 )[ 1 ]
+    assert_that( int( count ), greater_than( 0 ) )
+
+
+  def test_Profiler_TemporaryFile( self ):
+    profiler.Start( 0.001 )
+    result = profiler.Stop()
+    try:
+      assert_that( os.path.basename( result[ 'filepath' ] ),
+                   contains_string( f'ycmd_profile_{ os.getpid() }_' ) )
+    finally:
+      os.remove( result[ 'filepath' ] )
+
+
+  def test_Profiler_AlreadyRunning( self ):
+    profiler.Start( 0.001 )
+    try:
+      assert_that( calling( profiler.Start ).with_args( 0.001 ),
+                   raises( RuntimeError, 'The profiler is already running' ) )
+    finally:
+      os.remove( profiler.Stop()[ 'filepath' ] )
+
+
+  def test_Profiler_NotRunning( self ):
+    assert_that( calling( profiler.Stop ),
+                 raises( RuntimeError, 'The profiler is not running' ) )
+
+
+  def test_Profiler_NonPositiveInterval( self ):
+    for sampling_interval in [ 0, -0.001 ]:
+      assert_that( calling( profiler.Start ).with_args( sampling_interval ),
+                   raises( ValueError,
+                           'The sampling interval must be positive' ) )
+    assert_that( profiler.IsRunning(), equal_to( False ) )
+
+
+  def test_Profiler_UnwritableFileKeepsRunning( self ):
+    profiler.Start( 0.001 )
+    try:
+      with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join( tmp_dir, 'missing', 'profile.folded' )
+        assert_that( calling( profiler.Stop ).with_args( filepath ),
+                     raises( OSError ) )
+      assert_that( profiler.IsRunning(), equal_to( True ) )
+    finally:
+      os.remove( profiler.Stop()[ 'filepath' ] )
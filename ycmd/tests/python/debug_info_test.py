@@ -19,14 +19,23 @@ from hamcrest import ( assert_that,
                        contains_exactly,
                        has_entry,
                        has_entries,
+                       has_items,
                        instance_of )
 from unittest import TestCase
+import time
 
+from ycmd.completers.python import jedi_operations
 from ycmd.tests.python import setUpModule # noqa
-from ycmd.tests.python import SharedYcmd
+from ycmd.tests.python import IsolatedYcmd, PathToTestFile, SharedYcmd
 from ycmd.tests.test_utils import BuildRequest
 
 
+def DebugInfoItems( app, request_data ):
+  debug_info = app.post_json( '/debug_info', request_data ).json
+  return { item[ 'key' ]: item[ 'value' ]
+           for item in debug_info[ 'completer' ][ 'items' ] }
+
+
 class DebugInfoTest( TestCase ):
   @SharedYcmd
   def test_DebugInfo( self, app ):
@@ -59,7 +68,86 @@ class DebugInfoTest( TestCase ):
           has_entries( {
             'key': 'Parso version',
             'value': instance_of( str )
+          } ),
+          has_entries( {
+            'key': 'Jedi warmed up modules',
+            'value': instance_of( str )
+          } ),
+          has_entries( {
+            'key': 'Jedi modules to warm up',
+            'value': instance_of( str )
+          } ),
+          has_entries( {
+            'key': 'Jedi module being warmed up',
+            'value': None
           } )
         )
       } ) )
     )
+
+
+  @IsolatedYcmd( { 'python_jedi_worker_processes': 2 } )
+  def test_DebugInfo_JediWorkers( self, app ):
+    request_data = BuildRequest( filetype = 'python' )
+    assert_that(
+      app.post_json( '/debug_info', request_data ).json,
+      has_entry( 'completer', has_entries( {
+        'name': 'Python',
+        'items': has_items(
+          has_entries( {
+            'key': 'Jedi worker processes',
+            'value': '2'
+          } ),
+          has_entries( {
+            'key': 'Jedi worker 0',
+            'value': instance_of( str )
+          } ),
+          has_entries( {
+            'key': 'Jedi worker 1',
+            'value': instance_of( str )
+          } )
+        )
+      } ) )
+    )
+
+
+  @IsolatedYcmd( { 'python_jedi_worker_processes': 1 } )
+  def test_DebugInfo_WarmUp( self, app ):
+    request_data = BuildRequest( filepath = PathToTestFile( 'basic.py' ),
+                                 filetype = 'python',
+                                 contents = 'import json\nimport xml.dom\n',
+                                 event_name = 'FileReadyToParse' )
+    app.post_json( '/event_notification', request_data )
+
+    # The imports of the file and the common modules of the standard library
+    # are warmed up.
+    number_of_modules = len( jedi_operations.COMMON_STDLIB_MODULES ) + 1
+    expiration = time.time() + 60
+    while True:
+      items = DebugInfoItems( app, request_data )
+      if items[ 'Jedi warmed up modules' ] == str( number_of_modules ):
+        break
+      if time.time() > expiration:
+        raise RuntimeError( 'Waited for the warm-up for 60 seconds, '
+                            'aborting.' )
+      time.sleep( 0.1 )
+
+    assert_that( items, has_entries( {
+      'Jedi modules to warm up': '0',
+      'Jedi module being warmed up': None
+    } ) )
+
+
+  @IsolatedYcmd()
+  def test_DebugInfo_NoWarmUpInProcess( self, app ):
+    request_data = BuildRequest( filepath = PathToTestFile( 'basic.py' ),
+                                 filetype = 'python',
+                                 contents = 'import json\n',
+                                 event_name = 'FileReadyToParse' )
+    app.post_json( '/event_notification', request_data )
+
+    assert_that( DebugInfoItems( app, request_data ), has_entries( {
+      'Jedi warmed up modules': '0',
+      'Jedi modules to warm up': '0',
+      'Jedi module being warmed up': None
+    } ) )
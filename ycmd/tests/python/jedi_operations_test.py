@@ -0,0 +1,136 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+from hamcrest import assert_that, equal_to, is_not, same_instance
+from unittest import TestCase
+from unittest.mock import patch
+import jedi
+
+from ycmd.completers.python import jedi_operations
+from ycmd.completers.python.jedi_operations import ( ScriptCache,
+                                                     TopLevelImports )
+from ycmd.tests.python import PathToTestFile
+
+
+def Request( contents, filepath = PathToTestFile( 'basic.py' ) ):
+  return {
+    'filepath': filepath,
+    'contents': contents,
+    'line_num': 1,
+    'start_codepoint': 1,
+    'column_codepoint': 1
+  }
+
+
+class ScriptCacheTest( TestCase ):
+  def setUp( self ):
+    self._environment = jedi.get_default_environment()
+    self._project = jedi.Project( PathToTestFile() )
+
+
+  def test_ScriptCache_SameContents( self ):
+    cache = ScriptCache()
+    script = cache.Get( self._project, self._environment, Request( 'a = 1' ) )
+    assert_that( cache.Get( self._project,
+                            self._environment,
+                            Request( 'a = 1' ) ),
+                 same_instance( script ) )
+    assert_that( ( cache.hits, cache.misses ), equal_to( ( 1, 1 ) ) )
+
+
+  def test_ScriptCache_ContentsChanged( self ):
+    cache = ScriptCache()
+    script = cache.Get( self._project, self._environment, Request( 'a = 1' ) )
+    assert_that( cache.Get( self._project,
+                            self._environment,
+                            Request( 'a = 12' ) ),
+                 is_not( same_instance( script ) ) )
+    assert_that( cache.Size(), equal_to( 1 ) )
+
+
+  def test_ScriptCache_ProjectChanged( self ):
+    cache = ScriptCache()
+    script = cache.Get( self._project, self._environment, Request( 'a = 1' ) )
+    assert_that( cache.Get( jedi.Project( PathToTestFile() ),
+                            self._environment,
+                            Request( 'a = 1' ) ),
+                 is_not( same_instance( script ) ) )
+
+
+  def test_ScriptCache_TooOld( self ):
+    cache = ScriptCache()
+    with patch( 'time.monotonic', return_value = 100 ):
+      script = cache.Get( self._project,
+                          self._environment,
+                          Request( 'a = 1' ) )
+    with patch( 'time.monotonic',
+                return_value = 100 + jedi_operations.MAX_SCRIPT_AGE ):
+      assert_that( cache.Get( self._project,
+                              self._environment,
+                              Request( 'a = 1' ) ),
+                   is_not( same_instance( script ) ) )
+
+
+  def test_ScriptCache_LeastRecentlyUsedFileDropped( self ):
+    cache = ScriptCache( max_size = 2 )
+    first = cache.Get( self._project,
+                       self._environment,
+                       Request( 'a = 1', PathToTestFile( 'first.py' ) ) )
+    second = cache.Get( self._project,
+                        self._environment,
+                        Request( 'a = 1', PathToTestFile( 'second.py' ) ) )
+    cache.Get( self._project,
+               self._environment,
+               Request( 'a = 1', PathToTestFile( 'first.py' ) ) )
+    cache.Get( self._project,
+               self._environment,
+               Request( 'a = 1', PathToTestFile( 'third.py' ) ) )
+
+    assert_that( cache.Size(), equal_to( 2 ) )
+    assert_that( cache.Get( self._project,
+                            self._environment,
+                            Request( 'a = 1', PathToTestFile( 'first.py' ) ) ),
+                 same_instance( first ) )
+    assert_that( cache.Get( self._project,
+                            self._environment,
+                            Request( 'a = 1',
+                                     PathToTestFile( 'second.py' ) ) ),
+                 is_not( same_instance( second ) ) )
+
+
+  def test_ScriptCache_Remove( self ):
+    cache = ScriptCache()
+    cache.Get( self._project, self._environment, Request( 'a = 1' ) )
+    cache.Remove( PathToTestFile( 'basic.py' ) )
+    assert_that( cache.Size(), equal_to( 0 ) )
+
+
+class TopLevelImportsTest( TestCase ):
+  def test_TopLevelImports( self ):
+    assert_that( TopLevelImports( 'import os.path as path, sys\n'
+                                  'from collections import abc, deque\n'
+                                  'from . import sibling\n'
+                                  'from .sibling import name\n'
+                                  'try:\n'
+                                  '  import ujson as json\n'
+                                  'except ImportError:\n'
+                                  '  import json\n'
+                                  'def Function():\n'
+                                  '  import inner\n'
+                                  'import sys\n' ),
+                 equal_to( [ 'os.path', 'sys', 'collections', 'ujson',
+                             'json' ] ) )
@@ -0,0 +1,310 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+from hamcrest import ( assert_that,
+                       calling,
+                       contains_exactly,
+                       contains_string,
+                       equal_to,
+                       has_entries,
+                       has_items,
+                       is_not,
+                       raises,
+                       same_instance )
+from unittest import TestCase
+from unittest.mock import patch
+import sys
+import threading
+import time
+
+from ycmd.completers.python import jedi_operations
+from ycmd.completers.python.jedi_worker import ( JediRequestCancelled,
+                                                 JediWorkerPool,
+                                                 _JediWorker )
+from ycmd.request_wrap import RequestWrap
+from ycmd.tests.python import setUpModule # noqa
+from ycmd.tests.python import IsolatedYcmd, PathToTestFile
+from ycmd.tests.test_utils import ( BuildRequest,
+                                    CompletionEntryMatcher,
+                                    ErrorMatcher )
+from ycmd.utils import ReadFile
+
+
+def BasicRequest( line_num, column_num ):
+  filepath = PathToTestFile( 'basic.py' )
+  return jedi_operations.JediRequest( RequestWrap(
+    BuildRequest( filepath = filepath,
+                  filetype = 'python',
+                  contents = ReadFile( filepath ),
+                  line_num = line_num,
+                  column_num = column_num ) ) )
+
+
+class BlockingExecute:
+  """Replaces _JediWorker._Execute to hold the jobs until they are
+  released."""
+
+  def __init__( self ):
+    self.started = threading.Event()
+    self.release = threading.Event()
+
+
+  def __call__( self, job ):
+    self.started.set()
+    self.release.wait( 10 )
+    return job.operation
+
+
+class JediWorkerTest( TestCase ):
+  @IsolatedYcmd( { 'python_jedi_worker_processes': 2 } )
+  def test_JediWorker_Completions( self, app ):
+    filepath = PathToTestFile( 'basic.py' )
+    completion_data = BuildRequest( filepath = filepath,
+                                    filetype = 'python',
+                                    contents = ReadFile( filepath ),
+                                    line_num = 7,
+                                    column_num = 3 )
+
+    results = app.post_json( '/completions',
+                             completion_data ).json[ 'completions' ]
+    assert_that( results,
+                 has_items(
+                   CompletionEntryMatcher( 'a',
+                                           'self.a = 1',
+                                           {
+                                             'detailed_info': '',
+                                             'kind': 'statement'
+                                           } ),
+                   CompletionEntryMatcher( 'b',
+                                           'self.b = 2',
+                                           {
+                                             'detailed_info': '',
+                                             'kind': 'statement'
+                                           } )
+                 ) )
+
+
+  @IsolatedYcmd( { 'python_jedi_worker_processes': 1 } )
+  def test_JediWorker_Subcommands( self, app ):
+    filepath = PathToTestFile( 'basic.py' )
+    command_data = BuildRequest( filepath = filepath,
+                                 filetype = 'python',
+                                 contents = ReadFile( filepath ),
+                                 line_num = 7,
+                                 column_num = 3,
+                                 command_arguments = [ 'GoTo' ] )
+    assert_that(
+      app.post_json( '/run_completer_command', command_data ).json,
+      has_entries( {
+        'filepath': filepath,
+        'line_num': 3,
+        'column_num': 10
+      } )
+    )
+
+    # Errors raised in the worker are returned to the client.
+    command_data = BuildRequest( filepath = filepath,
+                                 filetype = 'python',
+                                 contents = ReadFile( filepath ),
+                                 line_num = 5,
+                                 column_num = 1,
+                                 command_arguments = [ 'GoTo' ] )
+    response = app.post_json( '/run_completer_command',
+                              command_data,
+                              expect_errors = True ).json
+    assert_that( response,
+                 ErrorMatcher( RuntimeError, 'Can\'t jump to definition.' ) )
+
+
+  def test_JediWorker_ShardsAreSpreadOverWorkers( self ):
+    with patch.object( _JediWorker, '_Execute', return_value = None ):
+      pool = JediWorkerPool( 2 )
+      try:
+        first = pool._WorkerForShard( ( 'python', '/first', () ) )
+        second = pool._WorkerForShard( ( 'python', '/second', () ) )
+        assert_that( first, is_not( same_instance( second ) ) )
+        # A shard is identified by the interpreter and the project directory.
+        assert_that( pool._WorkerForShard( ( 'python', '/first', ( 'a', ) ) ),
+                     same_instance( first ) )
+      finally:
+        pool.Shutdown()
+
+
+  def test_JediWorker_SupersededCompletionsAreCancelled( self ):
+    execute = BlockingExecute()
+    with patch.object( _JediWorker, '_Execute', execute ):
+      pool = JediWorkerPool( 1 )
+      try:
+        worker = pool._workers[ 0 ]
+        results = {}
+
+        def Run( name, operation, supersede_key ):
+          try:
+            results[ name ] = worker.Run( operation,
+                                          None,
+                                          10,
+                                          supersede_key = supersede_key )
+          except JediRequestCancelled as error:
+            results[ name ] = error
+
+        # Keep the worker busy so that the next requests are queued.
+        busy = threading.Thread( target = Run,
+                                 args = ( 'busy', 'GoToReferences', None ) )
+        busy.start()
+        execute.started.wait( 10 )
+
+        old = threading.Thread( target = Run,
+                                args = ( 'old', 'Complete', 'file' ) )
+        old.start()
+        while not worker._queue:
+          time.sleep( 0.01 )
+        new = threading.Thread( target = Run,
+                                args = ( 'new', 'Complete', 'file' ) )
+        new.start()
+        old.join( 10 )
+
+        execute.release.set()
+        busy.join( 10 )
+        new.join( 10 )
+
+        assert_that( results[ 'busy' ], equal_to( 'GoToReferences' ) )
+        assert_that( str( results[ 'old' ] ), contains_string( 'superseded' ) )
+        assert_that( results[ 'new' ], equal_to( 'Complete' ) )
+        assert_that( worker.Describe(),
+                     contains_string( 'superseded requests: 1' ) )
+      finally:
+        execute.release.set()
+        pool.Shutdown()
+
+
+  def test_JediWorker_BackgroundRequestsRunWhenIdle( self ):
+    execute = BlockingExecute()
+    executed = []
+
+    def Execute( job ):
+      executed.append( job.operation )
+      return execute( job )
+
+    with patch.object( _JediWorker, '_Execute', side_effect = Execute ):
+      pool = JediWorkerPool( 1 )
+      try:
+        worker = pool._workers[ 0 ]
+        threads = []
+
+        def Run( operation, background ):
+          thread = threading.Thread(
+            target = worker.Run,
+            args = ( operation, None, 10 ),
+            kwargs = { 'background': background } )
+          thread.start()
+          threads.append( thread )
+
+        # Keep the worker busy so that the next requests are queued.
+        Run( 'GoToReferences', False )
+        execute.started.wait( 10 )
+        Run( 'WarmUp', True )
+        while len( worker._queue ) < 1:
+          time.sleep( 0.01 )
+        Run( 'GetDoc', False )
+        while len( worker._queue ) < 2:
+          time.sleep( 0.01 )
+
+        execute.release.set()
+        for thread in threads:
+          thread.join( 10 )
+
+        assert_that( executed,
+                     contains_exactly( 'GoToReferences', 'GetDoc', 'WarmUp' ) )
+      finally:
+        execute.release.set()
+        pool.Shutdown()
+
+
+  def test_JediWorker_Timeout( self ):
+    execute = BlockingExecute()
+    with patch.object( _JediWorker, '_Execute', execute ):
+      pool = JediWorkerPool( 1 )
+      try:
+        worker = pool._workers[ 0 ]
+        assert_that(
+          calling( worker.Run ).with_args( 'GoToReferences', None, 0.1 ),
+          raises( RuntimeError, 'Jedi GoToReferences request timed out' ) )
+        assert_that( worker.Describe(), contains_string( 'timeouts: 1' ) )
+
+        # The worker is still usable once the request it was running is done.
+        execute.release.set()
+        assert_that( worker.Run( 'GetDoc', None, 10 ), equal_to( 'GetDoc' ) )
+      finally:
+        execute.release.set()
+        pool.Shutdown()
+
+
+  def test_JediWorker_RestartedAfterExiting( self ):
+    pool = JediWorkerPool( 1 )
+    try:
+      spec = ( sys.executable, PathToTestFile(), () )
+      worker = pool._workers[ 0 ]
+      pool.Run( 'GetType', spec, BasicRequest( 7, 3 ) )
+      worker._process.kill()
+      worker._process.wait()
+
+      assert_that( pool.Run( 'GetType', spec, BasicRequest( 7, 3 ) ),
+                   has_entries( { 'message': 'instance int' } ) )
+      assert_that( worker.Describe(), contains_string( 'restarts: 1' ) )
+    finally:
+      pool.Shutdown()
+
+
+  def test_JediWorker_CompletionsOfRestartedWorkerNotDetailed( self ):
+    pool = JediWorkerPool( 1 )
+    try:
+      spec = ( sys.executable, PathToTestFile(), () )
+      worker = pool._workers[ 0 ]
+      _, old_completion = pool.Complete( spec, BasicRequest( 7, 3 ) )[ 0 ]
+      worker._process.kill()
+      worker._process.wait()
+
+      # The new process counts its completion requests from 0 as well.
+      _, new_completion = pool.Complete( spec, BasicRequest( 7, 3 ) )[ 0 ]
+      assert_that( new_completion.generation,
+                   equal_to( old_completion.generation ) )
+      assert_that( pool.DetailCompletions( [ old_completion,
+                                             new_completion ] ),
+                   contains_exactly( None, is_not( None ) ) )
+    finally:
+      pool.Shutdown()
+
+
+  def test_JediWorker_DebugInfoItems( self ):
+    with patch.object( _JediWorker, '_Execute', return_value = None ):
+      pool = JediWorkerPool( 2 )
+      try:
+        pool.Run( 'GetDoc', ( 'python', '/project', () ), None )
+        items = pool.DebugInfoItems()
+        assert_that( [ item.key for item in items ], contains_exactly(
+          'Jedi worker processes',
+          'Jedi worker 0',
+          'Jedi worker 1',
+          'Jedi GetDoc latency' ) )
+        assert_that( { item.key: item.value for item in items }, has_entries( {
+          'Jedi worker processes': '2',
+          'Jedi worker 0': contains_string( 'projects: 1' ),
+          'Jedi worker 1': contains_string( 'projects: 0' ),
+          'Jedi GetDoc latency': contains_string( '1 requests' )
+        } ) )
+      finally:
+        pool.Shutdown()
@@ -53,6 +53,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str )
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': instance_of( str )
@@ -108,6 +111,9 @@ class DebugInfoTest( TestCase ):
               'key': 'Server State',
               'value': instance_of( str )
             } ),
+            has_entries( {
+              'key': 'Time To First Semantic Completion',
+            } ),
             has_entries( {
               'key': 'Project Directory',
               'value': instance_of( str )
@@ -0,0 +1,241 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+import threading
+import time
+from hamcrest import assert_that, contains_exactly, empty, equal_to, has_entries
+from unittest import TestCase
+from unittest.mock import patch
+from ycmd.scheduler import Priority, RequestSuperseded, Scheduler
+
+
+class _Request:
+  """Runs a request of |priority| in a thread. The request records its name in
+  |started| when it starts running, then runs until Finish is called."""
+
+  def __init__( self, scheduler, priority, name, started, **kwargs ):
+    self._running = threading.Event()
+    self._finish = threading.Event()
+    self.superseded = False
+
+    def Run():
+      try:
+        with scheduler.Run( priority, **kwargs ):
+          started.append( name )
+          self._running.set()
+          self._finish.wait()
+      except RequestSuperseded:
+        self.superseded = True
+
+    self._thread = threading.Thread( target = Run )
+    self._thread.start()
+
+
+  def WaitUntilRunning( self ):
+    assert_that( self._running.wait( 5 ), equal_to( True ) )
+
+
+  def IsRunning( self ):
+    return self._running.is_set()
+
+
+  def Finish( self ):
+    self._finish.set()
+    self._thread.join()
+
+
+def _WaitUntilQueued( scheduler, **queue_lengths ):
+  for _ in range( 500 ):
+    if scheduler.QueueLengths() == queue_lengths:
+      return
+    time.sleep( 0.01 )
+  assert_that( scheduler.QueueLengths(), equal_to( queue_lengths ) )
+
+
+class SchedulerTest( TestCase ):
+  def test_Scheduler_InteractiveRequestsDoNotWait( self ):
+    scheduler = Scheduler( 'completer', max_delay = 60 )
+    started = []
+    event = _Request( scheduler, Priority.EVENT, 'event', started )
+    event.WaitUntilRunning()
+    command = _Request( scheduler, Priority.BACKGROUND, 'command', started )
+    _WaitUntilQueued( scheduler, event = 0, background = 1 )
+
+    completion = _Request( scheduler, Priority.INTERACTIVE, 'completion',
+                           started )
+    completion.WaitUntilRunning()
+    assert_that( started, contains_exactly( 'event', 'completion' ) )
+
+    completion.Finish()
+    event.Finish()
+    command.WaitUntilRunning()
+    command.Finish()
+
+
+  def test_Scheduler_MoreUrgentRequestsRunFirst( self ):
+    scheduler = Scheduler( 'completer', max_delay = 60 )
+    started = []
+    completion = _Request( scheduler, Priority.INTERACTIVE, 'completion',
+                           started )
+    completion.WaitUntilRunning()
+
+    command = _Request( scheduler, Priority.BACKGROUND, 'command', started )
+    _WaitUntilQueued( scheduler, event = 0, background = 1 )
+    first_event = _Request( scheduler, Priority.EVENT, 'first event', started )
+    second_event = _Request( scheduler, Priority.EVENT, 'second event',
+                             started )
+    _WaitUntilQueued( scheduler, event = 2, background = 1 )
+    assert_that( started, contains_exactly( 'completion' ) )
+
+    completion.Finish()
+    # Events run one at a time, in the order they were received.
+    first_event.WaitUntilRunning()
+    assert_that( second_event.IsRunning(), equal_to( False ) )
+    first_event.Finish()
+    second_event.WaitUntilRunning()
+    assert_that( command.IsRunning(), equal_to( False ) )
+    second_event.Finish()
+    command.WaitUntilRunning()
+    command.Finish()
+
+    assert_that( started, contains_exactly( 'completion',
+                                            'first event',
+                                            'second event',
+                                            'command' ) )
+    assert_that( scheduler.QueueLengths(), has_entries( {
+      'event': 0,
+      'background': 0
+    } ) )
+
+
+  def test_Scheduler_EventsOfDifferentFilesDoNotWait( self ):
+    scheduler = Scheduler( 'completer', max_delay = 60 )
+    started = []
+    first_event = _Request( scheduler, Priority.EVENT, 'first event', started,
+                            serialize_key = 'file' )
+    first_event.WaitUntilRunning()
+
+    # The events of a file still run one at a time.
+    second_event = _Request( scheduler, Priority.EVENT, 'second event',
+                             started, serialize_key = 'file' )
+    _WaitUntilQueued( scheduler, event = 1, background = 0 )
+    other_event = _Request( scheduler, Priority.EVENT, 'other event', started,
+                            serialize_key = 'other file' )
+    other_event.WaitUntilRunning()
+    assert_that( second_event.IsRunning(), equal_to( False ) )
+
+    other_event.Finish()
+    first_event.Finish()
+    second_event.WaitUntilRunning()
+    second_event.Finish()
+
+    assert_that( started, contains_exactly( 'first event',
+                                            'other event',
+                                            'second event' ) )
+    assert_that( scheduler._running_by_key, empty() )
+
+
+  def test_Scheduler_MaxDelay( self ):
+    scheduler = Scheduler( 'completer', max_delay = 0.05 )
+    started = []
+    completion = _Request( scheduler, Priority.INTERACTIVE, 'completion',
+                           started )
+    completion.WaitUntilRunning()
+
+    # The event stops waiting for the completion after the maximum delay.
+    event = _Request( scheduler, Priority.EVENT, 'event', started )
+    event.WaitUntilRunning()
+    assert_that( started, contains_exactly( 'completion', 'event' ) )
+
+    event.Finish()
+    completion.Finish()
+
+
+  def test_Scheduler_ReleasedOnException( self ):
+    scheduler = Scheduler( 'completer', max_delay = 60 )
+    with self.assertRaises( RuntimeError ):
+      with scheduler.Run( Priority.EVENT ):
+        raise RuntimeError( 'error' )
+
+    started = []
+    event = _Request( scheduler, Priority.EVENT, 'event', started )
+    event.WaitUntilRunning()
+    event.Finish()
+    assert_that( started, contains_exactly( 'event' ) )
+    assert_that( [ name for name, length in scheduler.QueueLengths().items()
+                   if length ], empty() )
+
+
+  def test_Scheduler_QueuedRequestsAreSuperseded( self ):
+    scheduler = Scheduler( 'completer', max_delay = 60 )
+    started = []
+    first_parse = _Request( scheduler, Priority.EVENT, 'first parse', started,
+                            supersede_key = 'file' )
+    first_parse.WaitUntilRunning()
+
+    second_parse = _Request( scheduler, Priority.EVENT, 'second parse',
+                             started, supersede_key = 'file' )
+    other_parse = _Request( scheduler, Priority.EVENT, 'other parse', started,
+                            supersede_key = 'other file' )
+    _WaitUntilQueued( scheduler, event = 2, background = 0 )
+    third_parse = _Request( scheduler, Priority.EVENT, 'third parse', started,
+                            supersede_key = 'file' )
+    # The second parse leaves the queue as soon as the third one arrives.
+    second_parse.Finish()
+    assert_that( second_parse.superseded, equal_to( True ) )
+    _WaitUntilQueued( scheduler, event = 2, background = 0 )
+
+    first_parse.Finish()
+    other_parse.WaitUntilRunning()
+    other_parse.Finish()
+    third_parse.WaitUntilRunning()
+    third_parse.Finish()
+
+    assert_that( started, contains_exactly( 'first parse',
+                                            'other parse',
+                                            'third parse' ) )
+    assert_that( third_parse.superseded, equal_to( False ) )
+
+
+  def test_Scheduler_DelayedRequestsAreSuperseded( self ):
+    scheduler = Scheduler( 'completer', max_delay = 60 )
+    started = []
+    first_parse = _Request( scheduler, Priority.EVENT, 'first parse', started,
+                            supersede_key = 'file', delay = 60 )
+    while 'file' not in scheduler._latest_tickets:
+      time.sleep( 0.01 )
+    second_parse = _Request( scheduler, Priority.EVENT, 'second parse',
+                             started, supersede_key = 'file', delay = 0.01 )
+    first_parse.Finish()
+    assert_that( first_parse.superseded, equal_to( True ) )
+    second_parse.WaitUntilRunning()
+    second_parse.Finish()
+
+    assert_that( started, contains_exactly( 'second parse' ) )
+
+
+  def test_Scheduler_DelayEndsWhileWaiting( self ):
+    scheduler = Scheduler( 'completer', max_delay = 60 )
+    # The delay ends between two reads of the clock while waiting.
+    times = iter( [ 0.0, 0.0, 0.05, 0.2 ] )
+    with patch( 'ycmd.scheduler.time.monotonic',
+                side_effect = lambda: next( times, 0.2 ) ):
+      with scheduler.Run( Priority.EVENT, supersede_key = 'file', delay = 0.1 ):
+        assert_that( scheduler.QueueLengths(),
+                     has_entries( { 'event': 0 } ) )
+
+    assert_that( scheduler._latest_tickets, empty() )
@@ -114,6 +114,53 @@ class GetCompletionsTest( TestCase ):
     } )
 
 
+  @SharedYcmd
+  def test_GetCompletions_LargeModifiedFile( self, app ):
+    # Only the lines around the cursor are sent to Tern for a large file whose
+    # previous version was already sent.
+    filepath = PathToTestFile( 'simple_test.js' )
+    padding = '// padding\n' * 300
+    contents = padding + ReadFile( filepath )
+    request = {
+      'filetype'  : 'javascript',
+      'filepath'  : filepath,
+      'line_num'  : 313,
+      'column_num': 43,
+    }
+
+    app.post_json( '/event_notification',
+                   CombineRequest( request, {
+                     'event_name': 'FileReadyToParse',
+                     'contents': contents,
+                   } ) )
+
+    response = app.post_json( '/completions',
+                              CombineRequest( request, {
+                                'contents': '// modified' + contents
+                              } ) ).json
+
+    print( f'completer response: { pformat( response ) }' )
+
+    assert_that( response, has_entries( {
+      'completions': contains_inanyorder(
+        CompletionEntryMatcher( 'a_simple_function',
+                                'fn(param: ?) -> string' ),
+        CompletionEntryMatcher( 'basic_type', 'number' ),
+        CompletionEntryMatcher( 'object', 'object' ),
+        CompletionEntryMatcher( 'toString', 'fn() -> string' ),
+        CompletionEntryMatcher( 'toLocaleString', 'fn() -> string' ),
+        CompletionEntryMatcher( 'valueOf', 'fn() -> number' ),
+        CompletionEntryMatcher( 'hasOwnProperty',
+                                'fn(prop: string) -> bool' ),
+        CompletionEntryMatcher( 'isPrototypeOf',
+                                'fn(obj: ?) -> bool' ),
+        CompletionEntryMatcher( 'propertyIsEnumerable',
+                                'fn(prop: string) -> bool' ),
+      ),
+      'errors': empty(),
+    } ) )
+
+
   @SharedYcmd
   def test_GetCompletions_Query( self, app ):
     RunTest( app, {
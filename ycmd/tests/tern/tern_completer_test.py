@@ -0,0 +1,80 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import TestCase
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries, none
+
+from ycmd import user_options_store
+from ycmd.completers.javascript.tern_completer import TernCompleter
+from ycmd.request_wrap import RequestWrap
+from ycmd.tests.tern import setUpModule, tearDownModule # noqa
+
+LARGE_FILE = '\n'.join( [ 'function f() {', '  return 1;', '}' ] * 100 )
+
+
+def BuildRequest( contents, line_num = 1, column_num = 1 ):
+  return RequestWrap( {
+    'filepath': '/large.js',
+    'line_num': line_num,
+    'column_num': column_num,
+    'file_data': {
+      '/large.js': { 'contents': contents, 'filetypes': [ 'javascript' ] },
+      '/small.js': { 'contents': 'var a;', 'filetypes': [ 'javascript' ] },
+      '/other.py': { 'contents': 'a = 1', 'filetypes': [ 'python' ] }
+    }
+  } )
+
+
+class TernCompleterTest( TestCase ):
+  def test_FilesToSend_SkipsUnchangedFiles( self ):
+    completer = TernCompleter( user_options_store.GetAll() )
+    request = BuildRequest( LARGE_FILE )
+    files, file_hashes = completer._FilesToSend( request, None )
+    assert_that( [ ( f[ 'type' ], f[ 'name' ] ) for f in files ],
+                 contains_exactly( ( 'full', '/large.js' ),
+                                   ( 'full', '/small.js' ) ) )
+
+    completer._file_hashes.update( file_hashes )
+    files, _ = completer._FilesToSend( BuildRequest( LARGE_FILE + '\n' ),
+                                       None )
+    assert_that( [ ( f[ 'type' ], f[ 'name' ] ) for f in files ],
+                 contains_exactly( ( 'full', '/large.js' ) ) )
+
+
+  def test_MakePart_OnlyForModifiedLargeFiles( self ):
+    completer = TernCompleter( user_options_store.GetAll() )
+    assert_that( completer._MakePart( BuildRequest( LARGE_FILE, 290 ) ),
+                 none() )
+
+    _, file_hashes = completer._FilesToSend( BuildRequest( LARGE_FILE ), None )
+    completer._file_hashes.update( file_hashes )
+    assert_that( completer._MakePart( BuildRequest( LARGE_FILE, 290 ) ),
+                 none() )
+    assert_that( completer._MakePart( BuildRequest( 'var a;\n', 1 ) ),
+                 none() )
+
+    # The part starts at the function before the cursor.
+    part = completer._MakePart( BuildRequest( LARGE_FILE + '\n', 290 ) )
+    assert_that( part, has_entries( {
+      'type': 'part',
+      'name': '/large.js',
+      'offsetLines': 288
+    } ) )
+    assert_that( part[ 'text' ],
+                 equal_to( '\n'.join( [ 'function f() {',
+                                         '  return 1;',
+                                         '}' ] * 4 ) + '\n' ) )
@@ -41,7 +41,11 @@ import stat
 import shutil
 import json
 
-from ycmd import extra_conf_store, handlers, user_options_store
+from ycmd import ( extra_conf_store,
+                   handlers,
+                   metrics,
+                   tracing,
+                   user_options_store )
 from ycmd.completers.completer import Completer
 from ycmd.responses import BuildCompletionData
 from ycmd.utils import ( GetCurrentDirectory,
@@ -59,7 +63,9 @@ TESTS_DIR = os.path.abspath( os.path.dirname( __file__ ) )
 TEST_OPTIONS = {
   # The 'client' represented by the tests supports on-demand resolve, but the
   # server default config doesn't for backward compatibility
-  'max_num_candidates_to_detail': 10
+  'max_num_candidates_to_detail': 10,
+  # Only start the language servers used by the tests.
+  'language_server_background_startup': 0
 }
 
 WindowsOnly = skipIf( not OnWindows(), 'Windows only' )
@@ -289,6 +295,8 @@ def IsolatedApp( custom_options = {} ):
   old_server_state = handlers._server_state
   old_extra_conf_store_state = extra_conf_store.Get()
   old_options = user_options_store.GetAll()
+  old_metrics_enabled = metrics.IsEnabled()
+  old_tracing_state = ( tracing._enabled, tracing._slow_request_threshold )
   try:
     with IgnoreExtraConfOutsideTestsFolder():
       yield SetUpApp( custom_options )
@@ -296,6 +304,8 @@ def IsolatedApp( custom_options = {} ):
     handlers._server_state = old_server_state
     extra_conf_store.Set( old_extra_conf_store_state )
     user_options_store.SetAll( old_options )
+    metrics.SetEnabled( old_metrics_enabled )
+    tracing._enabled, tracing._slow_request_threshold = old_tracing_state
 
 
 def StartCompleterServer( app, filetype, filepath = '/foo' ):
@@ -326,6 +336,24 @@ def WaitUntilCompleterServerReady( app, filetype, timeout = 30 ):
     time.sleep( 0.1 )
 
 
+def WaitUntilTagFilesAreLoaded( app, timeout = 10 ):
+  expiration = time.time() + timeout
+  while True:
+    if time.time() > expiration:
+      raise RuntimeError( f'Waited for the tag files to be loaded for '
+                          f'{ timeout } seconds, aborting.' )
+
+    debug_info = app.post_json(
+      '/debug_info',
+      BuildRequest( completer_target = 'identifier' ) ).json
+    items = { item[ 'key' ]: item[ 'value' ]
+              for item in debug_info[ 'completer' ][ 'items' ] }
+    if items[ 'Tag Files Pending' ] == 0:
+      return
+
+    time.sleep( 0.1 )
+
+
 def MockProcessTerminationTimingOut( handle, timeout = 5 ):
   WaitUntilProcessIsTerminated( handle, timeout )
   raise RuntimeError( f'Waited process to terminate for { timeout } seconds, '
@@ -0,0 +1,110 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+from hamcrest import ( assert_that,
+                       contains_exactly,
+                       empty,
+                       equal_to,
+                       has_entries )
+from unittest.mock import MagicMock
+from unittest import TestCase
+from ycmd import tracing
+from ycmd.tracing_plugin import TracingPlugin
+
+
+def _Configure( enabled, threshold_ms = 0 ):
+  tracing.Configure( { 'enable_tracing': enabled,
+                       'tracing_slow_request_threshold_ms': threshold_ms } )
+
+
+class TracingTest( TestCase ):
+  def setUp( self ):
+    tracing.ClearTraces()
+
+
+  def tearDown( self ):
+    _Configure( False )
+    tracing.ClearTraces()
+
+
+  def test_Trace_NestedSpans( self ):
+    _Configure( True )
+    with tracing.Trace( '/completions' ):
+      with tracing.Span( 'outer' ):
+        with tracing.Span( 'inner' ):
+          pass
+      with tracing.Span( 'sibling' ):
+        pass
+
+    events = tracing.ChromeTraceEvents()[ 'traceEvents' ]
+    assert_that( events, contains_exactly(
+      has_entries( { 'ph': 'M',
+                     'name': 'thread_name',
+                     'args': has_entries( {
+                       'name': equal_to( f'Request { events[ 0 ][ "tid" ] } '
+                                         '/completions' ) } ) } ),
+      has_entries( { 'ph': 'X', 'name': 'inner',
+                     'args': has_entries( { 'depth': 2 } ) } ),
+      has_entries( { 'ph': 'X', 'name': 'outer',
+                     'args': has_entries( { 'depth': 1 } ) } ),
+      has_entries( { 'ph': 'X', 'name': 'sibling',
+                     'args': has_entries( { 'depth': 1 } ) } ),
+      has_entries( { 'ph': 'X', 'name': '/completions',
+                     'args': has_entries( { 'depth': 0 } ) } ) ) )
+
+    inner, outer, _, root = events[ 1: ]
+    assert_that( outer[ 'ts' ] <= inner[ 'ts' ], equal_to( True ) )
+    assert_that( inner[ 'ts' ] + inner[ 'dur' ] <=
+                 outer[ 'ts' ] + outer[ 'dur' ], equal_to( True ) )
+    assert_that( root[ 'dur' ] >= outer[ 'dur' ], equal_to( True ) )
+
+
+  def test_Trace_FastRequestsAreDropped( self ):
+    _Configure( True, threshold_ms = 60000 )
+    with tracing.Trace( '/completions' ):
+      with tracing.Span( 'span' ):
+        pass
+
+    assert_that( tracing.ChromeTraceEvents()[ 'traceEvents' ], empty() )
+
+
+  def test_Trace_Disabled( self ):
+    _Configure( False )
+    with tracing.Trace( '/completions' ):
+      with tracing.Span( 'span' ):
+        pass
+
+    assert_that( tracing.ChromeTraceEvents()[ 'traceEvents' ], empty() )
+
+
+  def test_Span_OutsideOfTrace( self ):
+    _Configure( True )
+    with tracing.Span( 'span' ):
+      pass
+
+    assert_that( tracing.ChromeTraceEvents()[ 'traceEvents' ], empty() )
+
+
+  def test_TracingPlugin( self ):
+    _Configure( True )
+    callback = MagicMock( return_value = '{}' )
+    wrapper = TracingPlugin()( callback )
+
+    assert_that( wrapper( MagicMock( path = '/shutdown' ), MagicMock() ),
+                 equal_to( '{}' ) )
+    assert_that( tracing.ChromeTraceEvents()[ 'traceEvents' ][ -1 ],
+                 has_entries( { 'name': '/shutdown', 'ph': 'X' } ) )
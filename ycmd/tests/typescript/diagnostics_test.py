@@ -19,15 +19,29 @@ from hamcrest import ( assert_that,
                        contains_exactly,
                        contains_inanyorder,
                        has_entries,
-                       has_entry )
+                       has_entry,
+                       has_item )
 from unittest import TestCase
 
 from ycmd.tests.typescript import setUpModule, tearDownModule # noqa
 from ycmd.tests.typescript import IsolatedYcmd, PathToTestFile, SharedYcmd
-from ycmd.tests.test_utils import BuildRequest, LocationMatcher, RangeMatcher
+from ycmd.tests.test_utils import ( BuildRequest,
+                                    LocationMatcher,
+                                    PollForMessages,
+                                    RangeMatcher )
 from ycmd.utils import ReadFile
 
 
+def PollForDiagnostics( app, filepath, filetype ):
+  # The diagnostics are sent asynchronously once TSServer has checked the file.
+  for message in PollForMessages( app,
+                                  { 'filepath': filepath,
+                                    'contents': ReadFile( filepath ),
+                                    'filetype': filetype } ):
+    if 'diagnostics' in message and message[ 'filepath' ] == filepath:
+      return message[ 'diagnostics' ]
+
+
 class DiagnosticsTest( TestCase ):
   @SharedYcmd
   def test_Diagnostics_FileReadyToParse( self, app ):
@@ -45,8 +59,10 @@ class DiagnosticsTest( TestCase ):
                                contents = contents,
                                event_name = 'FileReadyToParse' )
 
+    app.post_json( '/event_notification', event_data )
+
     assert_that(
-      app.post_json( '/event_notification', event_data ).json,
+      PollForDiagnostics( app, filepath, 'typescript' ),
       contains_inanyorder(
         has_entries( {
           'kind': 'ERROR',
@@ -129,8 +145,10 @@ class DiagnosticsTest( TestCase ):
                                contents = contents,
                                event_name = 'FileReadyToParse' )
 
+    app.post_json( '/event_notification', event_data )
+
     assert_that(
-      app.post_json( '/event_notification', event_data ).json,
+      PollForDiagnostics( app, filepath, 'typescript' ),
       contains_inanyorder(
         has_entries( {
           'kind': 'ERROR',
@@ -152,3 +170,33 @@ class DiagnosticsTest( TestCase ):
         } ),
       )
     )
+
+
+  @IsolatedYcmd()
+  def test_Diagnostics_FileReadyToParse_CancelledRequest( self, app ):
+    # The geterr request for the second file cancels the one for the first
+    # file, which is requested again with the second file.
+    filepath = PathToTestFile( 'test.ts' )
+    other_filepath = PathToTestFile( 'file2.ts' )
+    for path in [ filepath, other_filepath ]:
+      app.post_json( '/event_notification',
+                     BuildRequest( filepath = path,
+                                   filetype = 'typescript',
+                                   contents = ReadFile( path ),
+                                   event_name = 'FileReadyToParse' ) )
+
+    diagnostics = {}
+    for message in PollForMessages( app,
+                                    { 'filepath': filepath,
+                                      'contents': ReadFile( filepath ),
+                                      'filetype': 'typescript' } ):
+      if 'diagnostics' in message:
+        diagnostics[ message[ 'filepath' ] ] = message[ 'diagnostics' ]
+      if len( diagnostics ) == 2:
+        break
+
+    assert_that( diagnostics, has_entry( filepath, has_item( has_entries( {
+      'kind': 'ERROR',
+      'text': "Property 'mA' does not exist on type 'Foo'.",
+      'location': LocationMatcher( filepath, 17, 5 )
+    } ) ) ) )
@@ -17,12 +17,13 @@
 
 from unittest.mock import patch
 from unittest import TestCase
-from hamcrest import assert_that, equal_to
+from hamcrest import assert_that, equal_to, has_entries, none
 
 from ycmd import user_options_store
 from ycmd.completers.typescript.typescript_completer import (
     ShouldEnableTypeScriptCompleter,
-    FindTSServer )
+    FindTSServer,
+    _ComputeChange )
 from ycmd.tests.typescript import setUpModule, tearDownModule # noqa
 
 
@@ -43,3 +44,53 @@ class TypescriptCompleterTest( TestCase ):
   @patch( 'os.path.isfile', return_value = True )
   def test_FindTSServer_CustomTsserverPath( self, *args ):
     assert_that( 'tsserver', equal_to( FindTSServer( 'tsserver' ) ) )
+
+
+  def test_ComputeChange_Insertion( self ):
+    assert_that( _ComputeChange( 'let a = 1;\nlet b = a;\n',
+                                 'let a = 1;\nlet bc = a;\n' ),
+                 has_entries( {
+                   'line': 2,
+                   'offset': 6,
+                   'endLine': 2,
+                   'endOffset': 6,
+                   'insertString': 'c'
+                 } ) )
+
+
+  def test_ComputeChange_DeletionAcrossLines( self ):
+    assert_that( _ComputeChange( 'let a = 1;\nlet b = a;\nlet c = b;\n',
+                                 'let a = 1;\nlet c = b;\n' ),
+                 has_entries( {
+                   'line': 2,
+                   'offset': 5,
+                   'endLine': 3,
+                   'endOffset': 5,
+                   'insertString': ''
+                 } ) )
+
+
+  def test_ComputeChange_Unchanged( self ):
+    assert_that( _ComputeChange( 'let a = 1;\n', 'let a = 1;\n' ),
+                 has_entries( {
+                   'line': 2,
+                   'offset': 1,
+                   'endLine': 2,
+                   'endOffset': 1,
+                   'insertString': ''
+                 } ) )
+
+
+  def test_ComputeChange_UnsupportedCharactersBeforeChange( self ):
+    # TSServer counts offsets in UTF-16 code units and splits lines on carriage
+    # returns.
+    assert_that( _ComputeChange( 'let a = "🐍";\nlet b = a;\n',
+                                 'let a = "🐍";\nlet bc = a;\n' ),
+                 none() )
+    assert_that( _ComputeChange( 'let a = 1;\r\nlet b = a;\r\n',
+                                 'let a = 1;\r\nlet bc = a;\r\n' ),
+                 none() )
+    # They don't matter after the change.
+    assert_that( _ComputeChange( 'let a = 1;\nlet b = "🐍";\r\n',
+                                 'let ab = 1;\nlet b = "🐍";\r\n' ),
+                 has_entries( { 'line': 1, 'offset': 6 } ) )
@@ -538,6 +538,38 @@ class UtilsTest( TestCase ):
                      equal_to( safe_name ) )
 
 
+  def test_ApproximateSize( self ):
+    text = 'x' * 1000
+    assert_that( utils.ApproximateSize( text ),
+                 equal_to( sys.getsizeof( text ) ) )
+
+    # Shared objects are only counted once.
+    shared = [ text, text ]
+    assert_that( utils.ApproximateSize( shared ),
+                 equal_to( sys.getsizeof( shared ) + sys.getsizeof( text ) ) )
+
+    class Object:
+      pass
+
+    obj = Object()
+    obj.values = { 'key': text }
+    assert_that( utils.ApproximateSize( obj ), equal_to(
+      sys.getsizeof( obj ) +
+      sys.getsizeof( vars( obj ) ) +
+      sys.getsizeof( 'values' ) +
+      sys.getsizeof( obj.values ) +
+      sys.getsizeof( 'key' ) +
+      sys.getsizeof( text ) ) )
+
+
+  def test_MemoryUsage( self ):
+    cache = { 'key': 'value' }
+    assert_that( utils.MemoryUsage( cache ), equal_to( {
+      'entries': 1,
+      'bytes': utils.ApproximateSize( cache )
+    } ) )
+
+
   def test_UpdateDict( self ):
     for target, override, expected in [
       ( {}, {}, {} ),
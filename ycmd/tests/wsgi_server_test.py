@@ -0,0 +1,69 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import socket
+from hamcrest import assert_that, equal_to
+from unittest import TestCase
+from ycmd.wsgi_server import RequestHandler
+
+
+def _Handler( connection ):
+  handler = RequestHandler.__new__( RequestHandler )
+  handler.connection = connection
+  return handler
+
+
+class WsgiServerTest( TestCase ):
+  def test_ClientDisconnected( self ):
+    server, client = socket.socketpair()
+    handler = _Handler( server )
+    try:
+      assert_that( handler.ClientDisconnected(), equal_to( False ) )
+      client.close()
+      assert_that( handler.ClientDisconnected(), equal_to( True ) )
+    finally:
+      server.close()
+
+
+  def test_ClientDisconnected_HighFileDescriptor( self ):
+    # select.select can't watch file descriptors above FD_SETSIZE.
+    server, client = socket.socketpair()
+    try:
+      high_fd = os.dup2( server.fileno(), 2000 )
+    except OSError:
+      client.close()
+      self.skipTest( 'Cannot open a file descriptor above FD_SETSIZE' )
+    finally:
+      server.close()
+    high_server = socket.socket( fileno = high_fd )
+    handler = _Handler( high_server )
+    try:
+      assert_that( handler.ClientDisconnected(), equal_to( False ) )
+      client.close()
+      assert_that( handler.ClientDisconnected(), equal_to( True ) )
+    finally:
+      high_server.close()
+
+
+  def test_ClientDisconnected_ErrorIsNotADisconnection( self ):
+    server, client = socket.socketpair()
+    server.close()
+    try:
+      assert_that( _Handler( server ).ClientDisconnected(), equal_to( False ) )
+    finally:
+      client.close()
@@ -0,0 +1,156 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Request-scoped tracing.
+
+When tracing is enabled with the 'enable_tracing' option, each HTTP request is
+traced by the TracingPlugin and the code handling it can record nested timings
+with the Span context manager. Spans opened by a thread outside of a traced
+request are ignored. The traces of the requests slower than the
+'tracing_slow_request_threshold_ms' option are kept, up to MAX_SLOW_TRACES, and
+can be retrieved in the Chrome trace event format (which chrome://tracing and
+Perfetto load) from /trace or written to the 'tracing_trace_file' file on
+shutdown."""
+
+import collections
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+from ycmd.utils import LOGGER
+
+MAX_SLOW_TRACES = 50
+
+_enabled = False
+_slow_request_threshold = 0.1
+_slow_traces = collections.deque( maxlen = MAX_SLOW_TRACES )
+_slow_traces_lock = threading.Lock()
+_request_ids = itertools.count( 1 )
+_thread_state = threading.local()
+
+
+def Configure( user_options ):
+  global _enabled, _slow_request_threshold
+  _enabled = bool( user_options.get( 'enable_tracing' ) )
+  _slow_request_threshold = user_options.get(
+    'tracing_slow_request_threshold_ms', 100 ) / 1000
+
+
+def IsEnabled():
+  return _enabled
+
+
+class _Trace:
+  def __init__( self, name ):
+    self.request_id = next( _request_ids )
+    self.thread_id = threading.get_ident()
+    self.stack = []
+    # ( name, start time, duration, depth ) in seconds.
+    self.spans = []
+    self.Open( name )
+
+
+  def Open( self, name ):
+    self.stack.append( ( name, time.perf_counter(), len( self.stack ) ) )
+
+
+  def Close( self ):
+    name, start_time, depth = self.stack.pop()
+    self.spans.append(
+      ( name, start_time, time.perf_counter() - start_time, depth ) )
+
+
+@contextlib.contextmanager
+def Trace( name ):
+  """Traces the request handled by the current thread in its block, recording
+  the block itself as the root span |name|."""
+  if not _enabled:
+    yield
+    return
+
+  trace = _thread_state.trace = _Trace( name )
+  try:
+    yield
+  finally:
+    trace.Close()
+    _thread_state.trace = None
+    # The root span is the last one to be closed.
+    if trace.spans[ -1 ][ 2 ] >= _slow_request_threshold:
+      with _slow_traces_lock:
+        _slow_traces.append( trace )
+
+
+@contextlib.contextmanager
+def Span( name ):
+  """Records the time spent in its block as the span |name| of the trace of the
+  current thread, nested in the spans currently open."""
+  trace = getattr( _thread_state, 'trace', None ) if _enabled else None
+  if trace is None:
+    yield
+    return
+
+  trace.Open( name )
+  try:
+    yield
+  finally:
+    trace.Close()
+
+
+def ChromeTraceEvents():
+  """Returns the slow traces in the Chrome trace event format. Each request is
+  shown as its own track, named after its id and root span."""
+  with _slow_traces_lock:
+    traces = list( _slow_traces )
+
+  pid = os.getpid()
+  events = []
+  for trace in traces:
+    root_name = trace.spans[ -1 ][ 0 ]
+    events.append( {
+      'name': 'thread_name',
+      'ph': 'M',
+      'pid': pid,
+      'tid': trace.request_id,
+      'args': { 'name': f'Request { trace.request_id } { root_name }' },
+    } )
+    for name, start_time, duration, depth in trace.spans:
+      events.append( {
+        'name': name,
+        'cat': 'ycmd',
+        'ph': 'X',
+        'ts': start_time * 1e6,
+        'dur': duration * 1e6,
+        'pid': pid,
+        'tid': trace.request_id,
+        'args': { 'thread': trace.thread_id, 'depth': depth },
+      } )
+  return { 'traceEvents': events, 'displayTimeUnit': 'ms' }
+
+
+def WriteChromeTrace( path ):
+  try:
+    with open( path, 'w' ) as trace_file:
+      json.dump( ChromeTraceEvents(), trace_file )
+  except OSError:
+    LOGGER.exception( 'Unable to write the trace to %s', path )
+
+
+def ClearTraces():
+  with _slow_traces_lock:
+    _slow_traces.clear()
@@ -0,0 +1,34 @@
+# Copyright (C) 2026 ycmd contributors
+#
+# This file is part of ycmd.
+#
+# ycmd is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# ycmd is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
+
+from ycmd import tracing
+
+
+# This class implements the Bottle plugin API:
+# http://bottlepy.org/docs/dev/plugindev.html
+#
+# Every route handler is decorated so that each request is traced, with the
+# route as its root span. The plugin is only installed when tracing is enabled.
+class TracingPlugin:
+  name = 'tracing'
+  api = 2
+
+  def __call__( self, callback ):
+    def wrapper( request, response ):
+      with tracing.Trace( request.path ):
+        return callback( request, response )
+    return wrapper
@@ -25,6 +25,7 @@ import sys
 import tempfile
 import time
 import threading
+import types
 
 LOGGER = logging.getLogger( 'ycmd' )
 ROOT_DIR = os.path.normpath( os.path.join( os.path.dirname( __file__ ), '..' ) )
@@ -456,6 +457,23 @@ class HashableDict( Mapping ):
     return self.__class__( self, **add_or_replace )
 
 
+# State of the HTTP request handled by the current thread.
+_request_state = threading.local()
+
+
+def SetClientDisconnectedCheck( check ):
+  """Sets the callable returning whether the client of the HTTP request handled
+  by the current thread has disconnected, or None when outside of a request."""
+  _request_state.client_disconnected = check
+
+
+def GetClientDisconnectedCheck():
+  """Returns the callable set by SetClientDisconnectedCheck for the current
+  thread, or None. Long-running operations on behalf of a request can poll it to
+  give up once nobody is waiting for the result."""
+  return getattr( _request_state, 'client_disconnected', None )
+
+
 def ListDirectory( path ):
   try:
     # Path must be a Unicode string to get Unicode strings out of listdir.
@@ -580,3 +598,37 @@ def UpdateDict( target, override ):
       target[ key ] = value
 
   return target
+
+
+def ApproximateSize( obj ):
+  """Returns an estimate of the number of bytes used by |obj| and the objects it
+  references through containers and instance attributes. Objects referenced
+  several times are only counted once. Classes, modules and functions are not
+  followed."""
+  seen = set()
+  size = 0
+  objects = [ obj ]
+  while objects:
+    current = objects.pop()
+    if id( current ) in seen:
+      continue
+    seen.add( id( current ) )
+    size += sys.getsizeof( current )
+    if isinstance( current, dict ):
+      objects.extend( current.keys() )
+      objects.extend( current.values() )
+    elif isinstance( current, ( list, tuple, set, frozenset ) ):
+      objects.extend( current )
+    elif ( hasattr( current, '__dict__' ) and
+           not isinstance( current, ( type,
+                                      types.ModuleType,
+                                      types.FunctionType,
+                                      types.MethodType ) ) ):
+      objects.append( vars( current ) )
+  return size
+
+
+def MemoryUsage( container ):
+  """Returns the number of entries of |container| and an estimate of its size in
+  bytes, in the format of the /memory_usage response."""
+  return { 'entries': len( container ), 'bytes': ApproximateSize( container ) }
@@ -20,6 +20,7 @@ import copy
 from threading import Lock
 from ycmd.handlers import ServerShutdown
 from ycmd.utils import LOGGER, StartThread
+from ycmd.web_plumbing import EventStream
 
 
 # This class implements the Bottle plugin API:
@@ -94,5 +95,10 @@ class WatchdogPlugin:
   def __call__( self, callback ):
     def wrapper( *args, **kwargs ):
       self._SetLastRequestTime( time.time() )
-      return callback( *args, **kwargs )
+      body = callback( *args, **kwargs )
+      # A client holding an event stream open is not idle, even though it does
+      # not send requests.
+      if isinstance( body, EventStream ):
+        body.AddObserver( lambda: self._SetLastRequestTime( time.time() ) )
+      return body
     return wrapper
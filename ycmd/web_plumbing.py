@@ -25,6 +25,8 @@ import sys
 import traceback
 import urllib.parse
 
+from ycmd.utils import SetClientDisconnectedCheck
+
 
 _MEMFILE_MAX = 10 * 1024 * 1024
 
@@ -98,6 +100,49 @@ class Request:
     return json.loads( self.body )
 
 
+class EventStream:
+  """ A response body made of server-sent events, sent to the client as they
+  are produced instead of all at once. |events| is an iterable of ( event,
+  data ) pairs of strings; an event of None is a heartbeat, sent as a comment
+  to keep the connection alive. Plugins can add a field to every event with
+  AddField and be notified before each event is sent with AddObserver. """
+  def __init__( self, events ):
+    self._events = events
+    self._fields : List[ Tuple[ str, Callable[ [ str, str ], str ] ] ] = []
+    self._observers : List[ Callable[ [], None ] ] = []
+
+  def AddField( self,
+                name : str,
+                producer : Callable[ [ str, str ], str ] ) -> None:
+    """ Adds the field |name| to every event, its value being the result of
+    calling |producer| with the name and the data of the event. """
+    self._fields.append( ( name, producer ) )
+
+  def AddObserver( self, observer : Callable[ [], None ] ) -> None:
+    self._observers.append( observer )
+
+  def __iter__( self ):
+    # The headers are only sent with the first chunk of the body, which must not
+    # wait for the first event.
+    yield ': stream\n\n'
+    for event, data in self._events:
+      for observer in self._observers:
+        observer()
+      if event is None:
+        yield ': heartbeat\n\n'
+        continue
+      lines = [ f'event: { event }' ]
+      lines.extend( f'data: { line }' for line in data.split( '\n' ) )
+      lines.extend( f'{ name }: { producer( event, data ) }'
+                    for name, producer in self._fields )
+      yield '\n'.join( lines ) + '\n\n'
+
+  def close( self ) -> None:
+    close = getattr( self._events, 'close', None )
+    if close:
+      close()
+
+
 CallbackType = Callable[ [ Request, Response ], str ]
 CallbackDecoratorType = Callable[ [ CallbackType ], CallbackType ]
 PluginType = Callable[ [ CallbackType ], CallbackType ]
@@ -199,6 +244,7 @@ class AppProducer:
     status = '200 OK'
     request = Request( environ )
     response = Response()
+    SetClientDisconnectedCheck( environ.get( 'ycmd.client_disconnected' ) )
     try:
       if int( environ.get( 'CONTENT_LENGTH' ) or '0' ) > _MEMFILE_MAX:
         raise HTTPError( 413, 'Request too large' )
@@ -223,12 +269,29 @@ class AppProducer:
       status = '500 ' + e.body
       response = Response()
       out = self._ErrorHandler( e, response )
+    finally:
+      SetClientDisconnectedCheck( None )
+    if isinstance( out, EventStream ):
+      response.set_header( 'Content-Type', 'text/event-stream' )
+      response.set_header( 'Cache-Control', 'no-cache' )
+      start_response( status, response.headers )
+      return _EncodeEventStream( out )
     out = out.encode( 'utf-8' )
     response.set_header( 'Content-Length', str( len( out ) ) )
     start_response( status, response.headers )
     return [ out ]
 
 
+def _EncodeEventStream( stream : EventStream ):
+  # The server closes the returned iterable when the client disconnects, which
+  # closes the stream in turn.
+  try:
+    for chunk in stream:
+      yield chunk.encode( 'utf-8' )
+  finally:
+    stream.close()
+
+
 def abort( code : int, text : str ):
   """ abort() lets plugins easily abort a response, providing an HTTP status
   code and reason as arguments. """
@@ -15,13 +15,54 @@
 # You should have received a copy of the GNU General Public License
 # along with ycmd.  If not, see <http://www.gnu.org/licenses/>.
 
+import selectors
+import socket
 from wsgiref.simple_server import WSGIServer, WSGIRequestHandler
 from socketserver import ThreadingMixIn
 
 
+class RequestHandler( WSGIRequestHandler ):
+  """Request handler letting the application check whether the client closed
+  the connection while its request is being processed, through the
+  'ycmd.client_disconnected' callable of the WSGI environment."""
+
+  _selector = None
+
+
+  def get_environ( self ):
+    environ = super().get_environ()
+    environ[ 'ycmd.client_disconnected' ] = self.ClientDisconnected
+    return environ
+
+
+  def ClientDisconnected( self ):
+    # The request body has already been read, so the socket is only readable
+    # once the client has closed its end of the connection. A selector is used
+    # instead of select.select, which fails for file descriptors above
+    # FD_SETSIZE. Errors are not taken as a disconnection so that requests are
+    # not cancelled because of them.
+    try:
+      if self._selector is None:
+        self._selector = selectors.DefaultSelector()
+        self._selector.register( self.connection, selectors.EVENT_READ )
+      return ( bool( self._selector.select( 0 ) ) and
+               not self.connection.recv( 1, socket.MSG_PEEK ) )
+    except ( OSError, ValueError ):
+      return False
+
+
+  def finish( self ):
+    try:
+      super().finish()
+    finally:
+      if self._selector is not None:
+        self._selector.close()
+        self._selector = None
+
+
 class StoppableWSGIServer( ThreadingMixIn, WSGIServer ):
   daemon_threads = False
 
   def __init__( self, app, host, port ):
-    super().__init__( ( host, port ), WSGIRequestHandler )
+    super().__init__( ( host, port ), RequestHandler )
     self.set_app( app )